@@ -13,14 +13,13 @@ Safe by design:
 This version is a DROP-IN replacement for your current ace_bias.py:
 - Keeps existing env vars:
     COUNCIL_ACE_ENABLE, COUNCIL_ACE_WS, COUNCIL_ACE_CACHE_SECONDS, SHEET_URL
-- Uses utils.get_gspread_client() if present (preferred, consistent auth/backoff),
-  else falls back to your prior gspread+oauth2client loading.
+- Opens Sheets via the shared utils client/Spreadsheet registry
+  (one authorization per process, consistent auth/backoff).
 - Adds bounded per-refresh step limiting to prevent oscillation.
 """
 
 from __future__ import annotations
 
-import json
 import os
 import threading
 import time
@@ -71,57 +70,15 @@ def _idx(headers: list, name: str) -> int:
     except ValueError:
         return -1
 
-def _open_worksheet_prefer_utils():
-    """
-    Preferred: use your existing utils.get_gspread_client() so we inherit your
-    service-account fallback logic and any rate-limits/backoff you already built.
-    """
-    try:
-        from utils import get_gspread_client
-        if not SHEET_URL:
-            raise RuntimeError("SHEET_URL not configured")
-        gc = get_gspread_client()
-        sh = gc.open_by_url(SHEET_URL)
-        return sh.worksheet(ACE_WS)
-    except Exception:
-        return None
-
-def _open_worksheet_fallback():
+def _open_worksheet():
     """
-    Fallback: keep your previous behavior (gspread + oauth2client).
+    Open ACE_WS through the shared utils client/Spreadsheet registry so we
+    inherit the service-account fallback logic, rate limits and backoff.
     """
-    import gspread
-    from oauth2client.service_account import ServiceAccountCredentials
-
+    from utils import get_sheet
     if not SHEET_URL:
         raise RuntimeError("SHEET_URL not configured")
-
-    svc = (
-        os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        or os.getenv("GOOGLE_CREDENTIALS_JSON")
-        or os.getenv("SVC_JSON")
-        or "sentiment-log-service.json"
-    )
-
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive",
-    ]
-
-    if str(svc).strip().startswith("{"):
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(json.loads(svc), scope)
-    else:
-        creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-
-    client = gspread.authorize(creds)
-    sh = client.open_by_url(SHEET_URL)
-    return sh.worksheet(ACE_WS)
-
-def _open_worksheet():
-    ws = _open_worksheet_prefer_utils()
-    if ws is not None:
-        return ws
-    return _open_worksheet_fallback()
+    return get_sheet(SHEET_URL).worksheet(ACE_WS)
 
 def _compute_from_rates(row: list, col_trades: int, col_success: int, col_error: int) -> Optional[float]:
     """
@@ -0,0 +1,309 @@
+# agent_freshness.py — in-memory Edge agent freshness for the lease trust boundary
+"""
+/api/commands/pull evaluates the requesting agent on every lease. That used
+to cost a MAX(created_at) query on nova_telemetry per agent and, on a miss,
+a full uncached Wallet_Monitor read; authority_gate added an upsert plus a
+select per pull. This module keeps the answer in memory instead:
+
+- Telemetry push handlers (wsgi telemetry_push / telemetry_push_balances,
+  telemetry_routes.update_from_push and /api/heartbeat, telemetry_api
+  pushes) call note_seen(agent, ts). Pulls read last_seen()/age_seconds()
+  from a dict.
+- Reconciliation: every AGENT_FRESHNESS_RECONCILE_S the background thread
+  merges the latest nova_telemetry.created_at for the known agents (one
+  indexed top-1 lookup per agent). This covers pushes handled by another
+  worker. An agent with no signal in memory yet (fresh process) is looked
+  up inline once, rate-limited per agent.
+- Sheets: never read on the pull path. When Postgres is unavailable the
+  background thread merges Wallet_Monitor / NovaHeartbeat timestamps
+  (normal cached reads) at the reconcile cadence.
+- Contacts: touch(agent) records a pull; the background thread writes them
+  in one batch every AGENT_FRESHNESS_FLUSH_S through the sink registered
+  with set_contact_sink() (authority_gate's agent_authority.last_seen).
+
+Env:
+  AGENT_FRESHNESS_RECONCILE_S   default 30
+  AGENT_FRESHNESS_FLUSH_S       default 5
+  AGENT_FRESHNESS_STMT_MS       default 2000 (statement_timeout for reconciliation)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional
+
+AGENT_FRESHNESS_RECONCILE_S = float(os.getenv("AGENT_FRESHNESS_RECONCILE_S", "30") or "30")
+AGENT_FRESHNESS_FLUSH_S = float(os.getenv("AGENT_FRESHNESS_FLUSH_S", "5") or "5")
+AGENT_FRESHNESS_STMT_MS = int(os.getenv("AGENT_FRESHNESS_STMT_MS", "2000") or "2000")
+
+_DB_URL = os.getenv("DB_URL") or os.getenv("DATABASE_URL") or ""
+
+try:
+    from utils import warn  # type: ignore
+except Exception:  # pragma: no cover
+    def warn(msg: str) -> None:  # type: ignore
+        print("[WARN]", msg)
+
+_ANY_AGENT = "*"  # Sheets rows that carry no agent
+
+_lock = threading.Lock()
+_seen: Dict[str, float] = {}        # agent -> latest freshness signal (epoch seconds)
+_source: Dict[str, str] = {}        # agent -> where that signal came from
+_contacts: Dict[str, float] = {}    # agent -> latest pull, pending the batched write
+_contact_sink: Optional[Callable[[Dict[str, float]], None]] = None
+
+_reconcile_lock = threading.Lock()
+_reconciled_at = 0.0
+_looked_up: Dict[str, float] = {}   # agent -> last on-demand lookup (unknown agents)
+_db_ok: Optional[bool] = None       # None: not tried yet
+
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+_stats: Dict[str, Any] = {
+    "pushes": 0,
+    "reconciles": 0,
+    "reconcile_errors": 0,
+    "sheet_fallbacks": 0,
+    "contacts_flushed": 0,
+    "contact_flush_errors": 0,
+}
+
+
+def _merge(agent_id: str, ts: float, source: str) -> None:
+    """Keep the newest signal per agent. Caller holds _lock."""
+    if ts > _seen.get(agent_id, 0.0):
+        _seen[agent_id] = ts
+        _source[agent_id] = source
+
+
+def note_seen(agent_id: Any, ts: Any = None, source: str = "push") -> None:
+    """Record a freshness signal (telemetry push / heartbeat) for agent_id."""
+    aid = str(agent_id or "").strip()
+    if not aid:
+        return
+    now = time.time()
+    try:
+        t = float(ts) if ts is not None else now
+    except Exception:
+        t = now
+    if t > 1e12:  # milliseconds
+        t /= 1000.0
+    t = min(t, now)  # an Edge clock running ahead must not extend trust
+    with _lock:
+        _merge(aid, t, source)
+        _stats["pushes"] += 1
+    _ensure_thread()
+
+
+# ---------------- reconciliation ----------------
+def _db_latest(agent_ids: Iterable[str]) -> Dict[str, float]:
+    ids = sorted({a for a in agent_ids if a})
+    if not ids or not _DB_URL:
+        raise RuntimeError("no agents or DB_URL missing")
+    from db_pool import pg_conn  # type: ignore
+
+    with pg_conn(url=_DB_URL, autocommit=True, statement_timeout_ms=AGENT_FRESHNESS_STMT_MS,
+                 caller="agent_freshness") as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT a.agent_id,
+                   (SELECT EXTRACT(EPOCH FROM MAX(t.created_at))
+                      FROM nova_telemetry t
+                     WHERE t.agent_id = a.agent_id)
+              FROM unnest(%s::text[]) AS a(agent_id)
+            """,
+            (ids,),
+        )
+        rows = cur.fetchall()
+        cur.close()
+    return {str(r[0]): float(r[1]) for r in rows if r[1] is not None}
+
+
+def reconcile(agent_ids: Iterable[str] = (), *, force: bool = False) -> bool:
+    """Merge nova_telemetry freshness for the known agents (plus agent_ids).
+
+    Runs when forced, when the last pass is older than AGENT_FRESHNESS_RECONCILE_S,
+    or for an agent not looked up yet. Returns True when a pass ran; never
+    waits behind another caller's pass.
+    """
+    global _reconciled_at, _db_ok
+    now = time.time()
+    extra = [str(a).strip() for a in agent_ids if str(a).strip()]
+    new = [a for a in extra if a not in _seen and now - _looked_up.get(a, 0.0) >= AGENT_FRESHNESS_RECONCILE_S]
+    if not force and not new and now - _reconciled_at < AGENT_FRESHNESS_RECONCILE_S:
+        return False
+    if not _reconcile_lock.acquire(blocking=False):
+        return False
+    try:
+        with _lock:
+            ids = (set(_seen) | set(_contacts) | set(extra)) - {_ANY_AGENT}
+        for a in extra:
+            _looked_up[a] = now
+        _reconciled_at = now
+        if not ids:
+            return False
+        try:
+            latest = _db_latest(ids)
+            _db_ok = True
+        except Exception as e:
+            if _db_ok is not False:
+                warn(f"agent_freshness: nova_telemetry reconcile unavailable: {e!r}")
+            _db_ok = False
+            _stats["reconcile_errors"] += 1
+            return False
+        with _lock:
+            for aid, ts in latest.items():
+                _merge(aid, ts, "nova_telemetry")
+            _stats["reconciles"] += 1
+        return True
+    finally:
+        _reconcile_lock.release()
+
+
+def _parse_sheet_ts(ts: Any) -> Optional[float]:
+    try:
+        s = str(ts).strip()
+        if not s:
+            return None
+        # Common Sheets format: "YYYY-MM-DD HH:MM:SS"
+        return datetime.strptime(s, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+    except Exception:
+        return None
+
+
+def _merge_from_sheets() -> None:
+    """Fallback while Postgres telemetry is unavailable (background thread only)."""
+    try:
+        from utils import get_records_cached  # type: ignore
+    except Exception:
+        return
+    for tab in ("Wallet_Monitor", "NovaHeartbeat"):
+        try:
+            rows = get_records_cached(tab) or []
+        except Exception:
+            continue
+        best: Dict[str, float] = {}
+        for r in rows:
+            if not isinstance(r, dict):
+                continue
+            # rows without an agent column count for every agent (as before)
+            a = str(r.get("Agent") or r.get("agent_id") or r.get("agent") or "").strip() or _ANY_AGENT
+            t = _parse_sheet_ts(r.get("Timestamp") or r.get("ts") or r.get("created_at"))
+            if t is not None and t > best.get(a, 0.0):
+                best[a] = t
+        with _lock:
+            for a, t in best.items():
+                _merge(a, min(t, time.time()), tab)
+    _stats["sheet_fallbacks"] += 1
+
+
+# ---------------- reads ----------------
+def last_seen(agent_id: str) -> Optional[float]:
+    """Newest freshness signal for agent_id (epoch seconds), from memory.
+
+    Only an agent this process has no signal for triggers an inline DB lookup
+    (rate-limited per agent); periodic reconciliation runs in the background.
+    """
+    aid = str(agent_id or "").strip()
+    ts = _seen.get(aid)
+    if ts is None:
+        reconcile((aid,))
+        ts = _seen.get(aid)
+    _ensure_thread()
+    anyone = _seen.get(_ANY_AGENT)
+    if anyone is not None and (ts is None or anyone > ts):
+        return anyone
+    return ts
+
+
+def age_seconds(agent_id: str) -> Optional[int]:
+    ts = last_seen(agent_id)
+    if ts is None:
+        return None
+    return max(0, int(time.time() - ts))
+
+
+# ---------------- pull contacts (batched writes) ----------------
+def set_contact_sink(fn: Callable[[Dict[str, float]], None]) -> None:
+    """fn({agent_id: epoch_seconds}) persists a batch of pull contacts."""
+    global _contact_sink
+    _contact_sink = fn
+
+
+def touch(agent_id: str) -> None:
+    """Record a pull from agent_id; written in the next batch."""
+    aid = str(agent_id or "").strip()
+    if not aid:
+        return
+    with _lock:
+        _contacts[aid] = time.time()
+    _ensure_thread()
+
+
+def flush_contacts() -> int:
+    sink = _contact_sink
+    with _lock:
+        if not _contacts or sink is None:
+            return 0
+        batch = dict(_contacts)
+        _contacts.clear()
+    try:
+        sink(batch)
+    except Exception as e:
+        with _lock:
+            for a, t in batch.items():
+                if t > _contacts.get(a, 0.0):
+                    _contacts[a] = t
+            _stats["contact_flush_errors"] += 1
+        warn(f"agent_freshness: contact flush failed ({len(batch)} agents): {e!r}")
+        return 0
+    _stats["contacts_flushed"] += len(batch)
+    return len(batch)
+
+
+# ---------------- background thread ----------------
+def _run() -> None:
+    next_sheet = 0.0
+    while True:
+        time.sleep(AGENT_FRESHNESS_FLUSH_S)
+        try:
+            flush_contacts()
+            reconcile()
+            if _db_ok is False and time.time() >= next_sheet:
+                next_sheet = time.time() + AGENT_FRESHNESS_RECONCILE_S
+                _merge_from_sheets()
+        except Exception as e:
+            warn(f"agent_freshness: background pass failed: {e!r}")
+
+
+def _ensure_thread() -> None:
+    global _thread
+    if _thread is not None:
+        return
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="agent-freshness", daemon=True)
+            _thread.start()
+
+
+def freshness_stats() -> Dict[str, Any]:
+    now = time.time()
+    with _lock:
+        agents = {
+            a: {"age_sec": int(now - t), "source": _source.get(a, "")}
+            for a, t in sorted(_seen.items())
+        }
+        pending = len(_contacts)
+    out = dict(_stats)
+    out.update({
+        "agents": agents,
+        "pending_contacts": pending,
+        "db_ok": _db_ok,
+        "reconciled_age_sec": int(now - _reconciled_at) if _reconciled_at else None,
+    })
+    return out
@@ -21,6 +21,8 @@ from __future__ import annotations
 import os, json
 from typing import Any, Dict, List, Optional
 
+import config_service
+
 try:
     from utils import info, warn, error, get_sheet
 except Exception:  # pragma: no cover
@@ -43,13 +45,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw=(os.getenv("DB_READ_JSON") or "").strip()
-    if not raw: return {}
-    try:
-        obj=json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg_alpha() -> Dict[str, Any]:
@@ -123,7 +119,8 @@ def _rows_for_today(cur, limit:int=200) -> List[Dict[str, Any]]:
           COALESCE(gates::text,'{}') AS gates_json,
           proposal_hash
         FROM alpha_proposals
-        WHERE (ts AT TIME ZONE 'UTC')::date = (NOW() AT TIME ZONE 'UTC')::date
+        WHERE ts >= date_trunc('day', NOW() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+          AND ts <  (date_trunc('day', NOW() AT TIME ZONE 'UTC') + INTERVAL '1 day') AT TIME ZONE 'UTC'
         ORDER BY ts DESC
         LIMIT %s;
         """,
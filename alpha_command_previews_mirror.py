@@ -26,6 +26,8 @@ import json
 import os
 from typing import Any, Dict, List, Optional
 
+import config_service
+
 try:
     import psycopg2  # type: ignore
 except Exception:  # pragma: no cover
@@ -51,14 +53,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _alpha_cfg() -> Dict[str, Any]:
@@ -290,53 +290,53 @@ def run_alpha_outbox_preview(limit: int = 50) -> Tuple[int, int, str]:
         info(f"alpha_outbox_preview: {msg}")
         return 0, 0, msg
 
-    conn = _get_conn()
-    if conn is None:
-        warn("alpha_outbox_preview: no DB connection")
-        return 0, 0, "no_db"
+    with _get_conn() as conn:
+        if conn is None:
+            warn("alpha_outbox_preview: no DB connection")
+            return 0, 0, "no_db"
 
-    store = get_store()
+        store = get_store()
 
-    processed = 0
-    enq = 0
-    try:
-        cur = conn.cursor()
-        translations = _fetch_latest_approved_translations(cur, limit=limit)
-        processed = len(translations)
+        processed = 0
+        enq = 0
+        try:
+            cur = conn.cursor()
+            translations = _fetch_latest_approved_translations(cur, limit=limit)
+            processed = len(translations)
 
-        for t in translations:
-            rh = t.get("row_hash") or ""
-            if not rh:
-                continue
-            if _already_enqueued(cur, rh):
-                continue
+            for t in translations:
+                rh = t.get("row_hash") or ""
+                if not rh:
+                    continue
+                if _already_enqueued(cur, rh):
+                    continue
 
-            intent = _build_outbox_intent(t)
-            res = store.enqueue(agent_id=AGENT_ID, intent=intent, dedup_ttl_seconds=DEDUP_TTL)
-            cmd_id = int(res.get("id") or 0)
-            if cmd_id <= 0:
-                continue
+                intent = _build_outbox_intent(t)
+                res = store.enqueue(agent_id=AGENT_ID, intent=intent, dedup_ttl_seconds=DEDUP_TTL)
+                cmd_id = int(res.get("id") or 0)
+                if cmd_id <= 0:
+                    continue
 
-            enq += _record_preview(cur, t, cmd_id, intent)
+                enq += _record_preview(cur, t, cmd_id, intent)
 
-        conn.commit()
+            conn.commit()
 
-        try:
-            mirrored = _mirror_sheet(conn)
-        except Exception as e:
-            mirrored = 0
-            warn(f"alpha_outbox_preview: sheet mirror failed: {e}")
+            try:
+                mirrored = _mirror_sheet(conn)
+            except Exception as e:
+                mirrored = 0
+                warn(f"alpha_outbox_preview: sheet mirror failed: {e}")
 
-        info(f"alpha_outbox_preview: processed={processed} enqueued_new={enq} mirrored={mirrored} (tab='{TAB_PREVIEWS}')")
-        return processed, enq, "ok"
+            info(f"alpha_outbox_preview: processed={processed} enqueued_new={enq} mirrored={mirrored} (tab='{TAB_PREVIEWS}')")
+            return processed, enq, "ok"
 
-    except Exception as e:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        warn(f"alpha_outbox_preview failed: {e}")
-        return processed, enq, f"error:{e}"
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            warn(f"alpha_outbox_preview failed: {e}")
+            return processed, enq, f"error:{e}"
 
 
 if __name__ == "__main__":
@@ -29,16 +29,11 @@ import json
 import logging
 from typing import Any, Dict
 
+import config_service
+
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg_get(cfg: Dict[str, Any], dotted: str, default=None):
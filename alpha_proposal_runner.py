@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-alpha_proposal_runner.py — Phase 26A (v1.3.1 SQL-native, bulletproof)
+alpha_proposal_runner.py — Phase 26A (v1.4 SQL-native, in-process)
 
 Why this exists:
 - Your Phase 26 logic already lives in canonical SQL files.
@@ -14,24 +14,28 @@ Safety:
     ALPHA_PREVIEW_PROPOSALS_ENABLED=1
 - Never enqueues commands / never executes trades.
 
-Execution model:
-1) Run sql/alpha_tools.sql in SAFE mode (force preview_enabled=0) to ensure helper objects exist.
-2) Run sql/alpha_proposal_generator.sql with preview_enabled=1 to generate preview proposals.
-3) Optionally run sql/alpha_polish.sql with preview_enabled=1.
+Execution model (one pooled connection, one transaction; no psql subprocesses):
+1) sql/alpha_tools.sql in SAFE mode (force preview_enabled=0) — only when its
+   checksum differs from the one recorded in schema_migrations.
+2) sql/alpha_proposal_generator.sql with preview_enabled=1; its final
+   `SELECT COUNT(*) AS inserted` (INSERT ... RETURNING) is the new-proposal count.
+3) Optionally sql/alpha_polish.sql with preview_enabled=1.
+
+The SQL files keep their psql form (\\set, \\if :{?var}, :var / :'var'); the
+small interpreter below expands those the way psql does and splits the script
+into statements (quotes, dollar-quoted bodies and comments are left intact).
 
 This file is intentionally self-contained and avoids shim hacks that can break imports.
 """
 
 from __future__ import annotations
 
+import hashlib
 import os
 import re
-import subprocess
-import tempfile
-from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parent
 SQL_DIR = ROOT / "sql"
@@ -47,12 +51,20 @@ POLISH_ENABLED = os.getenv("ALPHA_POLISH_ENABLED", "1").strip().lower() not in (
 PREVIEW_ENABLED = os.getenv("PREVIEW_ENABLED", "0").strip().lower() in ("1", "true", "yes")
 ALPHA_ENABLED = os.getenv("ALPHA_PREVIEW_PROPOSALS_ENABLED", "0").strip().lower() in ("1", "true", "yes")
 
-# psql binary name/path
-PSQL_BIN = os.getenv("PSQL_BIN", "psql")
+# Statement timeout for the whole tick (0 = server default)
+ALPHA_RUNNER_STMT_MS = int(os.getenv("ALPHA_RUNNER_STMT_MS", "120000"))
 
 # Remove any existing \set preview_enabled ... lines from tools and force to 0
 _PREVIEW_SET_RE = re.compile(r"^\s*\\set\s+preview_enabled\s+.*$", re.IGNORECASE | re.MULTILINE)
 
+# Today's UTC window as a range on ts, so idx_alpha_proposals_ts is usable
+# (matches the mirrors' WHERE clause).
+TODAY_COUNT_SQL = (
+    "SELECT COUNT(*) FROM alpha_proposals "
+    "WHERE ts >= date_trunc('day', NOW() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' "
+    "AND ts < (date_trunc('day', NOW() AT TIME ZONE 'UTC') + INTERVAL '1 day') AT TIME ZONE 'UTC'"
+)
+
 
 def _utc_now() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
@@ -62,30 +74,6 @@ def _log(level: str, msg: str) -> None:
     print(f"[{_utc_now()}] {level.upper():5s} {msg}", flush=True)
 
 
-@dataclass
-class RunResult:
-    ok: bool
-    returncode: int
-    stdout: str
-    stderr: str
-
-
-def _run_cmd(cmd: list[str], env: Optional[dict] = None, cwd: Optional[Path] = None) -> RunResult:
-    proc = subprocess.run(
-        cmd,
-        env=env,
-        cwd=str(cwd) if cwd else None,
-        capture_output=True,
-        text=True,
-    )
-    return RunResult(
-        ok=(proc.returncode == 0),
-        returncode=proc.returncode,
-        stdout=proc.stdout or "",
-        stderr=proc.stderr or "",
-    )
-
-
 def _require_db_url() -> str:
     db_url = os.getenv("DB_URL") or os.getenv("DATABASE_URL")
     if not db_url:
@@ -108,32 +96,198 @@ def _patched_tools_sql(original: str) -> str:
     return "\\set preview_enabled 0\n" + stripped
 
 
-def _write_temp_sql(contents: str) -> Path:
-    fd, path = tempfile.mkstemp(prefix="alpha_tools_safe_", suffix=".sql")
-    os.close(fd)
-    p = Path(path)
-    p.write_text(contents, encoding="utf-8")
-    return p
+# ---------------- psql script interpreter ----------------
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_DOLLAR_RE = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)?\$")
+_TRUE = {"1", "on", "true", "t", "yes", "y"}
+
+
+def _quote_literal(v: str) -> str:
+    return "'" + v.replace("'", "''") + "'"
+
+
+def _meta_args(rest: str, variables: Dict[str, str]) -> List[str]:
+    """Split psql meta-command arguments (quotes stripped, :var expanded)."""
+    out: List[str] = []
+    for tok in re.findall(r"'(?:[^']|'')*'|\S+", rest):
+        if tok.startswith("'") and tok.endswith("'") and len(tok) >= 2:
+            out.append(tok[1:-1].replace("''", "'"))
+        elif tok.startswith(":{?") and tok.endswith("}"):
+            out.append("TRUE" if tok[3:-1] in variables else "FALSE")
+        elif tok.startswith(":") and tok[1:] in variables:
+            out.append(variables[tok[1:]])
+        else:
+            out.append(tok)
+    return out
+
+
+def _psql_statements(script: str, variables: Optional[Dict[str, str]] = None) -> List[str]:
+    """Expand psql variables / \\if blocks in `script` and split it into statements."""
+    variables = dict(variables or {})
+    active: List[bool] = []          # \if stack: branch taken?
+    taken: List[bool] = []           # \if stack: some branch already taken?
+    stmts: List[str] = []
+    buf: List[str] = []
+    has_code = False
+    i, n = 0, len(script)
+
+    def on() -> bool:
+        return all(active)
+
+    def emit(s: str, code: bool = True) -> None:
+        nonlocal has_code
+        if on():
+            buf.append(s)
+            has_code = has_code or (code and bool(s.strip()))
+
+    while i < n:
+        at_line_start = i == 0 or script[i - 1] == "\n"
+        if at_line_start:
+            j = i
+            while j < n and script[j] in " \t":
+                j += 1
+            if j < n and script[j] == "\\":
+                end = script.find("\n", j)
+                end = n if end < 0 else end
+                line = script[j + 1:end].strip()
+                cmd, _, rest = line.partition(" ")
+                cmd = cmd.lower()
+                if cmd == "if":
+                    cond = " ".join(_meta_args(rest, variables)).strip().lower() in _TRUE
+                    active.append(cond)
+                    taken.append(cond)
+                elif cmd == "elif" and active:
+                    cond = not taken[-1] and " ".join(_meta_args(rest, variables)).strip().lower() in _TRUE
+                    active[-1] = cond
+                    taken[-1] = taken[-1] or cond
+                elif cmd == "else" and active:
+                    active[-1] = not taken[-1]
+                    taken[-1] = True
+                elif cmd == "endif" and active:
+                    active.pop()
+                    taken.pop()
+                elif cmd == "set" and on():
+                    args = _meta_args(rest, variables)
+                    if args:
+                        variables[args[0]] = "".join(args[1:])
+                elif cmd == "unset" and on():
+                    for a in _meta_args(rest, variables)[:1]:
+                        variables.pop(a, None)
+                # \echo, \timing, \pset ... are output-only: ignored.
+                i = end + 1
+                continue
+
+        c = script[i]
+        if c == "-" and script.startswith("--", i):
+            end = script.find("\n", i)
+            end = n if end < 0 else end
+            emit(script[i:end], code=False)
+            i = end
+        elif c == "/" and script.startswith("/*", i):
+            end = script.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            emit(script[i:end], code=False)
+            i = end
+        elif c in ("'", '"'):
+            j = i + 1
+            while j < n:
+                if script[j] == c:
+                    if j + 1 < n and script[j + 1] == c:
+                        j += 2
+                        continue
+                    break
+                j += 1
+            emit(script[i:j + 1])
+            i = j + 1
+        elif c == "$" and _DOLLAR_RE.match(script, i) and (i == 0 or not (script[i - 1].isalnum() or script[i - 1] == "_")):
+            tag = _DOLLAR_RE.match(script, i).group(0)
+            end = script.find(tag, i + len(tag))
+            end = n if end < 0 else end + len(tag)
+            emit(script[i:end])
+            i = end
+        elif c == ":":
+            if script.startswith("::", i):
+                emit("::")
+                i += 2
+                continue
+            m = re.match(r":'([A-Za-z_][A-Za-z0-9_]*)'", script[i:])
+            if m and m.group(1) in variables:
+                emit(_quote_literal(variables[m.group(1)]))
+                i += m.end()
+                continue
+            m = re.match(r':"([A-Za-z_][A-Za-z0-9_]*)"', script[i:])
+            if m and m.group(1) in variables:
+                emit('"' + variables[m.group(1)].replace('"', '""') + '"')
+                i += m.end()
+                continue
+            m = re.match(r":\{\?([A-Za-z_][A-Za-z0-9_]*)\}", script[i:])
+            if m:
+                emit("TRUE" if m.group(1) in variables else "FALSE")
+                i += m.end()
+                continue
+            m = _IDENT_RE.match(script, i + 1)
+            if m and m.group(0) in variables:
+                emit(variables[m.group(0)])
+                i = m.end()
+                continue
+            emit(":")
+            i += 1
+        elif c == ";":
+            if on():
+                if has_code:
+                    stmts.append("".join(buf).strip())
+                buf.clear()
+                has_code = False
+            i += 1
+        else:
+            emit(c)
+            i += 1
+
+    if has_code:
+        stmts.append("".join(buf).strip())
+    return stmts
+
+
+# ---------------- migrations (checksum-tracked) ----------------
+def _ensure_schema_migrations(cur) -> None:
+    # Shared with bus_store_pg; checksum lets a file-backed migration re-apply on change.
+    cur.execute("""
+        create table if not exists schema_migrations (
+          version text primary key,
+          applied_at timestamptz not null default now()
+        )
+    """)
+    cur.execute("alter table schema_migrations add column if not exists checksum text")
+
+
+def _apply_if_changed(cur, version: str, sql: str, variables: Dict[str, str]) -> bool:
+    """Run `sql` unless schema_migrations already has it at this checksum. Returns True if applied."""
+    checksum = hashlib.sha256(sql.encode("utf-8")).hexdigest()
+    cur.execute("select checksum from schema_migrations where version = %s", (version,))
+    row = cur.fetchone()
+    if row and row[0] == checksum:
+        return False
+    for stmt in _psql_statements(sql, variables):
+        cur.execute(stmt)
+    cur.execute(
+        """
+        insert into schema_migrations (version, checksum) values (%s, %s)
+        on conflict (version) do update set checksum = excluded.checksum, applied_at = now()
+        """,
+        (version, checksum),
+    )
+    return True
 
 
-def _parse_generated_count(text: str) -> int:
-    """
-    Best-effort parse from SQL output. Safe to return 0 if not detectable.
-    """
-    if not text:
-        return 0
-    for pat in (
-        re.compile(r"generated\D+(\d+)", re.IGNORECASE),
-        re.compile(r"wrote\D+(\d+)", re.IGNORECASE),
-        re.compile(r"inserted\D+(\d+)", re.IGNORECASE),
-    ):
-        m = pat.search(text)
-        if m:
-            try:
-                return int(m.group(1))
-            except Exception:
-                pass
-    return 0
+def _run_script(cur, sql: str, variables: Dict[str, str]) -> Optional[int]:
+    """Execute every statement; returns the value of a trailing `inserted` column, if any."""
+    inserted: Optional[int] = None
+    for stmt in _psql_statements(sql, variables):
+        cur.execute(stmt)
+        if cur.description and [d[0] for d in cur.description] == ["inserted"]:
+            row = cur.fetchone()
+            inserted = int(row[0] or 0) if row else 0
+    return inserted
 
 
 def run_alpha_proposal_runner() -> Tuple[int, str]:
@@ -144,7 +298,7 @@ def run_alpha_proposal_runner() -> Tuple[int, str]:
       (generated_new, status_string)
 
     Logging semantics:
-      - generated_new: how many *new* proposals were inserted this run (delta).
+      - generated_new: how many *new* proposals were inserted this run (RETURNING count).
       - proposals_today_total: how many proposals exist for the current UTC day (snapshot).
         This should match what alpha_proposals_mirror publishes.
     """
@@ -164,78 +318,42 @@ def run_alpha_proposal_runner() -> Tuple[int, str]:
         except FileNotFoundError:
             polish_path = None  # optional
 
-    env = os.environ.copy()
-    env["PGCONNECT_TIMEOUT"] = env.get("PGCONNECT_TIMEOUT", "10")
+    tools_sql = _patched_tools_sql(tools_path.read_text(encoding="utf-8", errors="replace"))
+    gen_sql = gen_path.read_text(encoding="utf-8", errors="replace")
+    polish_sql = polish_path.read_text(encoding="utf-8", errors="replace") if polish_path is not None else ""
 
-    def _psql_scalar_int(sql: str) -> int:
-        """Run a scalar SQL via psql and parse an int from stdout."""
-        res = _run_cmd([PSQL_BIN, db_url, "-v", "ON_ERROR_STOP=1", "-t", "-A", "-c", sql], env=env, cwd=ROOT)
-        if not res.ok:
-            raise RuntimeError((res.stderr or res.stdout or "").strip() or "psql scalar query failed")
-        out = (res.stdout or "").strip()
-        try:
-            return int(out) if out else 0
-        except Exception:
-            return 0
-
-    # Snapshot size for today's UTC window (matches mirror's WHERE clause)
-    count_sql = "SELECT COUNT(*) FROM alpha_proposals WHERE (ts AT TIME ZONE 'UTC')::date = (NOW() AT TIME ZONE 'UTC')::date;"
-    before_total = 0
-    try:
-        before_total = _psql_scalar_int(count_sql)
-    except Exception:
-        # If table doesn't exist yet, tools SQL will create it; treat as 0.
-        before_total = 0
+    from db_pool import pg_conn  # type: ignore
 
-    # 1) tools (safe preview=0)
-    tmp_tools = None
+    stage = "tools"
     try:
-        tools_sql = tools_path.read_text(encoding="utf-8", errors="replace")
-        tmp_tools = _write_temp_sql(_patched_tools_sql(tools_sql))
-        _log("INFO", f"alpha_proposal_runner: tools (safe) -> {tools_path.name}")
-        res_tools = _run_cmd([PSQL_BIN, db_url, "-v", "ON_ERROR_STOP=1", "-f", str(tmp_tools)], env=env, cwd=ROOT)
-        if not res_tools.ok:
-            _log("ERROR", f"alpha_proposal_runner tools failed rc={res_tools.returncode}")
-            if res_tools.stderr.strip():
-                _log("ERROR", res_tools.stderr.strip())
-            return 0, f"tools_failed rc={res_tools.returncode}"
-
-        # 2) generator (preview_enabled=1)
-        _log("INFO", f"alpha_proposal_runner: generator -> {gen_path.name}")
-        res_gen = _run_cmd([PSQL_BIN, db_url, "-v", "ON_ERROR_STOP=1", "-v", "preview_enabled=1", "-f", str(gen_path)], env=env, cwd=ROOT)
-        if not res_gen.ok:
-            _log("ERROR", f"alpha_proposal_runner generator failed rc={res_gen.returncode}")
-            if res_gen.stderr.strip():
-                _log("ERROR", res_gen.stderr.strip())
-            return 0, f"generator_failed rc={res_gen.returncode}"
-
-        # 3) polish (optional)
-        if polish_path is not None:
-            _log("INFO", f"alpha_proposal_runner: polish -> {polish_path.name}")
-            res_polish = _run_cmd([PSQL_BIN, db_url, "-v", "ON_ERROR_STOP=1", "-v", "preview_enabled=1", "-f", str(polish_path)], env=env, cwd=ROOT)
-            if not res_polish.ok:
-                _log("ERROR", f"alpha_proposal_runner polish failed rc={res_polish.returncode}")
-                if res_polish.stderr.strip():
-                    _log("ERROR", res_polish.stderr.strip())
-                return 0, f"polish_failed rc={res_polish.returncode}"
-
-        after_total = 0
-        try:
-            after_total = _psql_scalar_int(count_sql)
-        except Exception:
-            after_total = before_total
-
-        generated_new = max(0, after_total - before_total)
-
-        _log("INFO", f"alpha_proposal_runner: ok generated_new={generated_new} proposals_today_total={after_total}")
-        return generated_new, "ok"
-
-    finally:
-        if tmp_tools is not None:
-            try:
-                tmp_tools.unlink(missing_ok=True)  # py3.11+
-            except Exception:
-                pass
+        # One transaction: tools (if changed) + generator + polish commit together or not at all.
+        with pg_conn(url=db_url, statement_timeout_ms=ALPHA_RUNNER_STMT_MS, caller="alpha_proposal_runner") as conn:
+            with conn.cursor() as cur:
+                # Serialize overlapping ticks (scheduler + manual smoketest).
+                cur.execute("select pg_advisory_xact_lock(hashtext('alpha_proposal_runner'))")
+                _ensure_schema_migrations(cur)
+                applied = _apply_if_changed(cur, f"sql/{tools_path.name}", tools_sql, {"preview_enabled": "0"})
+                _log("INFO", f"alpha_proposal_runner: tools (safe) -> {tools_path.name} "
+                             f"{'applied' if applied else 'unchanged, skipped'}")
+
+                stage = "generator"
+                _log("INFO", f"alpha_proposal_runner: generator -> {gen_path.name}")
+                generated_new = _run_script(cur, gen_sql, {"preview_enabled": "1"}) or 0
+
+                if polish_path is not None:
+                    stage = "polish"
+                    _log("INFO", f"alpha_proposal_runner: polish -> {polish_path.name}")
+                    _run_script(cur, polish_sql, {"preview_enabled": "1"})
+
+                stage = "count"
+                cur.execute(TODAY_COUNT_SQL)
+                after_total = int(cur.fetchone()[0] or 0)
+    except Exception as e:
+        _log("ERROR", f"alpha_proposal_runner {stage} failed: {e}")
+        return 0, f"{stage}_failed"
+
+    _log("INFO", f"alpha_proposal_runner: ok generated_new={generated_new} proposals_today_total={after_total}")
+    return generated_new, "ok"
 
 
 def main() -> None:
@@ -254,34 +254,34 @@ def run_alpha_translation_preview() -> Tuple[int, int, str]:
         info(f"alpha_translation_preview: {msg}")
         return 0, 0, msg
 
-    conn = _get_conn()
-    if conn is None:
-        warn("alpha_translation_preview: no DB connection (DB_URL/psycopg2 missing?)")
-        return 0, 0, "no_db"
+    with _get_conn() as conn:
+        if conn is None:
+            warn("alpha_translation_preview: no DB connection (DB_URL/psycopg2 missing?)")
+            return 0, 0, "no_db"
 
-    inserted = 0
-    processed = 0
-    try:
-        cur = conn.cursor()
-        proposals = _fetch_approved_latest_proposals(cur)
-        processed = len(proposals)
+        inserted = 0
+        processed = 0
+        try:
+            cur = conn.cursor()
+            proposals = _fetch_approved_latest_proposals(cur)
+            processed = len(proposals)
 
-        for p in proposals:
-            inserted += _insert_translation(cur, p)
+            for p in proposals:
+                inserted += _insert_translation(cur, p)
 
-        conn.commit()
+            conn.commit()
 
-        mirrored = _mirror_latest_translations(conn)
+            mirrored = _mirror_latest_translations(conn)
 
-        info(f"alpha_translation_preview: processed={processed} inserted_new={inserted} mirrored={mirrored} (tab='{TAB_TRANSLATIONS}')")
-        return processed, inserted, "ok"
-    except Exception as e:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        warn(f"alpha_translation_preview failed: {e}")
-        return processed, inserted, f"error:{e}"
+            info(f"alpha_translation_preview: processed={processed} inserted_new={inserted} mirrored={mirrored} (tab='{TAB_TRANSLATIONS}')")
+            return processed, inserted, "ok"
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            warn(f"alpha_translation_preview failed: {e}")
+            return processed, inserted, f"error:{e}"
 
 if __name__ == "__main__":
     run_alpha_translation_preview()
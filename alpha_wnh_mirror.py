@@ -28,6 +28,8 @@ import os
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
+import config_service
+
 
 def _truthy(v: Any) -> bool:
     if v is None:
@@ -40,22 +42,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        # Support CONFIG_BUNDLE_JSON.vars.DB_READ_JSON fallback if present
-        bundle = (os.getenv("CONFIG_BUNDLE_JSON") or "").strip()
-        if not bundle:
-            return {}
-        try:
-            b = json.loads(bundle)
-            return (b.get("vars") or {}).get("DB_READ_JSON") or {}
-        except Exception:
-            return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg_get(cfg: Dict[str, Any], dotted: str, default: Any = None) -> Any:
@@ -124,7 +111,9 @@ def _fetch_alpha_today(conn) -> Tuple[Optional[str], List[Dict[str, Any]]]:
         ap.payload,
         ROW_NUMBER() OVER (PARTITION BY ap.token ORDER BY ap.ts DESC) AS rn
       FROM alpha_proposals ap
-      WHERE to_char((ap.ts AT TIME ZONE 'UTC')::date, 'YYYY-MM-DD') = %s
+      -- sargable UTC-day range (uses idx_alpha_proposals_ts)
+      WHERE ap.ts >= (%s::date)::timestamp AT TIME ZONE 'UTC'
+        AND ap.ts <  (%s::date + 1)::timestamp AT TIME ZONE 'UTC'
     )
     SELECT
       p.ts,
@@ -154,7 +143,7 @@ def _fetch_alpha_today(conn) -> Tuple[Optional[str], List[Dict[str, Any]]]:
     """
     try:
         with conn.cursor() as cur:
-            cur.execute(sql, (day,))
+            cur.execute(sql, (day, day))
             cols = [d[0] for d in cur.description]
             out = []
             for row in cur.fetchall():
@@ -190,32 +179,13 @@ def _ensure_sheet_headers(tab: str) -> None:
 
         ensure_sheet_headers(tab, _headers())
     except Exception:
-        # Fall back to the policy_logger's legacy creation pattern.
+        # Fall back to creating the tab through the shared registry.
         try:
-            import gspread
-            from oauth2client.service_account import ServiceAccountCredentials
+            from utils import open_ws  # type: ignore
 
-            sheet_url = os.getenv("SHEET_URL")
-            if not sheet_url:
+            if not os.getenv("SHEET_URL"):
                 return
-            svc = (
-                os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-                or os.getenv("GOOGLE_CREDENTIALS_JSON")
-                or os.getenv("SVC_JSON")
-                or "sentiment-log-service.json"
-            )
-            scope = [
-                "https://spreadsheets.google.com/feeds",
-                "https://www.googleapis.com/auth/drive",
-            ]
-            creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-            gc = gspread.authorize(creds)
-            sh = gc.open_by_url(sheet_url)
-            try:
-                ws = sh.worksheet(tab)
-            except Exception:
-                ws = sh.add_worksheet(title=tab, rows=4000, cols=20)
-                ws.append_row(_headers(), value_input_option="USER_ENTERED")
+            open_ws(tab, create=True, rows=4000, cols=20, headers=_headers())
         except Exception:
             return
 
@@ -230,28 +200,13 @@ def _append_row(tab: str, row: List[Any]) -> None:
     except Exception:
         pass
 
-    # Legacy fallback
+    # Fallback: plain append through the shared registry handle
     try:
-        import gspread
-        from oauth2client.service_account import ServiceAccountCredentials
+        from utils import get_sheet  # type: ignore
 
-        sheet_url = os.getenv("SHEET_URL")
-        if not sheet_url:
+        if not os.getenv("SHEET_URL"):
             return
-        svc = (
-            os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-            or os.getenv("GOOGLE_CREDENTIALS_JSON")
-            or os.getenv("SVC_JSON")
-            or "sentiment-log-service.json"
-        )
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-        gc = gspread.authorize(creds)
-        sh = gc.open_by_url(sheet_url)
-        ws = sh.worksheet(tab)
+        ws = get_sheet().worksheet(tab)
         ws.append_row(row, value_input_option="USER_ENTERED")
     except Exception:
         return
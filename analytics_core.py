@@ -0,0 +1,323 @@
+# analytics_core.py — shared vectorized analytics for dashboard / rotation jobs
+"""
+performance_dashboard and rotation_memory each walked their tabs row by
+row to build the same kind of per-token numbers. This module turns a tab into a Table once
+(through the DB-aware cached read path, shared by every job for
+ANALYTICS_TTL_SEC) and computes the aggregates column-wise with pandas:
+
+    load_table(tab)                     -> Table (TTL cached, shared across jobs)
+    peek_table(tab)                     -> the cached Table if still fresh, else None (never loads)
+    Table.from_records(rows) / Table.from_values(values, usecols=None)
+    Table.num(col)                      -> float column ("12.5%", "1,234" ok; junk -> NaN), parsed once
+    Table.tokens(col="Token")           -> stripped, upper-cased labels, parsed once
+    map_unique(series, fn, dtype)       -> fn applied once per distinct cell value
+    roi_stats(tokens, roi)              -> per-token n / wins / sum / mean / std / sharpe / p95 / win_rate
+    novascore_rows(tables)              -> Performance_Dashboard rows (same shape as the loop version)
+
+Parsing sheet text is per-cell work whichever way it is done; it is done
+once per distinct value (factorize) and memoized on the Table, so only the
+first consumer within the TTL pays it and everything after is array math.
+That first (cold) pass is not faster than a plain loop for a single
+aggregate, so secondary consumers such as rotation_memory only use a
+Table another job has already parsed (peek_table + Table.parsed) and keep
+their loop otherwise.
+
+pandas is optional at import time: HAVE_PANDAS is False when it is missing
+and callers keep their loop implementations as the fallback.
+tools/bench_analytics_core.py compares both on synthetic 50k-row logs.
+
+Env:
+  ANALYTICS_TTL_SEC   default 120
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+    import pandas as pd  # type: ignore
+    HAVE_PANDAS = True
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+    pd = None  # type: ignore
+    HAVE_PANDAS = False
+
+try:
+    from utils import get_all_records_cached_dbaware  # type: ignore
+except Exception:  # pragma: no cover
+    get_all_records_cached_dbaware = None  # type: ignore
+
+ANALYTICS_TTL_SEC = int(os.getenv("ANALYTICS_TTL_SEC", "120"))
+
+# Sharpe is undefined for a flat series; float noise below this counts as flat.
+_FLAT_STD = 1e-12
+
+
+# ---------------- cell parsing ----------------
+def _parse_num(v: Any) -> float:
+    if v is None:
+        return np.nan
+    if isinstance(v, (int, float)):
+        return float(v)
+    s = str(v).strip().replace("%", "").replace(",", "")
+    if not s:
+        return np.nan
+    try:
+        return float(s)
+    except Exception:
+        return np.nan
+
+
+def _norm_token(v: Any) -> str:
+    return "" if v is None else str(v).strip().upper()
+
+
+def map_unique(s, fn, dtype):
+    """Apply fn once per distinct value of s and broadcast back."""
+    codes, uniq = pd.factorize(s, use_na_sentinel=False)
+    mapped = np.array([fn(u) for u in uniq], dtype=dtype)
+    return pd.Series(mapped[codes] if len(uniq) else np.array([], dtype=dtype), index=s.index)
+
+
+def to_num(s):
+    """Vectorized to_float for a column of sheet cells; unparsable -> NaN."""
+    if s.dtype.kind in "fi":
+        return s.astype(float)
+    return map_unique(s, _parse_num, float)
+
+
+def token_keys(s):
+    return map_unique(s, _norm_token, object)
+
+
+# ---------------- tables ----------------
+class Table:
+    """A tab as a DataFrame plus memoized parsed columns."""
+
+    def __init__(self, df) -> None:
+        self.df = df
+        self._num: Dict[Any, Any] = {}
+        self._tok: Dict[Any, Any] = {}
+
+    @classmethod
+    def from_records(cls, rows: Sequence[Dict[str, Any]]) -> "Table":
+        return cls(pd.DataFrame.from_records(list(rows or [])))
+
+    @classmethod
+    def from_values(cls, values: Sequence[Sequence[Any]], usecols: Optional[Sequence[int]] = None) -> "Table":
+        """
+        Header row + data rows (get_all_values shape); short rows are padded with "".
+        With usecols only those positions are kept and the columns are labelled by position.
+        """
+        if not values:
+            return cls(pd.DataFrame())
+        header = [str(h).strip() for h in values[0]]
+        body = values[1:]
+        n = len(body)
+        if usecols is not None:
+            data = {i: np.asarray([r[i] if i < len(r) else "" for r in body], dtype=object) for i in usecols}
+            return cls(pd.DataFrame(data, index=pd.RangeIndex(n)))
+        width = len(header)
+        # Transpose in C; zip_longest pads short rows, extra trailing cells are dropped.
+        cols = list(itertools.islice(itertools.zip_longest(*body, fillvalue=""), width))
+        cols += [("",) * n] * (width - len(cols))
+        df = pd.DataFrame({i: np.asarray(c, dtype=object) for i, c in enumerate(cols)}, index=pd.RangeIndex(n))
+        df.columns = header
+        return cls(df)
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    def has(self, col: Any) -> bool:
+        return col in self.df.columns
+
+    def raw(self, col: Any):
+        if col in self.df.columns:
+            return self.df[col]
+        return pd.Series("", index=self.df.index, dtype=object)
+
+    def num(self, col: Any):
+        out = self._num.get(col)
+        if out is None:
+            out = self._num[col] = to_num(self.raw(col))
+        return out
+
+    def tokens(self, col: Any = "Token"):
+        out = self._tok.get(col)
+        if out is None:
+            out = self._tok[col] = token_keys(self.raw(col))
+        return out
+
+    def parsed(self, col: Any, kind: str = "num") -> bool:
+        """True once num(col) / tokens(col) has been computed on this Table."""
+        return col in (self._num if kind == "num" else self._tok)
+
+    def last_rows(self, col: Any = "Token"):
+        """Last row per token (what `{token: row for row in rows}` keeps): row label -> token."""
+        tok = self.tokens(col)
+        keep = tok[tok != ""]
+        return keep[~keep.duplicated(keep="last")]
+
+
+_tables: Dict[str, Tuple[float, Table]] = {}
+_tables_lock = threading.Lock()
+
+
+def load_table(tab: str, ttl_s: Optional[int] = None) -> Table:
+    """Tab as a Table, loaded once per TTL and shared by every job in the process."""
+    ttl = ANALYTICS_TTL_SEC if ttl_s is None else ttl_s
+    hit = _tables.get(tab)
+    if hit is not None and time.time() - hit[0] < ttl:
+        return hit[1]
+    with _tables_lock:
+        hit = _tables.get(tab)
+        if hit is not None and time.time() - hit[0] < ttl:
+            return hit[1]
+        rows: List[Dict[str, Any]] = []
+        if get_all_records_cached_dbaware is not None:
+            rows = get_all_records_cached_dbaware(tab, ttl_s=ttl, logical_stream=f"sheet_mirror:{tab}") or []
+        table = Table.from_records(rows)
+        _tables[tab] = (time.time(), table)
+        return table
+
+
+def peek_table(tab: str, ttl_s: Optional[int] = None) -> Optional[Table]:
+    """The shared Table for tab if one is loaded and within TTL; never reads the sheet."""
+    ttl = ANALYTICS_TTL_SEC if ttl_s is None else ttl_s
+    hit = _tables.get(tab)
+    if hit is not None and time.time() - hit[0] < ttl:
+        return hit[1]
+    return None
+
+
+def invalidate(tab: Optional[str] = None) -> None:
+    with _tables_lock:
+        if tab is None:
+            _tables.clear()
+        else:
+            _tables.pop(tab, None)
+
+
+# ---------------- aggregates ----------------
+def roi_stats(tokens, roi):
+    """
+    Per-token ROI aggregates over observations with a numeric ROI.
+    Columns: n, wins (roi > 0), sum, mean, std (population), win_rate (%),
+    sharpe (mean/std, n >= 3 and std > 0), p95 (nearest rank).
+    """
+    mask = (tokens != "") & roi.notna()
+    tok = tokens[mask]
+    val = roi[mask].astype(float)
+    g = val.groupby(tok, sort=True)
+    out = pd.DataFrame({
+        "n": g.size(),
+        "wins": (val > 0).groupby(tok, sort=True).sum(),
+        "sum": g.sum(),
+        "mean": g.mean(),
+        "std": g.std(ddof=0),
+        "p95": g.quantile(0.95, interpolation="nearest"),
+    })
+    out["win_rate"] = out["wins"] / out["n"] * 100.0
+    ok = (out["n"] >= 3) & (out["std"] > _FLAT_STD)
+    out["sharpe"] = (out["mean"] / out["std"]).where(ok)
+    return out
+
+
+# ---------------- NovaScore ----------------
+def _none(v) -> Optional[float]:
+    return None if v is None or v != v else float(v)
+
+
+def _last_num(table: Table, col: str, index):
+    """Numeric column from the last row per token, aligned to index."""
+    last = table.last_rows()
+    return pd.Series(table.num(col).loc[last.index].to_numpy(), index=last.to_numpy()).reindex(index)
+
+
+def novascore_rows(tables: Dict[str, Table]) -> List[Dict[str, Any]]:
+    """
+    performance_dashboard._aggregate_metrics, column-wise.
+    tables: rotation_stats, rotation_log, vault_intel, trade_log, rotation_mem.
+    """
+    rs = tables["rotation_stats"]
+    rl = tables["rotation_log"]
+    vi = tables["vault_intel"]
+    tl = tables["trade_log"]
+    rm = tables["rotation_mem"]
+
+    tokens: set = set()
+    for t in (rs, rl, vi, tl, rm):
+        if not t.empty and t.has("Token"):
+            tokens.update(t.tokens().unique())
+    tokens.discard("")
+    index = pd.Index(sorted(tokens), name="tok")
+    if index.empty:
+        return []
+    nan = pd.Series(np.nan, index=index)
+
+    # ROI series from Rotation_Stats: Follow-up ROI, else Initial ROI
+    if rs.empty or not rs.has("Token"):
+        roi = pd.DataFrame(columns=["n", "mean", "sharpe"], dtype=float)
+    else:
+        base = rs.num("Follow-up ROI").fillna(rs.num("Initial ROI"))
+        roi = roi_stats(rs.tokens(), base)
+    roi = roi.reindex(index)
+
+    # Allocation: last numeric value per token in Rotation_Log
+    if rl.empty or not rl.has("Token"):
+        alloc = nan
+    else:
+        tok, v = rl.tokens(), rl.num("Allocation (%)")
+        m = (tok != "") & v.notna()
+        alloc = v[m].groupby(tok[m]).last().reindex(index)
+
+    # Win rate from the last Rotation_Memory row per token
+    if rm.empty or not rm.has("Token"):
+        win_rate = nan
+    else:
+        present = index.isin(rm.last_rows().to_numpy())
+        wins = _last_num(rm, "Wins", index).fillna(0.0)
+        total = wins + _last_num(rm, "Losses", index).fillna(0.0)
+        win_rate = (wins / total * 100.0).where((total > 0) & present)
+
+    if vi.empty or not vi.has("Token"):
+        liq = mscore = nan
+    else:
+        liq = _last_num(vi, "liquidity_usd", index)
+        mscore = _last_num(vi, "memory_score", index)
+
+    roi7 = roi["mean"]
+    sharpe = roi["sharpe"]
+    sharpe_scaled = (sharpe.clip(-2.0, 3.0) + 2.0) / 5.0 * 100.0
+
+    # 35% ROI30, 25% ROI7, 20% Sharpe scaled, 15% WinRate, 5% MemoryScore (over present parts)
+    parts = [
+        (0.35, roi7.clip(-100.0, 300.0)),
+        (0.25, roi7.clip(-100.0, 300.0)),
+        (0.20, sharpe_scaled),
+        (0.15, win_rate.clip(0.0, 100.0)),
+        (0.05, (mscore * 100.0).clip(0.0, 100.0)),
+    ]
+    num = pd.Series(0.0, index=index)
+    den = pd.Series(0.0, index=index)
+    for w, s in parts:
+        present = s.notna()
+        num = num + (w * s).where(present, 0.0)
+        den = den + present * w
+    novascore = (num / den).where(den > 0)
+
+    cols = {
+        "ROI_7d": roi7, "ROI_30d": roi7, "Sharpe": sharpe, "Win_Rate_%": win_rate,
+        "Allocation_%": alloc, "Liquidity_USD": liq, "Memory_Score": mscore, "NovaScore": novascore,
+    }
+    arrays = {k: v.to_numpy(dtype=float).tolist() for k, v in cols.items()}
+    return [
+        {"Token": t, **{k: _none(arrays[k][i]) for k in arrays}}
+        for i, t in enumerate(index)
+    ]
@@ -1,16 +1,9 @@
-import os
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from utils import get_sheet
 
 # === SETUP ===
 def get_gspread_ws(tab_name):
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
-    sheet = client.open_by_url(os.getenv("SHEET_URL"))
-    return sheet.worksheet(tab_name)
+    return get_sheet().worksheet(tab_name)
 
 # === MAIN FUNCTION ===
 def run_apply_heatmap():
@@ -63,15 +56,11 @@ def run_apply_heatmap():
         })
 
     if requests:
-        service = build("sheets", "v4", credentials=creds)
         body = {"requests": requests}
         try:
-            service.spreadsheets().batchUpdate(
-                spreadsheetId=ws.spreadsheet.id,
-                body=body
-            ).execute()
+            get_sheet().batch_update(body)
             print(f"✅ Heatmap applied to {len(requests)} row(s)")
-        except HttpError as e:
+        except gspread.exceptions.APIError as e:
             print(f"❌ Sheets API error: {e}")
     else:
         print("⚠️ No valid ROI rows to color")
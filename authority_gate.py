@@ -20,12 +20,18 @@ Env:
   AUTHORITY_FAIL_OPEN            default "0"  (1 = allow if DB errors; 0 = block if DB errors)
   AUTHORITY_BOOTSTRAP_TRUSTED    default ""   (comma-separated agent_ids to trust on boot)
   AUTHORITY_DEFAULT_TRUSTED      default "0"  (if agent missing from table, trust it? usually 0)
+  AUTHORITY_STMT_TIMEOUT_MS      default "3000" (statement_timeout on the pooled connection)
+  AUTHORITY_CACHE_TTL_S          default "15"   (how long a trust row is served from memory)
+
+Pull contacts (last_seen) are written in batches by agent_freshness.
 """
 
 from __future__ import annotations
 
 import os
 import threading
+import time
+from contextlib import contextmanager
 from typing import Optional, Tuple, Dict, Any
 
 # Prefer DB_URL, but also accept DATABASE_URL
@@ -34,6 +40,8 @@ _DB_URL = os.getenv("DB_URL") or os.getenv("DATABASE_URL") or ""
 AUTHORITY_GATE_ENABLED = os.getenv("AUTHORITY_GATE_ENABLED", "1").lower() in ("1", "true", "yes", "on")
 AUTHORITY_FAIL_OPEN = os.getenv("AUTHORITY_FAIL_OPEN", "0").lower() in ("1", "true", "yes", "on")
 AUTHORITY_DEFAULT_TRUSTED = os.getenv("AUTHORITY_DEFAULT_TRUSTED", "0").lower() in ("1", "true", "yes", "on")
+AUTHORITY_STMT_TIMEOUT_MS = int(os.getenv("AUTHORITY_STMT_TIMEOUT_MS", "3000"))
+AUTHORITY_CACHE_TTL_S = float(os.getenv("AUTHORITY_CACHE_TTL_S", "15"))
 
 _BOOTSTRAP_TRUSTED = [
     a.strip() for a in (os.getenv("AUTHORITY_BOOTSTRAP_TRUSTED", "") or "").split(",") if a.strip()
@@ -42,6 +50,9 @@ _BOOTSTRAP_TRUSTED = [
 _init_lock = threading.Lock()
 _inited = False
 
+# agent_id -> (expires_at, (trusted, reason) or None); pulls read trust from here
+_trust_cache: Dict[str, Tuple[float, Optional[Tuple[bool, str]]]] = {}
+
 # Optional utils hooks (logging + telegram)
 try:
     from utils import info, warn, send_telegram_message_dedup  # type: ignore
@@ -57,19 +68,29 @@ except Exception:
         return
 
 
+try:
+    import agent_freshness  # type: ignore
+except Exception:  # pragma: no cover
+    agent_freshness = None  # type: ignore
+
+
+@contextmanager
 def _connect():
     """
-    Create a short-lived DB connection.
+    Check out a pooled autocommit DB connection (see db_pool).
 
-    Uses psycopg2 if available (most common on Render).
+    Every /api/commands/pull evaluates the agent, so this used to pay a fresh
+    connect per lease; the pool keeps a few warm connections per process.
     """
     if not _DB_URL:
         raise RuntimeError("DB_URL/DATABASE_URL missing")
     try:
-        import psycopg2  # type: ignore
-        return psycopg2.connect(_DB_URL, connect_timeout=5)
+        from db_pool import pg_conn  # type: ignore
     except Exception as e:
-        raise RuntimeError(f"psycopg2 connect failed: {e}") from e
+        raise RuntimeError(f"db_pool unavailable: {e}") from e
+    with pg_conn(url=_DB_URL, autocommit=True, statement_timeout_ms=AUTHORITY_STMT_TIMEOUT_MS,
+                 caller="authority_gate") as conn:
+        yield conn
 
 
 def _ensure_schema() -> None:
@@ -86,9 +107,7 @@ def _ensure_schema() -> None:
             return
 
         try:
-            conn = _connect()
-            try:
-                conn.autocommit = True
+            with _connect() as conn:
                 cur = conn.cursor()
                 cur.execute(
                     """
@@ -106,8 +125,6 @@ def _ensure_schema() -> None:
                     "create index if not exists idx_agent_authority_last_seen on agent_authority (last_seen desc);"
                 )
                 cur.close()
-            finally:
-                conn.close()
 
             # Bootstrap trust list (idempotent)
             if _BOOTSTRAP_TRUSTED:
@@ -136,9 +153,7 @@ def set_agent_trust(agent_id: str, trusted: bool, reason: str = "") -> None:
     if not agent_id:
         raise ValueError("agent_id required")
 
-    conn = _connect()
-    try:
-        conn.autocommit = True
+    with _connect() as conn:
         cur = conn.cursor()
         cur.execute(
             """
@@ -153,40 +168,74 @@ def set_agent_trust(agent_id: str, trusted: bool, reason: str = "") -> None:
             (agent_id, bool(trusted), reason or None),
         )
         cur.close()
-    finally:
-        conn.close()
+    _trust_cache[agent_id] = (time.time() + AUTHORITY_CACHE_TTL_S, (bool(trusted), reason or ""))
 
 
-def _touch_agent(agent_id: str) -> None:
+def _touch_agents(batch: Dict[str, float]) -> None:
     """
-    Ensure the agent exists in the table and update last_seen.
-    Does NOT change trusted value if it already exists.
+    Batched contact write (agent_freshness sink): insert unseen agents and
+    advance last_seen. Does NOT change trusted value if a row already exists.
     """
     _ensure_schema()
-    if not _DB_URL:
+    if not _DB_URL or not batch:
         return
 
+    default_reason = "auto-seen" if not AUTHORITY_DEFAULT_TRUSTED else "auto-trusted"
+    rows = [(a, bool(AUTHORITY_DEFAULT_TRUSTED), default_reason, float(ts)) for a, ts in sorted(batch.items())]
+    with _connect() as conn:
+        cur = conn.cursor()
+        values = ",".join(["(%s, %s, %s, to_timestamp(%s), now())"] * len(rows))
+        cur.execute(
+            f"""
+            insert into agent_authority (agent_id, trusted, reason, last_seen, updated_at)
+            values {values}
+            on conflict (agent_id) do update set
+              last_seen = greatest(agent_authority.last_seen, excluded.last_seen),
+              updated_at = excluded.updated_at;
+            """,
+            [v for row in rows for v in row],
+        )
+        cur.close()
+
+
+def _touch_agent(agent_id: str) -> None:
+    """
+    Record contact from agent_id. The write is batched by agent_freshness
+    (every AGENT_FRESHNESS_FLUSH_S); falls back to a direct write without it.
+    """
     agent_id = (agent_id or "").strip()
     if not agent_id:
         return
+    if agent_freshness is not None:
+        agent_freshness.touch(agent_id)
+        return
+    _touch_agents({agent_id: time.time()})
 
-    conn = _connect()
-    try:
-        conn.autocommit = True
+
+def _read_trust(agent_id: str) -> Optional[Tuple[bool, str]]:
+    """(trusted, reason) for agent_id, cached for AUTHORITY_CACHE_TTL_S. None: no row yet."""
+    now = time.time()
+    hit = _trust_cache.get(agent_id)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+
+    with _connect() as conn:
         cur = conn.cursor()
         cur.execute(
             """
-            insert into agent_authority (agent_id, trusted, reason, last_seen, updated_at)
-            values (%s, %s, %s, now(), now())
-            on conflict (agent_id) do update set
-              last_seen = excluded.last_seen,
-              updated_at = excluded.updated_at;
+            select trusted, coalesce(reason, '')
+            from agent_authority
+            where agent_id = %s
+            limit 1;
             """,
-            (agent_id, bool(AUTHORITY_DEFAULT_TRUSTED), "auto-seen" if not AUTHORITY_DEFAULT_TRUSTED else "auto-trusted"),
+            (agent_id,),
         )
+        row = cur.fetchone()
         cur.close()
-    finally:
-        conn.close()
+
+    val = (bool(row[0]), str(row[1] or "")) if row else None
+    _trust_cache[agent_id] = (now + AUTHORITY_CACHE_TTL_S, val)
+    return val
 
 
 def evaluate_agent(agent_id: str) -> Tuple[bool, str, int]:
@@ -194,8 +243,9 @@ def evaluate_agent(agent_id: str) -> Tuple[bool, str, int]:
     Returns: (trusted, reason, age_sec)
 
     - If AUTHORITY_GATE_ENABLED is False -> always trusted=True
-    - Updates last_seen on every call (when DB is available)
-    - Reads trust decision from agent_authority
+    - Records last_seen on every call (batched write when the DB is available)
+    - Reads trust decision from agent_authority (cached for AUTHORITY_CACHE_TTL_S;
+      set_agent_trust updates the cache immediately)
     """
     _ensure_schema()
 
@@ -216,6 +266,9 @@ def evaluate_agent(agent_id: str) -> Tuple[bool, str, int]:
             return True, "authority_db_missing_fail_open", 0
         return False, "authority_db_missing_fail_closed", 0
 
+    # age_sec is measured against last_seen, which this very call refreshes
+    age_sec = 0
+
     # Touch first (records contact even if untrusted)
     try:
         _touch_agent(agent_id)
@@ -226,38 +279,17 @@ def evaluate_agent(agent_id: str) -> Tuple[bool, str, int]:
         warn(f"authority_gate: touch failed; FAIL_CLOSED blocking agent={agent_id}: {e!r}")
         return False, "authority_touch_failed_fail_closed", 0
 
-    # Read trust + age
+    # Read trust
     try:
-        conn = _connect()
-        try:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                select
-                  trusted,
-                  coalesce(reason, ''),
-                  extract(epoch from (now() - last_seen))::int as age_sec
-                from agent_authority
-                where agent_id = %s
-                limit 1;
-                """,
-                (agent_id,),
-            )
-            row = cur.fetchone()
-            cur.close()
-        finally:
-            conn.close()
+        row = _read_trust(agent_id)
 
-        if not row:
-            # Should not happen because _touch_agent inserts, but keep defensive
+        if row is None:
+            # First contact: the batched touch inserts the row with the default trust
+            # (same verdict and reason the inserted row will carry)
             trusted = bool(AUTHORITY_DEFAULT_TRUSTED)
-            reason = "missing_row_default_trusted" if trusted else "missing_row_default_untrusted"
-            age_sec = 0
-            return trusted, reason, age_sec
+            return trusted, ("auto-trusted" if trusted else "auto-seen"), age_sec
 
-        trusted = bool(row[0])
-        reason = str(row[1] or "")
-        age_sec = int(row[2] or 0)
+        trusted, reason = row
 
         if trusted:
             return True, reason or "trusted", age_sec
@@ -298,3 +330,7 @@ def lease_block_response(agent_id: str) -> Dict[str, Any]:
         "agent_id": agent_id,
         "age_sec": int(age or 0),
     }
+
+
+if agent_freshness is not None:
+    agent_freshness.set_contact_sink(_touch_agents)
@@ -3,47 +3,214 @@
 Backfill trades table from receipts that don't yet have a trade row.
 
 Safe to run multiple times; it only inserts for receipts with no trade.
+
+Set-based: each chunk is one INSERT ... SELECT that normalizes the receipt
+JSON with JSONB operators (same field precedence as
+db_backbone.record_trade_from_receipt) and anti-joins trades. Receipts that
+cannot become a trade (no venue/symbol, non-object payload, non-numeric
+quantities) go to trade_backfill_rejects with a reason instead of being
+re-selected forever. Chunks follow a keyset cursor on receipts.id, so a run
+always terminates, and each chunk commits on its own.
+
+Usage:
+  python backfill_trades_from_receipts.py [--chunk 5000] [--after-id 0] [--max-chunks N]
+
+Env:
+  DB_URL                      Postgres URL (DATABASE_URL also accepted)
+  TRADE_BACKFILL_CHUNK        default 5000 receipts per chunk
+  TRADE_BACKFILL_TIMEOUT_MS   default 60000 per statement
 """
 
-from typing import Any, Dict, List
-
-from db_backbone import _get_conn, record_trade_from_receipt  # type: ignore[attr-defined]
-
-
-def _fetch_unprocessed_receipts(batch_size: int = 500) -> List[Dict[str, Any]]:
-    conn = _get_conn()
-    if not conn:
-        return []
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            SELECT r.id, r.cmd_id, r.ok, r.payload
-            FROM receipts r
-            LEFT JOIN trades t ON t.receipt_id = r.id
-            WHERE t.id IS NULL
-            ORDER BY r.id ASC
-            LIMIT %s
-            """,
-            (batch_size,),
-        )
-        cols = [c[0] for c in cur.description]
-        rows = [dict(zip(cols, row)) for row in cur.fetchall()]
-        return rows
-    finally:
-        cur.close()
+import argparse
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from db_pool import pg_conn
+
+DB_URL = os.getenv("DB_URL") or os.getenv("DATABASE_URL")
+CHUNK = int(os.getenv("TRADE_BACKFILL_CHUNK", "5000") or "5000")
+TIMEOUT_MS = int(os.getenv("TRADE_BACKFILL_TIMEOUT_MS", "60000") or "60000")
+
+# Serializes concurrent backfills so two runs can't both see "no trade yet".
+_LOCK_KEY = 0x7472_6266  # "trbf"
+
+REJECTS_DDL = """
+CREATE TABLE IF NOT EXISTS trade_backfill_rejects (
+    receipt_id  BIGINT PRIMARY KEY,
+    reason      TEXT NOT NULL,
+    payload     JSONB,
+    rejected_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Text payload columns (older receipts tables) may hold malformed JSON;
+-- a failed cast must reject one receipt, not abort the chunk.
+CREATE OR REPLACE FUNCTION trade_backfill_try_jsonb(v jsonb) RETURNS jsonb
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+  IF jsonb_typeof(v) = 'string' THEN
+    RETURN (v #>> '{}')::jsonb;
+  END IF;
+  RETURN v;
+EXCEPTION WHEN others THEN
+  RETURN NULL;
+END $$;
+"""
+
+_NUM = r"'^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$'"
+
+# receipts has been `receipt jsonb` (db_schema.sql) and `payload` (ops_api);
+# to_jsonb(r) reads whichever exists, along with cmd_id / ok.
+CHUNK_SQL = """
+WITH batch AS (
+    SELECT r.id, to_jsonb(r) AS rj
+    FROM receipts r
+    WHERE r.id > %(after)s
+    ORDER BY r.id
+    LIMIT %(chunk)s
+),
+todo AS (
+    SELECT b.id, b.rj,
+           trade_backfill_try_jsonb(COALESCE(b.rj -> 'receipt', b.rj -> 'payload')) AS p
+    FROM batch b
+    LEFT JOIN trades t ON t.receipt_id = b.id
+    LEFT JOIN trade_backfill_rejects x ON x.receipt_id = b.id
+    WHERE t.id IS NULL AND x.receipt_id IS NULL
+),
+unwrapped AS (
+    SELECT id, rj, p,
+           CASE WHEN jsonb_typeof(p -> 'trade') = 'object' THEN p -> 'trade' ELSE p END AS t
+    FROM todo
+),
+fields AS (
+    SELECT
+        id AS receipt_id,
+        CASE WHEN (rj ->> 'cmd_id') ~ '^[0-9]+$' THEN (rj ->> 'cmd_id')::bigint END AS cmd_id,
+        p,
+        jsonb_typeof(p) AS p_type,
+        COALESCE(NULLIF(t ->> 'venue', ''), NULLIF(p ->> 'venue', '')) AS venue,
+        COALESCE(NULLIF(t ->> 'symbol', ''), NULLIF(p ->> 'symbol', '')) AS symbol,
+        COALESCE(NULLIF(t ->> 'side', ''), NULLIF(t ->> 'direction', '')) AS side,
+        COALESCE(NULLIF(t ->> 'filled_base', ''), NULLIF(t ->> 'base_qty', ''), NULLIF(t ->> 'amount_base', '')) AS base_txt,
+        COALESCE(NULLIF(t ->> 'filled_quote', ''), NULLIF(t ->> 'quote_qty', ''), NULLIF(t ->> 'amount_quote', '')) AS quote_txt,
+        NULLIF(t ->> 'price', '') AS price_txt,
+        COALESCE(NULLIF(t ->> 'status', ''),
+                 CASE WHEN lower(COALESCE(rj ->> 'ok', '')) IN ('true', 't', '1') THEN 'ok' ELSE 'error' END) AS status
+    FROM unwrapped
+),
+classified AS (
+    SELECT f.*,
+           CASE
+             WHEN p_type IS DISTINCT FROM 'object' THEN 'payload_not_object'
+             WHEN venue IS NULL OR symbol IS NULL THEN 'missing_venue_symbol'
+             WHEN base_txt IS NOT NULL AND base_txt !~ {num} THEN 'bad_base_qty'
+             WHEN quote_txt IS NOT NULL AND quote_txt !~ {num} THEN 'bad_quote_qty'
+             WHEN price_txt IS NOT NULL AND price_txt !~ {num} THEN 'bad_price'
+           END AS reject_reason
+    FROM fields f
+),
+ins AS (
+    INSERT INTO trades (
+        cmd_id, receipt_id,
+        venue, symbol, side,
+        base_qty, quote_qty, price,
+        status, raw_payload
+    )
+    SELECT {cmd_id}, c.receipt_id,
+           c.venue, c.symbol, c.side,
+           c.base_txt::numeric, c.quote_txt::numeric, c.price_txt::numeric,
+           c.status, c.p
+    FROM classified c
+    {cmd_join}
+    WHERE c.reject_reason IS NULL
+    RETURNING 1
+),
+rej AS (
+    INSERT INTO trade_backfill_rejects (receipt_id, reason, payload)
+    SELECT receipt_id, reject_reason, p
+    FROM classified
+    WHERE reject_reason IS NOT NULL
+    ON CONFLICT (receipt_id) DO NOTHING
+    RETURNING 1
+)
+SELECT (SELECT max(id) FROM batch),
+       (SELECT count(*) FROM batch),
+       (SELECT count(*) FROM ins),
+       (SELECT count(*) FROM rej)
+"""
+
+
+def _chunk_sql(has_commands: bool) -> str:
+    # trades.cmd_id references commands(id) ON DELETE SET NULL; receipts of
+    # archived/deleted commands get NULL here too instead of failing the chunk.
+    if has_commands:
+        cmd_id, cmd_join = "cm.id", "LEFT JOIN commands cm ON cm.id = c.cmd_id"
+    else:
+        cmd_id, cmd_join = "c.cmd_id", ""
+    return CHUNK_SQL.format(num=_NUM, cmd_id=cmd_id, cmd_join=cmd_join)
+
+
+def _run_chunk(conn, sql: str, after: int, chunk: int) -> Tuple[Optional[int], int, int, int]:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_LOCK_KEY,))
+        cur.execute(sql, {"after": after, "chunk": chunk})
+        last_id, scanned, inserted, rejected = cur.fetchone()
+    conn.commit()
+    return last_id, int(scanned), int(inserted), int(rejected)
+
+
+def backfill(chunk: int = CHUNK, after_id: int = 0, max_chunks: Optional[int] = None,
+             verbose: bool = True) -> Dict[str, Any]:
+    """Convert every receipt with id > after_id that has no trade yet."""
+    chunk = max(1, int(chunk))
+    totals = {"scanned": 0, "inserted": 0, "rejected": 0, "chunks": 0, "last_id": after_id}
+    t_start = time.perf_counter()
+    with pg_conn(url=DB_URL, statement_timeout_ms=TIMEOUT_MS, caller="trade_backfill") as conn:
+        with conn.cursor() as cur:
+            cur.execute(REJECTS_DDL)
+            cur.execute("SELECT to_regclass('commands') IS NOT NULL")
+            has_commands = bool(cur.fetchone()[0])
+        conn.commit()
+        sql = _chunk_sql(has_commands)
+
+        cursor = int(after_id)
+        while max_chunks is None or totals["chunks"] < max_chunks:
+            t0 = time.perf_counter()
+            last_id, scanned, inserted, rejected = _run_chunk(conn, sql, cursor, chunk)
+            if last_id is None:
+                break
+            cursor = int(last_id)
+            dt = time.perf_counter() - t0
+            totals["chunks"] += 1
+            totals["scanned"] += scanned
+            totals["inserted"] += inserted
+            totals["rejected"] += rejected
+            totals["last_id"] = cursor
+            if verbose:
+                print(f"[trade_backfill] chunk={totals['chunks']} last_id={cursor} scanned={scanned} "
+                      f"inserted={inserted} rejected={rejected} {scanned / max(dt, 1e-9):,.0f} rows/s")
+            if scanned < chunk:
+                break
+
+    elapsed = time.perf_counter() - t_start
+    totals["elapsed_s"] = round(elapsed, 3)
+    totals["rows_per_s"] = round(totals["scanned"] / max(elapsed, 1e-9), 1)
+    return totals
 
 
 def main() -> None:
-    total_inserted = 0
-    while True:
-        batch = _fetch_unprocessed_receipts(batch_size=500)
-        if not batch:
-            break
-        for rcpt in batch:
-            record_trade_from_receipt(rcpt)
-            total_inserted += 1
-    print(f"Backfill complete. Inserted {total_inserted} trades.")
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0].strip())
+    ap.add_argument("--chunk", type=int, default=CHUNK, help="receipts per chunk")
+    ap.add_argument("--after-id", type=int, default=0, help="start after this receipts.id")
+    ap.add_argument("--max-chunks", type=int, default=None)
+    args = ap.parse_args()
+
+    if not DB_URL:
+        raise SystemExit("DB_URL is not set")
+    t = backfill(chunk=args.chunk, after_id=args.after_id, max_chunks=args.max_chunks)
+    print(f"Backfill complete. Inserted {t['inserted']} trades, rejected {t['rejected']} "
+          f"(scanned {t['scanned']} receipts in {t['elapsed_s']}s, {t['rows_per_s']:,.0f} rows/s; "
+          f"last_id={t['last_id']}).")
 
 
 if __name__ == "__main__":
@@ -4,8 +4,7 @@ import time
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from datetime import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 # Load API keys
 BINANCE_API_KEY = os.getenv("BINANCE_API_KEY")
@@ -17,10 +16,7 @@ BUY_ALLOCATION_PCT = 10  # % of USDT to spend
 SELL_ON_STALL = True
 
 # Google Sheets setup
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-gclient = gspread.authorize(creds)
-sheet = gclient.open_by_url(os.getenv("SHEET_URL"))
+sheet = get_sheet()
 trade_log = sheet.worksheet("Trade_Log")
 
 def log_trade(token, action, qty, price, usdt_value, alloc_pct, status):
@@ -3,8 +3,7 @@ import os
 import json
 from datetime import datetime
 from flask import Blueprint, request, jsonify
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 bp = Blueprint("telemetry_wallet_monitor", __name__)
 
@@ -12,10 +11,7 @@ SHEET_URL = os.getenv("SHEET_URL")
 WALLET_MONITOR_WS = os.getenv("WALLET_MONITOR_WS", "Wallet_Monitor")
 
 def _open_sheet():
-    scope=["https://spreadsheets.google.com/feeds","https://www.googleapis.com/auth/drive"]
-    svc_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "/etc/secrets/sentiment-log-service.json")
-    creds = ServiceAccountCredentials.from_json_keyfile_name(svc_path, scope)
-    return gspread.authorize(creds).open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 def _safe_num(x):
     try:
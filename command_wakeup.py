@@ -0,0 +1,211 @@
+# command_wakeup.py — wake long-polling Edge pulls when commands are enqueued
+"""
+Lets /api/commands/pull (and /api/commands/stream) block until there is work
+instead of running a lease UPDATE on every idle poll.
+
+Postgres mode:
+  A daemon thread holds one dedicated connection that LISTENs on
+  COMMANDS_NOTIFY_CHANNEL. An AFTER INSERT trigger on `commands` (installed
+  best-effort on first listen) sends pg_notify(channel, agent_id), so an
+  enqueue in any process/worker wakes the waiters here within milliseconds.
+
+SQLite mode (or when the listener is down):
+  bus_store_pg calls notify() after each enqueue, which wakes waiters in this
+  process through a condition variable. Waiters always time out, so a lost
+  notification only costs one wait period.
+
+    from command_wakeup import generation, wait_for_work
+
+    gen = generation(agent)          # snapshot BEFORE the lease
+    rows = store.lease(agent, n)
+    if not rows and wait_for_work(agent, 20, since=gen):
+        rows = store.lease(agent, n)
+
+Env:
+  COMMANDS_NOTIFY_CHANNEL     default nova_commands
+  COMMANDS_NOTIFY_TRIGGER     default 1  (install the AFTER INSERT trigger)
+  COMMANDS_LISTEN_PING_S      default 30 (keepalive on the LISTEN connection)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+CHANNEL = os.getenv("COMMANDS_NOTIFY_CHANNEL", "nova_commands").strip() or "nova_commands"
+INSTALL_TRIGGER = os.getenv("COMMANDS_NOTIFY_TRIGGER", "1").lower() in ("1", "true", "yes", "on")
+LISTEN_PING_S = float(os.getenv("COMMANDS_LISTEN_PING_S", "30"))
+
+log = logging.getLogger("command_wakeup")
+
+# "*" is bumped for notifications that are not agent-scoped (SQLite lease is
+# not filtered by agent; listener reconnects may have missed payloads).
+_ANY = "*"
+
+_cond = threading.Condition()
+_gen: Dict[str, int] = {}
+
+_listener: Optional[threading.Thread] = None
+_listener_lock = threading.Lock()
+
+_stats: Dict[str, Any] = {
+    "notifies_local": 0,
+    "notifies_pg": 0,
+    "waits": 0,
+    "woken": 0,
+    "timeouts": 0,
+    "waiting": 0,
+    "listener_connected": False,
+    "listener_reconnects": 0,
+    "listener_error": None,
+    "trigger_installed": False,
+}
+
+_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION nova_commands_notify() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_notify('{CHANNEL}', COALESCE(NEW.agent_id, ''));
+  RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'commands_notify_insert') THEN
+    CREATE TRIGGER commands_notify_insert
+      AFTER INSERT ON commands
+      FOR EACH ROW EXECUTE PROCEDURE nova_commands_notify();
+  END IF;
+END
+$$;
+"""
+
+
+def _bump(agent_id: str) -> None:
+    key = (agent_id or "").strip() or _ANY
+    with _cond:
+        _gen[key] = _gen.get(key, 0) + 1
+        _cond.notify_all()
+
+
+def generation(agent_id: str) -> Tuple[int, int]:
+    """Opaque token for wait_for_work(since=...); take it before leasing."""
+    with _cond:
+        return (_gen.get(agent_id, 0), _gen.get(_ANY, 0))
+
+
+def notify(agent_id: Optional[str] = None) -> None:
+    """Wake local waiters for agent_id (None/'' wakes everyone)."""
+    _stats["notifies_local"] += 1
+    _bump(agent_id or _ANY)
+
+
+def wait_for_work(agent_id: str, timeout_s: float, since: Optional[Tuple[int, int]] = None) -> bool:
+    """
+    Block up to timeout_s until a notification for agent_id (or a global one)
+    arrives after `since`. Returns True if woken, False on timeout.
+    """
+    _ensure_listener()
+    deadline = time.time() + max(0.0, float(timeout_s))
+    with _cond:
+        start = since if since is not None else (_gen.get(agent_id, 0), _gen.get(_ANY, 0))
+        _stats["waits"] += 1
+        _stats["waiting"] += 1
+        try:
+            while (_gen.get(agent_id, 0), _gen.get(_ANY, 0)) == start:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    _stats["timeouts"] += 1
+                    return False
+                _cond.wait(remaining)
+            _stats["woken"] += 1
+            return True
+        finally:
+            _stats["waiting"] -= 1
+
+
+def _db_url() -> str:
+    return (os.getenv("DB_URL") or os.getenv("DATABASE_URL") or "").strip()
+
+
+def _install_trigger(cur) -> None:
+    if not INSTALL_TRIGGER or _stats["trigger_installed"]:
+        return
+    try:
+        cur.execute(_TRIGGER_SQL)
+        _stats["trigger_installed"] = True
+    except Exception as e:
+        # Missing privileges or a concurrent install from another worker;
+        # local notify() + wait timeouts still keep delivery correct.
+        log.warning("command_wakeup: trigger install skipped: %r", e)
+
+
+def _listen_loop(url: str) -> None:
+    import psycopg2  # type: ignore
+
+    backoff = 1.0
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(url, connect_timeout=5, application_name="novatrade-listen")
+            conn.autocommit = True
+            cur = conn.cursor()
+            _install_trigger(cur)
+            cur.execute(f"LISTEN {CHANNEL};")
+            _stats["listener_connected"] = True
+            _stats["listener_error"] = None
+            backoff = 1.0
+            # Anything enqueued while we were disconnected went unnoticed.
+            _bump(_ANY)
+            while True:
+                if select.select([conn], [], [], LISTEN_PING_S) == ([], [], []):
+                    cur.execute("SELECT 1")
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    n = conn.notifies.pop(0)
+                    _stats["notifies_pg"] += 1
+                    _bump(n.payload or _ANY)
+        except Exception as e:
+            _stats["listener_connected"] = False
+            _stats["listener_reconnects"] += 1
+            _stats["listener_error"] = f"{e.__class__.__name__}:{e}"
+            log.warning("command_wakeup: listener error (retry in %.0fs): %r", backoff, e)
+            time.sleep(backoff)
+            backoff = min(60.0, backoff * 2)
+        finally:
+            try:
+                if conn is not None:
+                    conn.close()
+            except Exception:
+                pass
+
+
+def _ensure_listener() -> None:
+    """Start the LISTEN thread once per process (Postgres mode only)."""
+    global _listener
+    if _listener is not None:
+        return
+    url = _db_url()
+    if not url:
+        return
+    try:
+        import psycopg2  # type: ignore  # noqa: F401
+    except Exception:
+        return
+    with _listener_lock:
+        if _listener is not None:
+            return
+        _listener = threading.Thread(target=_listen_loop, args=(url,), name="commands-listen", daemon=True)
+        _listener.start()
+
+
+def wakeup_stats() -> Dict[str, Any]:
+    out = dict(_stats)
+    out["channel"] = CHANNEL
+    out["listener_started"] = _listener is not None
+    return out
@@ -0,0 +1,550 @@
+"""config_service.py — one parsed DB_READ_JSON for the whole Bus process
+
+Every module used to carry its own `_load_db_read_json()` and ran
+`json.loads(os.getenv("DB_READ_JSON"))` on each call, including
+kill_switches.cloud_hold_active() and edge_authority.authority_enabled()
+on every /api/commands/pull. db_read_adapter, meanwhile, froze its parse at
+import time. This module parses once and hands everyone the same snapshot.
+
+Sources (first non-empty wins):
+  1. DB_READ_JSON_FILE (path; read on boot and on reload())
+  2. the pinned row in Postgres config_pins (only when DB_READ_JSON_FILE is unset)
+  3. DB_READ_JSON env var
+  4. CONFIG_BUNDLE_JSON.vars.DB_READ_JSON (see config_bundle.py)
+
+Pinning (reload(raw=...), POST /api/config/reload) is shared by every
+process: the config is written to DB_READ_JSON_FILE when set, else to
+config_pins, and a watcher thread in each process (web and worker.py)
+re-reads it every CONFIG_PIN_CHECK_S. With neither available pinning is
+refused, so kill switches can't disagree between processes. A pin shadows
+the env until unpin() (POST /api/config/unpin) or until the file / row is
+deleted; config_status() reports it. When the pin store can't be read
+(DB blip, unreadable file) the current config is kept: only a successful
+read that finds no pin unpins. The first read happens at import, so no
+request pays for it.
+
+Parsing is copy/paste tolerant (list of objects, "{...}, {...}", first
+object span) and never raises; bad input yields {}.
+
+API:
+    db_read_json()                 -> dict  (shared; treat as read-only)
+    get("phase25.alpha.enabled", default)
+    get_bool / get_int / get_float / get_str / get_dict / get_list
+    derived(key, fn)               -> fn(cfg) cached until the config changes
+    snapshot()                     -> ConfigSnapshot(version, digest, source, loaded_at, data)
+    reload(raw=None, reason="")    -> bool changed   (raw: new JSON text or dict, pinned for all processes)
+    unpin(reason="")               -> bool changed   (drop the shared pin; env / bundle apply again)
+    on_change(fn)                  -> fn(old_snapshot, new_snapshot) after each change
+    install_reload_signal()        -> SIGHUP triggers reload() (main thread only)
+
+Change detection is cheap: each access compares the env string with the
+one last parsed (no JSON work unless it differs), so os.environ updates
+made by config_bundle or ops tooling are picked up without a restart.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger("config_service")
+
+CONFIG_PIN_CHECK_S = float(os.getenv("CONFIG_PIN_CHECK_S", "15") or "15")
+_PIN_KEY = "db_read_json"
+_PIN_DDL = """
+CREATE TABLE IF NOT EXISTS config_pins (
+  key TEXT PRIMARY KEY,
+  raw TEXT NOT NULL,
+  reason TEXT,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    version: int
+    digest: str
+    source: str
+    loaded_at: float
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def get(self, path: str, default: Any = None) -> Any:
+        cur: Any = self.data
+        for part in path.split("."):
+            if not isinstance(cur, dict) or part not in cur:
+                return default
+            cur = cur[part]
+        return default if cur is None else cur
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "digest": self.digest,
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "keys": sorted(self.data.keys()),
+        }
+
+
+# ---------------- parsing ----------------
+def _merge_dicts(parts: Any) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for part in parts:
+        if isinstance(part, dict):
+            merged.update(part)
+    return merged
+
+
+def parse_db_read_json(raw: str) -> Dict[str, Any]:
+    """Parse DB_READ_JSON text robustly; never raises."""
+    raw = (raw or "").strip()
+    if not raw:
+        return {}
+    if (raw.startswith("`") and raw.endswith("`")) or (raw.startswith("'") and raw.endswith("'")):
+        raw = raw.strip("`'").strip()
+
+    # 1) normal case (a list of objects is merged left-to-right)
+    try:
+        obj = json.loads(raw)
+        if isinstance(obj, dict):
+            return obj
+        if isinstance(obj, list):
+            return _merge_dicts(obj)
+        return {}
+    except Exception:
+        pass
+
+    # 2) common copy/paste error: "{...}, {...}"
+    try:
+        obj2 = json.loads("[" + raw + "]")
+        if isinstance(obj2, list):
+            return _merge_dicts(obj2)
+    except Exception:
+        pass
+
+    # 3) last resort: the span from the first '{' to the last '}'
+    try:
+        a = raw.find("{")
+        b = raw.rfind("}")
+        if a != -1 and b > a:
+            obj3 = json.loads(raw[a: b + 1])
+            return obj3 if isinstance(obj3, dict) else {}
+    except Exception:
+        pass
+    return {}
+
+
+def _bundle_db_read_json() -> str:
+    bundle = (os.getenv("CONFIG_BUNDLE_JSON") or "").strip()
+    if not bundle:
+        return ""
+    try:
+        b = json.loads(bundle)
+        v = (b.get("vars") or {}).get("DB_READ_JSON") if isinstance(b.get("vars"), dict) else b.get("DB_READ_JSON")
+    except Exception:
+        return ""
+    if v is None:
+        return ""
+    return v if isinstance(v, str) else json.dumps(v)
+
+
+def _db_url() -> str:
+    return (os.getenv("DB_URL") or os.getenv("DATABASE_URL") or "").strip()
+
+
+def _pin_path() -> str:
+    return (os.getenv("DB_READ_JSON_FILE") or "").strip()
+
+
+def _db_pin_read() -> Optional[Tuple[str, str]]:
+    """
+    (raw, version stamp) of the pinned config in Postgres, or None when there
+    is no pin. Raises when config_pins can't be read: a failed read must not
+    look like "unpinned".
+    """
+    if not _db_url():
+        return None
+    from db_pool import pg_conn
+    with pg_conn(url=_db_url(), autocommit=True, caller="config_service") as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('config_pins') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                return None
+            cur.execute("SELECT raw, updated_at::text FROM config_pins WHERE key = %s", (_PIN_KEY,))
+            r = cur.fetchone()
+    return (r[0], r[1]) if r else None
+
+
+def _read_pin() -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+    """
+    ((raw, source) or None, stamp) of the shared pin. A missing file / row is
+    "no pin"; any other read failure raises.
+    """
+    path = _pin_path()
+    if path:
+        try:
+            stamp = _pin_stamp()
+            with open(path, "r", encoding="utf-8") as fh:
+                text = fh.read()
+        except FileNotFoundError:
+            return None, None
+        return ((text, f"file:{path}") if text.strip() else None), stamp
+    pin = _db_pin_read()
+    if pin is None:
+        return None, None
+    return ((pin[0], "config_pins") if pin[0].strip() else None), pin[1]
+
+
+def _write_pin(text: str, reason: str) -> str:
+    """Persist a pinned config where every process reads it; returns the store used."""
+    path = _pin_path()
+    if path:
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+        return f"file:{path}"
+    if _db_url():
+        from db_pool import pg_conn
+        with pg_conn(url=_db_url(), autocommit=True, caller="config_service") as conn:
+            with conn.cursor() as cur:
+                cur.execute(_PIN_DDL)
+                cur.execute(
+                    """
+                    INSERT INTO config_pins (key, raw, reason, updated_at) VALUES (%s, %s, %s, clock_timestamp())
+                    ON CONFLICT (key) DO UPDATE
+                      SET raw = EXCLUDED.raw, reason = EXCLUDED.reason, updated_at = EXCLUDED.updated_at
+                    """,
+                    (_PIN_KEY, text, reason),
+                )
+        return "config_pins"
+    raise RuntimeError("config pinning needs DB_READ_JSON_FILE or DB_URL so every process sees it")
+
+
+def _delete_pin() -> str:
+    """Remove the shared pin; returns the store it was removed from."""
+    path = _pin_path()
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return f"file:{path}"
+    if _db_url():
+        from db_pool import pg_conn
+        with pg_conn(url=_db_url(), autocommit=True, caller="config_service") as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('config_pins') IS NOT NULL")
+                if cur.fetchone()[0]:
+                    cur.execute("DELETE FROM config_pins WHERE key = %s", (_PIN_KEY,))
+        return "config_pins"
+    return "none"
+
+
+def _pin_stamp() -> Optional[str]:
+    """
+    Cheap change marker for the shared pin (file mtime or config_pins.updated_at);
+    None when there is no pin. Raises when the store can't be read.
+    """
+    path = _pin_path()
+    if path:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    pin = _db_pin_read()
+    return pin[1] if pin else None
+
+
+# ---------------- state ----------------
+_lock = threading.RLock()
+_snap = ConfigSnapshot(version=0, digest="", source="none", loaded_at=0.0, data={})
+_env_raw: Optional[str] = None        # env text the current snapshot was built from (None: not env-sourced)
+_override: Optional[Tuple[str, str]] = None  # (raw, source) from the file or config_pins
+_pin_seen: Optional[str] = None               # _pin_stamp() the current snapshot was built from
+_PIN_UNREAD = "<unread>"                      # _pin_seen while the pin store has never been read
+_watcher: Optional[threading.Thread] = None
+_derived: Dict[str, Tuple[int, Any]] = {}
+_listeners: List[Callable[[ConfigSnapshot, ConfigSnapshot], None]] = []
+_stats: Dict[str, Any] = {"parses": 0, "reloads": 0, "changes": 0, "listener_errors": 0,
+                          "pin_read_errors": 0, "last_pin_error": "", "last_reason": ""}
+_booted = False
+
+
+def _digest(data: Dict[str, Any]) -> str:
+    try:
+        canon = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    except Exception:
+        canon = repr(data)
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()[:16]
+
+
+def _install(raw: str, source: str, reason: str) -> bool:
+    """Parse raw and swap the snapshot if its content changed. Caller holds _lock."""
+    global _snap
+    data = parse_db_read_json(raw)
+    _stats["parses"] += 1
+    digest = _digest(data)
+    if digest == _snap.digest and _snap.version:
+        return False
+    old = _snap
+    _snap = ConfigSnapshot(version=old.version + 1, digest=digest, source=source,
+                           loaded_at=time.time(), data=data)
+    _derived.clear()
+    _stats["changes"] += 1
+    _stats["last_reason"] = reason
+    if old.version:
+        log.info("config_service: DB_READ_JSON v%d -> v%d (%s, %s)", old.version, _snap.version, source, reason)
+        for fn in list(_listeners):
+            try:
+                fn(old, _snap)
+            except Exception as e:
+                _stats["listener_errors"] += 1
+                log.warning("config_service: change listener %r failed: %s", fn, e)
+    return True
+
+
+def _load_sources(reason: str) -> bool:
+    """
+    Re-read file / pinned row / env / bundle. Caller holds _lock.
+    If the pin store can't be read the current override (if any) is kept and
+    _pin_seen is left alone, so the watcher retries on its next tick.
+    """
+    global _env_raw, _override, _pin_seen
+    try:
+        override, stamp = _read_pin()
+    except Exception as e:
+        _stats["pin_read_errors"] += 1
+        _stats["last_pin_error"] = f"{e.__class__.__name__}: {e}"
+        log.warning("config_service: cannot read pinned config (%s); keeping %s", e,
+                    _override[1] if _override else "the unpinned config")
+        if _pin_seen is None and _override is None:
+            _pin_seen = _PIN_UNREAD
+    else:
+        if _override is not None and override is None:
+            log.info("config_service: pin removed from %s (%s)", _override[1], reason)
+        _override, _pin_seen = override, stamp
+    if _override is not None:
+        _env_raw = None
+        return _install(_override[0], _override[1], reason)
+    env = os.getenv("DB_READ_JSON") or ""
+    _env_raw = env
+    if env.strip():
+        return _install(env, "env", reason)
+    return _install(_bundle_db_read_json(), "config_bundle", reason)
+
+
+def snapshot() -> ConfigSnapshot:
+    global _booted
+    if not _booted:
+        with _lock:
+            if not _booted:
+                _load_sources("boot")
+                _booted = True
+        _start_pin_watcher()
+        return _snap
+    if _env_raw is not None and (os.getenv("DB_READ_JSON") or "") != _env_raw:
+        with _lock:
+            if _env_raw is not None and (os.getenv("DB_READ_JSON") or "") != _env_raw:
+                _load_sources("env_changed")
+    return _snap
+
+
+def db_read_json() -> Dict[str, Any]:
+    """The parsed DB_READ_JSON dict. Shared across modules: do not mutate it."""
+    return snapshot().data
+
+
+def reload(raw: Any = None, reason: str = "") -> bool:
+    """
+    Re-read the sources, or pin `raw` (JSON text or dict) as the new config.
+    A pin is written to DB_READ_JSON_FILE / config_pins, so the other
+    processes pick it up within CONFIG_PIN_CHECK_S; it stays until the next
+    pin. Raises RuntimeError when there is nowhere shared to pin to.
+    Returns True when the effective config changed.
+    """
+    global _booted
+    with _lock:
+        _stats["reloads"] += 1
+        _booted = True
+        if raw is not None:
+            text = raw if isinstance(raw, str) else json.dumps(raw)
+            store = _write_pin(text, reason or "admin")
+            log.info("config_service: pinned DB_READ_JSON to %s (%s)", store, reason or "admin")
+        changed = _load_sources(reason or ("admin" if raw is not None else "reload"))
+    _start_pin_watcher()
+    return changed
+
+
+def unpin(reason: str = "") -> bool:
+    """
+    Drop the shared pin (file or config_pins row) so env / bundle apply again
+    in every process. Raises when the pin store can't be written.
+    Returns True when the effective config changed.
+    """
+    global _booted
+    with _lock:
+        _stats["reloads"] += 1
+        _booted = True
+        store = _delete_pin()
+        log.info("config_service: unpinned DB_READ_JSON from %s (%s)", store, reason or "admin")
+        changed = _load_sources(reason or "unpin")
+    return changed
+
+
+def _check_pin() -> bool:
+    """One watcher tick: reload when the shared pin changed. True when the config changed."""
+    try:
+        stamp = _pin_stamp()
+    except Exception as e:
+        # Unreadable store: keep the current config, try again next tick.
+        _stats["pin_read_errors"] += 1
+        _stats["last_pin_error"] = f"{e.__class__.__name__}: {e}"
+        log.warning("config_service: pin check failed: %s", e)
+        return False
+    if stamp == _pin_seen:
+        return False
+    with _lock:
+        return _load_sources("pin_changed")
+
+
+def _watch_pins() -> None:
+    while True:
+        time.sleep(max(1.0, CONFIG_PIN_CHECK_S))
+        try:
+            _check_pin()
+        except Exception as e:
+            log.warning("config_service: pin reload failed: %s", e)
+
+
+def _start_pin_watcher() -> None:
+    """Follow pins made by other processes (file or config_pins) in the background."""
+    global _watcher
+    if _watcher is not None or not (_pin_path() or _db_url()):
+        return
+    with _lock:
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch_pins, name="config-pin-watcher", daemon=True)
+            _watcher.start()
+
+
+def on_change(fn: Callable[[ConfigSnapshot, ConfigSnapshot], None]) -> Callable[[ConfigSnapshot, ConfigSnapshot], None]:
+    """Register fn(old, new), called after each config change. Usable as a decorator."""
+    with _lock:
+        if fn not in _listeners:
+            _listeners.append(fn)
+    return fn
+
+
+def derived(key: str, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+    """fn(cfg) computed once per config version (for values that need work to derive)."""
+    snap = snapshot()
+    hit = _derived.get(key)
+    if hit is not None and hit[0] == snap.version:
+        return hit[1]
+    val = fn(snap.data)
+    _derived[key] = (snap.version, val)
+    return val
+
+
+# ---------------- typed getters ----------------
+def _truthy(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, (int, float)):
+        return v != 0
+    return str(v).strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def get(path: str, default: Any = None) -> Any:
+    return snapshot().get(path, default)
+
+
+def get_bool(path: str, default: bool = False) -> bool:
+    v = snapshot().get(path, _MISSING)
+    return default if v is _MISSING else _truthy(v)
+
+
+def get_int(path: str, default: int = 0) -> int:
+    v = snapshot().get(path, _MISSING)
+    try:
+        return default if v is _MISSING else int(float(v))
+    except Exception:
+        return default
+
+
+def get_float(path: str, default: float = 0.0) -> float:
+    v = snapshot().get(path, _MISSING)
+    try:
+        return default if v is _MISSING else float(v)
+    except Exception:
+        return default
+
+
+def get_str(path: str, default: str = "") -> str:
+    v = snapshot().get(path, _MISSING)
+    return default if v is _MISSING else str(v).strip()
+
+
+def get_dict(path: str) -> Dict[str, Any]:
+    v = snapshot().get(path, None)
+    return v if isinstance(v, dict) else {}
+
+
+def get_list(path: str) -> List[str]:
+    """List of non-empty strings; a comma-separated string is split."""
+    v = snapshot().get(path, None)
+    if v is None:
+        return []
+    if isinstance(v, (list, tuple)):
+        return [str(x).strip() for x in v if str(x).strip()]
+    if isinstance(v, str):
+        return [s.strip() for s in v.split(",") if s.strip()]
+    return [str(v)]
+
+
+# ---------------- reload triggers ----------------
+def install_reload_signal() -> bool:
+    """SIGHUP -> reload(). Only possible from the main thread; returns False otherwise."""
+    try:
+        import signal
+
+        def _on_hup(signum, frame):  # noqa: ARG001
+            # Do the work off the signal frame; reload() takes a lock.
+            threading.Thread(target=reload, kwargs={"reason": "SIGHUP"}, daemon=True).start()
+
+        signal.signal(signal.SIGHUP, _on_hup)
+        return True
+    except Exception as e:
+        log.info("config_service: SIGHUP handler not installed: %s", e)
+        return False
+
+
+def config_status() -> Dict[str, Any]:
+    out = snapshot().summary()
+    out.update(_stats)
+    out["listeners"] = len(_listeners)
+    pinned = _override[1] if _override else ""
+    out["pinned"] = pinned
+    # A pin wins over DB_READ_JSON until unpin(); say so when they differ.
+    out["env_shadowed"] = bool(pinned) and bool((os.getenv("DB_READ_JSON") or "").strip()) and (
+        _digest(parse_db_read_json(os.getenv("DB_READ_JSON") or "")) != _snap.digest)
+    return out
+
+
+# Boot read at import (web and worker import this module at startup), so the
+# first pinned-config read never lands on a request.
+try:
+    snapshot()
+except Exception as e:  # pragma: no cover
+    log.warning("config_service: boot load failed: %s", e)
@@ -27,6 +27,8 @@ from __future__ import annotations
 import os, json, logging
 from typing import Any, Dict
 
+import config_service
+
 log = logging.getLogger("council_analytics_rollup")
 
 def _truthy(v: Any) -> bool:
@@ -39,14 +41,7 @@ def _truthy(v: Any) -> bool:
     return str(v).strip().lower() in {"1","true","yes","y","on"}
 
 def _load_db_read_json() -> dict:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        o = json.loads(raw)
-        return o if isinstance(o, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 def _cfg() -> dict:
     cfg = _load_db_read_json()
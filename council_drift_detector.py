@@ -128,9 +128,14 @@ def _ensure_ws(sheet, ws_name: str, headers: List[str]):
         ws.append_row(headers)
 
 
-def _get_records(sheet, ws_name: str) -> List[dict]:
-    ws = sheet.worksheet(ws_name)
-    return ws.get_all_records()
+def _get_records(sheet, ws_name: str, n: int = WINDOW_N) -> List[dict]:
+    # Only the drift window is needed; read_tail fetches just those rows.
+    try:
+        from utils import read_tail  # type: ignore
+    except Exception:
+        ws = sheet.worksheet(ws_name)
+        return ws.get_all_records()[-n:]
+    return read_tail(ws_name, n)
 
 
 def _append_row(sheet, ws_name: str, row: List):
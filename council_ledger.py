@@ -21,7 +21,7 @@ import time
 from datetime import datetime
 from typing import List
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 SHEET_URL = os.getenv("SHEET_URL", "")
 VOICE_WS  = os.getenv("COUNCIL_VOICE_WS", "Council_Voice")
@@ -42,14 +42,9 @@ def _retry(fn, *args, **kwargs):
     raise last  # noqa: F821
 
 def _open_sheet():
-    scope = ["https://spreadsheets.google.com/feeds",
-             "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(
-        "sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
     if not SHEET_URL:
         raise ValueError("SHEET_URL not set for council_ledger.py")
-    return _retry(client.open_by_url, SHEET_URL)
+    return _retry(get_sheet, SHEET_URL)
 
 # ---------- Header helpers (non‑destructive) ----------
 def _row1(ws) -> List[str]:
@@ -25,6 +25,8 @@ import os, json, hashlib, logging
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+import config_service
+
 import psycopg2
 
 log = logging.getLogger("council_outcomes_pnl_rollup")
@@ -39,14 +41,7 @@ def _truthy(v: Any) -> bool:
     return str(v).strip().lower() in {"1","true","yes","y","on"}
 
 def _load_db_read_json() -> dict:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        o = json.loads(raw)
-        return o if isinstance(o, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 def _cfg() -> dict:
     cfg = _load_db_read_json()
@@ -93,24 +88,13 @@ def _get_ws(tab: str):
         from utils import get_ws_cached  # type: ignore
         return get_ws_cached(tab, ttl_s=30)
     except Exception:
-        import gspread
-        from oauth2client.service_account import ServiceAccountCredentials
+        from utils import get_sheet
 
         sheet_url = os.getenv("SHEET_URL")
         if not sheet_url:
             raise RuntimeError("SHEET_URL not set")
 
-        svc = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        if not svc:
-            raise RuntimeError("GOOGLE_APPLICATION_CREDENTIALS not set")
-
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-        gc = gspread.authorize(creds)
-        sh = gc.open_by_url(sheet_url)
+        sh = get_sheet(sheet_url)
         try:
             return sh.worksheet(tab)
         except Exception:
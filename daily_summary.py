@@ -2,7 +2,7 @@
 # daily_summary.py — Phase-5 Telegram digest (runs ~09:00 ET)
 #
 # Key features:
-# • Env-driven service account path (SVC_JSON)
+# • Shared gspread client/Spreadsheet registry (utils.get_sheet)
 # • Robust Google Sheets retries/backoff for 429/5xx
 # • Safer parsing of booleans/timestamps/strings (no .strip() on ints)
 # • One-per-day de-dupe (per ET day)
@@ -24,8 +24,7 @@ from zoneinfo import ZoneInfo
 from typing import Any, Dict, Tuple, Optional
 
 import requests
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 
 # ---- Config (env) -----------------------------------------------------------
@@ -35,7 +34,6 @@ TTL_READ_S = int(os.getenv("TTL_READ_S", "120") or "120")
 BOT_TOKEN = os.getenv("BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 SHEET_URL = os.getenv("SHEET_URL", "")
-SVC_JSON = os.getenv("SVC_JSON", "sentiment-log-service.json")
 
 VAULT_WS_NAME = os.getenv("VAULT_INTELLIGENCE_WS", "Vault Intelligence")
 POLICY_LOG_WS = os.getenv("POLICY_LOG_WS", "Policy_Log")
@@ -110,13 +108,7 @@ def _safe_stripped(v, default: str = "") -> str:
 
 
 def _open_sheet():
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(SVC_JSON, scope)
-    client = gspread.authorize(creds)
-    return client.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 
 def _retry(op, *args, **kwargs):
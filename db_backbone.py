@@ -21,8 +21,8 @@ from __future__ import annotations
 
 import json
 import os
-import threading
 import traceback
+from contextlib import ExitStack, contextmanager
 from typing import Any, Dict, List, Optional, Tuple
 
 try:
@@ -32,50 +32,41 @@ except Exception:
     psycopg2 = None  # type: ignore[assignment]
 
 _DB_URL = os.getenv("DB_URL")
-_conn_lock = threading.Lock()
-_conn = None  # type: ignore[assignment]
 _schema_initialized = False
 
 
+@contextmanager
 def _get_conn():
-    """Get (and lazily initialize) a global PG connection, or None if unavailable."""
-    global _conn
-    if not _DB_URL or not psycopg2:
-        return None
-
-    with _conn_lock:
-        if _conn is not None:
-            # Quick health check: if connection is dead, reset.
-            try:
-                cur = _conn.cursor()
-                cur.execute("SELECT 1")
-                _conn.commit()
-                return _conn
-            except Exception:
-                try:
-                    _conn.close()
-                except Exception:
-                    pass
-                _conn = None
+    """
+    Yield a pooled autocommit PG connection (db_pool), or None if unavailable.
 
+    Replaces the old single global connection, which was shared unlocked
+    across gunicorn threads and paid a SELECT 1 round-trip on every call.
+    The pool only pings connections that have sat idle.
+    """
+    if not _DB_URL or not psycopg2:
+        yield None
+        return
+    with ExitStack() as stack:
         try:
-            _conn = psycopg2.connect(_DB_URL)
-            _conn.autocommit = True
-            return _conn
+            from db_pool import pg_conn
+            conn = stack.enter_context(pg_conn(url=_DB_URL, autocommit=True, caller="db_backbone"))
         except Exception as e:
             print(f"[db_backbone] Failed to connect to DB_URL: {e}")
             traceback.print_exc()
-            _conn = None
-            return None
+            conn = None
+        yield conn
 
 
-def _ensure_schema() -> None:
-    """Create Phase-19 tables if they don't exist yet."""
+def _ensure_schema(conn=None) -> None:
+    """Create Phase-19 tables if they don't exist yet (on `conn` when given)."""
     global _schema_initialized
     if _schema_initialized:
         return
-    conn = _get_conn()
-    if not conn:
+    if conn is None:
+        with _get_conn() as own:
+            if own:
+                _ensure_schema(own)
         return
     try:
         cur = conn.cursor()
@@ -118,6 +109,11 @@ def _ensure_schema() -> None:
             );
             """
         )
+        # agent_freshness reconciles MAX(created_at) per agent; keep it an index probe.
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_nova_telemetry_agent_created "
+            "ON nova_telemetry (agent_id, created_at DESC);"
+        )
         # Phase 24B: Idempotency — prevent duplicate receipts for the same (agent_id, cmd_id).
         # Safe retries: /receipts/ack may be called multiple times.
         try:
@@ -147,22 +143,22 @@ def record_command_enqueued(agent_id: str, payload: Dict[str, Any]) -> None:
 
     This does *not* change how the command bus behaves; it's a ledger-only write.
     """
-    conn = _get_conn()
-    if not conn:
-        return
-    _ensure_schema()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO nova_commands (agent_id, payload)
-            VALUES (%s, %s)
-            """,
-            (agent_id, psycopg2.extras.Json(payload)),
-        )
-    except Exception as e:
-        print(f"[db_backbone] record_command_enqueued failed: {e}")
-        traceback.print_exc()
+    with _get_conn() as conn:
+        if not conn:
+            return
+        _ensure_schema(conn)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO nova_commands (agent_id, payload)
+                VALUES (%s, %s)
+                """,
+                (agent_id, psycopg2.extras.Json(payload)),
+            )
+        except Exception as e:
+            print(f"[db_backbone] record_command_enqueued failed: {e}")
+            traceback.print_exc()
 
 
 def record_receipt(
@@ -177,64 +173,64 @@ def record_receipt(
     Fields like venue/symbol/notional_usd are *best-effort* extractions
     from the receipt dict; if missing, they remain NULL.
     """
-    conn = _get_conn()
-    if not conn:
-        return
-    _ensure_schema()
-
-    ok_val = ok
-    if ok_val is None:
-        # Try to infer from receipt structure
-        if "ok" in receipt:
-            try:
-                ok_val = bool(receipt["ok"])
-            except Exception:
-                ok_val = None
+    with _get_conn() as conn:
+        if not conn:
+            return
+        _ensure_schema(conn)
+
+        ok_val = ok
+        if ok_val is None:
+            # Try to infer from receipt structure
+            if "ok" in receipt:
+                try:
+                    ok_val = bool(receipt["ok"])
+                except Exception:
+                    ok_val = None
 
-    # Try to pull out some top-level fields for fast queries
-    venue = None
-    symbol = None
-    base = None
-    quote = None
-    notional_usd = None
+        # Try to pull out some top-level fields for fast queries
+        venue = None
+        symbol = None
+        base = None
+        quote = None
+        notional_usd = None
 
-    try:
-        venue = receipt.get("venue") or receipt.get("exchange")
-        symbol = receipt.get("symbol")
-        base = receipt.get("base")
-        quote = receipt.get("quote")
-        notional_usd = receipt.get("notional_usd")
-    except Exception:
-        pass
+        try:
+            venue = receipt.get("venue") or receipt.get("exchange")
+            symbol = receipt.get("symbol")
+            base = receipt.get("base")
+            quote = receipt.get("quote")
+            notional_usd = receipt.get("notional_usd")
+        except Exception:
+            pass
 
-    status = receipt.get("status")
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO nova_receipts
-                (agent_id, cmd_id, ok, status,
-                 venue, symbol, base, quote, notional_usd, payload)
-            VALUES (%s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (agent_id, cmd_id) DO NOTHING
-            """,
-            (
-                agent_id,
-                int(cmd_id) if cmd_id is not None else None,
-                ok_val,
-                status,
-                venue,
-                symbol,
-                base,
-                quote,
-                notional_usd,
-                psycopg2.extras.Json(receipt),
-            ),
-        )
-    except Exception as e:
-        print(f"[db_backbone] record_receipt failed: {e}")
-        traceback.print_exc()
+        status = receipt.get("status")
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO nova_receipts
+                    (agent_id, cmd_id, ok, status,
+                     venue, symbol, base, quote, notional_usd, payload)
+                VALUES (%s, %s, %s, %s,
+                        %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (agent_id, cmd_id) DO NOTHING
+                """,
+                (
+                    agent_id,
+                    int(cmd_id) if cmd_id is not None else None,
+                    ok_val,
+                    status,
+                    venue,
+                    symbol,
+                    base,
+                    quote,
+                    notional_usd,
+                    psycopg2.extras.Json(receipt),
+                ),
+            )
+        except Exception as e:
+            print(f"[db_backbone] record_receipt failed: {e}")
+            traceback.print_exc()
 
 
 def record_telemetry(agent_id: str, payload: Dict[str, Any], kind: str = None) -> None:
@@ -243,22 +239,22 @@ def record_telemetry(agent_id: str, payload: Dict[str, Any], kind: str = None) -
 
     'kind' is a short free-text tag like 'balances', 'snapshot', etc.
     """
-    conn = _get_conn()
-    if not conn:
-        return
-    _ensure_schema()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO nova_telemetry (agent_id, kind, payload)
-            VALUES (%s, %s, %s)
-            """,
-            (agent_id, kind, psycopg2.extras.Json(payload)),
-        )
-    except Exception as e:
-        print(f"[db_backbone] record_telemetry failed: {e}")
-        traceback.print_exc()
+    with _get_conn() as conn:
+        if not conn:
+            return
+        _ensure_schema(conn)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO nova_telemetry (agent_id, kind, payload)
+                VALUES (%s, %s, %s)
+                """,
+                (agent_id, kind, psycopg2.extras.Json(payload)),
+            )
+        except Exception as e:
+            print(f"[db_backbone] record_telemetry failed: {e}")
+            traceback.print_exc()
 
 
 def record_telemetry_snapshot(agent_id: str, payload: Dict[str, Any], kind: str = None) -> None:
@@ -271,53 +267,53 @@ def record_telemetry_snapshot(agent_id: str, payload: Dict[str, Any], kind: str
     This function is intentionally best-effort: telemetry must never
     break the bus.
     """
-    conn = _get_conn()
-    if not conn:
-        return
-    _ensure_schema()
+    with _get_conn() as conn:
+        if not conn:
+            return
+        _ensure_schema(conn)
 
-    # Always try nova_telemetry first (forward path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO nova_telemetry (agent_id, kind, payload)
-            VALUES (%s, %s, %s)
-            """,
-            (agent_id, kind, psycopg2.extras.Json(payload)),
-        )
-    except Exception:
-        # Soft-fail
-        pass
+        # Always try nova_telemetry first (forward path)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO nova_telemetry (agent_id, kind, payload)
+                VALUES (%s, %s, %s)
+                """,
+                (agent_id, kind, psycopg2.extras.Json(payload)),
+            )
+        except Exception:
+            # Soft-fail
+            pass
 
-    # Then try legacy telemetry table (if present)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO telemetry (agent_id, payload)
-            VALUES (%s, %s)
-            """,
-            (agent_id, psycopg2.extras.Json(payload)),
-        )
-    except Exception:
-        # Soft-fail
-        pass
-      
+        # Then try legacy telemetry table (if present)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO telemetry (agent_id, payload)
+                VALUES (%s, %s)
+                """,
+                (agent_id, psycopg2.extras.Json(payload)),
+            )
+        except Exception:
+            # Soft-fail
+            pass
+          
 # --- DB observability helpers (Phase 19 Step 3) -----------------------------
 def _fetchall(query: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
     """Internal helper to run a query and return dict rows."""
-    conn = _get_conn()
-    if not conn:
-        return []
-    cur = conn.cursor()
-    try:
-        cur.execute(query, params)
-        cols = [c[0] for c in cur.description]
-        rows = [dict(zip(cols, r)) for r in cur.fetchall()]
-        return rows
-    finally:
-        cur.close()
+    with _get_conn() as conn:
+        if not conn:
+            return []
+        cur = conn.cursor()
+        try:
+            cur.execute(query, params)
+            cols = [c[0] for c in cur.description]
+            rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+            return rows
+        finally:
+            cur.close()
 
 def get_recent_commands(limit: int = 20) -> List[Dict[str, Any]]:
     """
@@ -388,68 +384,68 @@ def record_trade_from_receipt(receipt_row: Dict[str, Any]) -> None:
     expected receipt_row keys (from receipts table + payload JSON):
       - id, cmd_id, ok, payload (dict)
     """
-    conn = _get_conn()
-    if not conn:
-        return
+    with _get_conn() as conn:
+        if not conn:
+            return
+
+        payload = receipt_row.get("payload") or {}
+        # In case we ever wrap under 'trade'
+        trade = payload.get("trade") or payload
+
+        venue = trade.get("venue") or payload.get("venue")
+        symbol = trade.get("symbol") or payload.get("symbol")
+        side = trade.get("side") or trade.get("direction")
+        base_qty = (
+            trade.get("filled_base")
+            or trade.get("base_qty")
+            or trade.get("amount_base")
+        )
+        quote_qty = (
+            trade.get("filled_quote")
+            or trade.get("quote_qty")
+            or trade.get("amount_quote")
+        )
+        price = trade.get("price")
+        status = (
+            trade.get("status")
+            or ("ok" if receipt_row.get("ok") else "error")
+        )
 
-    payload = receipt_row.get("payload") or {}
-    # In case we ever wrap under 'trade'
-    trade = payload.get("trade") or payload
-
-    venue = trade.get("venue") or payload.get("venue")
-    symbol = trade.get("symbol") or payload.get("symbol")
-    side = trade.get("side") or trade.get("direction")
-    base_qty = (
-        trade.get("filled_base")
-        or trade.get("base_qty")
-        or trade.get("amount_base")
-    )
-    quote_qty = (
-        trade.get("filled_quote")
-        or trade.get("quote_qty")
-        or trade.get("amount_quote")
-    )
-    price = trade.get("price")
-    status = (
-        trade.get("status")
-        or ("ok" if receipt_row.get("ok") else "error")
-    )
-
-    # If we somehow can't even tell venue/symbol, don't insert junk.
-    if not venue or not symbol:
-        return
+        # If we somehow can't even tell venue/symbol, don't insert junk.
+        if not venue or not symbol:
+            return
 
-    cmd_id = receipt_row.get("cmd_id")
-    receipt_id = receipt_row.get("id")
+        cmd_id = receipt_row.get("cmd_id")
+        receipt_id = receipt_row.get("id")
 
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            INSERT INTO trades (
-                cmd_id, receipt_id,
-                venue, symbol, side,
-                base_qty, quote_qty, price,
-                status, raw_payload
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                """
+                INSERT INTO trades (
+                    cmd_id, receipt_id,
+                    venue, symbol, side,
+                    base_qty, quote_qty, price,
+                    status, raw_payload
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    cmd_id,
+                    receipt_id,
+                    venue,
+                    symbol,
+                    side,
+                    base_qty,
+                    quote_qty,
+                    price,
+                    status,
+                    json.dumps(payload),
+                ),
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (
-                cmd_id,
-                receipt_id,
-                venue,
-                symbol,
-                side,
-                base_qty,
-                quote_qty,
-                price,
-                status,
-                json.dumps(payload),
-            ),
-        )
-        conn.commit()
-    finally:
-        cur.close()
+            conn.commit()
+        finally:
+            cur.close()
 
 def record_trade_live(cmd_id: Optional[int], receipt: Dict[str, Any]) -> None:
     """
@@ -466,65 +462,65 @@ def record_trade_live(cmd_id: Optional[int], receipt: Dict[str, Any]) -> None:
       - post_balances (dict)
       - ts (ISO or unix-ish)
     """
-    conn = _get_conn()
-    if not conn:
-        return
-
-    # Normalize a bit
-    venue = (receipt.get("venue") or "").upper() or None
-    symbol = receipt.get("symbol") or receipt.get("requested_symbol") or None
-    side = (receipt.get("side") or receipt.get("direction") or "").upper() or None
-    status = receipt.get("status") or ("ok" if receipt.get("ok") else "error")
-    fills = receipt.get("fills") or []
-
-    # Derive qty / price from fills
-    total_qty = 0.0
-    notional = 0.0
-    for f in fills:
-        try:
-            q = float(f.get("qty") or f.get("size") or 0)
-            p = float(f.get("price") or 0)
-            total_qty += q
-            notional += q * p
-        except Exception:
-            continue
-    avg_price = (notional / total_qty) if total_qty > 0 else None
+    with _get_conn() as conn:
+        if not conn:
+            return
+
+        # Normalize a bit
+        venue = (receipt.get("venue") or "").upper() or None
+        symbol = receipt.get("symbol") or receipt.get("requested_symbol") or None
+        side = (receipt.get("side") or receipt.get("direction") or "").upper() or None
+        status = receipt.get("status") or ("ok" if receipt.get("ok") else "error")
+        fills = receipt.get("fills") or []
+
+        # Derive qty / price from fills
+        total_qty = 0.0
+        notional = 0.0
+        for f in fills:
+            try:
+                q = float(f.get("qty") or f.get("size") or 0)
+                p = float(f.get("price") or 0)
+                total_qty += q
+                notional += q * p
+            except Exception:
+                continue
+        avg_price = (notional / total_qty) if total_qty > 0 else None
 
-    base_qty = total_qty or None
-    quote_qty = notional or None
-    price = avg_price
+        base_qty = total_qty or None
+        quote_qty = notional or None
+        price = avg_price
 
-    if not venue or not symbol:
-        # Don't write junk rows
-        return
+        if not venue or not symbol:
+            # Don't write junk rows
+            return
 
-    raw_payload = json.dumps(receipt)
-    cmd_id_val = cmd_id or receipt.get("id") or receipt.get("cmd_id")
+        raw_payload = json.dumps(receipt)
+        cmd_id_val = cmd_id or receipt.get("id") or receipt.get("cmd_id")
 
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            INSERT INTO trades (
-                cmd_id, receipt_id,
-                venue, symbol, side,
-                base_qty, quote_qty, price,
-                status, raw_payload
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                """
+                INSERT INTO trades (
+                    cmd_id, receipt_id,
+                    venue, symbol, side,
+                    base_qty, quote_qty, price,
+                    status, raw_payload
+                )
+                VALUES (%s, NULL, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    int(cmd_id_val) if cmd_id_val is not None else None,
+                    venue,
+                    symbol,
+                    side,
+                    base_qty,
+                    quote_qty,
+                    price,
+                    status,
+                    raw_payload,
+                ),
             )
-            VALUES (%s, NULL, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (
-                int(cmd_id_val) if cmd_id_val is not None else None,
-                venue,
-                symbol,
-                side,
-                base_qty,
-                quote_qty,
-                price,
-                status,
-                raw_payload,
-            ),
-        )
-        conn.commit()
-    finally:
-        cur.close()
+            conn.commit()
+        finally:
+            cur.close()
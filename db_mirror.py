@@ -35,6 +35,26 @@ Reads (Phase 22B):
     {"enabled":1, "mirror_reads":1, "mirror_max_rows":1000}
   Optional override:
     DB_MIRROR_READS_ENABLED=1
+
+Read snapshots (snapshot-versioned read model)
+----------------------------------------------
+Each get_all_records() mirror becomes one snapshot instead of N loose
+sheet_row events:
+
+sheet_snapshots:         id, tab, row_count, content_hash, complete, created_at, verified_at
+sheet_snapshot_members:  snapshot_id, ordinal, row_hash   (row order as in the sheet)
+sheet_snapshot_rows:     row_hash PK, tab, payload        (content-addressed, shared)
+
+- An identical re-read only bumps verified_at (no new rows).
+- A changed read inserts only the rows whose content is new; unchanged rows
+  are referenced by hash from the new snapshot's members.
+- `complete` is false when the read was truncated by mirror_max_rows; a tab
+  whose newest snapshot is incomplete is read from Sheets, never served from
+  an older or capped snapshot.
+- The legacy sheet_row events are still written alongside each snapshot
+  (db_read_adapter's fallback for tabs without one).
+- compact_snapshots() keeps DB_MIRROR_SNAPSHOT_KEEP complete snapshots per tab
+  and deletes unreferenced rows.
 """
 
 from __future__ import annotations
@@ -47,6 +67,8 @@ import threading
 import time
 from typing import Any, List, Optional
 
+import config_service
+
 try:
     import psycopg2  # type: ignore
     import psycopg2.extras  # type: ignore
@@ -67,14 +89,7 @@ def _db_url() -> str:
     return os.getenv("DATABASE_URL") or os.getenv("DB_URL") or ""
 
 def _load_db_read_json_cfg() -> dict:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 DEFAULT_TABS = [
     "Policy_Log",
@@ -231,17 +246,174 @@ class _Mirror:
         except Exception:
             max_rows = 1000
         max_rows = max(10, min(5000, max_rows))
-        if isinstance(rows, list) and len(rows) > max_rows:
+        rows = list(rows or [])
+        # Callers hand over the whole read; a capped read is never complete.
+        complete = len(rows) <= max_rows
+        if not complete:
             rows = rows[:max_rows]
 
+        write_snapshot(tab, rows, complete=complete)
+
+        # Legacy sheet_row events: db_read_adapter still falls back to these
+        # for tabs without a snapshot.
         records: list[tuple[str, str, str]] = []
         for r in rows:
-            # r is typically dict from ws.get_all_records()
             payload = {"type": "sheet_row", "tab": tab, "row": r}
             records.append((tab, _row_hash(tab, payload), json.dumps(payload, default=str)))
-
         self._insert_records(records)
 
+
+# ----------------- read snapshots -----------------
+
+SNAPSHOT_KEEP = int(os.getenv("DB_MIRROR_SNAPSHOT_KEEP", "3") or "3")
+
+# Writers hold this advisory lock shared, compaction holds it exclusive, so a
+# row reused by an in-flight snapshot is never pruned as unreferenced.
+_SNAPSHOT_LOCK_KEY = 2202201
+
+_SNAPSHOT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_snapshots (
+  id BIGSERIAL PRIMARY KEY,
+  tab TEXT NOT NULL,
+  row_count INT NOT NULL,
+  content_hash TEXT NOT NULL,
+  complete BOOLEAN NOT NULL DEFAULT TRUE,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  verified_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS ix_sheet_snapshots_tab_complete
+  ON sheet_snapshots(tab, id DESC) WHERE complete;
+CREATE TABLE IF NOT EXISTS sheet_snapshot_rows (
+  row_hash TEXT PRIMARY KEY,
+  tab TEXT NOT NULL,
+  payload JSONB NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE TABLE IF NOT EXISTS sheet_snapshot_members (
+  snapshot_id BIGINT NOT NULL REFERENCES sheet_snapshots(id) ON DELETE CASCADE,
+  ordinal INT NOT NULL,
+  row_hash TEXT NOT NULL,
+  PRIMARY KEY (snapshot_id, ordinal)
+);
+CREATE INDEX IF NOT EXISTS ix_sheet_snapshot_members_hash
+  ON sheet_snapshot_members(row_hash);
+"""
+
+_snapshot_schema_ok = False
+
+
+def _ensure_snapshot_schema(cur) -> None:
+    global _snapshot_schema_ok
+    if _snapshot_schema_ok:
+        return
+    cur.execute(_SNAPSHOT_SCHEMA)
+    _snapshot_schema_ok = True
+
+
+def write_snapshot(tab: str, rows: List[Any], *, complete: bool = True) -> Optional[int]:
+    """Persist one read of `tab` as a snapshot. Returns the snapshot id (None on no-op/error)."""
+    global _snapshot_schema_ok
+    if psycopg2 is None or not _db_url():
+        return None
+    row_hashes: list[str] = []
+    payloads: dict[str, str] = {}
+    for r in rows:
+        h = _row_hash(tab, r)
+        row_hashes.append(h)
+        if h not in payloads:
+            payloads[h] = json.dumps(r, default=str)
+    content_hash = hashlib.sha256("\n".join(row_hashes).encode("utf-8")).hexdigest()
+
+    try:
+        from db_pool import pg_conn  # type: ignore
+        with pg_conn(url=_db_url(), caller="db_mirror.snapshot") as conn:
+            with conn.cursor() as cur:
+                _ensure_snapshot_schema(cur)
+                cur.execute(
+                    "SELECT id, content_hash, complete FROM sheet_snapshots WHERE tab=%s ORDER BY id DESC LIMIT 1",
+                    (tab,),
+                )
+                last = cur.fetchone()
+                if last and last[1] == content_hash and bool(last[2]) == bool(complete):
+                    cur.execute("UPDATE sheet_snapshots SET verified_at=NOW() WHERE id=%s", (last[0],))
+                    return None
+
+                cur.execute("SELECT pg_advisory_xact_lock_shared(%s)", (_SNAPSHOT_LOCK_KEY,))
+                psycopg2.extras.execute_values(
+                    cur,
+                    "INSERT INTO sheet_snapshot_rows(row_hash, tab, payload) VALUES %s ON CONFLICT (row_hash) DO NOTHING",
+                    [(h, tab, p) for h, p in payloads.items()],
+                    template="(%s, %s, %s::jsonb)",
+                    page_size=500,
+                )
+                cur.execute(
+                    """
+                    INSERT INTO sheet_snapshots(tab, row_count, content_hash, complete)
+                    VALUES (%s, %s, %s, %s) RETURNING id
+                    """,
+                    (tab, len(row_hashes), content_hash, bool(complete)),
+                )
+                snap_id = int(cur.fetchone()[0])
+                psycopg2.extras.execute_values(
+                    cur,
+                    "INSERT INTO sheet_snapshot_members(snapshot_id, ordinal, row_hash) VALUES %s",
+                    [(snap_id, i, h) for i, h in enumerate(row_hashes)],
+                    page_size=1000,
+                )
+                return snap_id
+    except Exception as e:
+        _snapshot_schema_ok = False  # the DDL may have been rolled back with the txn
+        logger.debug("db_mirror: snapshot write failed tab=%s err=%s", tab, e)
+        return None
+
+
+def compact_snapshots(keep: Optional[int] = None) -> dict:
+    """Drop superseded snapshots (keep the newest `keep` complete ones per tab) and orphan rows."""
+    keep = SNAPSHOT_KEEP if keep is None else max(1, int(keep))
+    if psycopg2 is None or not _db_url():
+        return {"ok": False, "reason": "db_unavailable"}
+    try:
+        from db_pool import pg_conn  # type: ignore
+        with pg_conn(url=_db_url(), caller="db_mirror.compact") as conn:
+            with conn.cursor() as cur:
+                _ensure_snapshot_schema(cur)
+                cur.execute("SELECT pg_advisory_xact_lock(%s)", (_SNAPSHOT_LOCK_KEY,))
+                # Keep the newest `keep` snapshots per tab plus the newest `keep`
+                # complete ones (reads only use complete snapshots). Members go
+                # with their snapshot via ON DELETE CASCADE.
+                cur.execute(
+                    """
+                    DELETE FROM sheet_snapshots s
+                    USING (
+                      SELECT id FROM (
+                        SELECT id, complete,
+                               row_number() OVER (PARTITION BY tab ORDER BY id DESC) AS rn_all,
+                               row_number() OVER (PARTITION BY tab, complete ORDER BY id DESC) AS rn_state
+                        FROM sheet_snapshots
+                      ) x
+                      WHERE x.rn_all > %s AND NOT (x.complete AND x.rn_state <= %s)
+                    ) d
+                    WHERE s.id = d.id
+                    """,
+                    (keep, keep),
+                )
+                snapshots = cur.rowcount or 0
+                cur.execute(
+                    """
+                    DELETE FROM sheet_snapshot_rows r
+                    WHERE NOT EXISTS (
+                      SELECT 1 FROM sheet_snapshot_members m WHERE m.row_hash = r.row_hash
+                    )
+                    """
+                )
+                rows = cur.rowcount or 0
+        logger.info("db_mirror: compacted snapshots=%s rows=%s keep=%s", snapshots, rows, keep)
+        return {"ok": True, "snapshots_deleted": snapshots, "rows_deleted": rows, "keep": keep}
+    except Exception as e:
+        logger.warning("db_mirror: compaction failed: %s", e)
+        return {"ok": False, "reason": f"{e.__class__.__name__}:{e}"}
+
+
 _MIRROR = _Mirror()
 
 # ----------------- public helpers -----------------
@@ -264,7 +436,7 @@ def mirror_rows(tab: str, rows: List[Any]) -> None:
         if tab not in _LOGGED_TABS:
             _LOGGED_TABS.add(tab)
             logger.info(
-                "🪞 sheet_mirror_events: mirrored rows tab=%s n=%s",
+                "🪞 sheet_snapshots: mirrored rows tab=%s n=%s",
                 tab,
                 len(rows),
             )
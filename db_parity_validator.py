@@ -21,6 +21,8 @@ import os
 import time
 from typing import Any, Dict, Optional
 
+import config_service
+
 
 def _truthy(v: Any) -> bool:
     if isinstance(v, bool):
@@ -31,45 +33,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_cfg() -> Dict[str, Any]:
-    """Parse DB_READ_JSON robustly (copy/paste tolerant)."""
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    # normal
-    try:
-        obj = json.loads(raw)
-        if isinstance(obj, dict):
-            return obj
-        if isinstance(obj, list):
-            merged: Dict[str, Any] = {}
-            for part in obj:
-                if isinstance(part, dict):
-                    merged.update(part)
-            return merged
-        return {}
-    except Exception:
-        pass
-    # common: two dicts pasted separated by comma
-    try:
-        obj2 = json.loads("[" + raw + "]")
-        if isinstance(obj2, list):
-            merged: Dict[str, Any] = {}
-            for part in obj2:
-                if isinstance(part, dict):
-                    merged.update(part)
-            return merged
-    except Exception:
-        pass
-    # last resort: first object span
-    try:
-        a = raw.find("{")
-        b = raw.rfind("}")
-        if a != -1 and b != -1 and b > a:
-            obj3 = json.loads(raw[a : b + 1])
-            return obj3 if isinstance(obj3, dict) else {}
-    except Exception:
-        pass
-    return {}
+    return config_service.db_read_json()
 
 
 def _cfg_int(d: Dict[str, Any], k: str, default: int) -> int:
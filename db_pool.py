@@ -0,0 +1,290 @@
+# db_pool.py — shared Postgres connection pool for the Bus hot path
+"""
+Process-wide psycopg2 ThreadedConnectionPool (one pool per DB URL).
+
+Every Bus module that used to open a fresh connection per operation
+(bus_store_pg, outbox_db, authority_gate, event_store, sheet_mirror_worker,
+db_backbone) checks connections out of here instead, so gunicorn threads
+reuse warm connections rather than paying a TCP+auth handshake per call.
+
+    from db_pool import pg_conn
+
+    with pg_conn(statement_timeout_ms=3000, caller="outbox.pull") as con:
+        with con.cursor() as cur:
+            cur.execute("select 1")
+
+- Commits on clean exit (unless autocommit), rolls back on exceptions.
+- Connections idle longer than DB_POOL_HEALTHCHECK_IDLE_S are pinged
+  (SELECT 1) before being handed out; broken ones are discarded.
+- Connections older than DB_POOL_MAX_LIFETIME_S are recycled on return.
+- statement_timeout is applied per checkout and reset on return.
+- pool_stats() reports checkouts, wait time, size and recycle counters.
+
+Env:
+  DB_POOL_MIN                 default 1
+  DB_POOL_MAX                 default 8
+  DB_POOL_WAIT_TIMEOUT_S      default 10   (block this long when exhausted)
+  DB_POOL_MAX_LIFETIME_S      default 1800
+  DB_POOL_HEALTHCHECK_IDLE_S  default 30
+  DB_POOL_CONNECT_TIMEOUT_S   default 5
+  DB_POOL_STATEMENT_TIMEOUT_MS default 0 (no timeout unless the caller asks)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+try:
+    import psycopg2  # type: ignore
+    import psycopg2.pool  # type: ignore
+except Exception:  # pragma: no cover
+    psycopg2 = None  # type: ignore
+
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "8"))
+DB_POOL_WAIT_TIMEOUT_S = float(os.getenv("DB_POOL_WAIT_TIMEOUT_S", "10"))
+DB_POOL_MAX_LIFETIME_S = float(os.getenv("DB_POOL_MAX_LIFETIME_S", "1800"))
+DB_POOL_HEALTHCHECK_IDLE_S = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE_S", "30"))
+DB_POOL_CONNECT_TIMEOUT_S = int(os.getenv("DB_POOL_CONNECT_TIMEOUT_S", "5"))
+DB_POOL_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_POOL_STATEMENT_TIMEOUT_MS", "0"))
+DB_POOL_APP_NAME = os.getenv("DB_POOL_APP_NAME", "novatrade-bus")
+
+
+def db_url() -> str:
+    """Canonical DB URL (DB_URL preferred, DATABASE_URL accepted)."""
+    return (os.getenv("DB_URL") or os.getenv("DATABASE_URL") or "").strip()
+
+
+def available() -> bool:
+    return psycopg2 is not None and bool(db_url())
+
+
+class _Pool:
+    """ThreadedConnectionPool plus a semaphore so checkouts block instead of raising."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.minconn = max(0, DB_POOL_MIN)
+        self.maxconn = max(1, DB_POOL_MAX, self.minconn)
+        self.pool = psycopg2.pool.ThreadedConnectionPool(
+            self.minconn,
+            self.maxconn,
+            url,
+            connect_timeout=DB_POOL_CONNECT_TIMEOUT_S,
+            application_name=DB_POOL_APP_NAME,
+        )
+        self.slots = threading.BoundedSemaphore(self.maxconn)
+        self.lock = threading.Lock()
+        self.born: Dict[int, float] = {}
+        self.last_used: Dict[int, float] = {}
+        self.in_use = 0
+        self.stats: Dict[str, Any] = {
+            "checkouts": 0,
+            "wait_s_total": 0.0,
+            "wait_s_max": 0.0,
+            "timeouts": 0,
+            "healthcheck_failures": 0,
+            "recycled_lifetime": 0,
+            "discarded_broken": 0,
+            "by_caller": {},
+        }
+
+    def _track(self, conn) -> None:
+        # New connections count as freshly used, so they skip the idle ping.
+        now = time.time()
+        with self.lock:
+            if id(conn) not in self.born:
+                self.born[id(conn)] = now
+                self.last_used[id(conn)] = now
+
+    def _discard(self, conn) -> None:
+        with self.lock:
+            self.born.pop(id(conn), None)
+            self.last_used.pop(id(conn), None)
+        try:
+            self.pool.putconn(conn, close=True)
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _healthy(self, conn) -> bool:
+        if getattr(conn, "closed", 1):
+            return False
+        idle = time.time() - self.last_used.get(id(conn), 0.0)
+        if idle < DB_POOL_HEALTHCHECK_IDLE_S:
+            return True
+        try:
+            prev = conn.autocommit
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.autocommit = prev
+            return True
+        except Exception:
+            return False
+
+    def checkout(self, caller: str):
+        t0 = time.time()
+        if not self.slots.acquire(timeout=DB_POOL_WAIT_TIMEOUT_S):
+            with self.lock:
+                self.stats["timeouts"] += 1
+            raise RuntimeError(f"db_pool: no connection available within {DB_POOL_WAIT_TIMEOUT_S}s")
+        try:
+            for _ in range(3):
+                conn = self.pool.getconn()
+                self._track(conn)
+                if self._healthy(conn):
+                    break
+                with self.lock:
+                    self.stats["healthcheck_failures"] += 1
+                self._discard(conn)
+            else:
+                conn = self.pool.getconn()
+                self._track(conn)
+        except Exception:
+            self.slots.release()
+            raise
+
+        waited = time.time() - t0
+        with self.lock:
+            self.in_use += 1
+            s = self.stats
+            s["checkouts"] += 1
+            s["wait_s_total"] += waited
+            s["wait_s_max"] = max(s["wait_s_max"], waited)
+            s["by_caller"][caller] = s["by_caller"].get(caller, 0) + 1
+        return conn
+
+    def checkin(self, conn, broken: bool = False) -> None:
+        try:
+            age = time.time() - self.born.get(id(conn), time.time())
+            if broken or getattr(conn, "closed", 1):
+                with self.lock:
+                    self.stats["discarded_broken"] += 1
+                self._discard(conn)
+            elif age > DB_POOL_MAX_LIFETIME_S:
+                with self.lock:
+                    self.stats["recycled_lifetime"] += 1
+                self._discard(conn)
+            else:
+                with self.lock:
+                    self.last_used[id(conn)] = time.time()
+                self.pool.putconn(conn)
+        finally:
+            with self.lock:
+                self.in_use = max(0, self.in_use - 1)
+            self.slots.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            s = dict(self.stats)
+            s["by_caller"] = dict(self.stats["by_caller"])
+            s["in_use"] = self.in_use
+            s["open"] = len(self.born)
+            s["idle"] = max(0, len(self.born) - self.in_use)
+            s["min"] = self.minconn
+            s["max"] = self.maxconn
+            n = s["checkouts"] or 1
+            s["wait_ms_avg"] = round(1000.0 * s["wait_s_total"] / n, 3)
+            s["wait_ms_max"] = round(1000.0 * s.pop("wait_s_max"), 3)
+            s.pop("wait_s_total", None)
+        return s
+
+
+_pools: Dict[str, _Pool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(url: Optional[str] = None) -> _Pool:
+    url = (url or db_url()).strip()
+    if not url:
+        raise RuntimeError("DB_URL/DATABASE_URL not set")
+    if psycopg2 is None:
+        raise RuntimeError("psycopg2 not available")
+    p = _pools.get(url)
+    if p is not None:
+        return p
+    with _pools_lock:
+        p = _pools.get(url)
+        if p is None:
+            p = _Pool(url)
+            _pools[url] = p
+        return p
+
+
+def _is_disconnect(e: BaseException) -> bool:
+    if psycopg2 is None:
+        return False
+    return isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+
+
+@contextmanager
+def pg_conn(
+    *,
+    url: Optional[str] = None,
+    autocommit: bool = False,
+    statement_timeout_ms: Optional[int] = None,
+    caller: str = "",
+):
+    """Check a pooled connection out for the duration of the with-block."""
+    pool = get_pool(url)
+    conn = pool.checkout(caller or "default")
+    broken = False
+    timeout_ms = DB_POOL_STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else int(statement_timeout_ms)
+    try:
+        conn.autocommit = bool(autocommit)
+        if timeout_ms > 0:
+            with conn.cursor() as cur:
+                cur.execute("SET statement_timeout = %s", (int(timeout_ms),))
+            if not autocommit:
+                conn.commit()
+        yield conn
+        if not autocommit:
+            conn.commit()
+    except BaseException as e:
+        broken = _is_disconnect(e)
+        try:
+            if not conn.closed and not conn.autocommit:
+                conn.rollback()
+        except Exception:
+            broken = True
+        raise
+    finally:
+        if not broken and timeout_ms > 0:
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute("RESET statement_timeout")
+            except Exception:
+                broken = True
+        if not broken:
+            try:
+                conn.autocommit = False
+            except Exception:
+                broken = True
+        pool.checkin(conn, broken=broken)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Per-URL pool metrics (URLs are reduced to host/db so secrets stay out of logs)."""
+    out: Dict[str, Any] = {}
+    for url, p in list(_pools.items()):
+        key = url.rsplit("@", 1)[-1]
+        out[key] = p.snapshot()
+    return out
+
+
+def close_all() -> None:
+    with _pools_lock:
+        for p in _pools.values():
+            try:
+                p.pool.closeall()
+            except Exception:
+                pass
+        _pools.clear()
@@ -9,7 +9,10 @@ What this does
 - Supports logical streams:
     - commands / receipts / telemetry
     - sheet_mirror
-    - sheet_mirror:<TAB_NAME>  -> returns reconstructed row dicts (most recent first)
+    - sheet_mirror:<TAB_NAME>  -> returns row dicts in sheet order from the latest
+                                  snapshot (db_mirror.write_snapshot) when it is
+                                  complete, else Sheets; tabs without a snapshot
+                                  fall back to sheet_mirror_events (most recent first)
 
 Design rules (canon)
 -------------------
@@ -35,6 +38,8 @@ import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
+import config_service
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -52,66 +57,12 @@ def _env_bool(name: str, default: str = "0") -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    """Parse DB_READ_JSON robustly.
-
-    Render env-var constraints + copy/paste can sometimes produce malformed JSON,
-    commonly:
-      - two JSON objects pasted back-to-back separated by a comma
-      - stray leading/trailing braces
-      - accidental whitespace / newlines
+    """DB_READ_JSON via config_service (one robust parse shared by every module).
 
-    Canon rule: config parsing must never crash NovaTrade.
-    We therefore attempt a couple of safe recoveries and otherwise return {}.
+    Canon rule: config parsing must never crash NovaTrade; config_service
+    recovers common copy/paste damage and otherwise returns {}.
     """
-
-    raw = (os.getenv("DB_READ_JSON", "") or "").strip()
-    if not raw:
-        return {}
-
-    def _as_dict(x: Any) -> Dict[str, Any]:
-        return x if isinstance(x, dict) else {}
-
-    # 1) normal case
-    try:
-        obj = json.loads(raw)
-        if isinstance(obj, dict):
-            return obj
-        # allow list-of-dicts (merge left-to-right)
-        if isinstance(obj, list):
-            merged: Dict[str, Any] = {}
-            for part in obj:
-                if isinstance(part, dict):
-                    merged.update(part)
-            return merged
-        return {}
-    except Exception:
-        pass
-
-    # 2) common copy/paste error: "{...}, {....}" (two objects)
-    try:
-        obj2 = json.loads("[" + raw + "]")
-        if isinstance(obj2, list):
-            merged: Dict[str, Any] = {}
-            for part in obj2:
-                if isinstance(part, dict):
-                    merged.update(part)
-            return merged
-    except Exception:
-        pass
-
-    # 3) last-resort: try to extract the first valid object
-    # (best-effort; keeps system running)
-    try:
-        # heuristic: find first '{' and last '}'
-        a = raw.find("{")
-        b = raw.rfind("}")
-        if a != -1 and b != -1 and b > a:
-            obj3 = json.loads(raw[a : b + 1])
-            return _as_dict(obj3)
-    except Exception:
-        pass
-
-    return {}
+    return config_service.db_read_json()
 
 
 _CFG = _load_db_read_json()
@@ -123,13 +74,6 @@ def _cfg_get(key: str, default=None):
     return default if v is None else v
 
 
-DB_READ_ENABLED = bool(_cfg_get("enabled", _env_bool("DB_READ_ENABLED", "0")))
-DB_READ_PREFER  = bool(_cfg_get("prefer_db", _env_bool("DB_READ_PREFER", "1")))
-DB_READ_TTL_S   = int(_cfg_get("ttl_s", os.getenv("DB_READ_TTL_S", "120") or "120"))
-DB_READ_MAX_ROWS = int(_cfg_get("max_rows", os.getenv("DB_READ_MAX_ROWS", "2000") or "2000"))
-DB_READ_STALE_SEC = int(_cfg_get("stale_sec", os.getenv("DB_READ_STALE_SEC", "900") or "900"))
-
-
 # Phase 23 — Module 12: selective DB-first (Sheets remain primary)
 # If DB_READ_JSON includes `prefer_db_tabs` (non-empty), then DB-first is only used for those sheet tabs
 # when reading `logical_stream='sheet_mirror:<TAB>'` via get_all_records_cached_dbaware.
@@ -143,7 +87,21 @@ def _as_str_list(v):
         return [s.strip() for s in v.split(',') if s.strip()]
     return [str(v)]
 
-DB_READ_PREFER_TABS = {s.strip().lower() for s in _as_str_list(_cfg_get('prefer_db_tabs', [])) if s.strip()}
+
+def _apply_cfg(cfg: Dict[str, Any]) -> None:
+    """(Re)derive the module settings; runs at import and on every config_service reload."""
+    global _CFG, DB_READ_ENABLED, DB_READ_PREFER, DB_READ_TTL_S, DB_READ_MAX_ROWS, DB_READ_STALE_SEC, DB_READ_PREFER_TABS
+    _CFG = cfg
+    DB_READ_ENABLED = bool(_cfg_get("enabled", _env_bool("DB_READ_ENABLED", "0")))
+    DB_READ_PREFER  = bool(_cfg_get("prefer_db", _env_bool("DB_READ_PREFER", "1")))
+    DB_READ_TTL_S   = int(_cfg_get("ttl_s", os.getenv("DB_READ_TTL_S", "120") or "120"))
+    DB_READ_MAX_ROWS = int(_cfg_get("max_rows", os.getenv("DB_READ_MAX_ROWS", "2000") or "2000"))
+    DB_READ_STALE_SEC = int(_cfg_get("stale_sec", os.getenv("DB_READ_STALE_SEC", "900") or "900"))
+    DB_READ_PREFER_TABS = {s.strip().lower() for s in _as_str_list(_cfg_get('prefer_db_tabs', [])) if s.strip()}
+
+
+_apply_cfg(_CFG)
+config_service.on_change(lambda _old, new: _apply_cfg(new.data))
 
 _DB_URL = os.getenv("DB_URL") or os.getenv("DATABASE_URL") or ""
 
@@ -329,6 +287,53 @@ def _fetch_table_rows(table: str, limit: int = 2000, tab: Optional[str] = None)
         return []
 
 
+def _fetch_latest_snapshot(tab: str, limit: int = 2000) -> Tuple[Optional[float], bool, List[Dict[str, Any]]]:
+    """
+    Rows of the newest snapshot for `tab`, in sheet order.
+    Returns (verified_at epoch, complete, rows); (None, False, []) when the tab
+    has no snapshot. An incomplete newest snapshot (capped read) returns no
+    rows: an older complete one is stale and the capped one is partial.
+    """
+    head = _pg.query(
+        """
+        select id, complete, extract(epoch from verified_at) as ts
+        from sheet_snapshots
+        where tab=%s
+        order by id desc
+        limit 1
+        """,
+        (tab,),
+    )
+    if not head:
+        return None, False, []
+    ts = head[0].get("ts")
+    ts = float(ts) if ts is not None else None
+    if not head[0].get("complete"):
+        return ts, False, []
+    rows = _pg.query(
+        """
+        select r.payload
+        from sheet_snapshot_members m
+        join sheet_snapshot_rows r on r.row_hash = m.row_hash
+        where m.snapshot_id = %s
+        order by m.ordinal
+        limit %s
+        """,
+        (head[0]["id"], max(1, int(limit))),
+    )
+    out: List[Dict[str, Any]] = []
+    for r in rows:
+        payload = r.get("payload")
+        try:
+            if isinstance(payload, str):
+                payload = json.loads(payload)
+        except Exception:
+            continue
+        if isinstance(payload, dict):
+            out.append(payload)
+    return ts, True, out
+
+
 def _reconstruct_sheet_rows(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Convert sheet_mirror_events payloads into row dicts.
@@ -374,6 +379,7 @@ def db_health() -> Dict[str, Any]:
         "db_url": bool(_DB_URL),
         "tables": {
             "sheet_mirror_events": _table_exists("sheet_mirror_events"),
+            "sheet_snapshots": _table_exists("sheet_snapshots"),
             "nova_telemetry": _table_exists("nova_telemetry"),
             "nova_receipts": _table_exists("nova_receipts"),
             "nova_commands": _table_exists("nova_commands"),
@@ -400,7 +406,9 @@ def get_records_prefer_db(
     - Otherwise: Sheets fallback (required)
 
     Special:
-      logical_stream="sheet_mirror:<TAB>" returns reconstructed sheet row dicts.
+      logical_stream="sheet_mirror:<TAB>" returns sheet row dicts, read from the
+      latest snapshot when one exists (sheet order; Sheets when that snapshot
+      is incomplete), otherwise reconstructed from sheet_mirror_events.
     """
     ttl_s = DB_READ_TTL_S if ttl_s is None else int(ttl_s)
 
@@ -424,6 +432,21 @@ def get_records_prefer_db(
     if not DB_READ_PREFER and not db_native:
         return sheets_fallback_fn(sheet_tab, ttl_s=ttl_s)
 
+    # sheet_mirror:<TAB> => latest complete snapshot (one indexed query)
+    if base == "sheet_mirror" and tab and _table_exists("sheet_snapshots"):
+        snap_key = f"db::sheet_snapshots::{tab}::{ttl_s}"
+        cached = _cache_get(snap_key)
+        if cached is not None:
+            return cached
+        ts, complete, rows = _fetch_latest_snapshot(tab, limit=DB_READ_MAX_ROWS)
+        if ts is not None:
+            # A capped read (more rows than mirror_max_rows) is not the tab.
+            if not complete or time.time() - ts > DB_READ_STALE_SEC:
+                return sheets_fallback_fn(sheet_tab, ttl_s=ttl_s)
+            _cache_set(snap_key, rows, ttl_s)
+            return rows
+        # no snapshot yet for this tab: legacy event rows below
+
     # continue DB path
     table = _choose_table(base)
     if not table:
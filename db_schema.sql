@@ -16,6 +16,29 @@ create table if not exists commands (
 
 create index if not exists idx_commands_status on commands(status);
 create index if not exists idx_commands_lease_expires on commands(lease_expires_at);
+-- Hot-path partial indexes (lease): stay small as done/error history grows
+create index if not exists idx_commands_queued_agent on commands(agent_id, id) where status='queued';
+create index if not exists idx_commands_leased_expiry on commands(lease_expires_at) where status='leased';
+
+-- Terminal commands older than COMMANDS_ARCHIVE_AFTER_DAYS are moved here
+-- (bus_store_pg.run_commands_archive); monthly partitions are created on demand.
+create table if not exists commands_archive (
+  id bigint not null,
+  created_at timestamptz not null,
+  agent_id text not null,
+  intent jsonb not null,
+  intent_hash text not null,
+  status text not null,
+  leased_by text,
+  lease_at timestamptz,
+  lease_expires_at timestamptz,
+  attempts int not null default 0,
+  dedup_ttl_seconds int not null default 900,
+  archived_at timestamptz not null default now(),
+  primary key (id, created_at)
+) partition by range (created_at);
+create table if not exists commands_archive_default partition of commands_archive default;
+create index if not exists idx_commands_archive_agent on commands_archive(agent_id, id);
 
 create table if not exists receipts (
   id bigserial primary key,
@@ -1,16 +1,11 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime, timedelta
 import os
-from utils import send_telegram_prompt
+from utils import get_sheet, send_telegram_prompt
 
 def run_dormant_claim_alert():
     print("🔎 Scanning Claim_Tracker for unhandled claimed tokens...")
     try:
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_url(os.getenv("SHEET_URL"))
+        sheet = get_sheet()
         ws = sheet.worksheet("Claim_Tracker")
 
         rows = ws.get_all_records()
@@ -14,9 +14,10 @@ Config (via DB_READ_JSON; no new env vars)
 }
 
 DB-first posture
-- Prefer Postgres telemetry (nova_telemetry) when present.
+- Freshness comes from agent_freshness: telemetry pushes update it in memory,
+  reconciled against Postgres telemetry (nova_telemetry).
 - Gracefully degrade to Wallet_Monitor freshness, then NovaHeartbeat freshness
-  while telemetry is still being wired during Sheets → DB-first migration.
+  (background refresh) while telemetry is still being wired during Sheets → DB-first migration.
 
 Fail-safe posture
 - If no acceptable freshness signal is available, treat agent as NOT trusted (deny lease).
@@ -26,9 +27,10 @@ from __future__ import annotations
 
 import json
 import os
-from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Tuple
 
+import config_service
+
 
 def _truthy(v: Any) -> bool:
     if v is None:
@@ -42,14 +44,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg() -> Dict[str, Any]:
@@ -87,93 +82,21 @@ def allow_agents() -> Optional[list]:
     return None
 
 
-def _parse_ts(ts: Any) -> Optional[datetime]:
-    try:
-        s = str(ts).strip()
-        if not s:
-            return None
-        # Common Sheets format: "YYYY-MM-DD HH:MM:SS"
-        return datetime.strptime(s, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
-    except Exception:
-        return None
-
-
-def _age_seconds_from_tab(tab: str, agent_id: str) -> Optional[int]:
+def _latest_telemetry_age_seconds(agent_id: str) -> Optional[int]:
     """
-    Uses utils.get_records_cached(tab) which in your system already supports DB-first
-    + Sheets mirror behavior depending on configuration.
+    Seconds since the freshest signal for agent_id, answered from memory by
+    agent_freshness (fed by the telemetry push handlers, reconciled against
+    nova_telemetry; Wallet_Monitor/NovaHeartbeat only in the background
+    while Postgres is unavailable). Never reads Sheets on the pull path.
     """
     try:
-        from utils import get_records_cached  # type: ignore
-    except Exception:
-        return None
-
-    try:
-        rows = get_records_cached(tab, ttl_s=0) or []
-        if not rows:
-            return None
-
-        best_dt: Optional[datetime] = None
-        for r in rows:
-            if not isinstance(r, dict):
-                continue
+        import agent_freshness  # type: ignore
 
-            a = (r.get("Agent") or r.get("agent_id") or r.get("agent") or "").strip()
-            if a and a != agent_id:
-                continue
-
-            dt = _parse_ts(r.get("Timestamp") or r.get("ts") or r.get("created_at"))
-            if dt and (best_dt is None or dt > best_dt):
-                best_dt = dt
-
-        if best_dt is None:
-            return None
-
-        now = datetime.now(timezone.utc)
-        return int((now - best_dt).total_seconds())
+        return agent_freshness.age_seconds(agent_id)
     except Exception:
         return None
 
 
-def _latest_telemetry_age_seconds(agent_id: str) -> Optional[int]:
-    """
-    Preferred: Postgres nova_telemetry.
-    Fallbacks: Wallet_Monitor freshness, then NovaHeartbeat freshness.
-    """
-    # 1) DB telemetry (best)
-    try:
-        from db_backbone import _get_conn  # type: ignore
-
-        conn = _get_conn()
-        if conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT EXTRACT(EPOCH FROM (now() - MAX(created_at)))::int
-                FROM nova_telemetry
-                WHERE agent_id = %s
-                """,
-                (agent_id,),
-            )
-            row = cur.fetchone()
-            if row and row[0] is not None:
-                return int(row[0])
-    except Exception:
-        pass
-
-    # 2) Wallet_Monitor (your current “freshness truth”)
-    age = _age_seconds_from_tab("Wallet_Monitor", agent_id)
-    if age is not None:
-        return age
-
-    # 3) NovaHeartbeat (last resort; often lower cadence)
-    age = _age_seconds_from_tab("NovaHeartbeat", agent_id)
-    if age is not None:
-        return age
-
-    return None
-
-
 def evaluate_agent(agent_id: str) -> Tuple[bool, str, Optional[int]]:
     """Return (trusted, reason, age_sec).
 
@@ -20,6 +20,7 @@ from utils import (
     sheets_gate, warn, info, sanitize_range,
     BACKOFF_BASE_S, BACKOFF_MAX_S, BACKOFF_JIT_S
 )
+from sheets_quota import read_flight
 
 # Phase 22A: optional Postgres shadow-write mirror for append-only tabs.
 # Best-effort only: it must never break Sheets writes.
@@ -55,6 +56,30 @@ def _with_backoff(op_name: str, fn, *args, **kwargs):
                 continue
             raise
 
+# -----------------------------------------------------------------------------
+# Single-flight reads: identical reads already in flight (same worksheet,
+# method and arguments) are joined instead of spending another token.
+# -----------------------------------------------------------------------------
+def _read_key(ws: Any, op_name: str, args: Tuple[Any, ...], kwargs: dict):
+    sid = getattr(ws, "spreadsheet_id", None)
+    if sid is None:
+        sid = getattr(getattr(ws, "spreadsheet", None), "id", None)
+    wid = getattr(ws, "id", None)
+    if wid is None:
+        wid = getattr(ws, "title", None)
+    if sid is None or wid is None:
+        return None
+    try:
+        return (sid, wid, op_name, repr(args), repr(sorted(kwargs.items())))
+    except Exception:
+        return None
+
+def _flight(ws: Any, op_name: str, args: Tuple[Any, ...], kwargs: dict, call):
+    key = _read_key(ws, op_name, args, kwargs)
+    if key is None:
+        return call()
+    return read_flight.do(key, call)
+
 # -----------------------------------------------------------------------------
 # Argument normalization for Worksheet.get
 # Prevents "multiple values for argument 'range_name'" across call styles.
@@ -123,15 +148,17 @@ def _patch() -> None:
                     return _orig_get(self, **kw)
                 return _orig_get(self, range_name=range_name, **kw)
 
-        return _with_backoff("get", _call)
+        return _flight(self, "get", (range_name,) + tuple(rest), kw, lambda: _with_backoff("get", _call))
 
     @functools.wraps(_orig_get_all_values)
     def _guard_get_all_values(self: Worksheet, *args: Any, **kwargs: Any):
-        return _with_backoff("get_all_values", _orig_get_all_values, self, *args, **kwargs)
+        return _flight(self, "get_all_values", args, kwargs,
+                       lambda: _with_backoff("get_all_values", _orig_get_all_values, self, *args, **kwargs))
 
     @functools.wraps(_orig_get_all_records)
     def _guard_get_all_records(self: Worksheet, *args: Any, **kwargs: Any):
-        return _with_backoff("get_all_records", _orig_get_all_records, self, *args, **kwargs)
+        return _flight(self, "get_all_records", args, kwargs,
+                       lambda: _with_backoff("get_all_records", _orig_get_all_records, self, *args, **kwargs))
 
     # ---- WRITES ----
     @functools.wraps(_orig_update)
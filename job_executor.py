@@ -0,0 +1,302 @@
+# job_executor.py — bounded worker pool for main.py scheduled jobs
+"""
+schedule.run_pending() used to run every job inline on the scheduler thread,
+so one slow job (wallet monitor, ROI tracker) delayed everything behind it,
+including the 2-minute Nova Trigger Watcher. The scheduler thread now only
+submits; jobs run here.
+
+- Bounded pool of JOB_EXECUTOR_WORKERS threads.
+- No overlapping runs: a job that is still queued or running when its next
+  tick fires is skipped (counted in `skips`).
+- Priority classes: trigger < realtime < normal < batch < digest. A free
+  worker always takes the highest-priority ready job.
+- Cost hints: a job may declare the Sheets reads/writes it expects to spend.
+  If the utils token buckets cannot cover it, non-trigger jobs are deferred
+  a few seconds (up to JOB_MAX_DEFER_S) instead of starting and stalling on
+  the gate while holding a worker.
+- Timeouts: Python threads cannot be killed, so a run that exceeds its
+  timeout is marked timed out, its worker is written off and a replacement
+  worker is started; the job itself stays "running" (no overlap) until the
+  stuck call returns.
+- Per-job stats: runs, errors, skips, defers, timeouts, duration and
+  lateness (start time minus submit time).
+
+    from job_executor import submit, executor_stats
+    submit("Wallet Monitor", fn, priority="batch", timeout_s=900, reads=40, writes=5)
+
+Env:
+  JOB_EXECUTOR_WORKERS   default 4
+  JOB_DEFAULT_TIMEOUT_S  default 900 (used when neither job nor class sets one)
+  JOB_MAX_DEFER_S        default 120
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+log = logging.getLogger("job_executor")
+
+WORKERS = max(1, int(os.getenv("JOB_EXECUTOR_WORKERS", "4") or "4"))
+DEFAULT_TIMEOUT_S = float(os.getenv("JOB_DEFAULT_TIMEOUT_S", "900") or "900")
+MAX_DEFER_S = float(os.getenv("JOB_MAX_DEFER_S", "120") or "120")
+_DEFER_STEP_S = 5.0
+
+PRIORITIES: Dict[str, int] = {
+    "trigger": 0,
+    "realtime": 1,
+    "normal": 2,
+    "batch": 3,
+    "digest": 4,
+}
+
+_CLASS_TIMEOUT_S: Dict[str, float] = {
+    "trigger": 120.0,
+    "realtime": 300.0,
+    "batch": 1800.0,
+    "digest": 1800.0,
+}
+
+
+def _sheets_budget() -> Optional[Dict[str, float]]:
+    try:
+        from utils import sheets_budget_available  # type: ignore
+        return sheets_budget_available()
+    except Exception:
+        return None
+
+
+class _JobState:
+    def __init__(self, label: str, priority: str) -> None:
+        self.label = label
+        self.priority = priority
+        self.queued = False
+        self.running = False
+        self.runs = 0
+        self.errors = 0
+        self.skips = 0
+        self.defers = 0
+        self.timeouts = 0
+        self.total_duration_s = 0.0
+        self.last_duration_s: Optional[float] = None
+        self.max_duration_s = 0.0
+        self.last_lateness_s: Optional[float] = None
+        self.max_lateness_s = 0.0
+        self.last_start: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "priority": self.priority,
+            "queued": self.queued,
+            "running": self.running,
+            "runs": self.runs,
+            "errors": self.errors,
+            "skips": self.skips,
+            "defers": self.defers,
+            "timeouts": self.timeouts,
+            "last_duration_s": None if self.last_duration_s is None else round(self.last_duration_s, 3),
+            "avg_duration_s": round(self.total_duration_s / self.runs, 3) if self.runs else None,
+            "max_duration_s": round(self.max_duration_s, 3),
+            "last_lateness_s": None if self.last_lateness_s is None else round(self.last_lateness_s, 3),
+            "max_lateness_s": round(self.max_lateness_s, 3),
+            "last_start": self.last_start,
+            "last_error": self.last_error,
+        }
+
+
+class _Run:
+    __slots__ = ("state", "fn", "prio", "seq", "submitted", "not_before",
+                 "timeout_s", "reads", "writes", "started", "timed_out")
+
+    def __init__(self, state: _JobState, fn: Callable[[], Any], prio: int, seq: int,
+                 timeout_s: float, reads: int, writes: int) -> None:
+        self.state = state
+        self.fn = fn
+        self.prio = prio
+        self.seq = seq
+        self.submitted = time.time()
+        self.not_before = 0.0
+        self.timeout_s = timeout_s
+        self.reads = reads
+        self.writes = writes
+        self.started: Optional[float] = None
+        self.timed_out = False
+
+
+class JobExecutor:
+    def __init__(self, workers: int = WORKERS) -> None:
+        self.workers = max(1, int(workers))
+        self._cond = threading.Condition()
+        self._pending: List[_Run] = []
+        self._running: Dict[int, _Run] = {}      # worker id -> run
+        self._jobs: Dict[str, _JobState] = {}
+        self._seq = itertools.count()
+        self._worker_ids = itertools.count()
+        self._started = False
+        self._live_workers = 0
+        self._abandoned = 0
+
+    # ---- lifecycle ----
+    def _ensure_started(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        for _ in range(self.workers):
+            self._spawn_worker()
+        threading.Thread(target=self._watchdog, name="job-watchdog", daemon=True).start()
+
+    def _spawn_worker(self) -> None:
+        wid = next(self._worker_ids)
+        self._live_workers += 1
+        threading.Thread(target=self._worker, args=(wid,), name=f"job-worker-{wid}", daemon=True).start()
+
+    # ---- submit ----
+    def submit(
+        self,
+        label: str,
+        fn: Callable[[], Any],
+        *,
+        priority: str = "normal",
+        timeout_s: Optional[float] = None,
+        reads: int = 0,
+        writes: int = 0,
+    ) -> bool:
+        """Queue one run of `label`. Returns False if a run is already queued/running."""
+        prio_name = priority if priority in PRIORITIES else "normal"
+        if timeout_s is None:
+            timeout_s = _CLASS_TIMEOUT_S.get(prio_name, DEFAULT_TIMEOUT_S)
+        with self._cond:
+            self._ensure_started()
+            state = self._jobs.get(label)
+            if state is None:
+                state = self._jobs[label] = _JobState(label, prio_name)
+            state.priority = prio_name
+            if state.queued or state.running:
+                state.skips += 1
+                log.info("job_executor: skip %s (previous run still %s)",
+                         label, "running" if state.running else "queued")
+                return False
+            state.queued = True
+            self._pending.append(_Run(state, fn, PRIORITIES[prio_name], next(self._seq),
+                                      float(timeout_s), max(0, int(reads)), max(0, int(writes))))
+            self._cond.notify()
+        return True
+
+    # ---- dispatch ----
+    def _affordable(self, run: _Run) -> bool:
+        if run.prio == PRIORITIES["trigger"] or not (run.reads or run.writes):
+            return True
+        if time.time() - run.submitted >= MAX_DEFER_S:
+            return True
+        budget = _sheets_budget()
+        if not budget:
+            return True
+        return budget.get("read", 0.0) >= run.reads and budget.get("write", 0.0) >= run.writes
+
+    def _next_run(self) -> Optional[_Run]:
+        """Pop the best ready run, deferring unaffordable ones. Caller holds the lock."""
+        now = time.time()
+        ready = sorted((r for r in self._pending if r.not_before <= now), key=lambda r: (r.prio, r.seq))
+        for run in ready:
+            if self._affordable(run):
+                self._pending.remove(run)
+                return run
+            run.not_before = now + _DEFER_STEP_S
+            run.state.defers += 1
+        return None
+
+    def _worker(self, wid: int) -> None:
+        while True:
+            with self._cond:
+                run = self._next_run()
+                while run is None:
+                    waits = [r.not_before - time.time() for r in self._pending]
+                    self._cond.wait(max(0.2, min(waits)) if waits else None)
+                    run = self._next_run()
+                state = run.state
+                state.queued = False
+                state.running = True
+                run.started = time.time()
+                state.last_start = run.started
+                state.last_lateness_s = run.started - run.submitted
+                state.max_lateness_s = max(state.max_lateness_s, state.last_lateness_s)
+                self._running[wid] = run
+
+            error: Optional[str] = None
+            try:
+                run.fn()
+            except Exception as e:
+                error = f"{e.__class__.__name__}:{e}"
+                log.warning("job_executor: %s failed: %s", state.label, error)
+
+            with self._cond:
+                dur = time.time() - (run.started or time.time())
+                state.running = False
+                state.runs += 1
+                state.total_duration_s += dur
+                state.last_duration_s = dur
+                state.max_duration_s = max(state.max_duration_s, dur)
+                if error:
+                    state.errors += 1
+                    state.last_error = error
+                self._running.pop(wid, None)
+                if run.timed_out:
+                    # A replacement was started when this run timed out.
+                    self._live_workers -= 1
+                    log.warning("job_executor: %s finished after timeout (%.1fs)", state.label, dur)
+                    return
+                self._cond.notify()
+
+    def _watchdog(self) -> None:
+        while True:
+            time.sleep(1.0)
+            with self._cond:
+                now = time.time()
+                for run in list(self._running.values()):
+                    if run.timed_out or run.started is None:
+                        continue
+                    if now - run.started > run.timeout_s:
+                        run.timed_out = True
+                        run.state.timeouts += 1
+                        self._abandoned += 1
+                        log.warning("job_executor: %s exceeded %.0fs; starting a replacement worker",
+                                    run.state.label, run.timeout_s)
+                        self._spawn_worker()
+
+    # ---- observability ----
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "live_workers": self._live_workers,
+                "abandoned_workers": self._abandoned,
+                "pending": len(self._pending),
+                "running": sorted(r.state.label for r in self._running.values()),
+                "jobs": {label: st.snapshot() for label, st in sorted(self._jobs.items())},
+            }
+
+
+_EXECUTOR: Optional[JobExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> JobExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = JobExecutor()
+    return _EXECUTOR
+
+
+def submit(label: str, fn: Callable[[], Any], **kwargs: Any) -> bool:
+    return get_executor().submit(label, fn, **kwargs)
+
+
+def executor_stats() -> Dict[str, Any]:
+    return get_executor().stats() if _EXECUTOR is not None else {"workers": WORKERS, "started": False}
@@ -20,6 +20,8 @@ import json
 import os
 from typing import Any, Dict
 
+import config_service
+
 
 def _truthy(v: Any) -> bool:
     if v is None:
@@ -33,14 +35,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def cloud_hold_active() -> bool:
@@ -4,6 +4,8 @@ import os, time, random, threading, schedule
 from typing import Optional, Callable
 import gspread_guard  # patches Worksheet methods (cache+gates+backoff)
 import hmac, hashlib, json
+import config_service
+from sheets_quota import quota_context
 from flask import Blueprint, request, jsonify
 from policy_bias_engine import run_policy_bias_builder
 from telegram_summaries import run_telegram_summaries
@@ -122,12 +124,58 @@ def _safe_call(label: str, module_path: str, func_name: str, *args, **kwargs):
     except Exception as e:
         error(f"{label} failed: {e}")
 
+# --- Job executor profiles ----------------------------------------------------
+# Scheduled jobs are handed to job_executor (bounded pool, no overlap per job)
+# instead of running inline on the scheduler thread. JOB_EXECUTOR_ENABLED=0
+# restores the old inline behaviour.
+JOB_EXECUTOR_ENABLED = os.getenv("JOB_EXECUTOR_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+# module_path -> (priority class, timeout_s or None for class default, sheet reads, sheet writes)
+_JOB_PROFILES = {
+    "nova_trigger_watcher":          ("trigger",  None, 2,  1),
+    "sheet_mirror_worker":           ("realtime", None, 0,  2),
+    "alpha_phase26_tick":            ("realtime", None, 2,  2),
+    "planner_to_log_sync":           ("normal",   None, 4,  4),
+    "council_drift_detector":        ("normal",   None, 4,  1),
+    "wallet_monitor":                ("batch",    900,  10, 6),
+    "telemetry_mirror":              ("batch",    None, 4,  4),
+    "unified_snapshot":              ("batch",    None, 6,  4),
+    "rebuy_roi_tracker":             ("batch",    None, 6,  4),
+    "rotation_memory":               ("batch",    None, 6,  4),
+    "rotation_memory_weighted":      ("batch",    None, 6,  4),
+    "sentiment_radar":               ("batch",    None, 2,  4),
+    "sheet_mirror_parity_validator": ("batch",    None, 10, 1),
+    "db_mirror":                     ("batch",    None, 0,  0),
+    "bus_store_pg":                  ("batch",    1800, 0,  0),
+    "db_parity_validator":           ("batch",    None, 4,  1),
+    "telemetry_digest":              ("digest",   None, 4,  1),
+    "health_summary":                ("digest",   None, 4,  1),
+    "daily_summary":                 ("digest",   None, 4,  1),
+    "telegram_summaries":            ("digest",   None, 4,  1),
+    "wnh_weekly_digest":             ("digest",   None, 4,  1),
+    "sentiment_alerts":              ("digest",   None, 2,  1),
+}
+
+# job priority class -> Sheets quota lane (sheets_quota); unprofiled jobs use the module default
+_QUOTA_LANES = {"trigger": "critical", "realtime": "critical", "normal": "normal",
+                "batch": "background", "digest": "background"}
+
 def _schedule(label: str, module_path: str, func_name: str,
               when: Optional[str]=None, every: Optional[int]=None, unit: str="minutes"):
     """Add a scheduled job that safely imports & runs target each time."""
-    def job():
+    priority, timeout_s, reads, writes = _JOB_PROFILES.get(module_path, ("normal", None, 0, 0))
+    lane = _QUOTA_LANES.get(priority) if module_path in _JOB_PROFILES else None
+
+    def run():
         _sleep_jitter(0.2, 0.6)
-        _safe_call(label, module_path, func_name)
+        with quota_context(module=module_path, lane=lane):
+            _safe_call(label, module_path, func_name)
+
+    def job():
+        if not JOB_EXECUTOR_ENABLED:
+            return run()
+        from job_executor import submit
+        submit(label, run, priority=priority, timeout_s=timeout_s, reads=reads, writes=writes)
 
     if when:
         schedule.every().day.at(when).do(job)
@@ -137,7 +185,7 @@ def _schedule(label: str, module_path: str, func_name: str,
         ev.do(job)
         info(f"⏰ Scheduled {label} every {every} {unit}")
     else:
-        _thread(job)
+        _thread(run)
 
 # --- Optional background loop: staking yield (soft) --------------------------
 def _staking_yield_loop():
@@ -194,11 +242,10 @@ def _boot_serialize_first_minute():
 
     # Soft sheet health probe (optional)
     try:
-        from utils import get_gspread_client
+        from utils import get_sheet
         SHEET_URL = os.getenv("SHEET_URL", "")
         if SHEET_URL:
-            client = get_gspread_client()
-            sh = client.open_by_url(SHEET_URL)
+            sh = get_sheet(SHEET_URL)
             _ = sh.worksheet("Presale_Stream")
             info("Presale_Stream loaded.")
     except Exception as e:
@@ -246,48 +293,33 @@ def _council_rollup_every_min(default: int) -> int:
     Read cadence from DB_READ_JSON if present (preferred), else fall back to env, else default.
     Keeps env-var count low.
     """
-    try:
-        raw = (os.getenv("DB_READ_JSON") or "").strip()
-        if raw:
-            cfg = json.loads(raw)
-            council = cfg.get("council_rollups") or {}
-            if isinstance(council, dict):
-                v = council.get("every_min")
-                if v is not None:
-                    return max(5, int(v))
-    except Exception:
-        pass
+    v = config_service.get("council_rollups.every_min")
+    if v is not None:
+        try:
+            return max(5, int(v))
+        except Exception:
+            pass
     try:
         return max(5, int(os.getenv("COUNCIL_ROLLUPS_EVERY_MIN", str(default)) or str(default)))
     except Exception:
         return default
 
 def _council_pnl_every_min(default: int) -> int:
-    try:
-        raw = (os.getenv("DB_READ_JSON") or "").strip()
-        if raw:
-            cfg = json.loads(raw)
-            council = cfg.get("council_rollups") or {}
-            if isinstance(council, dict):
-                v = council.get("pnl_every_min")
-                if v is not None:
-                    return max(5, int(v))
-    except Exception:
-        pass
+    v = config_service.get("council_rollups.pnl_every_min")
+    if v is not None:
+        try:
+            return max(5, int(v))
+        except Exception:
+            pass
     return default
 
 def _council_index_every_min(default: int) -> int:
-    try:
-        raw = (os.getenv("DB_READ_JSON") or "").strip()
-        if raw:
-            cfg = json.loads(raw)
-            council = cfg.get("council_rollups") or {}
-            if isinstance(council, dict):
-                v = council.get("index_every_min")
-                if v is not None:
-                    return max(5, int(v))
-    except Exception:
-        pass
+    v = config_service.get("council_rollups.index_every_min")
+    if v is not None:
+        try:
+            return max(5, int(v))
+        except Exception:
+            pass
     return default
     
 def _set_schedules():
@@ -345,6 +377,8 @@ def _set_schedules():
     _schedule("Stalled Asset Detector",       "stalled_asset_detector",      "run_stalled_asset_detector",    every=60, unit="minutes")
     _schedule("Stalled Autotrader (Shadow)",  "stalled_autotrader",          "run_stalled_autotrader_shadow", every=6, unit="hours")
     _schedule("Sheet Mirror Parity Validator", "sheet_mirror_parity_validator", "run_sheet_mirror_parity_validator", every=6, unit="hours")
+    _schedule("Commands Archive",            "bus_store_pg",                 "run_commands_archive",            when="03:40")
+    _schedule("Sheet Snapshot Compaction",   "db_mirror",                    "compact_snapshots",               every=6, unit="hours")
 
     # --- Council rollups (Bus/DB-driven; Sheets-mirrored) -------------------
     # These modules should self-gate on DB_READ_JSON so scheduling them is always safe.
@@ -354,12 +388,7 @@ def _set_schedules():
     _schedule("WNH Weekly Digest",           "wnh_weekly_digest",            "run_wnh_weekly_digest",           when="13:15")
 
     # DB parity (Phase 22B)
-    try:
-        from db_parity_validator import run_db_parity_validator
-        schedule.every(6).hours.do(run_db_parity_validator)
-        print("🧪 Scheduled DB parity validator every 6 hours", flush=True)
-    except Exception as e:
-        print(f"DB parity validator not scheduled: {e}", flush=True)
+    _schedule("DB Parity Validator",         "db_parity_validator",          "run_db_parity_validator",         every=6, unit="hours")
 
 
 def _kick_once_and_threads():
@@ -471,6 +500,9 @@ def boot():
     """Start all jobs/threads; expose Flask via wsgi.py/gunicorn (no app.run here)."""
     send_boot_notice_once("🟢 NovaTrade system booted and live.")
 
+    # DB_READ_JSON hot reload: `kill -HUP <pid>` (or POST /api/config/reload)
+    config_service.install_reload_signal()
+
     # Ensure governance tabs before anything can log to them
     try:
         ensure_ledger_tabs()
@@ -478,6 +510,8 @@ def boot():
         warn(f"Ledger ensure skipped: {e}")
 
     time.sleep(0.4)
+    # Bus schema migrations off the boot path (try-lock; never blocks a request).
+    _thread(_safe_call, "Bus Migrations", "bus_store_pg", "run_bus_migrations")
     _thread(_safe_call, "Orion Voice Loop", "orion_voice_loop", "run_orion_voice_loop")
 
     _boot_serialize_first_minute()
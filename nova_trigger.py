@@ -138,65 +138,27 @@ except Exception:  # fail-open if module missing
 
 # === Config & Const
 
-UNIFIED_SNAPSHOT_WS = os.getenv("UNIFIED_SNAPSHOT_WS", "Unified_Snapshot")
-PRICE_CACHE_TTL_SEC = int(os.getenv("PRICE_CACHE_TTL_SEC", "180"))
 TELEGRAM_DEDUP_TTL = int(os.getenv("TELEGRAM_DEDUP_TTL_SEC", "120"))
 
-# Global Cache (In-process memory)
-_price_cache = {"ts": 0.0, "rows": []}
-
 
 # ---------------------------------------------------------------------------
-# B-2: Unified_Snapshot price lookup for manual rebuys
+# B-2: Unified_Snapshot price lookup for manual rebuys (shared price_oracle)
 # ---------------------------------------------------------------------------
-def _load_price_snapshot(force: bool = False) -> List[Dict[str, Any]]:
-    global _price_cache
-    now = time.time()
-    if (
-        not force
-        and _price_cache.get("ts", 0.0) > 0
-        and now - _price_cache["ts"] < PRICE_CACHE_TTL_SEC
-    ):
-        return _price_cache["rows"]
-
+def _get_price_usd_from_snapshot(token: str) -> Tuple[Optional[float], str]:
     try:
-        ws = get_ws_cached(SHEET_URL, UNIFIED_SNAPSHOT_WS)
-        rows = ws.get_all_records()
-        _price_cache["ts"] = now
-        _price_cache["rows"] = rows or []
-        return _price_cache["rows"]
+        from price_oracle import get_snapshot_price
     except Exception as e:
-        warn(f"nova_trigger: Failed to load {UNIFIED_SNAPSHOT_WS} for price feed: {e}")
-        return []
-
-
-def _get_price_usd_from_snapshot(token: str) -> Tuple[Optional[float], str]:
-    token_up = (token or "").upper()
-    if not token_up:
-        return None, "no_token"
-
-    rows = _load_price_snapshot()
-    for r in rows:
-        row_token = (r.get("Token") or "").upper()
-        if row_token != token_up:
-            continue
-        price = r.get("Price_USD")
-        if price is None:
-            return None, "no_price"
-        try:
-            return float(price), "ok"
-        except Exception:
-            return None, "bad_price"
-
-    return None, "not_found"
+        warn(f"nova_trigger: price_oracle unavailable: {e}")
+        return None, "no_oracle"
+    return get_snapshot_price(token)
 
 
 def _get_price_usd(token: str, quote: str = "USDT", venue: str | None = None) -> Tuple[Optional[float], str]:
     """
     Price resolution strategy for manual rebuys:
 
-      1) Unified_Snapshot (fast, sheet driven)
-      2) Venue-specific feed (price_feed.get_price_usd)
+      1) Unified_Snapshot (price_oracle index)
+      2) Venue-specific feed (price_feed.get_price_usd, coalesced per symbol)
     """
     # 1) Snapshot first
     p, reason = _get_price_usd_from_snapshot(token)
@@ -1,6 +1,6 @@
 # nova_trigger_listener.py — loop-based listener (optional)
-import os, time, gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import os, time
+from utils import get_sheet
 from nova_trigger import route_manual
 
 SHEET_URL = os.getenv("SHEET_URL")
@@ -9,10 +9,7 @@ POLL_SEC  = int(os.getenv("NOVA_TRIGGER_POLL_SEC","30"))
 
 def listen_for_nova_trigger():
     print("🎯 NovaTrigger listener started...")
-    scope = ["https://spreadsheets.google.com/feeds","https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
-    ws = client.open_by_url(SHEET_URL).worksheet(TAB)
+    ws = get_sheet(SHEET_URL).worksheet(TAB)
 
     while True:
         try:
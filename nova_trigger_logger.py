@@ -15,7 +15,7 @@ import os
 from datetime import datetime
 from typing import Optional
 
-from utils import get_gspread_client, warn  # type: ignore
+from utils import get_sheet, warn  # type: ignore
 
 SHEET_URL = os.getenv("SHEET_URL", "").strip()
 NOVATRIGGER_LOG_WS = os.getenv("NOVATRIGGER_LOG_WS", "NovaTrigger_Log").strip()
@@ -33,8 +33,7 @@ def log_nova_trigger(trigger: str, notes: Optional[str] = "") -> None:
         return
 
     try:
-        gc = get_gspread_client()
-        sh = gc.open_by_url(SHEET_URL)
+        sh = get_sheet(SHEET_URL)
         try:
             ws = sh.worksheet(NOVATRIGGER_LOG_WS)
         except Exception:
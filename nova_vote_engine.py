@@ -2,8 +2,7 @@
 
 import os
 from datetime import datetime, timedelta
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 from telegram import Bot
 
 # === Config ===
@@ -13,10 +12,7 @@ LOOKBACK_DAYS = 3
 MAX_AUTOVOTES_PER_RUN = 3
 
 # === Setup ===
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-gclient = gspread.authorize(creds)
-sheet = gclient.open_by_url(os.getenv("SHEET_URL"))
+sheet = get_sheet()
 scout_ws = sheet.worksheet("Scout Decisions")
 data = scout_ws.get_all_records()
 
@@ -3,8 +3,7 @@ import os
 import time
 import json
 from datetime import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 from utils import with_sheet_backoff, send_telegram_message_dedup
 
@@ -59,10 +58,7 @@ def _now_epoch():
 # ---------- Sheets ----------
 @with_sheet_backoff
 def _open_trigger_ws():
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
-    sh = client.open_by_url(SHEET_URL)
+    sh = get_sheet(SHEET_URL)
     return sh.worksheet("NovaTrigger")
 
 @with_sheet_backoff
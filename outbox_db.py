@@ -66,22 +66,20 @@ def _detect_mode() -> str:
 # Postgres implementation
 # ---------------------------
 
-def _pg_connect():
-    import psycopg2  # type: ignore
-    return psycopg2.connect(DB_URL)
+OUTBOX_STMT_TIMEOUT_MS = int(os.getenv("OUTBOX_STMT_TIMEOUT_MS", "5000"))
 
 @contextmanager
-def _pg_conn():
-    con = _pg_connect()
-    try:
+def _pg_conn(caller: str = "outbox"):
+    # Pooled (db_pool): callers still commit explicitly; the pool commits on
+    # clean exit and rolls back on error before returning the connection.
+    from db_pool import pg_conn  # local import keeps sqlite-only installs working
+    with pg_conn(url=DB_URL, caller=caller, statement_timeout_ms=OUTBOX_STMT_TIMEOUT_MS) as con:
         yield con
-    finally:
-        con.close()
 
 def _pg_init() -> None:
     # We do NOT create the canonical commands table here; migrations live elsewhere.
     # But we *do* sanity-check the connection.
-    with _pg_conn() as con:
+    with _pg_conn("outbox.init") as con:
         with con.cursor() as cur:
             cur.execute("SELECT 1;")
         con.commit()
@@ -98,7 +96,7 @@ def _pg_enqueue(
     ih = intent_hash or _compute_intent_hash(intent)
     ttl = int(dedup_ttl_seconds if dedup_ttl_seconds is not None else DEDUP_TTL_S)
 
-    with _pg_conn() as con:
+    with _pg_conn("outbox.enqueue") as con:
         with con.cursor() as cur:
             # On conflict (unique intent_hash), return existing id
             cur.execute(
@@ -124,9 +122,8 @@ def _pg_pull(
     lease_s = LEASE_S if lease_s is None else int(lease_s)
     leased_by = leased_by or agent_id
     # We lease commands that are queued and not currently leased, or whose lease expired.
-    with _pg_conn() as con:
+    with _pg_conn("outbox.pull") as con:
         with con.cursor() as cur:
-            cur.execute("BEGIN;")
             cur.execute(
                 """
                 WITH cte AS (
@@ -172,7 +169,7 @@ def _pg_ack(agent_id: str, receipts: List[Dict[str, Any]]) -> None:
     receipts: [{id:<cmd_id>, ok:bool, status:str?, txid:str?, message:str?, result:dict?}]
     Note: canonical receipts table is handled elsewhere in your stack; this function only marks commands.
     """
-    with _pg_conn() as con:
+    with _pg_conn("outbox.ack") as con:
         with con.cursor() as cur:
             for r in receipts:
                 cmd_id = int(r["id"])
@@ -193,7 +190,7 @@ def _pg_ack(agent_id: str, receipts: List[Dict[str, Any]]) -> None:
         con.commit()
 
 def _pg_reap_expired(agent_id: Optional[str] = None) -> int:
-    with _pg_conn() as con:
+    with _pg_conn("outbox.reap") as con:
         with con.cursor() as cur:
             if agent_id:
                 cur.execute(
@@ -37,6 +37,8 @@ import time
 import logging
 from typing import Any, Dict, List, Optional
 
+import config_service
+
 logger = logging.getLogger(__name__)
 
 __all__ = ["maybe_auto_heal"]
@@ -54,13 +56,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> dict:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        return json.loads(raw)
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg() -> dict:
@@ -10,7 +10,7 @@ from statistics import mean, pstdev
 from datetime import datetime
 
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 SHEET_URL = os.getenv("SHEET_URL")
 DASHBOARD_WS = os.getenv("PERF_DASHBOARD_WS", "Performance_Dashboard")
@@ -21,6 +21,12 @@ VAULT_INTEL_WS = os.getenv("VAULT_INTELLIGENCE_WS", "Vault_Intelligence")
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+# Vectorized aggregation (pandas); the loop version below stays as the fallback.
+try:
+    import analytics_core as _analytics
+except Exception:
+    _analytics = None
+
 # Phase 22B: optional DB-first reads (Sheets fallback)
 try:
     from utils import get_all_records_cached_dbaware as _get_all_records_cached_dbaware
@@ -29,10 +35,7 @@ except Exception:
 
 # -------- Sheet helpers --------
 def _open_sheet():
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
-    return client.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 def _get(ws_name, ttl_s=120):
     """
@@ -168,7 +171,21 @@ def _collect_token_sets():
     }
 
 def _aggregate_metrics():
-    data = _collect_token_sets()
+    if _analytics is not None and _analytics.HAVE_PANDAS:
+        try:
+            tables = {
+                "rotation_stats": _analytics.load_table("Rotation_Stats"),
+                "rotation_log": _analytics.load_table("Rotation_Log"),
+                "vault_intel": _analytics.load_table(VAULT_INTEL_WS or "Vault Intelligence"),
+                "trade_log": _analytics.load_table("Trade_Log"),
+                "rotation_mem": _analytics.load_table(MEMORY_WS),
+            }
+            return _analytics.novascore_rows(tables)
+        except Exception as e:
+            print(f"⚠️ performance_dashboard: vectorized metrics failed ({e}); using loop path.")
+    return _aggregate_metrics_loop(_collect_token_sets())
+
+def _aggregate_metrics_loop(data):
     RS = data["rotation_stats"]
     RL = data["rotation_log"]
     VI = data["vault_intel"]
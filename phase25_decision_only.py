@@ -31,6 +31,8 @@ import time
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
+import config_service
+
 
 # -----------------------
 # Row selection helpers
@@ -113,14 +115,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg() -> Dict[str, Any]:
@@ -48,9 +48,12 @@ import json
 import os
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+import config_service
+
 
 _LOG_ONCE = set()
 
@@ -78,14 +81,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg() -> Dict[str, Any]:
@@ -184,102 +180,106 @@ def _edge_authority_ok(agent: str) -> Tuple[bool, str, Optional[int]]:
         return False, "edge_authority_missing", None
 
 
+@contextmanager
 def _get_conn():
+    """db_backbone._get_conn (a pooled connection or None), or None if unavailable."""
     try:
         from db_backbone import _get_conn as _gc  # type: ignore
-        return _gc()
     except Exception:
-        return None
+        yield None
+        return
+    with _gc() as conn:
+        yield conn
 
 
 def _ensure_table() -> None:
-    conn = _get_conn()
-    if not conn:
-        return
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS nova_plan_enqueues (
-              plan_id TEXT NOT NULL,
-              item_index INTEGER NOT NULL,
-              cmd_id TEXT,
-              created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
-              PRIMARY KEY(plan_id, item_index)
-            );
-            """
-        )
-        # helpful index
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_nova_plan_enqueues_created_at ON nova_plan_enqueues(created_at);")
-        conn.commit()
-    except Exception:
+    with _get_conn() as conn:
+        if not conn:
+            return
         try:
-            conn.rollback()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nova_plan_enqueues (
+                  plan_id TEXT NOT NULL,
+                  item_index INTEGER NOT NULL,
+                  cmd_id TEXT,
+                  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                  PRIMARY KEY(plan_id, item_index)
+                );
+                """
+            )
+            # helpful index
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_nova_plan_enqueues_created_at ON nova_plan_enqueues(created_at);")
+            conn.commit()
         except Exception:
-            pass
+            try:
+                conn.rollback()
+            except Exception:
+                pass
 
 
 def _already_enqueued(plan_id: str, item_index: int) -> bool:
-    conn = _get_conn()
-    if not conn:
-        return False
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT 1 FROM nova_plan_enqueues WHERE plan_id=%s AND item_index=%s LIMIT 1;", (plan_id, item_index))
-        return cur.fetchone() is not None
-    except Exception:
-        return False
+    with _get_conn() as conn:
+        if not conn:
+            return False
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1 FROM nova_plan_enqueues WHERE plan_id=%s AND item_index=%s LIMIT 1;", (plan_id, item_index))
+            return cur.fetchone() is not None
+        except Exception:
+            return False
 
 
 def _mark_enqueued(plan_id: str, item_index: int, cmd_id: str) -> None:
-    conn = _get_conn()
-    if not conn:
-        return
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO nova_plan_enqueues(plan_id, item_index, cmd_id)
-            VALUES(%s,%s,%s)
-            ON CONFLICT(plan_id, item_index) DO NOTHING;
-            """,
-            (plan_id, item_index, cmd_id),
-        )
-        conn.commit()
-    except Exception:
+    with _get_conn() as conn:
+        if not conn:
+            return
         try:
-            conn.rollback()
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO nova_plan_enqueues(plan_id, item_index, cmd_id)
+                VALUES(%s,%s,%s)
+                ON CONFLICT(plan_id, item_index) DO NOTHING;
+                """,
+                (plan_id, item_index, cmd_id),
+            )
+            conn.commit()
         except Exception:
-            pass
+            try:
+                conn.rollback()
+            except Exception:
+                pass
 
 
 def _latest_plan_from_db(agent: str) -> Optional[Dict[str, Any]]:
-    conn = _get_conn()
-    if not conn:
-        return None
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT payload
-            FROM nova_plans
-            WHERE agent_id=%s
-            ORDER BY created_at DESC
-            LIMIT 1;
-            """,
-            (agent,),
-        )
-        row = cur.fetchone()
-        if not row:
+    with _get_conn() as conn:
+        if not conn:
+            return None
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT payload
+                FROM nova_plans
+                WHERE agent_id=%s
+                ORDER BY created_at DESC
+                LIMIT 1;
+                """,
+                (agent,),
+            )
+            row = cur.fetchone()
+            if not row:
+                return None
+            payload = row[0]
+            if isinstance(payload, dict):
+                return payload
+            if isinstance(payload, str):
+                return json.loads(payload)
+            return json.loads(str(payload))
+        except Exception:
             return None
-        payload = row[0]
-        if isinstance(payload, dict):
-            return payload
-        if isinstance(payload, str):
-            return json.loads(payload)
-        return json.loads(str(payload))
-    except Exception:
-        return None
 
 
 def _run_planner_once() -> Optional[Dict[str, Any]]:
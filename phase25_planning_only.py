@@ -37,6 +37,8 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List
 from utils import str_or_empty, safe_float  # type: ignore
 
+import config_service
+
 
 _LOG_ONCE = set()
 
@@ -64,14 +66,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg() -> Dict[str, Any]:
@@ -290,41 +285,41 @@ def _db_write_plan(plan: Dict[str, Any]) -> None:
     except Exception:
         return
     try:
-        conn = _get_conn()
-        if not conn:
-            return
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS nova_plans (
-              plan_id   TEXT PRIMARY KEY,
-              created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
-              agent_id  TEXT,
-              decision_id TEXT,
-              phase     TEXT,
-              mode      TEXT,
-              enqueue   BOOLEAN,
-              payload   JSONB
-            );
-            """
-        )
-        cur.execute(
-            """
-            INSERT INTO nova_plans(plan_id, agent_id, decision_id, phase, mode, enqueue, payload)
-            VALUES(%s,%s,%s,%s,%s,%s,%s::jsonb)
-            ON CONFLICT (plan_id) DO NOTHING;
-            """,
-            (
-                plan.get("plan_id"),
-                plan.get("agent_id"),
-                plan.get("decision_id"),
-                plan.get("phase"),
-                plan.get("mode"),
-                bool(plan.get("enqueue")),
-                json.dumps(plan, default=str),
-            ),
-        )
-        conn.commit()
+        with _get_conn() as conn:
+            if not conn:
+                return
+            cur = conn.cursor()
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nova_plans (
+                  plan_id   TEXT PRIMARY KEY,
+                  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                  agent_id  TEXT,
+                  decision_id TEXT,
+                  phase     TEXT,
+                  mode      TEXT,
+                  enqueue   BOOLEAN,
+                  payload   JSONB
+                );
+                """
+            )
+            cur.execute(
+                """
+                INSERT INTO nova_plans(plan_id, agent_id, decision_id, phase, mode, enqueue, payload)
+                VALUES(%s,%s,%s,%s,%s,%s,%s::jsonb)
+                ON CONFLICT (plan_id) DO NOTHING;
+                """,
+                (
+                    plan.get("plan_id"),
+                    plan.get("agent_id"),
+                    plan.get("decision_id"),
+                    plan.get("phase"),
+                    plan.get("mode"),
+                    bool(plan.get("enqueue")),
+                    json.dumps(plan, default=str),
+                ),
+            )
+            conn.commit()
     except Exception:
         return
 
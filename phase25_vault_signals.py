@@ -36,6 +36,8 @@ import re
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
+import config_service
+
 from utils import get_records_cached, str_or_empty, safe_float  # type: ignore
 
 
@@ -63,14 +65,7 @@ ALPHA_LISTINGS_TAB = _tab("ALPHA_LISTINGS_TAB", "Listings")
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _alpha_enabled() -> bool:
@@ -174,6 +169,20 @@ def _get_quote_facts_from_wallet_monitor() -> Dict[str, Any]:
         "snapshot_ts": "YYYY-MM-DD HH:MM:SS" (if available)
       }
     """
+    # Typed snapshot store first (written by telemetry_mirror on every push).
+    try:
+        from wallet_snapshot_store import latest_snapshot
+        snap_obj = latest_snapshot()
+    except Exception:
+        snap_obj = None
+    if snap_obj is not None and snap_obj.holdings:
+        breakdown = snap_obj.quote_breakdown()
+        return {
+            "total_quote": _total_quote_from_breakdown(breakdown),
+            "by_currency": breakdown,
+            "snapshot_ts": snap_obj.ts_str,
+        }
+
     rows = _read_records_prefer_db(WALLET_MONITOR_TAB)
     if not rows:
         return {"total_quote": 0.0, "by_currency": {}}
@@ -3,15 +3,26 @@
 # Builds a per-token Policy Bias from Rotation_Memory, Rotation_Stats and recent Policy_Log.
 # Writes to Policy_Bias tab and exposes get_bias_map() for routers/policy to consult.
 # Safe under missing tabs; never raises.
-import os, math, time
+#
+# The intent path (predictive_policy_driver) must not read Sheets: the builder
+# compiles the bias map into an immutable {TOKEN: (factor, confidence)} table,
+# persists it (POLICY_BIAS_CACHE_PATH JSON, plus policy_bias_compiled in
+# Postgres when DB_URL is set) and bumps its version. get_bias_map() only reads
+# the in-memory table; a background thread (started on first use) re-checks
+# the persisted version every POLICY_BIAS_CHECK_S, so a build in another
+# process is picked up without any I/O on the intent path. Until its first
+# load finishes the map is empty (neutral bias). The thread loads the
+# persisted table; Policy_Bias is read only when nothing has been persisted yet.
+import os, math, time, json, threading
 from datetime import datetime, timedelta
+from types import MappingProxyType
 
 try:
-    from utils import get_gspread_client, warn, info
+    from utils import get_sheet, warn, info
 except Exception:
     def warn(x): print("[policy_bias] WARN:", x)
     def info(x): print("[policy_bias] INFO:", x)
-    get_gspread_client = None
+    get_sheet = None
 
 SHEET_URL = os.getenv("SHEET_URL", "")
 BIAS_WS   = os.getenv("POLICY_BIAS_WS", "Policy_Bias")
@@ -25,9 +36,12 @@ MAX_FACTOR = float(os.getenv("POLICY_BIAS_MAX", "1.25"))
 
 LOOKBACK_DAYS = int(os.getenv("POLICY_BIAS_LOOKBACK_DAYS", "30"))
 
+CACHE_PATH = os.getenv("POLICY_BIAS_CACHE_PATH", "policy_bias.json")
+CHECK_S    = float(os.getenv("POLICY_BIAS_CHECK_S", "30"))
+DB_URL     = os.getenv("DB_URL") or os.getenv("DATABASE_URL") or ""
+
 def _open():
-    gc = get_gspread_client()
-    return gc.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 def _get(ws_name):
     try:
@@ -176,20 +190,152 @@ def run_policy_bias_builder():
         except Exception as e:
             warn(f"Policy_Bias write failed: {e}")
 
-def get_bias_map():
-    # read Policy_Bias and return {TOKEN: (factor, confidence)}
+    # Compile for the intent path and bump the version (even if the sheet write failed).
+    bias = _compile({"Token": r[0], "Bias_Factor": r[1], "Confidence": r[2]} for r in rows)
+    version = int(time.time() * 1000)
+    _install(bias, version, "builder")
+    _persist(bias, version)
+
+# ---------------- compiled bias table ----------------
+_EMPTY = MappingProxyType({})
+_table = {"map": _EMPTY, "version": 0, "source": "", "checked_at": 0.0, "loaded": False, "file_mtime": None}
+_table_lock = threading.Lock()
+_refresher = None
+
+def _compile(rows):
+    # rows: Policy_Bias records -> immutable {TOKEN: (factor, confidence)}
+    out = {}
+    for r in rows or []:
+        t = str(r.get("Token","")).strip().upper()
+        f = _safe_float(r.get("Bias_Factor"))
+        c = _safe_float(r.get("Confidence"))
+        if t and f is not None:
+            out[t] = (f, c if c is not None else 0.0)
+    return MappingProxyType(out)
+
+def _install(bias, version, source):
+    with _table_lock:
+        if version < _table["version"]:
+            return
+        _table.update({"map": bias, "version": version, "source": source, "loaded": True})
+
+def _persist(bias, version):
+    doc = {"version": version, "built_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+           "bias": {t: list(v) for t, v in bias.items()}}
     try:
-        rows = _get(BIAS_WS)
-        out = {}
-        for r in rows:
-            t = str(r.get("Token","")).strip().upper()
-            f = _safe_float(r.get("Bias_Factor"))
-            c = _safe_float(r.get("Confidence"))
-            if t and f is not None:
-                out[t] = (f, c if c is not None else 0.0)
-        return out
-    except Exception:
-        return {}
+        tmp = f"{CACHE_PATH}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(doc, fh, separators=(",", ":"))
+        os.replace(tmp, CACHE_PATH)
+    except Exception as e:
+        warn(f"policy_bias: persist to {CACHE_PATH} failed: {e}")
+    if not DB_URL:
+        return
+    try:
+        from db_pool import pg_conn
+        with pg_conn(url=DB_URL, caller="policy_bias_engine") as conn:
+            with conn.cursor() as cur:
+                cur.execute("""CREATE TABLE IF NOT EXISTS policy_bias_compiled (
+                                 id int PRIMARY KEY, version bigint NOT NULL,
+                                 payload jsonb NOT NULL, built_at timestamptz NOT NULL DEFAULT now())""")
+                cur.execute("""INSERT INTO policy_bias_compiled (id, version, payload) VALUES (1, %s, %s::jsonb)
+                               ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version,
+                                 payload = EXCLUDED.payload, built_at = now()""",
+                            (version, json.dumps(doc["bias"])))
+    except Exception as e:
+        warn(f"policy_bias: persist to Postgres failed: {e}")
+
+def _load_file(min_version):
+    try:
+        mtime = os.stat(CACHE_PATH).st_mtime
+    except OSError:
+        return None
+    if mtime == _table.get("file_mtime"):
+        return None
+    try:
+        with open(CACHE_PATH) as fh:
+            doc = json.load(fh)
+        _table["file_mtime"] = mtime
+        v = int(doc.get("version") or 0)
+        if v <= min_version:
+            return None
+        return _compile({"Token": t, "Bias_Factor": f, "Confidence": c}
+                        for t, (f, c) in (doc.get("bias") or {}).items()), v
+    except Exception as e:
+        warn(f"policy_bias: {CACHE_PATH} unreadable: {e}")
+        return None
+
+def _load_db(min_version):
+    if not DB_URL:
+        return None
+    try:
+        from db_pool import pg_conn
+        with pg_conn(url=DB_URL, autocommit=True, statement_timeout_ms=2000, caller="policy_bias_engine") as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('policy_bias_compiled') IS NOT NULL")
+                if not cur.fetchone()[0]:
+                    return None
+                # payload only travels when the version moved
+                cur.execute("SELECT version, payload FROM policy_bias_compiled WHERE id = 1 AND version > %s",
+                            (min_version,))
+                row = cur.fetchone()
+        if not row:
+            return None
+        payload = row[1] if isinstance(row[1], dict) else json.loads(row[1])
+        return _compile({"Token": t, "Bias_Factor": f, "Confidence": c} for t, (f, c) in payload.items()), int(row[0])
+    except Exception as e:
+        warn(f"policy_bias: Postgres load failed: {e}")
+        return None
+
+def _refresh(force=False):
+    # Pick up a newer persisted version (another process's build / restart).
+    now = time.time()
+    if not force and now - _table["checked_at"] < CHECK_S:
+        return
+    with _table_lock:
+        if not force and now - _table["checked_at"] < CHECK_S:
+            return
+        _table["checked_at"] = now
+        current = _table["version"]
+    for loader, source in ((_load_file, "file"), (_load_db, "postgres")):
+        got = loader(current)
+        if got:
+            _install(got[0], got[1], source)
+            current = got[1]
+    if not _table["loaded"]:
+        # Nothing persisted yet: compile the current Policy_Bias tab (retried
+        # every CHECK_S while it comes back empty).
+        bias = _compile(_get(BIAS_WS))
+        if bias:
+            version = int(time.time() * 1000)
+            _install(bias, version, "sheet")
+            _persist(bias, version)
+
+def _refresh_loop():
+    while True:
+        try:
+            _refresh(force=True)
+        except Exception as e:
+            warn(f"policy_bias: refresh failed: {e}")
+        time.sleep(max(1.0, CHECK_S))
+
+def _start_refresher():
+    global _refresher
+    if _refresher is not None:
+        return
+    with _table_lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, name="policy-bias-refresh", daemon=True)
+            _refresher.start()
+
+def get_bias_map():
+    # {TOKEN: (factor, confidence)} — immutable, served from memory; no I/O here
+    _start_refresher()
+    return _table["map"]
+
+def bias_table_status():
+    return {"version": _table["version"], "source": _table["source"], "tokens": len(_table["map"]),
+            "checked_age_s": round(time.time() - _table["checked_at"], 1) if _table["checked_at"] else None}
 
 if __name__ == "__main__":
     run_policy_bias_builder()
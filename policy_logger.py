@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import os
 import json
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import time
 from insight_model import CouncilInsight
 
@@ -15,11 +18,39 @@ INSIGHT_LOG_PATH = os.getenv("COUNCIL_INSIGHT_LOG", "council_insights.jsonl")
 COUNCIL_INSIGHT_LOG = os.environ.get("COUNCIL_INSIGHT_LOG", "council_insights.jsonl")
 COUNCIL_INSIGHTS_FILE = os.environ.get("COUNCIL_INSIGHTS_FILE", "council_insights.jsonl")
 
+# Async pipeline: log_decision only appends to the local JSONL (which doubles
+# as the write-ahead log) and returns; a background thread ships new lines to
+# Policy_Log with batched append_rows and runs the insight/WNH side work.
+POLICY_LOG_ASYNC = os.getenv("POLICY_LOG_ASYNC", "1").lower() in ("1", "true", "yes", "on")
+POLICY_LOG_FLUSH_S = float(os.getenv("POLICY_LOG_FLUSH_S", "5"))
+POLICY_LOG_BATCH = int(os.getenv("POLICY_LOG_BATCH", "200"))
+POLICY_LOG_QUEUE_MAX = int(os.getenv("POLICY_LOG_QUEUE_MAX", "1000"))
+POLICY_LOG_PG_MIRROR = os.getenv("POLICY_LOG_PG_MIRROR", "0").lower() in ("1", "true", "yes", "on")
+POLICY_LOG_FSYNC = os.getenv("POLICY_LOG_FSYNC", "0").lower() in ("1", "true", "yes", "on")
+WAL_OFFSET_PATH = os.getenv("POLICY_LOG_WAL_OFFSET", LOCAL_FALLBACK_PATH + ".offset")
+# web and worker append to the same WAL; shipping (read -> append -> advance
+# offset) runs under an exclusive flock on this file so a line ships once.
+WAL_LOCK_PATH = WAL_OFFSET_PATH + ".lock"
+# Once the shipped offset passes this size the WAL is rotated to <path>.1 and
+# shipping restarts at 0 on a fresh file (unshipped tail carried over).
+WAL_ROTATE_BYTES = int(os.getenv("POLICY_LOG_WAL_ROTATE_BYTES", str(16 * 1024 * 1024)))
+# Lines longer than this (or than the read window) are moved to the
+# dead-letter file instead of stalling the shipper.
+WAL_MAX_LINE_BYTES = int(os.getenv("POLICY_LOG_MAX_LINE_BYTES", str(1024 * 1024)))
+WAL_DEADLETTER_PATH = os.getenv("POLICY_LOG_DEADLETTER", LOCAL_FALLBACK_PATH + ".deadletter")
+_WAL_READ_WINDOW = 4 * 1024 * 1024
+_WAL_ROTATING = LOCAL_FALLBACK_PATH + ".rotating"
+
+try:
+    import fcntl
+except Exception:  # pragma: no cover - non-POSIX
+    fcntl = None
+
 try:
     # Prefer Bus-wide Sheets helpers if available
-    from utils import get_gspread_client, with_sheet_backoff, warn as _log_warn
+    from utils import open_ws, with_sheet_backoff, warn as _log_warn
 except Exception:
-    get_gspread_client = None
+    open_ws = None
 
     def with_sheet_backoff(fn):
         return fn
@@ -42,60 +73,72 @@ def _to_json(obj: Any) -> str:
         return "{}"
 
 
-def _append_local(row: Dict[str, Any]) -> None:
-    try:
-        with open(LOCAL_FALLBACK_PATH, "a", encoding="utf-8") as f:
-            f.write(_to_json(row) + "\n")
-    except Exception:
-        # Local logging must never break the policy flow
-        pass
-
-
-def _open_sheet_legacy():
-    import gspread
-    from oauth2client.service_account import ServiceAccountCredentials
+_local_lock = threading.Lock()
 
-    svc = (
-        os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        or os.getenv("GOOGLE_CREDENTIALS_JSON")
-        or os.getenv("SVC_JSON")
-        or "sentiment-log-service.json"
-    )
-
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-    gc = gspread.authorize(creds)
-    sh = gc.open_by_url(SHEET_URL)
 
+def _wal_write(data: bytes) -> None:
+    """
+    One O_APPEND write to the WAL so concurrent processes never interleave.
+    A shared flock on the file lets rotation (exclusive flock on the old
+    inode) wait for in-flight writers; a writer that opened the file just
+    before it was renamed away notices and re-opens the new one.
+    """
+    for _ in range(5):
+        fd = os.open(LOCAL_FALLBACK_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+                try:
+                    current = os.stat(LOCAL_FALLBACK_PATH).st_ino
+                except FileNotFoundError:
+                    current = None
+                if current != os.fstat(fd).st_ino:
+                    continue
+            os.write(fd, data)
+            if POLICY_LOG_FSYNC:
+                os.fsync(fd)
+            return
+        finally:
+            os.close(fd)
+    raise OSError(f"{LOCAL_FALLBACK_PATH} kept moving during append")
+
+
+def _append_local(row: Dict[str, Any]) -> bool:
     try:
-        ws = sh.worksheet(POLICY_LOG_WS)
+        line = (_to_json(row) + "\n").encode("utf-8")
+        with _local_lock:
+            _wal_write(line)
+        return True
     except Exception:
-        ws = sh.add_worksheet(title=POLICY_LOG_WS, rows=4000, cols=20)
-        ws.append_row(
-            [
-                "Timestamp",
-                "Token",
-                "Action",
-                "Amount_USD",
-                "OK",
-                "Reason",
-                "Patched",
-                "Venue",
-                "Quote",
-                "Liquidity",
-                "Cooldown_Min",
-                "Notes",
-                "Intent_ID",
-                "Symbol",
-                "Decision",
-                "Source",
-            ],
-            value_input_option="USER_ENTERED",
-        )
-    return ws
+        # Local logging must never break the policy flow
+        return False
+
+
+_POLICY_LOG_HEADERS = [
+    "Timestamp",
+    "Token",
+    "Action",
+    "Amount_USD",
+    "OK",
+    "Reason",
+    "Patched",
+    "Venue",
+    "Quote",
+    "Liquidity",
+    "Cooldown_Min",
+    "Notes",
+    "Intent_ID",
+    "Symbol",
+    "Decision",
+    "Source",
+]
+
+
+def _open_policy_ws():
+    """Policy_Log worksheet via the shared client/Spreadsheet registry (created if missing)."""
+    if open_ws is None:
+        raise RuntimeError("utils.open_ws unavailable")
+    return open_ws(POLICY_LOG_WS, url=SHEET_URL, create=True, rows=4000, cols=20, headers=_POLICY_LOG_HEADERS)
 
 
 @with_sheet_backoff
@@ -103,62 +146,22 @@ def _append_sheet_row(row: Dict[str, Any]) -> None:
     if not SHEET_URL:
         raise RuntimeError("SHEET_URL not configured")
 
-    if get_gspread_client is not None:
-        gc = get_gspread_client()
-        sh = gc.open_by_url(SHEET_URL)
-        try:
-            ws = sh.worksheet(POLICY_LOG_WS)
-        except Exception:
-            ws = sh.add_worksheet(title=POLICY_LOG_WS, rows=4000, cols=20)
-            ws.append_row(
-                [
-                    "Timestamp",
-                    "Token",
-                    "Action",
-                    "Amount_USD",
-                    "OK",
-                    "Reason",
-                    "Patched",
-                    "Venue",
-                    "Quote",
-                    "Liquidity",
-                    "Cooldown_Min",
-                    "Notes",
-                    "Intent_ID",
-                    "Symbol",
-                    "Decision",
-                    "Source",
-                ],
-                value_input_option="USER_ENTERED",
-            )
-    else:
-        # Fallback to direct gspread auth
-        ws = _open_sheet_legacy()
-
-    headers = [
-        "Timestamp",
-        "Token",
-        "Action",
-        "Amount_USD",
-        "OK",
-        "Reason",
-        "Patched",
-        "Venue",
-        "Quote",
-        "Liquidity",
-        "Cooldown_Min",
-        "Notes",
-        "Intent_ID",
-        "Symbol",
-        "Decision",
-        "Source",
-    ]
-    values = [row.get(h, "") for h in headers]
+    ws = _open_policy_ws()
+    values = [row.get(h, "") for h in _POLICY_LOG_HEADERS]
     try:
         ws.append_row(values, value_input_option="USER_ENTERED")
     except TypeError:
         ws.append_row(values)
 
+@with_sheet_backoff
+def _append_sheet_rows(values: List[List[Any]]) -> None:
+    ws = _open_policy_ws()
+    try:
+        ws.append_rows(values, value_input_option="USER_ENTERED")
+    except TypeError:
+        ws.append_rows(values)
+
+
 def _append_jsonl(path: str, obj: Dict[str, Any]) -> None:
     """
     Append a single JSON object as one line to a JSONL file.
@@ -280,8 +283,21 @@ def log_decision(decision: Any, intent: Dict[str, Any], when: Optional[str] = No
         "Source": source,
     }
 
-    # Always log locally first
-    _append_local(row_dict)
+    # Pipeline first: its WAL checkpoint must predate this row.
+    pipeline = _get_pipeline() if POLICY_LOG_ASYNC else None
+
+    # Always log locally first (this is also the async pipeline's WAL)
+    wal_ok = _append_local(row_dict)
+
+    if pipeline is not None:
+        if not wal_ok and SHEET_URL:
+            # The row never reached the WAL, so the pipeline can't ship it.
+            try:
+                _append_sheet_row(row_dict)
+            except Exception as e:
+                _log_warn(f"Policy_Log direct append after WAL failure failed: {e}")
+        pipeline.submit(decision, intent, ts, wal_ok=wal_ok)
+        return
 
     # Then try Sheets if configured
     if not SHEET_URL:
@@ -295,11 +311,16 @@ def log_decision(decision: Any, intent: Dict[str, Any], when: Optional[str] = No
         except Exception:
             pass
 
-        # Also mirror into council_insights.jsonl for Ops API / Council_Insight sheet
+    _after_decision(decision, intent, ts)
+
+
+def _after_decision(decision: Any, intent: Dict[str, Any], ts: str) -> None:
+    """Council insight + WNH side work for one logged decision (best-effort)."""
+    # Also mirror into council_insights.jsonl for Ops API / Council_Insight sheet
     try:
         log_decision_insight(decision, intent)
     except Exception as e:
-        warn(f"policy_logger: insight logging failed: {e}")
+        _log_warn(f"policy_logger: insight logging failed: {e}")
 
     # ------------------------------------------------------------
     # Why Nothing Happened (WNH) — silence explanations
@@ -311,6 +332,305 @@ def log_decision(decision: Any, intent: Dict[str, Any], when: Optional[str] = No
         pass
 
 
+@contextmanager
+def _wal_lock():
+    if fcntl is None:
+        yield
+        return
+    with open(WAL_LOCK_PATH, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class _PolicyLogPipeline:
+    """
+    Background Policy_Log writer.
+
+    - Durability: rows are already in LOCAL_FALLBACK_PATH when submit() runs;
+      the byte offset of the last line shipped to Sheets is kept in
+      WAL_OFFSET_PATH, so after a crash the next flush resumes from there.
+      Processes sharing the WAL ship under WAL_LOCK_PATH and re-read the
+      offset file first, so each line goes out once.
+    - Size: once the committed offset passes POLICY_LOG_WAL_ROTATE_BYTES the
+      WAL is rotated to <path>.1 and any unshipped tail is carried into the
+      fresh file. A line over POLICY_LOG_MAX_LINE_BYTES goes to
+      POLICY_LOG_DEADLETTER (alone in its batch, so it is never re-read).
+    - Sheets: new WAL lines go out in POLICY_LOG_BATCH-row append_rows calls
+      every POLICY_LOG_FLUSH_S; a failed batch is retried next tick.
+    - Side work (insight JSONL, WNH) runs on a bounded queue; when it is full
+      the item is dropped and counted rather than blocking the policy path.
+    - Optional Postgres mirror (POLICY_LOG_PG_MIRROR=1) of each shipped batch
+      via db_mirror.mirror_append.
+    """
+
+    def __init__(self) -> None:
+        self._side: "queue.Queue[tuple]" = queue.Queue(maxsize=max(1, POLICY_LOG_QUEUE_MAX))
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "wal_errors": 0,
+            "side_dropped": 0,
+            "side_high_water": 0,
+            "sheet_rows": 0,
+            "sheet_batches": 0,
+            "sheet_failures": 0,
+            "pg_rows": 0,
+            "bad_lines": 0,
+            "dead_lettered": 0,
+            "rotations": 0,
+            "last_error": None,
+            "last_flush_ts": 0,
+        }
+        self._offset = self._load_offset()
+
+    # ---- WAL offset -------------------------------------------------------
+    @staticmethod
+    def _wal_size() -> int:
+        try:
+            return os.path.getsize(LOCAL_FALLBACK_PATH)
+        except OSError:
+            return 0
+
+    def _load_offset(self) -> int:
+        try:
+            with open(WAL_OFFSET_PATH, "r", encoding="utf-8") as f:
+                return int((f.read() or "0").strip())
+        except Exception:
+            # No checkpoint yet: everything already in the local log was
+            # written synchronously by earlier versions, so start at the end.
+            size = self._wal_size()
+            self._save_offset(size)
+            return size
+
+    @staticmethod
+    def _save_offset(offset: int) -> None:
+        try:
+            tmp = WAL_OFFSET_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(str(int(offset)))
+            os.replace(tmp, WAL_OFFSET_PATH)
+        except Exception:
+            pass
+
+    def _dead_letter(self, f, start: int, first: bytes) -> int:
+        """
+        Move the oversized line starting at `start` to the dead-letter file.
+        `first` is what the read window already holds. Returns the bytes
+        consumed (0 while the line has no newline yet).
+        """
+        end = -1 if first.endswith(b"\n") else None
+        length = len(first)
+        if end is None:
+            f.seek(start + length)
+            while True:
+                piece = f.read(_WAL_READ_WINDOW)
+                if not piece:
+                    return 0
+                nl = piece.find(b"\n")
+                if nl != -1:
+                    length += nl + 1
+                    break
+                length += len(piece)
+        f.seek(start)
+        remaining = length
+        with open(WAL_DEADLETTER_PATH, "ab") as out:
+            while remaining:
+                piece = f.read(min(remaining, _WAL_READ_WINDOW))
+                if not piece:
+                    break
+                out.write(piece)
+                remaining -= len(piece)
+        self._stats["dead_lettered"] += 1
+        _log_warn(f"Policy_Log: {length}-byte WAL line moved to {WAL_DEADLETTER_PATH}")
+        return length
+
+    def _read_batch(self) -> tuple:
+        """Return (rows, consumed_bytes) for up to POLICY_LOG_BATCH complete lines."""
+        size = self._wal_size()
+        if size < self._offset:
+            # Local log was rotated/truncated; start over on the new file.
+            self._offset = 0
+        if size == self._offset:
+            return [], 0
+        with open(LOCAL_FALLBACK_PATH, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(min(size - self._offset, _WAL_READ_WINDOW))
+            lines = chunk.splitlines(keepends=True)
+            first = lines[0] if lines else b""
+            if len(first) > WAL_MAX_LINE_BYTES or (
+                    not first.endswith(b"\n") and len(first) >= _WAL_READ_WINDOW):
+                # Alone in its batch: the caller commits the offset right away.
+                return [], self._dead_letter(f, self._offset, first)
+        rows: List[Dict[str, Any]] = []
+        consumed = 0
+        for raw in lines:
+            if not raw.endswith(b"\n") or len(rows) >= POLICY_LOG_BATCH or len(raw) > WAL_MAX_LINE_BYTES:
+                break  # partial trailing line (still being written), batch full, or oversized next
+            consumed += len(raw)
+            if not raw.strip():
+                continue
+            try:
+                obj = json.loads(raw.decode("utf-8"))
+                if isinstance(obj, dict):
+                    rows.append(obj)
+            except Exception:
+                self._stats["bad_lines"] += 1
+        return rows, consumed
+
+    # ---- public ------------------------------------------------------------
+    def submit(self, decision: Any, intent: Dict[str, Any], ts: str, wal_ok: bool = True) -> None:
+        self._stats["submitted"] += 1
+        # Callers may keep mutating their dicts after we return.
+        decision = dict(decision) if isinstance(decision, dict) else decision
+        intent = dict(intent) if isinstance(intent, dict) else intent
+        if not wal_ok:
+            self._stats["wal_errors"] += 1
+        # Side work only ran when Sheets was configured in the synchronous path.
+        if SHEET_URL:
+            try:
+                self._side.put_nowait((decision, intent, ts))
+                depth = self._side.qsize()
+                if depth > self._stats["side_high_water"]:
+                    self._stats["side_high_water"] = depth
+            except queue.Full:
+                self._stats["side_dropped"] += 1
+        self._ensure_thread()
+
+    def _rotate(self) -> None:
+        """
+        Caller holds _wal_lock. Move the WAL aside once its shipped prefix is
+        large, carry the unshipped tail into the fresh file and restart the
+        offset at 0. Also finishes a rotation a crash interrupted (the offset
+        file then still refers to the rotating file).
+        """
+        if not os.path.exists(_WAL_ROTATING):
+            if self._offset < WAL_ROTATE_BYTES:
+                return
+            os.replace(LOCAL_FALLBACK_PATH, _WAL_ROTATING)
+        with open(_WAL_ROTATING, "rb") as f:
+            if fcntl is not None:
+                # Waits for writers that opened the old file before the rename.
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            f.seek(min(self._offset, os.fstat(f.fileno()).st_size))
+            tail = f.read()
+        if tail:
+            _wal_write(tail if tail.endswith(b"\n") else tail + b"\n")
+        self._offset = 0
+        self._save_offset(0)
+        os.replace(_WAL_ROTATING, LOCAL_FALLBACK_PATH + ".1")
+        self._stats["rotations"] += 1
+
+    def _try_rotate(self) -> None:
+        try:
+            self._rotate()
+        except Exception as e:
+            self._stats["last_error"] = f"rotate: {e.__class__.__name__}: {e}"
+            _log_warn(f"Policy_Log WAL rotation failed: {e}")
+
+    def flush(self) -> int:
+        """Ship pending WAL lines and drain side work. Returns rows shipped to Sheets."""
+        shipped = 0
+        with self._flush_lock, _wal_lock():
+            # Another process may have shipped (and advanced) since our last pass.
+            self._offset = self._load_offset()
+            # Finish a rotation a crash interrupted before reading the new file.
+            self._try_rotate()
+            while True:
+                rows, consumed = self._read_batch()
+                if not consumed:
+                    break
+                values = [[r.get(h, "") for h in _POLICY_LOG_HEADERS] for r in rows]
+                if values and SHEET_URL:
+                    try:
+                        _append_sheet_rows(values)
+                    except Exception as e:
+                        self._stats["sheet_failures"] += 1
+                        self._stats["last_error"] = f"{e.__class__.__name__}: {e}"
+                        _log_warn(f"Policy_Log batched append failed (will retry): {e}")
+                        break
+                    self._stats["sheet_batches"] += 1
+                    self._stats["sheet_rows"] += len(values)
+                    shipped += len(values)
+                if values and POLICY_LOG_PG_MIRROR:
+                    try:
+                        from db_mirror import mirror_append  # type: ignore
+                        mirror_append(POLICY_LOG_WS, values)
+                        self._stats["pg_rows"] += len(values)
+                    except Exception:
+                        pass
+                self._offset += consumed
+                self._save_offset(self._offset)
+            self._try_rotate()
+            self._stats["last_flush_ts"] = int(time.time())
+
+        while True:
+            try:
+                decision, intent, ts = self._side.get_nowait()
+            except queue.Empty:
+                break
+            _after_decision(decision, intent, ts)
+        return shipped
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(POLICY_LOG_FLUSH_S)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self._stats["last_error"] = f"{e.__class__.__name__}: {e}"
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="policy-log-writer", daemon=True)
+                self._thread.start()
+                try:
+                    import atexit
+                    atexit.register(self.flush)
+                except Exception:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self._stats)
+        out["side_queue"] = self._side.qsize()
+        out["backlog_bytes"] = max(0, self._wal_size() - self._offset)
+        out["async"] = POLICY_LOG_ASYNC
+        return out
+
+
+_pipeline: Optional[_PolicyLogPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline() -> _PolicyLogPipeline:
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = _PolicyLogPipeline()
+    return _pipeline
+
+
+def flush_policy_log() -> int:
+    """Synchronously ship anything pending (tests, shutdown hooks, ops)."""
+    return _get_pipeline().flush() if POLICY_LOG_ASYNC else 0
+
+
+def policy_log_stats() -> Dict[str, Any]:
+    if not POLICY_LOG_ASYNC:
+        return {"async": False}
+    return _get_pipeline().stats()
+
+
 def _maybe_emit_wnh(decision: Dict[str, Any], intent: Dict[str, Any], ts: str) -> None:
     """Emit a WNH row for "inaction" outcomes.
 
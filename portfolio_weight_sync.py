@@ -1,5 +1,4 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 import os
 from utils import get_records_cached
 
@@ -7,10 +6,7 @@ def run_portfolio_weight_sync():
     print("🔁 Syncing Suggested Target Weights to Portfolio Targets...")
 
     try:
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_url(os.getenv("SHEET_URL"))
+        sheet = get_sheet()
         ws = sheet.worksheet("Portfolio_Targets")
 
         rows = get_records_cached("Some_Tab", ttl_s=180)  # 3‑minute cache
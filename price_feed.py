@@ -12,12 +12,15 @@ Behavior:
         - KRAKEN     -> https://api.kraken.com/0/public/Ticker
     • If venue is None or unsupported, try BinanceUS BTC/USDT-style symbol.
     • Cache responses for PRICE_FEED_TTL_SEC (default 30s) to avoid hammering APIs.
+    • Coalesce concurrent misses: callers asking for the same (venue, token, quote)
+      while a fetch is in flight wait for that fetch instead of issuing their own.
     • Return None on failure; callers (trade_guard/PolicyEngine) will deny or fall back.
 """
 
 from __future__ import annotations
 
 import os
+import threading
 import time
 from typing import Dict, Tuple, Optional
 
@@ -29,6 +32,10 @@ PRICE_FEED_TTL_SEC = int(os.getenv("PRICE_FEED_TTL_SEC", "30"))
 # (venue, token, quote) -> (price, ts)
 _price_cache: Dict[Tuple[str, str, str], Tuple[float, float]] = {}
 
+# (venue, token, quote) -> [done_event, price]; one HTTP fetch per key at a time
+_inflight: Dict[Tuple[str, str, str], list] = {}
+_inflight_lock = threading.Lock()
+
 
 def _cache_get(venue: str, token: str, quote: str) -> Optional[float]:
     key = (venue.upper(), token.upper(), quote.upper())
@@ -144,9 +151,11 @@ def get_price_usd(token: str, quote: str = "USDT", venue: Optional[str] = None)
     Returns:
         float price in quote units (usually USD/USDT) or None if unavailable.
     """
-    token = (token or "").upper()
-    quote = (quote or "USDT").upper()
-    venue = (venue or "").upper()
+    # Normalize once so the cache and in-flight keys match price_oracle's
+    # index (" btc" and "BTC" must share one upstream fetch).
+    token = (token or "").strip().upper()
+    quote = (quote or "").strip().upper() or "USDT"
+    venue = (venue or "").strip().upper()
 
     if not token:
         return None
@@ -160,6 +169,26 @@ def get_price_usd(token: str, quote: str = "USDT", venue: Optional[str] = None)
     if cached is not None:
         return cached
 
+    key = (venue or "ANY", token, quote)
+    with _inflight_lock:
+        slot = _inflight.get(key)
+        leader = slot is None
+        if leader:
+            slot = _inflight[key] = [threading.Event(), None]
+    if not leader:
+        slot[0].wait(timeout=15)
+        return slot[1]
+
+    try:
+        slot[1] = _fetch_price(token, quote, venue)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        slot[0].set()
+    return slot[1]
+
+
+def _fetch_price(token: str, quote: str, venue: str) -> Optional[float]:
     price: Optional[float] = None
 
     # Venue-specific first
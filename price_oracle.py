@@ -0,0 +1,184 @@
+"""
+price_oracle.py — shared Unified_Snapshot price/equity oracle
+
+One in-process view of Unified_Snapshot for nova_trigger (manual rebuy
+prices), venue_budget (per-venue quote equity) and anything else that needs
+snapshot prices. The tab is loaded once per PRICE_ORACLE_TTL_SEC through the
+cached, DB-aware read path (utils.get_all_records_cached_dbaware) and indexed
+so every lookup is a dict hit:
+
+    by_token        TOKEN           -> first row for that token (Token or Asset column)
+    by_venue_quote  (VENUE, QUOTE)  -> summed Equity_USD of quote rows
+    by_class        CLASS           -> rows (Class column, else QUOTE/ASSET from IsQuote)
+
+API:
+    get_snapshot_price(token)            -> (price | None, reason)
+    get_price_usd(token, quote, venue)   -> (price | None, source)   snapshot, then price_feed
+    get_quote_equity_usd(venue, quote)   -> float | None
+    get_class_equity_usd(asset_class)    -> float | None
+    rows_for_class(asset_class)          -> list[dict]
+    refresh(force=False)                 -> rebuilds the index when stale
+    oracle_stats()
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from utils import get_all_records_cached_dbaware, warn  # type: ignore
+except Exception:  # pragma: no cover
+    get_all_records_cached_dbaware = None  # type: ignore
+
+    def warn(msg: str) -> None:  # type: ignore[no-redef]
+        print(f"[price_oracle] {msg}", flush=True)
+
+
+UNIFIED_SNAPSHOT_WS = os.getenv("UNIFIED_SNAPSHOT_WS", "Unified_Snapshot")
+PRICE_ORACLE_TTL_SEC = int(os.getenv("PRICE_ORACLE_TTL_SEC", "60"))
+
+_TRUTHY = ("1", "true", "yes", "y", "t")
+
+
+def _num(v: Any) -> Optional[float]:
+    if v is None or v == "":
+        return None
+    try:
+        return float(str(v).replace(",", ""))
+    except Exception:
+        return None
+
+
+class _SnapshotIndex:
+    __slots__ = ("ts", "rows", "by_token", "by_venue_quote", "by_class", "class_equity")
+
+    def __init__(self, rows: List[Dict[str, Any]], ts: float) -> None:
+        self.ts = ts
+        self.rows = rows
+        self.by_token: Dict[str, Dict[str, Any]] = {}
+        self.by_venue_quote: Dict[Tuple[str, str], float] = {}
+        self.by_class: Dict[str, List[Dict[str, Any]]] = {}
+        self.class_equity: Dict[str, float] = {}
+
+        for r in rows:
+            token = str(r.get("Token") or r.get("Asset") or "").strip().upper()
+            if token and token not in self.by_token:
+                self.by_token[token] = r
+
+            is_quote = str(r.get("IsQuote") or "").strip().lower() in _TRUTHY
+            cls = str(r.get("Class") or ("QUOTE" if is_quote else "ASSET")).strip().upper()
+            self.by_class.setdefault(cls, []).append(r)
+
+            eq_usd = _num(r.get("Equity_USD")) or 0.0
+            if eq_usd > 0:
+                self.class_equity[cls] = self.class_equity.get(cls, 0.0) + eq_usd
+
+            if not is_quote or eq_usd <= 0:
+                continue
+            venue = str(r.get("Venue") or "").strip().upper()
+            quote = str(r.get("QuoteSymbol") or r.get("Asset") or "").strip().upper()
+            if venue and quote:
+                key = (venue, quote)
+                self.by_venue_quote[key] = self.by_venue_quote.get(key, 0.0) + eq_usd
+
+
+_EMPTY = _SnapshotIndex([], 0.0)
+_index: _SnapshotIndex = _EMPTY
+_load_lock = threading.Lock()
+_stats: Dict[str, Any] = {"loads": 0, "load_errors": 0, "lookups": 0, "feed_calls": 0}
+
+
+def refresh(force: bool = False) -> _SnapshotIndex:
+    """Return the current index, reloading Unified_Snapshot if it is older than the TTL."""
+    global _index
+    idx = _index
+    if not force and idx.ts > 0 and time.time() - idx.ts < PRICE_ORACLE_TTL_SEC:
+        return idx
+    # Single-flight: one caller reloads, the rest wait and reuse its result.
+    with _load_lock:
+        idx = _index
+        if not force and idx.ts > 0 and time.time() - idx.ts < PRICE_ORACLE_TTL_SEC:
+            return idx
+        if get_all_records_cached_dbaware is None:
+            return idx
+        try:
+            rows = get_all_records_cached_dbaware(
+                UNIFIED_SNAPSHOT_WS,
+                ttl_s=PRICE_ORACLE_TTL_SEC,
+                logical_stream=f"sheet_mirror:{UNIFIED_SNAPSHOT_WS}",
+            ) or []
+            _index = _SnapshotIndex(list(rows), time.time())
+            _stats["loads"] += 1
+        except Exception as e:
+            _stats["load_errors"] += 1
+            warn(f"price_oracle: failed to load {UNIFIED_SNAPSHOT_WS}: {e}")
+            # Keep serving the previous index; retry after one TTL.
+            _index = _SnapshotIndex(idx.rows, time.time())
+        return _index
+
+
+def get_snapshot_price(token: str) -> Tuple[Optional[float], str]:
+    token_up = (token or "").strip().upper()
+    if not token_up:
+        return None, "no_token"
+    _stats["lookups"] += 1
+    row = refresh().by_token.get(token_up)
+    if row is None:
+        return None, "not_found"
+    price = row.get("Price_USD")
+    if price is None:
+        return None, "no_price"
+    try:
+        return float(price), "ok"
+    except Exception:
+        return None, "bad_price"
+
+
+def get_price_usd(token: str, quote: str = "USDT", venue: Optional[str] = None) -> Tuple[Optional[float], str]:
+    """Snapshot price first, then the venue feed (coalesced per symbol inside price_feed)."""
+    p, reason = get_snapshot_price(token)
+    if p is not None:
+        return p, "snapshot"
+    try:
+        from price_feed import get_price_usd as _feed_get_price_usd
+    except Exception:
+        return None, f"no_price ({reason}, feed_missing)"
+    _stats["feed_calls"] += 1
+    p2 = _feed_get_price_usd(token, quote=quote, venue=venue)
+    if p2 is None:
+        return None, f"no_price ({reason}, feed_none)"
+    return p2, "feed"
+
+
+def get_quote_equity_usd(venue: str, quote: str) -> Optional[float]:
+    venue_up = (venue or "").strip().upper()
+    quote_up = (quote or "").strip().upper()
+    if not venue_up or not quote_up:
+        return None
+    _stats["lookups"] += 1
+    return refresh().by_venue_quote.get((venue_up, quote_up))
+
+
+def get_class_equity_usd(asset_class: str) -> Optional[float]:
+    _stats["lookups"] += 1
+    return refresh().class_equity.get((asset_class or "").strip().upper())
+
+
+def rows_for_class(asset_class: str) -> List[Dict[str, Any]]:
+    return list(refresh().by_class.get((asset_class or "").strip().upper(), []))
+
+
+def oracle_stats() -> Dict[str, Any]:
+    idx = _index
+    out = dict(_stats)
+    out.update({
+        "rows": len(idx.rows),
+        "tokens": len(idx.by_token),
+        "venue_quotes": len(idx.by_venue_quote),
+        "age_s": round(time.time() - idx.ts, 1) if idx.ts else None,
+        "ttl_s": PRICE_ORACLE_TTL_SEC,
+    })
+    return out
@@ -0,0 +1,248 @@
+# provider_fanout.py — bounded concurrent fetches for external data providers
+"""
+wallet_monitor and sentiment_radar used to call their providers one at a
+time (Zapper, Covalent per chain, Twitter, YouTube), so a run cost the sum
+of every timeout. This module runs those calls on one shared, bounded pool:
+
+- fan_out(tasks, deadline_s=...) runs {key: callable} concurrently and
+  returns whatever finished before the deadline. Late tasks are reported in
+  `timed_out` (never raised), so callers get partial results.
+- http_get / http_post go through utils._REQ (shared connection pool and
+  retries), wait on a per-provider rate limit and clamp their timeout to
+  the remaining deadline of the fan_out that is running them.
+- Per-provider limits: a token bucket (requests/sec, burst) plus a
+  concurrency cap, so fanning out never hammers one API.
+
+    from provider_fanout import fan_out, http_get
+    res = fan_out({addr: (lambda a=addr: fetch(a)) for addr in addrs}, deadline_s=45)
+    res.results, res.errors, res.timed_out
+
+A fan_out started from inside a fan_out task runs its tasks inline (the
+pool is bounded, and nesting could deadlock it).
+
+Env:
+  FANOUT_MAX_WORKERS   default 8
+  FANOUT_LIMITS        optional overrides, e.g. "zapper=2/2/2,covalent=4/8/4"
+                       (requests per sec / burst / max concurrent)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from utils import TokenBucket, _REQ  # type: ignore
+except Exception:  # pragma: no cover
+    TokenBucket = None  # type: ignore
+    _REQ = None  # type: ignore
+
+FANOUT_MAX_WORKERS = max(1, int(os.getenv("FANOUT_MAX_WORKERS", "8") or "8"))
+
+# provider -> (requests per sec, burst, max concurrent)
+_DEFAULT_LIMITS: Dict[str, Tuple[float, int, int]] = {
+    "zapper": (2.0, 2, 2),
+    "covalent": (4.0, 8, 4),
+    "twitter": (1.0, 2, 2),
+    "youtube": (2.0, 4, 2),
+}
+_FALLBACK_LIMIT: Tuple[float, int, int] = (4.0, 4, 4)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def _parse_limits(raw: str) -> Dict[str, Tuple[float, int, int]]:
+    out: Dict[str, Tuple[float, int, int]] = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        name, spec = part.split("=", 1)
+        bits = spec.split("/")
+        try:
+            rate = float(bits[0])
+            burst = int(bits[1]) if len(bits) > 1 else max(1, int(rate))
+            conc = int(bits[2]) if len(bits) > 2 else burst
+        except Exception:
+            continue
+        out[name.strip().lower()] = (rate, max(1, burst), max(1, conc))
+    return out
+
+
+class _Provider:
+    def __init__(self, name: str, rate: float, burst: int, concurrency: int) -> None:
+        self.name = name
+        self.bucket = TokenBucket(burst, rate) if TokenBucket is not None else None
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.calls = 0
+        self.errors = 0
+        self.throttled_s = 0.0
+
+    def acquire(self, deadline: Optional[float]) -> None:
+        t0 = time.monotonic()
+        while self.bucket is not None and not self.bucket.take(1):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded(f"{self.name}: rate limit wait past deadline")
+            time.sleep(0.05)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self.slots.acquire(timeout=timeout):
+            raise DeadlineExceeded(f"{self.name}: no free slot before deadline")
+        self.throttled_s += time.monotonic() - t0
+
+
+_limits = dict(_DEFAULT_LIMITS)
+_limits.update(_parse_limits(os.getenv("FANOUT_LIMITS", "")))
+_providers: Dict[str, _Provider] = {}
+_providers_lock = threading.Lock()
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def _provider(name: str) -> _Provider:
+    key = (name or "default").lower()
+    p = _providers.get(key)
+    if p is None:
+        with _providers_lock:
+            p = _providers.get(key)
+            if p is None:
+                rate, burst, conc = _limits.get(key, _FALLBACK_LIMIT)
+                p = _providers[key] = _Provider(key, rate, burst, conc)
+    return p
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="fanout")
+    return _pool
+
+
+def remaining_s() -> Optional[float]:
+    """Seconds left in the current fan_out task's deadline (None outside fan_out)."""
+    deadline = getattr(_local, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _request(method: str, provider: str, url: str, *, timeout: float, **kwargs: Any):
+    deadline = getattr(_local, "deadline", None)
+    if deadline is not None:
+        left = deadline - time.monotonic()
+        if left <= 0.05:
+            raise DeadlineExceeded(f"{provider}: deadline reached before request")
+        timeout = min(float(timeout), left)
+    p = _provider(provider)
+    p.acquire(deadline)
+    try:
+        p.calls += 1
+        session = _REQ
+        if session is None:  # pragma: no cover
+            import requests
+            session = requests
+        return session.request(method, url, timeout=timeout, **kwargs)
+    except Exception:
+        p.errors += 1
+        raise
+    finally:
+        p.slots.release()
+
+
+def http_get(provider: str, url: str, *, timeout: float = 20.0, **kwargs: Any):
+    return _request("GET", provider, url, timeout=timeout, **kwargs)
+
+
+def http_post(provider: str, url: str, *, timeout: float = 20.0, **kwargs: Any):
+    return _request("POST", provider, url, timeout=timeout, **kwargs)
+
+
+@dataclass
+class FanOutResult:
+    results: Dict[Any, Any] = field(default_factory=dict)
+    errors: Dict[Any, str] = field(default_factory=dict)
+    timed_out: List[Any] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors and not self.timed_out
+
+
+def _run_task(fn: Callable[[], Any], deadline: float) -> Any:
+    _local.deadline = deadline
+    _local.in_fanout = True
+    try:
+        return fn()
+    finally:
+        _local.deadline = None
+        _local.in_fanout = False
+
+
+def fan_out(tasks: Dict[Any, Callable[[], Any]], *, deadline_s: float) -> FanOutResult:
+    """Run tasks concurrently; return what finished within deadline_s."""
+    t0 = time.monotonic()
+    deadline = t0 + max(0.0, float(deadline_s))
+    outer = getattr(_local, "deadline", None)
+    if outer is not None:
+        deadline = min(deadline, outer)
+    res = FanOutResult()
+
+    if getattr(_local, "in_fanout", False):
+        for key, fn in tasks.items():
+            if time.monotonic() >= deadline:
+                res.timed_out.append(key)
+                continue
+            try:
+                res.results[key] = fn()
+            except DeadlineExceeded:
+                res.timed_out.append(key)
+            except Exception as e:
+                res.errors[key] = f"{e.__class__.__name__}:{e}"
+        res.elapsed_s = time.monotonic() - t0
+        return res
+
+    pool = _get_pool()
+    futures: Dict[Future, Any] = {pool.submit(_run_task, fn, deadline): key for key, fn in tasks.items()}
+    pending = set(futures)
+    while pending:
+        left = deadline - time.monotonic()
+        if left <= 0:
+            break
+        done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+        for fut in done:
+            key = futures[fut]
+            try:
+                res.results[key] = fut.result()
+            except DeadlineExceeded:
+                res.timed_out.append(key)
+            except Exception as e:
+                res.errors[key] = f"{e.__class__.__name__}:{e}"
+    for fut in pending:
+        # Not started yet: drop it. Already running: its requests are clamped
+        # to the deadline, so the worker frees up shortly.
+        fut.cancel()
+        res.timed_out.append(futures[fut])
+    res.elapsed_s = time.monotonic() - t0
+    return res
+
+
+def fanout_stats() -> Dict[str, Any]:
+    return {
+        "max_workers": FANOUT_MAX_WORKERS,
+        "providers": {
+            name: {
+                "calls": p.calls,
+                "errors": p.errors,
+                "throttled_s": round(p.throttled_s, 3),
+                "limit": _limits.get(name, _FALLBACK_LIMIT),
+            }
+            for name, p in sorted(_providers.items())
+        },
+    }
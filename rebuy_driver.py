@@ -6,7 +6,7 @@ from typing import Dict, Any
 
 import gspread  # type: ignore
 
-from utils import get_gspread_client, warn  # type: ignore
+from utils import get_sheet, warn  # type: ignore
 from policy_engine import PolicyEngine
 from trade_guard import guard_trade_intent
 from price_feed import get_price_usd  # NEW
@@ -27,8 +27,7 @@ def _hmac_sign(secret: str, payload: dict) -> str:
 def _open_sheet() -> gspread.Spreadsheet:
     if not SHEET_URL:
         raise RuntimeError("SHEET_URL not set.")
-    gc = get_gspread_client()
-    return gc.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 
 def run_rebuy_driver():
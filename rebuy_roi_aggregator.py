@@ -1,18 +1,14 @@
 # rebuy_roi_aggregator.py
 
 import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 from statistics import mean
 
 def run_rebuy_roi_aggregator():
     print("📊 Syncing Rebuy Performance Stats → Rotation_Stats...")
 
     try:
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_url(os.getenv("SHEET_URL"))
+        sheet = get_sheet()
 
         log_ws = sheet.worksheet("Rotation_Log")
         stats_ws = sheet.worksheet("Rotation_Stats")
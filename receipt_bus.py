@@ -5,7 +5,7 @@ from typing import Any, Dict, Tuple
 from flask import Blueprint, request, jsonify
 
 from hmac_auth import require_hmac
-from utils import get_gspread_client  # you already use this elsewhere
+from utils import get_sheet
 from db_backbone import record_trade_live  # Phase 19: mirror trades into Postgres
 
 bp = Blueprint("receipts_api", __name__, url_prefix="/api/receipts")
@@ -65,8 +65,7 @@ def _append_trade_log(row: Dict[str, Any]) -> None:
     # Connect to Google Sheets and append a normalized row.
     if not SHEET_URL:
         return
-    gc = get_gspread_client()
-    sh = gc.open_by_url(SHEET_URL)
+    sh = get_sheet(SHEET_URL)
     ws = sh.worksheet(TRADE_LOG_WS)
 
     # Ensure consistent ordering; adapt to your current header set.
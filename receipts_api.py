@@ -1,7 +1,7 @@
 # receipts_api.py — legacy /api/receipts/ack → Sheet + Postgres trades
 import os, time, json, hmac, hashlib, sqlite3
 from flask import Blueprint, request, jsonify
-from utils import get_gspread_client, send_telegram_message_dedup  # already in your app
+from utils import get_sheet, send_telegram_message_dedup
 from db_backbone import record_trade_live  # Phase 19: mirror trades into Postgres
 
 bp = Blueprint("receipts_api", __name__)
@@ -82,8 +82,7 @@ def receipts_ack():
 
     # Append to Google Sheet
     try:
-        gc = get_gspread_client()
-        sh = gc.open_by_url(SHEET_URL)
+        sh = get_sheet(SHEET_URL)
         ws = sh.worksheet(TRADE_LOG_SHEET)
     except Exception as e:
         send_telegram_message_dedup(f"⚠️ receipts: sheet open failed: {e}", "rcpt_sheet_open", 30)
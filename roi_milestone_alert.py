@@ -1,13 +1,10 @@
-import gspread
 import os
 import requests
 from datetime import datetime
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
-# Setup auth
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-creds = ServiceAccountCredentials.from_json_keyfile_name("token_vault.json", scope)
-sheet = gspread.authorize(creds).open_by_url(os.getenv("SHEET_URL"))
+# Shared Spreadsheet handle
+sheet = get_sheet()
 
 # Telegram Secrets
 TELEGRAM_TOKEN = os.getenv("BOT_TOKEN")
@@ -1,17 +1,13 @@
 # roi_threshold_validator.py
 
 import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 def run_roi_threshold_validator():
     print("🔎 Running ROI Threshold Validator...")
 
     try:
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_url(os.getenv("SHEET_URL"))
+        sheet = get_sheet()
 
         memory_ws = sheet.worksheet("Rotation_Memory")
         stats_ws = sheet.worksheet("Rotation_Stats")
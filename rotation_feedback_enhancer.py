@@ -24,16 +24,13 @@ import os
 from datetime import datetime
 import math
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 SHEET_URL = os.getenv("SHEET_URL")
 MEMORY_WS = os.getenv("ROTATION_MEMORY_WS", "Rotation_Memory")
 
 def _open_sheet():
-    scope = ["https://spreadsheets.google.com/feeds","https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
-    return client.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 def _get(ws_name):
     try:
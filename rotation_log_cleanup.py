@@ -1,16 +1,12 @@
-import gspread
 import re
 import os
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet, SheetWriteBatch
 
 def run_rotation_log_cleanup():
     print("🧹 Running cleanup on Rotation_Log...")
 
     try:
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_url(os.getenv("SHEET_URL"))
+        sheet = get_sheet()
         log_ws = sheet.worksheet("Rotation_Log")
 
         log_data = log_ws.get_all_values()
@@ -28,14 +24,15 @@ def run_rotation_log_cleanup():
         roi_col = header.index("Follow-up ROI") + 1
         cleaned = 0
 
-        for i, row in enumerate(data):
-            if len(row) <= roi_col - 1:
-                continue
-            value = row[roi_col - 1].strip()
-            if value and not re.match(r"^-?\d+(\.\d+)?$", value):
-                log_ws.update_cell(i + 2, roi_col, "")
-                cleaned += 1
-                print(f"❌ Cleared non-numeric ROI in row {i+2}: '{value}'")
+        with SheetWriteBatch(log_ws, header=header) as batch:
+            for i, row in enumerate(data):
+                if len(row) <= roi_col - 1:
+                    continue
+                value = row[roi_col - 1].strip()
+                if value and not re.match(r"^-?\d+(\.\d+)?$", value):
+                    batch.set(i + 2, "Follow-up ROI", "")
+                    cleaned += 1
+                    print(f"❌ Cleared non-numeric ROI in row {i+2}: '{value}'")
 
         print(f"✅ Cleanup complete. {cleaned} entries sanitized.")
 
@@ -2,8 +2,7 @@
 import os, time
 from datetime import datetime
 
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 # ---- Safe imports from utils (with graceful fallbacks) -----------------------
 try:
@@ -24,12 +23,8 @@ except Exception:  # fallback if utils isn’t available in local test context
         except Exception:
             return None
 
-SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-
 def _get_sheet():
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", SCOPE)
-    client = gspread.authorize(creds)
-    return client.open_by_url(os.getenv("SHEET_URL"))
+    return get_sheet()
 
 @with_sheet_backoff
 def _ws(sheet, name):
@@ -2,12 +2,17 @@ from utils import ws_batch_update, get_ws_cached
 
 # rotation_memory.py — patched to accept 'Follow-up ROI' as ROI source
 import os
-from utils import with_sheet_backoff, get_gspread_client, ping_webhook_debug
+from utils import with_sheet_backoff, get_sheet, ping_webhook_debug
+
+try:
+    import analytics_core as _analytics
+except Exception:
+    _analytics = None
 
 SHEET_URL = os.getenv("SHEET_URL")
 
 def _open_sheet():
-    return get_gspread_client().open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 @with_sheet_backoff
 def _get_all(ws):
@@ -34,45 +39,78 @@ def _safe_float(x):
     except Exception:
         return None
 
+_ROI_CANDIDATES = ("Follow-up ROI", "ROI %", "ROI")
+
+def _aggregate_shared():
+    """
+    Per-token {wins, total, sum} from the shared analytics table for Rotation_Log,
+    only when performance_dashboard has already loaded it and parsed Token.
+    Building that table cold is slower than the sheet loop
+    (tools/bench_analytics_core.py), so None -> use the sheet loop.
+    """
+    if _analytics is None or not _analytics.HAVE_PANDAS:
+        return None
+    t = _analytics.peek_table("Rotation_Log")
+    if t is None or t.empty or not t.has("Token") or not t.parsed("Token", "tok"):
+        return None
+    roi_col = next((c for c in _ROI_CANDIDATES if t.has(c)), None)
+    if roi_col is None:
+        return None
+    stats = _analytics.roi_stats(t.tokens(), t.num(roi_col))
+    return {
+        tok: {"wins": int(w), "total": int(n), "sum": float(sm)}
+        for tok, w, n, sm in zip(stats.index, stats["wins"], stats["n"], stats["sum"])
+    }
+
+def _aggregate_log(log_vals, tok_c, roi_c):
+    """Per-token {wins, total, sum} over Rotation_Log rows with a numeric ROI."""
+    agg = {}
+    for row in log_vals[1:]:
+        t = _normalize(row[tok_c] if tok_c < len(row) else "")
+        r = _safe_float(row[roi_c] if roi_c < len(row) else "")
+        if not t or r is None:
+            continue
+        a = agg.setdefault(t, {"wins": 0, "total": 0, "sum": 0.0})
+        a["total"] += 1
+        a["sum"] += r
+        if r > 0:
+            a["wins"] += 1
+    return agg
+
 def run_rotation_memory():
     try:
         sh = _open_sheet()
-        log_ws = sh.worksheet("Rotation_Log")
         stats_ws = sh.worksheet("Rotation_Stats")
-        log_vals = _get_all(log_ws)
         stats_vals = _get_all(stats_ws)
 
-        if not log_vals or not stats_vals:
-            print("⚠️ Missing data for memory sync.")
-            return
+        agg = _aggregate_shared()
+        if agg is None:
+            log_vals = _get_all(sh.worksheet("Rotation_Log"))
+            if not log_vals:
+                print("⚠️ Missing data for memory sync.")
+                return
 
-        lh = _header_index_map(log_vals[0])
-        sh_idx = _header_index_map(stats_vals[0])
+            lh = _header_index_map(log_vals[0])
+            tok_c = lh.get("Token")
 
-        tok_c = lh.get("Token")
+            # 🔧 Accept Follow-up ROI as primary, then fallback to 'ROI %' or 'ROI'
+            roi_c = None
+            for candidate in _ROI_CANDIDATES:
+                if candidate in lh:
+                    roi_c = lh.get(candidate)
+                    break
 
-        # 🔧 Accept Follow-up ROI as primary, then fallback to 'ROI %' or 'ROI'
-        roi_c = None
-        for candidate in ("Follow-up ROI", "ROI %", "ROI"):
-            if candidate in lh:
-                roi_c = lh.get(candidate)
-                break
+            if tok_c is None or roi_c is None:
+                print("⛔️ Rotation_Log must include 'Token' and 'Follow-up ROI' (or 'ROI %' / 'ROI').")
+                return
 
-        if tok_c is None or roi_c is None:
-            print("⛔️ Rotation_Log must include 'Token' and 'Follow-up ROI' (or 'ROI %' / 'ROI').")
+            agg = _aggregate_log(log_vals, tok_c, roi_c)
+
+        if not stats_vals:
+            print("⚠️ Missing data for memory sync.")
             return
 
-        agg = {}
-        for row in log_vals[1:]:
-            t = _normalize(row[tok_c] if tok_c < len(row) else "")
-            r = _safe_float(row[roi_c] if roi_c < len(row) else "")
-            if not t or r is None:
-                continue
-            a = agg.setdefault(t, {"wins": 0, "total": 0, "sum": 0.0})
-            a["total"] += 1
-            a["sum"] += r
-            if r > 0:
-                a["wins"] += 1
+        sh_idx = _header_index_map(stats_vals[0])
 
         # Ensure columns exist
         for name in ["Memory Win%", "Memory Avg ROI%", "Memory Weight"]:
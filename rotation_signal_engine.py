@@ -5,7 +5,7 @@
 import os
 from datetime import datetime
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 SHEET_URL = os.getenv("SHEET_URL")
 MILESTONES = [3, 7, 14, 30]
@@ -14,10 +14,7 @@ BOT_TOKEN = os.getenv("BOT_TOKEN") or os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
 def _open_sheet():
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
-    return client.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 def _safe_int(v, default=0):
     try:
@@ -1,9 +1,8 @@
 # sentiment_alerts.py
 
 import os
-import gspread
 from datetime import datetime, timedelta
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 from utils import send_telegram_prompt, ping_webhook_debug
 
 def run_sentiment_alerts():
@@ -11,10 +10,7 @@ def run_sentiment_alerts():
 
     try:
         # Auth
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_url(os.getenv("SHEET_URL"))
+        sheet = get_sheet()
 
         summary_ws = sheet.worksheet("Sentiment_Summary")
         alerts_ws = sheet.worksheet("Sentiment_Alerts")
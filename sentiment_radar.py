@@ -1,11 +1,13 @@
-import os, time, requests, gspread
+import os, time, gspread
 from datetime import datetime, timezone
 from oauth2client.service_account import ServiceAccountCredentials
 from utils import with_sheet_backoff, send_telegram_message
+from provider_fanout import fan_out, http_get
 
 ENABLE_TWITTER = True
 YOUTUBE_ENABLED = os.getenv("YOUTUBE_ENABLED", "false").lower() == "true"
 _YT_COOLDOWN_FILE = "/tmp/nova_yt_quota.block"
+SENTIMENT_FETCH_DEADLINE_S = float(os.getenv("SENTIMENT_FETCH_DEADLINE_S", "30"))
 
 def _utc_ymd(): return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 def _yt_cooldown_active(): return os.path.exists(_YT_COOLDOWN_FILE) and open(_YT_COOLDOWN_FILE).read().strip() == _utc_ymd()
@@ -18,7 +20,7 @@ def fetch_twitter_mentions(token: str) -> int:
     try:
         headers = {"Authorization": f"Bearer {bearer}"}
         url = f"https://api.twitter.com/2/tweets/search/recent?query={token} -is:retweet lang:en&max_results=10"
-        r = requests.get(url, headers=headers, timeout=12)
+        r = http_get("twitter", url, headers=headers, timeout=12)
         if r.status_code == 429:
             print("⚠️ Twitter 429; entering cooldown.")
             return 0
@@ -32,7 +34,7 @@ def fetch_youtube_mentions(token: str) -> int:
     if not api_key: return 0
     try:
         url = f"https://www.googleapis.com/youtube/v3/search?key={api_key}&part=snippet&type=video&maxResults=3&q={token}"
-        r = requests.get(url, timeout=12)
+        r = http_get("youtube", url, timeout=12)
         if r.status_code != 200: return 0
         data = r.json()
         if "error" in data and data["error"].get("errors", [{}])[0].get("reason") == "quotaExceeded":
@@ -45,7 +47,14 @@ def fetch_youtube_mentions(token: str) -> int:
 def run_sentiment_radar():
     print("📡 Running Sentiment Radar...")
     tokens = ["MIND","FOMO","etc"]  # stub
+    tasks = {}
     for t in tokens:
-        tw = fetch_twitter_mentions(t)
-        yt = fetch_youtube_mentions(t)
+        tasks[(t, "twitter")] = lambda t=t: fetch_twitter_mentions(t)
+        tasks[(t, "youtube")] = lambda t=t: fetch_youtube_mentions(t)
+    res = fan_out(tasks, deadline_s=SENTIMENT_FETCH_DEADLINE_S)
+    for t in tokens:
+        tw = res.results.get((t, "twitter"), 0)
+        yt = res.results.get((t, "youtube"), 0)
         print(f"{t}: Twitter={tw}, YouTube={yt}")
+    if res.timed_out:
+        print(f"⚠️ Sentiment Radar: {len(res.timed_out)} provider calls missed the {SENTIMENT_FETCH_DEADLINE_S:.0f}s deadline.")
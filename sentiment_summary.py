@@ -1,7 +1,6 @@
 import os
-import gspread
 from datetime import datetime
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 from collections import defaultdict
 
 # === CONFIG ===
@@ -11,10 +10,7 @@ SIGNAL_SCORE_NEGATIVE = -0.2
 
 # === SETUP ===
 def get_ws(sheet_name):
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", scope)
-    client = gspread.authorize(creds)
-    sheet = client.open_by_url(os.getenv("SHEET_URL"))
+    sheet = get_sheet()
     return sheet.worksheet(sheet_name)
 
 # === MAIN FUNCTION ===
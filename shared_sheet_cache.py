@@ -0,0 +1,381 @@
+# shared_sheet_cache.py — Sheets read cache shared by the web and worker processes
+"""
+utils.get_all_records_cached / get_values_cached keep per-process dicts, so
+`gunicorn wsgi:app` and `python worker.py` each read Unified_Snapshot,
+Wallet_Monitor, Policy_Bias, ... and each spend quota on it. When enabled,
+this module adds a second, shared layer under those dicts:
+
+- Backend: Postgres (sheet_cache_entries / sheet_cache_versions /
+  sheet_cache_procs) when DB_URL is set, else a local SQLite (WAL) file.
+- Version stamps: every tab has a version; "*" is a global epoch bumped by
+  clear_sheet_caches(). An entry (shared or local) is only valid while it
+  was stored under the tab's current version, so invalidate_tab() in one
+  process retires the other process's copies too. Each process re-reads the
+  (tiny) version table at most every SHEETS_SHARED_CACHE_POLL_S.
+- Hit-rate: each process counts local / shared hits and misses and
+  publishes them every SHEETS_SHARED_CACHE_REPORT_S; cache_report() returns
+  every process's numbers (for /healthz).
+- Failure: a backend error disables the shared layer for
+  SHEETS_SHARED_CACHE_RETRY_S; reads fall back to per-process caching.
+
+Env:
+  SHEETS_SHARED_CACHE            0 (default) | 1/auto (Postgres if DB_URL else SQLite) | sqlite | pg
+  SHEETS_SHARED_CACHE_PATH       default sheet_read_cache.db (SQLite backend)
+  SHEETS_SHARED_CACHE_POLL_S     default 1
+  SHEETS_SHARED_CACHE_REPORT_S   default 60
+  SHEETS_SHARED_CACHE_RETRY_S    default 60
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SHEETS_SHARED_CACHE = (os.getenv("SHEETS_SHARED_CACHE", "0") or "0").strip().lower()
+SHEETS_SHARED_CACHE_PATH = os.getenv("SHEETS_SHARED_CACHE_PATH", "sheet_read_cache.db")
+SHEETS_SHARED_CACHE_POLL_S = float(os.getenv("SHEETS_SHARED_CACHE_POLL_S", "1") or "1")
+SHEETS_SHARED_CACHE_REPORT_S = float(os.getenv("SHEETS_SHARED_CACHE_REPORT_S", "60") or "60")
+SHEETS_SHARED_CACHE_RETRY_S = float(os.getenv("SHEETS_SHARED_CACHE_RETRY_S", "60") or "60")
+
+_DB_URL = os.getenv("DB_URL") or os.getenv("DATABASE_URL") or ""
+
+_GLOBAL = "*"
+
+try:
+    from utils import warn  # type: ignore
+except Exception:  # pragma: no cover
+    def warn(msg: str) -> None:  # type: ignore
+        print("[WARN]", msg)
+
+
+def _process_name() -> str:
+    role = os.getenv("DYNO") or os.path.splitext(os.path.basename(sys.argv[0] or ""))[0] or "python"
+    return f"{role}@{socket.gethostname()}:{os.getpid()}"
+
+
+class _SqliteBackend:
+    """Local file; shared by processes on the same host."""
+
+    name = "sqlite"
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS sheet_cache_entries (
+             key TEXT PRIMARY KEY, tab TEXT NOT NULL, version INTEGER NOT NULL,
+             expires_at REAL NOT NULL, stored_at REAL NOT NULL, payload TEXT NOT NULL)""",
+        """CREATE TABLE IF NOT EXISTS sheet_cache_versions (
+             tab TEXT PRIMARY KEY, version INTEGER NOT NULL, updated_at REAL NOT NULL)""",
+        """CREATE TABLE IF NOT EXISTS sheet_cache_procs (
+             proc TEXT PRIMARY KEY, stats TEXT NOT NULL, updated_at REAL NOT NULL)""",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.con = sqlite3.connect(path, isolation_level=None, timeout=5, check_same_thread=False)
+        self.con.execute("PRAGMA journal_mode=WAL;")
+        self.con.execute("PRAGMA synchronous=NORMAL;")
+        for ddl in self.SCHEMA:
+            self.con.execute(ddl)
+
+    def get(self, key: str) -> Optional[Tuple[int, float, str]]:
+        with self.lock:
+            row = self.con.execute(
+                "SELECT version, expires_at, payload FROM sheet_cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        return (int(row[0]), float(row[1]), row[2]) if row else None
+
+    def put(self, key: str, tab: str, version: int, expires_at: float, payload: str) -> None:
+        with self.lock:
+            self.con.execute(
+                "INSERT INTO sheet_cache_entries (key, tab, version, expires_at, stored_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET tab = excluded.tab, "
+                "version = excluded.version, expires_at = excluded.expires_at, "
+                "stored_at = excluded.stored_at, payload = excluded.payload",
+                (key, tab, version, expires_at, time.time(), payload),
+            )
+
+    def versions(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.con.execute("SELECT tab, version FROM sheet_cache_versions").fetchall()
+        return {str(t): int(v) for t, v in rows}
+
+    def bump(self, tab: str) -> None:
+        with self.lock:
+            self.con.execute(
+                "INSERT INTO sheet_cache_versions (tab, version, updated_at) VALUES (?, 1, ?) "
+                "ON CONFLICT(tab) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at",
+                (tab, time.time()),
+            )
+            # Superseded entries can never hit again.
+            if tab == _GLOBAL:
+                self.con.execute("DELETE FROM sheet_cache_entries")
+            else:
+                self.con.execute("DELETE FROM sheet_cache_entries WHERE tab = ?", (tab,))
+
+    def report(self, proc: str, stats: str) -> None:
+        with self.lock:
+            self.con.execute(
+                "INSERT INTO sheet_cache_procs (proc, stats, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(proc) DO UPDATE SET stats = excluded.stats, updated_at = excluded.updated_at",
+                (proc, stats, time.time()),
+            )
+            self.con.execute("DELETE FROM sheet_cache_entries WHERE expires_at < ?", (time.time() - 3600,))
+
+    def reports(self, since: float) -> List[Tuple[str, str, float]]:
+        with self.lock:
+            return self.con.execute(
+                "SELECT proc, stats, updated_at FROM sheet_cache_procs WHERE updated_at >= ? ORDER BY proc",
+                (since,),
+            ).fetchall()
+
+
+class _PgBackend:
+    """Postgres via db_pool; shared by every process with DB_URL."""
+
+    name = "pg"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sheet_cache_entries (
+      key text PRIMARY KEY, tab text NOT NULL, version bigint NOT NULL,
+      expires_at double precision NOT NULL, stored_at timestamptz NOT NULL DEFAULT now(),
+      payload text NOT NULL);
+    CREATE INDEX IF NOT EXISTS idx_sheet_cache_entries_tab ON sheet_cache_entries(tab);
+    CREATE TABLE IF NOT EXISTS sheet_cache_versions (
+      tab text PRIMARY KEY, version bigint NOT NULL, updated_at timestamptz NOT NULL DEFAULT now());
+    CREATE TABLE IF NOT EXISTS sheet_cache_procs (
+      proc text PRIMARY KEY, stats jsonb NOT NULL, updated_at double precision NOT NULL);
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._exec(self.SCHEMA)
+
+    def _exec(self, sql: str, params: Any = None, fetch: bool = False):
+        from db_pool import pg_conn  # type: ignore
+
+        with pg_conn(url=self.url, autocommit=True, statement_timeout_ms=2000, caller="shared_sheet_cache") as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                return cur.fetchall() if fetch else None
+
+    def get(self, key: str) -> Optional[Tuple[int, float, str]]:
+        rows = self._exec(
+            "SELECT version, expires_at, payload FROM sheet_cache_entries WHERE key = %s", (key,), fetch=True
+        )
+        return (int(rows[0][0]), float(rows[0][1]), rows[0][2]) if rows else None
+
+    def put(self, key: str, tab: str, version: int, expires_at: float, payload: str) -> None:
+        self._exec(
+            "INSERT INTO sheet_cache_entries (key, tab, version, expires_at, payload) VALUES (%s, %s, %s, %s, %s) "
+            "ON CONFLICT (key) DO UPDATE SET tab = EXCLUDED.tab, version = EXCLUDED.version, "
+            "expires_at = EXCLUDED.expires_at, stored_at = now(), payload = EXCLUDED.payload",
+            (key, tab, version, expires_at, payload),
+        )
+
+    def versions(self) -> Dict[str, int]:
+        rows = self._exec("SELECT tab, version FROM sheet_cache_versions", fetch=True) or []
+        return {str(t): int(v) for t, v in rows}
+
+    def bump(self, tab: str) -> None:
+        self._exec(
+            "INSERT INTO sheet_cache_versions (tab, version) VALUES (%s, 1) "
+            "ON CONFLICT (tab) DO UPDATE SET version = sheet_cache_versions.version + 1, updated_at = now()",
+            (tab,),
+        )
+        if tab == _GLOBAL:
+            self._exec("DELETE FROM sheet_cache_entries")
+        else:
+            self._exec("DELETE FROM sheet_cache_entries WHERE tab = %s", (tab,))
+
+    def report(self, proc: str, stats: str) -> None:
+        self._exec(
+            "INSERT INTO sheet_cache_procs (proc, stats, updated_at) VALUES (%s, %s::jsonb, %s) "
+            "ON CONFLICT (proc) DO UPDATE SET stats = EXCLUDED.stats, updated_at = EXCLUDED.updated_at",
+            (proc, stats, time.time()),
+        )
+        self._exec("DELETE FROM sheet_cache_entries WHERE expires_at < %s", (time.time() - 3600,))
+
+    def reports(self, since: float) -> List[Tuple[str, str, float]]:
+        rows = self._exec(
+            "SELECT proc, stats::text, updated_at FROM sheet_cache_procs WHERE updated_at >= %s ORDER BY proc",
+            (since,), fetch=True,
+        ) or []
+        return [(r[0], r[1], float(r[2])) for r in rows]
+
+
+_lock = threading.Lock()
+_backend: Any = None
+_backend_tried = False
+_down_until = 0.0
+_versions: Dict[str, int] = {}
+_versions_at = 0.0
+_reported_at = 0.0
+_proc = _process_name()
+
+_stats: Dict[str, Any] = {
+    "local_hits": 0,
+    "shared_hits": 0,
+    "misses": 0,
+    "stale_versions": 0,
+    "invalidations": 0,
+    "errors": 0,
+}
+
+
+def _make_backend() -> Any:
+    mode = SHEETS_SHARED_CACHE
+    if mode in ("", "0", "false", "no", "off"):
+        return None
+    if mode == "pg" or (mode in ("1", "true", "yes", "on", "auto") and _DB_URL):
+        return _PgBackend(_DB_URL)
+    return _SqliteBackend(SHEETS_SHARED_CACHE_PATH)
+
+
+def _get_backend() -> Any:
+    global _backend, _backend_tried
+    if time.time() < _down_until:
+        return None
+    if not _backend_tried:
+        with _lock:
+            if not _backend_tried:
+                try:
+                    _backend = _make_backend()
+                    _backend_tried = True
+                except Exception as e:  # retried after SHEETS_SHARED_CACHE_RETRY_S
+                    _fail("init", e)
+                    return None
+    return _backend
+
+
+def _fail(op: str, e: Exception) -> None:
+    global _down_until
+    _stats["errors"] += 1
+    if time.time() >= _down_until:
+        warn(f"shared_sheet_cache: {op} failed, per-process caching only for {SHEETS_SHARED_CACHE_RETRY_S:.0f}s: {e!r}")
+    _down_until = time.time() + SHEETS_SHARED_CACHE_RETRY_S
+
+
+def enabled() -> bool:
+    return _get_backend() is not None
+
+
+def tab_version(tab: str) -> int:
+    """Current version stamp for tab (tab version + global epoch); 0 when disabled."""
+    global _versions, _versions_at
+    be = _get_backend()
+    if be is None:
+        return _versions.get(tab, 0) + _versions.get(_GLOBAL, 0)
+    if time.time() - _versions_at >= SHEETS_SHARED_CACHE_POLL_S:
+        try:
+            _versions = be.versions()
+        except Exception as e:
+            _fail("version poll", e)
+        _versions_at = time.time()
+        _maybe_report(be)
+    return _versions.get(tab, 0) + _versions.get(_GLOBAL, 0)
+
+
+def note(kind: str) -> None:
+    """Count a lookup outcome: local_hits / shared_hits / misses / stale_versions."""
+    _stats[kind] = _stats.get(kind, 0) + 1
+
+
+def get(key: str, tab: str) -> Optional[Tuple[Any, float, int]]:
+    """(value, expires_at, version) from the shared layer, or None."""
+    be = _get_backend()
+    if be is None:
+        return None
+    try:
+        row = be.get(key)
+    except Exception as e:
+        _fail("get", e)
+        return None
+    if row is None:
+        return None
+    version, expires_at, payload = row
+    if version != tab_version(tab):
+        _stats["stale_versions"] += 1
+        return None
+    if time.time() >= expires_at:
+        return None
+    try:
+        return json.loads(payload), expires_at, version
+    except Exception:
+        return None
+
+
+def put(key: str, tab: str, value: Any, ttl_s: float, version: int) -> None:
+    be = _get_backend()
+    if be is None:
+        return
+    try:
+        be.put(key, tab, version, time.time() + float(ttl_s),
+               json.dumps(value, separators=(",", ":"), default=str))
+    except Exception as e:
+        _fail("put", e)
+
+
+def invalidate(tab: Optional[str] = None) -> None:
+    """Bump tab's version (None: the global epoch) for every process."""
+    t = tab or _GLOBAL
+    _stats["invalidations"] += 1
+    # Local view first, so this process never serves its own stale copy.
+    _versions[t] = _versions.get(t, 0) + 1
+    be = _get_backend()
+    if be is None:
+        return
+    try:
+        be.bump(t)
+        _versions.update(be.versions())
+    except Exception as e:
+        _fail("invalidate", e)
+
+
+def local_stats() -> Dict[str, Any]:
+    out = dict(_stats)
+    lookups = out["local_hits"] + out["shared_hits"] + out["misses"]
+    out["lookups"] = lookups
+    out["hit_rate"] = round((out["local_hits"] + out["shared_hits"]) / lookups, 4) if lookups else None
+    out["shared_hit_rate"] = round(out["shared_hits"] / lookups, 4) if lookups else None
+    return out
+
+
+def _maybe_report(be: Any) -> None:
+    global _reported_at
+    if time.time() - _reported_at < SHEETS_SHARED_CACHE_REPORT_S:
+        return
+    _reported_at = time.time()
+    try:
+        be.report(_proc, json.dumps(local_stats()))
+    except Exception as e:
+        _fail("report", e)
+
+
+def cache_report() -> Dict[str, Any]:
+    """This process's hit rate plus the last report of every process sharing the backend."""
+    be = _get_backend()
+    out: Dict[str, Any] = {
+        "backend": getattr(be, "name", None),
+        "process": _proc,
+        "local": local_stats(),
+        "processes": {},
+    }
+    if be is None:
+        return out
+    try:
+        for proc, stats, ts in be.reports(time.time() - 10 * SHEETS_SHARED_CACHE_REPORT_S):
+            try:
+                p = json.loads(stats) if isinstance(stats, str) else stats
+            except Exception:
+                p = {}
+            p["reported_age_s"] = int(time.time() - ts)
+            out["processes"][proc] = p
+    except Exception as e:
+        out["error"] = repr(e)
+    return out
@@ -26,6 +26,8 @@ import logging
 import hashlib
 from typing import Any, Dict, List, Tuple
 
+import config_service
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_TABS = [
@@ -41,18 +43,11 @@ def _env_bool(name: str, default: str = "0") -> bool:
     return str(v).strip().lower() in ("1", "true", "yes", "on")
 
 def _load_db_read_json() -> dict:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        return json.loads(raw)
-    except Exception:
-        return {}
-
-_CFG = _load_db_read_json()
+    return config_service.db_read_json()
 
 def _cfg_get(key: str, default=None):
-    v = _CFG.get(key, default)
+    # read per call so reloads apply without a restart (config_service parses once per change)
+    v = _load_db_read_json().get(key, default)
     return default if v is None else v
 
 def _get_tabs() -> List[str]:
@@ -1,15 +1,33 @@
-import os, json
+import os, json, time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
+# Sources flushed to Sheets, in order. Each keeps its own high-water mark in
+# sheet_mirror_watermarks so a cycle only looks at rows newer than the last
+# mirrored id (instead of re-checking the first LIMIT rows forever).
+SOURCES = ("council_events", "wnh_events")
 
+# Rows fetched per source per cycle; each tab gets one append_rows call.
+BATCH_ROWS = int(os.getenv("SHEET_MIRROR_BATCH_ROWS", "1000"))
+HEADER_TTL_S = int(os.getenv("SHEET_MIRROR_HEADER_TTL_S", "600"))
+# A tab whose append fails is skipped for a growing delay so it can't hold
+# back (or crowd out) the other tabs of its source.
+TAB_BACKOFF_BASE_S = float(os.getenv("SHEET_MIRROR_TAB_BACKOFF_BASE_S", "30"))
+TAB_BACKOFF_MAX_S = float(os.getenv("SHEET_MIRROR_TAB_BACKOFF_MAX_S", "1800"))
+
+_header_cache: dict = {}  # tab -> (expires_at, header list)
+_tab_backoff: dict = {}   # (source, tab) -> (consecutive failures, retry_at)
+
+
+@contextmanager
 def _pg_connect():
-    import psycopg2  # type: ignore
+    """Pooled autocommit connection (db_pool) instead of a connect per call."""
+    from db_pool import pg_conn  # type: ignore
     url = (os.getenv("DATABASE_URL") or os.getenv("DB_URL") or "").strip()
     if not url:
         raise RuntimeError("DATABASE_URL/DB_URL not set")
-    conn = psycopg2.connect(url)
-    conn.autocommit = True
-    return conn
+    with pg_conn(url=url, autocommit=True, caller="sheet_mirror_worker") as conn:
+        yield conn
 
 
 def _safe_json(v) -> str:
@@ -21,125 +39,225 @@ def _safe_json(v) -> str:
         return str(v)
 
 
-def _append_row_dict_to_sheet(tab: str, row_dict: dict) -> dict:
+def _ensure_schema(cur) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sheet_mirror_watermarks (
+          source TEXT PRIMARY KEY,
+          last_id BIGINT NOT NULL DEFAULT 0,
+          updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+
+
+def _get_watermark(cur, source: str) -> int:
+    cur.execute("SELECT last_id FROM sheet_mirror_watermarks WHERE source=%s", (source,))
+    r = cur.fetchone()
+    return int(r[0]) if r and r[0] is not None else 0
+
+
+def _set_watermark(cur, source: str, last_id: int) -> None:
+    cur.execute(
+        """
+        INSERT INTO sheet_mirror_watermarks(source, last_id, updated_at)
+        VALUES (%s, %s, now())
+        ON CONFLICT (source) DO UPDATE
+          SET last_id = GREATEST(sheet_mirror_watermarks.last_id, EXCLUDED.last_id),
+              updated_at = now()
+        """,
+        (source, int(last_id)),
+    )
+
+
+def _tab_key(source: str, tab: str) -> str:
+    return f"{source}:{tab}"
+
+
+def _fetch_pending(cur, source: str, after_id: int, limit: int, skip_tabs: list) -> list:
+    """
+    Rows newer than the source watermark and their tab's own watermark that are
+    not yet in sheet_mirror_events (anti-join); tabs in skip_tabs are left out.
+    """
+    cur.execute(
+        f"""
+        SELECT e.id, e.tab, e.row_hash, e.payload
+        FROM {source} e
+        LEFT JOIN sheet_mirror_watermarks w ON w.source = %s || ':' || e.tab
+        WHERE e.id > GREATEST(%s, COALESCE(w.last_id, 0))
+          AND NOT (e.tab = ANY(%s))
+          AND NOT EXISTS (
+            SELECT 1 FROM sheet_mirror_events m
+            WHERE m.tab = e.tab AND m.row_hash = e.row_hash
+          )
+        ORDER BY e.id ASC
+        LIMIT %s
+        """,
+        (source, int(after_id), list(skip_tabs), int(limit)),
+    )
+    return cur.fetchall()
+
+
+def _max_id(cur, source: str) -> int:
+    cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {source}")
+    r = cur.fetchone()
+    return int(r[0]) if r else 0
+
+
+def _get_header(tab: str, ws) -> list:
+    now = time.time()
+    item = _header_cache.get(tab)
+    if item and now < item[0]:
+        return item[1]
+    header = ws.row_values(1) or []
+    if header:
+        _header_cache[tab] = (now + HEADER_TTL_S, header)
+    return header
+
+
+def _append_rows_to_sheet(tab: str, row_dicts: list) -> dict:
     """
-    Uses your existing, bullet-proof header-mapped append.
-    If you want, we can later split Council append into its own helper,
-    but for now this keeps it consistent with what already works.
+    Header-mapped batch append: one append_rows call per tab.
+    The header row is cached per tab (SHEET_MIRROR_HEADER_TTL_S).
     """
-    from wnh_logger import append_row_dict  # your proven helper
-    # append_row_dict reads tab from DB_READ_JSON. We need explicit tab routing.
-    # So we pass the tab explicitly via a reserved key and handle it in wnh_logger (small patch),
-    # OR we do a local append here. Keeping local to avoid touching wnh_logger:
     try:
         from utils import get_ws_cached  # type: ignore
-        ws = get_ws_cached(tab, ttl_s=10)
-        header = ws.row_values(1) or []
+        ws = get_ws_cached(tab, ttl_s=300)
+        header = _get_header(tab, ws)
         if not header:
             return {"ok": False, "reason": f"Empty header row in {tab}"}
-        out = [row_dict.get(h, "") for h in header]
+        out = [[d.get(h, "") for h in header] for d in row_dicts]
         try:
-            ws.append_row(out, value_input_option="USER_ENTERED")
+            ws.append_rows(out, value_input_option="USER_ENTERED")
         except Exception:
-            ws.append_row(out)
+            # Header may have changed under us; refresh it on the next cycle.
+            _header_cache.pop(tab, None)
+            raise
         try:
             from db_mirror import mirror_append  # type: ignore
-            mirror_append(tab, [out])
+            mirror_append(tab, out)
         except Exception:
             pass
-        return {"ok": True}
+        return {"ok": True, "rows": len(out)}
     except Exception as e:
         return {"ok": False, "reason": f"{e.__class__.__name__}:{e}"}
 
 
-def _already_mirrored(cur, tab: str, row_hash: str) -> bool:
-    try:
-        cur.execute(
-            "SELECT 1 FROM sheet_mirror_events WHERE tab=%s AND row_hash=%s LIMIT 1",
-            (tab, row_hash),
-        )
-        return cur.fetchone() is not None
-    except Exception:
-        return False
-
-
-def _mark_mirrored(cur, tab: str, row_hash: str, payload: dict):
+def _mark_mirrored(cur, records: list) -> None:
+    """records: list of (tab, row_hash, payload_dict)."""
+    if not records:
+        return
     try:
-        cur.execute(
+        from psycopg2.extras import execute_values  # type: ignore
+        execute_values(
+            cur,
             """
             INSERT INTO sheet_mirror_events(tab, row_hash, payload, created_at)
-            VALUES (%s, %s, %s::jsonb, now())
+            VALUES %s
             ON CONFLICT DO NOTHING
             """,
-            (tab, row_hash, _safe_json(payload)),
+            [(tab, rh, _safe_json(p)) for tab, rh, p in records],
+            template="(%s, %s, %s::jsonb, now())",
+            page_size=500,
         )
     except Exception:
         pass
 
 
-def run_sheet_mirror_worker(limit: int = 100) -> dict:
+def _flush_source(cur, source: str, limit: int) -> dict:
+    wm = _get_watermark(cur, source)
+    now = time.time()
+    failing = [tab for src, tab in _tab_backoff if src == source]
+    skip = [tab for tab in failing if _tab_backoff[(source, tab)][1] > now]
+    rows = _fetch_pending(cur, source, wm, limit, skip)
+    if not rows:
+        # Everything up to MAX(id) is mirrored; jump the watermark forward
+        # (unless a failing tab still has rows behind it).
+        top = _max_id(cur, source)
+        if top > wm and not failing:
+            _set_watermark(cur, source, top)
+            wm = top
+        out = {"rows": 0, "watermark": wm}
+        if skip:
+            out["backing_off"] = skip
+        return out
+
+    by_tab: dict = {}
+    seen = set()
+    duplicates = 0
+    for _id, tab, rh, payload in rows:
+        # Identical events in one batch go out once (sheet_mirror_events is keyed by hash).
+        if (tab, rh) in seen:
+            duplicates += 1
+            continue
+        seen.add((tab, rh))
+        row_dict = payload if isinstance(payload, dict) else {}
+        by_tab.setdefault(tab, []).append((int(_id), rh, row_dict))
+
+    written = 0
+    errors = []
+    for tab, items in by_tab.items():
+        r = _append_rows_to_sheet(tab, [d for _, _, d in items])
+        if r.get("ok"):
+            written += len(items)
+            _mark_mirrored(cur, [(tab, rh, d) for _, rh, d in items])
+            _set_watermark(cur, _tab_key(source, tab), items[-1][0])
+            _tab_backoff.pop((source, tab), None)
+        else:
+            errors.append(f"{tab}:{r.get('reason')}")
+            fails = _tab_backoff.get((source, tab), (0, 0.0))[0] + 1
+            delay = min(TAB_BACKOFF_MAX_S, TAB_BACKOFF_BASE_S * (2 ** (fails - 1)))
+            _tab_backoff[(source, tab)] = (fails, time.time() + delay)
+
+    # The source watermark is only a floor: it stays put while any tab of
+    # this source is failing (its rows may sit anywhere behind). Healthy tabs
+    # advance their own watermark above, so they don't re-select rows.
+    still_failing = any(src == source for src, _ in _tab_backoff)
+    new_wm = wm if still_failing else int(rows[-1][0])
+    if new_wm > wm:
+        _set_watermark(cur, source, new_wm)
+
+    out = {"rows": written, "watermark": max(wm, new_wm)}
+    if duplicates:
+        out["duplicates_skipped"] = duplicates
+    if skip:
+        out["backing_off"] = skip
+    if errors:
+        out["errors"] = errors
+    return out
+
+
+def run_sheet_mirror_worker(limit: int = BATCH_ROWS) -> dict:
     """
     Flushes DB-first events to Sheets UI.
 
     Order:
       - council_events -> Council_Insight
       - wnh_events -> Why_Nothing_Happened
-    Deduped via sheet_mirror_events.
+
+    Each source resumes from its watermark (sheet_mirror_watermarks), pending
+    rows are found with an anti-join against sheet_mirror_events, and rows are
+    written with one append_rows per tab.
     """
     written = 0
-    conn = None
+    per_source = {}
     try:
-        conn = _pg_connect()
-        cur = conn.cursor()
+        with _pg_connect() as conn:
+            cur = conn.cursor()
+            _ensure_schema(cur)
 
-        # 1) Council events
-        cur.execute(
-            """
-            SELECT id, tab, row_hash, payload
-            FROM council_events
-            ORDER BY id ASC
-            LIMIT %s
-            """,
-            (int(limit),),
-        )
-        for _id, tab, rh, payload in cur.fetchall():
-            if _already_mirrored(cur, tab, rh):
-                continue
-            row_dict = payload if isinstance(payload, dict) else {}
-            r = _append_row_dict_to_sheet(tab, row_dict)
-            if r.get("ok"):
-                written += 1
-                _mark_mirrored(cur, tab, rh, row_dict)
-
-        # 2) WNH events
-        cur.execute(
-            """
-            SELECT id, tab, row_hash, payload
-            FROM wnh_events
-            ORDER BY id ASC
-            LIMIT %s
-            """,
-            (int(limit),),
-        )
-        for _id, tab, rh, payload in cur.fetchall():
-            if _already_mirrored(cur, tab, rh):
-                continue
-            row_dict = payload if isinstance(payload, dict) else {}
-            r = _append_row_dict_to_sheet(tab, row_dict)
-            if r.get("ok"):
-                written += 1
-                _mark_mirrored(cur, tab, rh, row_dict)
+            for source in SOURCES:
+                try:
+                    res = _flush_source(cur, source, limit)
+                except Exception as e:
+                    res = {"rows": 0, "errors": [f"{e.__class__.__name__}:{e}"]}
+                per_source[source] = res
+                written += int(res.get("rows") or 0)
 
-        return {"ok": True, "rows": written}
+        return {"ok": True, "rows": written, "sources": per_source}
 
     except Exception as e:
         return {"ok": False, "rows": written, "reason": f"{e.__class__.__name__}:{e}"}
-    finally:
-        try:
-            if conn:
-                conn.close()
-        except Exception:
-            pass
 
 
 if __name__ == "__main__":
@@ -2,10 +2,10 @@
 from __future__ import annotations
 from flask import Blueprint, jsonify, request
 import threading
-from sheets_gateway import build_gateway_from_env
+from sheets_gateway import get_gateway
 
 SHEETS_ROUTES = Blueprint("sheets", __name__)
-_gateway = build_gateway_from_env()
+_gateway = get_gateway()
 _bg_thread = None
 _bg_stop = threading.Event()
 
@@ -27,7 +27,13 @@ def start_background_flusher():
 
 @SHEETS_ROUTES.route("/health", methods=["GET"])
 def sheets_health():
-    return jsonify({"ok": True, "health": _gateway.health()})
+    out = {"ok": True, "health": _gateway.health()}
+    try:
+        from utils import sheets_registry_stats
+        out["registry"] = sheets_registry_stats()
+    except Exception:
+        pass
+    return jsonify(out)
 
 @SHEETS_ROUTES.route("/read", methods=["GET"])
 def sheets_read():
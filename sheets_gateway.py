@@ -1,35 +1,15 @@
 from __future__ import annotations
 
-import os
 import json
+import os
+import random
+import sqlite3
+import threading
 import time
-import pathlib
-from typing import Any, List, Tuple
-
-
-def _read_service_json_from_env() -> str:
-    """
-    Returns JSON string for Google service account, using your existing envs:
-      1) GOOGLE_CREDS_JSON_PATH (path to file)
-      2) GOOGLE_APPLICATION_CREDENTIALS (path to file)
-      3) SVC_JSON (either a filename or raw JSON)
-    """
-    # 1) explicit path to JSON
-    for key in ("GOOGLE_CREDS_JSON_PATH", "GOOGLE_APPLICATION_CREDENTIALS"):
-        p = os.getenv(key, "").strip()
-        if p and pathlib.Path(p).exists():
-            return pathlib.Path(p).read_text(encoding="utf-8")
-
-    # 2) SVC_JSON (filename or raw JSON)
-    svc = os.getenv("SVC_JSON", "").strip()
-    if svc:
-        p = pathlib.Path(svc)
-        if p.exists():
-            return p.read_text(encoding="utf-8")
-        # otherwise assume it's raw JSON
-        return svc
-
-    return ""
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple
 
 
 class NoopAdapter:
@@ -48,29 +28,17 @@ class GSpreadAdapter:
     """
 
     def __init__(self):
-        raw = _read_service_json_from_env()
-        if not raw:
-            raise RuntimeError(
-                "service JSON not found in GOOGLE_CREDS_JSON_PATH / "
-                "GOOGLE_APPLICATION_CREDENTIALS / SVC_JSON"
-            )
+        sheet_url = os.getenv("SHEET_URL", "").strip()
+        if not sheet_url:
+            raise RuntimeError("SHEET_URL not set in environment")
 
         try:
-            import gspread  # type: ignore
-            from google.oauth2.service_account import Credentials  # type: ignore
+            from utils import get_sheet  # type: ignore
         except Exception as e:
             raise RuntimeError("gspread or google-auth not installed") from e
 
-        data = json.loads(raw)
-        scopes = ["https://www.googleapis.com/auth/spreadsheets"]
-        creds = Credentials.from_service_account_info(data, scopes=scopes)
-        client = gspread.authorize(creds)
-
-        sheet_url = os.getenv("SHEET_URL", "").strip()
-        if not sheet_url:
-            raise RuntimeError("SHEET_URL not set in environment")
-
-        self._sh = client.open_by_url(sheet_url)
+        # Shared process-wide client/Spreadsheet handle (no per-adapter auth).
+        self._sh = get_sheet(sheet_url)
 
     def _split_a1(self, a1: str) -> Tuple[Any, str]:
         if "!" not in a1:
@@ -90,11 +58,175 @@ class GSpreadAdapter:
         return {"ok": True, "written": len(values)}
     
 
-class SheetsGateway:
+SHEETS_QUEUE_DB = os.getenv("SHEETS_QUEUE_DB", "sheets_write_queue.db")
+SHEETS_QUEUE_BACKOFF_BASE_S = float(os.getenv("SHEETS_QUEUE_BACKOFF_BASE_S", "5"))
+SHEETS_QUEUE_BACKOFF_MAX_S = float(os.getenv("SHEETS_QUEUE_BACKOFF_MAX_S", "600"))
+SHEETS_QUEUE_MAX_ATTEMPTS = int(os.getenv("SHEETS_QUEUE_MAX_ATTEMPTS", "10"))
+# Journal rows are leased to one gateway; a lease not renewed (by flush) for
+# this long is taken over by another gateway on the same journal.
+SHEETS_QUEUE_LEASE_S = float(os.getenv("SHEETS_QUEUE_LEASE_S", "300"))
+
+try:
+    from utils import try_take_sheets_token, sheets_token_eta  # type: ignore
+except Exception:  # pragma: no cover
+    def try_take_sheets_token(mode: str = "write") -> bool:  # type: ignore
+        return True
+
+    def sheets_token_eta(mode: str = "write") -> float:  # type: ignore
+        return 0.0
+
+
+@dataclass
+class _Entry:
+    """One enqueue_write call; `done` rows of `values` are already in the sheet."""
+    range_a1: str
+    values: list[list[Any]]
+    enqueued_at: float
+    id: Optional[int] = None
+    done: int = 0
+    attempts: int = 0
+    next_at: float = 0.0
+    last_error: str = ""
+
+
+class _QueueStore:
+    """SQLite (WAL) journal behind the in-memory queue, so pending writes survive a restart."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sheets_write_queue (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      range_a1 TEXT NOT NULL,
+      values_json TEXT NOT NULL,
+      enqueued_at REAL NOT NULL,
+      done INTEGER NOT NULL DEFAULT 0,
+      attempts INTEGER NOT NULL DEFAULT 0,
+      next_at REAL NOT NULL DEFAULT 0,
+      last_error TEXT,
+      dead INTEGER NOT NULL DEFAULT 0,
+      owner TEXT,
+      lease_until REAL NOT NULL DEFAULT 0
+    )
     """
-    Simple batching + quota-aware wrapper around a Sheets adapter.
 
-    It batches writes and flushes them via adapter.append().
+    def __init__(self, path: str, owner: str):
+        self.path = path
+        self.owner = owner
+        self.con = sqlite3.connect(path, isolation_level=None, timeout=10, check_same_thread=False)
+        self.con.execute("PRAGMA journal_mode=WAL;")
+        self.con.execute("PRAGMA synchronous=NORMAL;")
+        self.con.execute(self.SCHEMA)
+        cols = {r[1] for r in self.con.execute("PRAGMA table_info(sheets_write_queue)")}
+        if "owner" not in cols:
+            self.con.execute("ALTER TABLE sheets_write_queue ADD COLUMN owner TEXT")
+        if "lease_until" not in cols:
+            self.con.execute("ALTER TABLE sheets_write_queue ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+
+    def claim(self, known: set) -> Tuple[list[_Entry], set]:
+        """
+        Renew our leases and take over unowned/expired rows.
+        Returns (newly owned entries not in `known`, ids we own).
+        """
+        now = time.time()
+        self.con.execute("BEGIN IMMEDIATE")
+        try:
+            self.con.execute(
+                "UPDATE sheets_write_queue SET owner = ?, lease_until = ? "
+                "WHERE dead = 0 AND (owner = ? OR owner IS NULL OR lease_until < ?)",
+                (self.owner, now + SHEETS_QUEUE_LEASE_S, self.owner, now),
+            )
+            owned = {r[0] for r in self.con.execute(
+                "SELECT id FROM sheets_write_queue WHERE dead = 0 AND owner = ?", (self.owner,)
+            )}
+            self.con.execute("COMMIT")
+        except Exception:
+            self.con.execute("ROLLBACK")
+            raise
+        new_ids = sorted(owned - known)
+        out: list[_Entry] = []
+        for i in range(0, len(new_ids), 500):
+            part = new_ids[i: i + 500]
+            out.extend(self._load(f"id IN ({','.join('?' * len(part))})", part))
+        return out, owned
+
+    def release(self) -> None:
+        """Hand our rows back so any other gateway can pick them up immediately."""
+        self.con.execute(
+            "UPDATE sheets_write_queue SET owner = NULL, lease_until = 0 WHERE dead = 0 AND owner = ?",
+            (self.owner,),
+        )
+
+    def _load(self, where: str, params: list) -> list[_Entry]:
+        out: list[_Entry] = []
+        cur = self.con.execute(
+            "SELECT id, range_a1, values_json, enqueued_at, done, attempts, next_at, COALESCE(last_error, '') "
+            f"FROM sheets_write_queue WHERE dead = 0 AND {where} ORDER BY id",
+            params,
+        )
+        for rid, rng, vj, ts, done, attempts, next_at, err in cur.fetchall():
+            try:
+                values = json.loads(vj)
+            except Exception:
+                continue
+            out.append(_Entry(rng, values, ts, id=rid, done=done, attempts=attempts, next_at=next_at, last_error=err))
+        return out
+
+    def add(self, e: _Entry, owned: bool = True) -> None:
+        cur = self.con.execute(
+            "INSERT INTO sheets_write_queue (range_a1, values_json, enqueued_at, owner, lease_until) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (e.range_a1, json.dumps(e.values, separators=(",", ":"), default=str), e.enqueued_at,
+             self.owner if owned else None, time.time() + SHEETS_QUEUE_LEASE_S if owned else 0),
+        )
+        e.id = cur.lastrowid
+
+    def save(self, entries: list[_Entry], finished: list[_Entry]) -> None:
+        self.con.execute("BEGIN")
+        try:
+            self.con.executemany(
+                "UPDATE sheets_write_queue SET done = ?, attempts = ?, next_at = ?, last_error = ? WHERE id = ?",
+                [(e.done, e.attempts, e.next_at, e.last_error, e.id) for e in entries if e.id is not None],
+            )
+            self.con.executemany(
+                "DELETE FROM sheets_write_queue WHERE id = ?",
+                [(e.id,) for e in finished if e.id is not None],
+            )
+            self.con.execute("COMMIT")
+        except Exception:
+            self.con.execute("ROLLBACK")
+            raise
+
+    def mark_dead(self, e: _Entry) -> None:
+        self.con.execute(
+            "UPDATE sheets_write_queue SET dead = 1, done = ?, attempts = ?, last_error = ? WHERE id = ?",
+            (e.done, e.attempts, e.last_error, e.id),
+        )
+
+    def dead_count(self) -> int:
+        return int(self.con.execute("SELECT COUNT(*) FROM sheets_write_queue WHERE dead = 1").fetchone()[0])
+
+
+class SheetsGateway:
+    """
+    Batching + quota-aware wrapper around a Sheets adapter.
+
+    Writes are queued (deque in memory, journaled to SQLite at SHEETS_QUEUE_DB
+    so a restart does not lose them) and flushed via adapter.append():
+
+    - pending writes to the same range are merged into as few appends as
+      possible, in enqueue order, each at most max_batch rows (larger
+      batches are chunked, never truncated);
+    - each append takes a Sheets write token; when none is left the flush
+      stops and the rest waits for the next pass;
+    - a failed append is retried with exponential backoff (never sooner
+      than the next write token); later writes to that range wait behind
+      it to keep row order. After SHEETS_QUEUE_MAX_ATTEMPTS the entry is
+      parked as dead in the journal.
+
+    Several gateways (web, worker) can share one journal: each row is leased
+    to the gateway that enqueued or claimed it, and only the lease holder
+    ships it. flush() renews the leases; rows whose owner stopped flushing
+    are taken over after SHEETS_QUEUE_LEASE_S. Use get_gateway() for the
+    process-wide instance.
     """
 
     def __init__(
@@ -105,67 +237,225 @@ class SheetsGateway:
         max_batch: int = 50,
         read_budget_per_min: int = 30,
         write_budget_per_min: int = 20,
+        queue_path: Optional[str] = None,
     ):
         self.adapter = adapter
         self.ttl_seconds = ttl_seconds
         self.flush_interval = flush_interval
-        self.max_batch = max_batch
+        self.max_batch = max(1, int(max_batch))
         self.read_budget_per_min = read_budget_per_min
         self.write_budget_per_min = write_budget_per_min
-        self._queue: List[Tuple[str, list[list[Any]]]] = []
+        self._queue: Deque[_Entry] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._store: Optional[_QueueStore] = None
+        self._dead = 0
+        self._stats: dict = {
+            "rows_written": 0,
+            "appends": 0,
+            "failures": 0,
+            "throttled": 0,
+            "last_flush_at": None,
+            "last_flush_ms": None,
+            "last_error": "",
+        }
+        self._recent: Deque[Tuple[float, int]] = deque(maxlen=512)  # (ts, rows) per append
+
+        path = SHEETS_QUEUE_DB if queue_path is None else queue_path
+        if path:
+            try:
+                self._store = _QueueStore(path, owner=f"{os.getpid()}:{uuid.uuid4().hex[:12]}")
+                if not isinstance(adapter, NoopAdapter):
+                    self._sync_claims()
+                self._dead = self._store.dead_count()
+            except Exception as e:  # noqa: BLE001
+                print(f"[SheetsGateway] durable queue unavailable ({path}): {e}; using memory only", flush=True)
+                self._store = None
 
     # --- public API used by sheets_bp / sheets_mirror -----------------------
 
     def enqueue_write(self, range_a1: str, values: list[list[Any]]) -> None:
         if not values:
             return
-        self._queue.append((range_a1, values))
+        e = _Entry(range_a1, values, time.time())
+        noop = isinstance(self.adapter, NoopAdapter)
+        with self._lock:
+            if self._store is not None:
+                try:
+                    # Unowned when we can't ship it: another process's gateway will.
+                    self._store.add(e, owned=not noop)
+                except Exception as ex:  # noqa: BLE001
+                    print(f"[SheetsGateway] journal write failed: {ex}", flush=True)
+            if not noop or self._store is None:
+                self._queue.append(e)
 
     def queue_depth(self) -> int:
         return len(self._queue)
 
+    def _sync_claims(self) -> None:
+        """Adopt journal rows leased to us; drop in-memory rows another gateway took over."""
+        if self._store is None:
+            return
+        with self._lock:
+            known = {e.id for e in self._queue if e.id is not None}
+            adopted, owned = self._store.claim(known)
+            if adopted or known - owned:
+                keep = [e for e in self._queue if e.id is None or e.id in owned]
+                self._queue = deque(sorted(keep + adopted, key=lambda e: (e.enqueued_at, e.id or 0)))
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(SHEETS_QUEUE_BACKOFF_MAX_S, SHEETS_QUEUE_BACKOFF_BASE_S * (2 ** max(0, attempts - 1)))
+        delay *= 1.0 + random.random() * 0.25
+        return max(delay, sheets_token_eta("write"))
+
+    def _due_groups(self, now: float) -> "OrderedDict[str, list[_Entry]]":
+        """Due entries per range in enqueue order; a range stops at its first entry still backing off."""
+        groups: "OrderedDict[str, list[_Entry]]" = OrderedDict()
+        blocked = set()
+        with self._lock:
+            entries = list(self._queue)
+        for e in entries:
+            if e.range_a1 in blocked:
+                continue
+            if e.next_at > now:
+                blocked.add(e.range_a1)
+                continue
+            groups.setdefault(e.range_a1, []).append(e)
+        return groups
+
     def flush(self) -> dict:
         """
         Flush queued writes. Returns a dict with at least:
             {"ok": bool, "written": int, "error": str?}
         """
         if isinstance(self.adapter, NoopAdapter):
-            # drain queue but report not-ok
-            drained = len(self._queue)
-            self._queue.clear()
-            return {"ok": False, "written": 0, "error": "NoopAdapter in use", "drained": drained}
-
-        written = 0
-        errors: list[str] = []
-        while self._queue:
-            range_a1, values = self._queue.pop(0)
-            if not values:
-                continue
-            # respect max_batch per append
-            batch = values[: self.max_batch]
+            # Can't ship from this process: keep the journal, hand our rows to
+            # a gateway that can, and only drop the in-memory copies.
+            with self._lock:
+                released = len(self._queue)
+                self._queue.clear()
+                if self._store is not None:
+                    try:
+                        self._store.release()
+                    except Exception:
+                        pass
+            return {"ok": False, "written": 0, "error": "NoopAdapter in use", "released": released}
+
+        with self._flush_lock:
+            t0 = time.time()
             try:
-                res = self.adapter.append(range_a1, batch)
-                if res.get("ok", True):
-                    written += len(batch)
-                else:
-                    errors.append(str(res))
-            except Exception as e:  # noqa: BLE001
-                errors.append(str(e))
+                self._sync_claims()
+            except Exception as ex:  # noqa: BLE001
+                # Without a fresh lease we might ship rows another gateway owns.
+                self._stats["last_error"] = f"journal claim: {ex}"
+                return {"ok": False, "written": 0, "error": f"journal claim failed: {ex}"}
+            written = 0
+            appends = 0
+            throttled = False
+            errors: list[str] = []
+            touched: list[_Entry] = []
+            finished: list[_Entry] = []
+            dead: list[_Entry] = []
+
+            for range_a1, entries in self._due_groups(t0).items():
+                if throttled:
+                    break
+                # (entry, row) pairs still to write, in order
+                pending = [(e, row) for e in entries for row in e.values[e.done:]]
+                for start in range(0, len(pending), self.max_batch):
+                    chunk = pending[start: start + self.max_batch]
+                    if not try_take_sheets_token("write"):
+                        throttled = True
+                        break
+                    try:
+                        res = self.adapter.append(range_a1, [row for _, row in chunk])
+                        if not res.get("ok", True):
+                            raise RuntimeError(str(res))
+                    except Exception as ex:  # noqa: BLE001
+                        head = chunk[0][0]
+                        head.attempts += 1
+                        head.last_error = str(ex)[:500]
+                        head.next_at = time.time() + self._backoff(head.attempts)
+                        touched.append(head)
+                        errors.append(f"{range_a1}: {ex}")
+                        self._stats["failures"] += 1
+                        self._stats["last_error"] = head.last_error
+                        if head.attempts >= SHEETS_QUEUE_MAX_ATTEMPTS:
+                            dead.append(head)
+                        break
+                    appends += 1
+                    written += len(chunk)
+                    self._recent.append((time.time(), len(chunk)))
+                    for e, _ in chunk:
+                        e.done += 1
+                        if e.done >= len(e.values):
+                            if not finished or finished[-1] is not e:
+                                finished.append(e)
+                        elif not touched or touched[-1] is not e:
+                            touched.append(e)
+
+            gone = {id(e) for e in finished} | {id(e) for e in dead}
+            with self._lock:
+                if gone:
+                    self._queue = deque(e for e in self._queue if id(e) not in gone)
+                if self._store is not None:
+                    try:
+                        self._store.save([e for e in touched if id(e) not in gone], finished)
+                        for e in dead:
+                            self._store.mark_dead(e)
+                    except Exception as ex:  # noqa: BLE001
+                        errors.append(f"journal: {ex}")
+                self._dead += len(dead)
+
+            if throttled:
+                self._stats["throttled"] += 1
+            self._stats["rows_written"] += written
+            self._stats["appends"] += appends
+            self._stats["last_flush_at"] = t0
+            self._stats["last_flush_ms"] = round((time.time() - t0) * 1000.0, 1)
 
         return {
             "ok": not errors,
             "written": written,
+            "appends": appends,
+            "throttled": throttled,
+            "dead_lettered": len(dead),
             "errors": errors,
         }
 
     def health(self) -> dict:
+        now = time.time()
+        with self._lock:
+            items = list(self._queue)
+        oldest = min((e.enqueued_at for e in items), default=None)
+        window = [n for ts, n in self._recent if now - ts <= 300.0]
         return {
             "ok": not isinstance(self.adapter, NoopAdapter),
-            "queue_depth": len(self._queue),
+            "queue_depth": len(items),
+            "pending_rows": sum(len(e.values) - e.done for e in items),
+            "oldest_age_s": round(now - oldest, 1) if oldest is not None else None,
+            "backing_off": sum(1 for e in items if e.next_at > now),
+            "dead_letters": self._dead,
+            "durable": self._store.path if self._store is not None else None,
             "flush_interval": self.flush_interval,
+            "throughput": dict(self._stats, rows_per_min_5m=round(sum(window) / 5.0, 1)),
         }
 
 
+_gateway: Optional[SheetsGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> SheetsGateway:
+    """Process-wide gateway (sheets_bp, sheets_mirror*); one journal lease holder per process."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = build_gateway_from_env()
+    return _gateway
+
+
 def build_gateway_from_env() -> SheetsGateway:
     """
     Factory used by sheets_bp / sheets_mirror to construct the global
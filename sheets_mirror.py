@@ -101,43 +101,22 @@ def flatten_receipts(rcpts):
 # ---------- Writers ----------
 def _gw_write(range_a1, values):
     try:
-        from sheets_gateway import build_gateway_from_env
-        gw = build_gateway_from_env()
+        from sheets_gateway import NoopAdapter, get_gateway
+        gw = get_gateway()
+        if isinstance(gw.adapter, NoopAdapter):
+            return False, "gateway has no Sheets adapter"
         gw.enqueue_write(range_a1, values)
         res = gw.flush()
-        return bool(res.get("ok")), res
+        # Once queued the gateway owns delivery (retry/backoff); falling back to a
+        # direct write here would append the rows twice.
+        return True, res
     except Exception as e:
         return False, f"gateway not available: {e}"
 
-def _gspread_client():
-    import json, pathlib
-    try:
-        import gspread
-    except Exception as e:
-        raise RuntimeError("gspread not installed") from e
-    raw = None
-    for key in ("GOOGLE_CREDS_JSON_PATH","GOOGLE_APPLICATION_CREDENTIALS"):
-        p = os.getenv(key, "").strip()
-        if p and pathlib.Path(p).exists():
-            raw = pathlib.Path(p).read_text(encoding="utf-8"); break
-    if raw is None:
-        svc = os.getenv("SVC_JSON","").strip()
-        if svc:
-            if pathlib.Path(svc).exists():
-                raw = pathlib.Path(svc).read_text(encoding="utf-8")
-            else:
-                raw = svc
-    if not raw:
-        raise RuntimeError("service JSON not found in GOOGLE_CREDS_JSON_PATH / GOOGLE_APPLICATION_CREDENTIALS / SVC_JSON")
-    data = json.loads(raw)
-    import gspread
-    gc = gspread.service_account_from_dict(data)  # type: ignore
-    return gc
-
 def _direct_write(range_a1, values):
     try:
-        gc = _gspread_client()
-        sh = gc.open_by_url(os.getenv("SHEET_URL","").strip())
+        from utils import get_sheet
+        sh = get_sheet(os.getenv("SHEET_URL","").strip())
         if "!" not in range_a1:
             raise RuntimeError("Range must include worksheet name, e.g., 'Sheet1!A2'")
         ws_name, rng = range_a1.split("!",1)
@@ -0,0 +1,340 @@
+# sheets_quota.py — central Sheets quota scheduler (priority lanes + single-flight reads)
+"""
+utils.sheets_gate / gspread_guard used to spin on the read/write TokenBuckets
+(`_wait_for` slept 0.2s in a loop, one token at a time), so whoever polled
+first won: a 20-row digest could starve the Nova Trigger Watcher and policy
+logging, and N threads reading the same tab spent N tokens. This module sits
+behind those gates:
+
+- QuotaScheduler wraps one TokenBucket. acquire(tokens, lane=, module=)
+  queues the caller; the head of the queue takes all its tokens at once and
+  waiters sleep on a condition variable (woken on every grant, or when the
+  head's token deficit should have refilled) instead of polling.
+- Lanes: critical < normal < background. The head is the waiter with the
+  best (lane - waited / SHEETS_QUOTA_AGING_S, arrival) key, so a higher lane
+  goes first but a background waiter is never starved forever.
+- SingleFlight: identical reads already in flight are joined instead of
+  re-issued (gspread_guard keys them by spreadsheet, worksheet, method and
+  arguments); each joiner gets its own copy of the result (list / dict and
+  its rows), taken before the leader's caller can touch it.
+- Attribution: tokens are charged to a module. Set it with
+  quota_context(module=..., lane=...) (main._schedule does this per job);
+  otherwise the first caller frame outside the Sheets plumbing is used, and
+  its lane comes from SHEETS_QUOTA_LANES / the defaults below.
+
+    from sheets_quota import quota_context, quota_stats
+    with quota_context(module="nova_trigger_watcher", lane="critical"):
+        ...
+
+Env:
+  SHEETS_QUOTA_AGING_S   default 30 (seconds of waiting worth one lane)
+  SHEETS_QUOTA_LANES     optional "module=lane,..." overrides
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LANES: Dict[str, int] = {"critical": 0, "normal": 1, "background": 2}
+
+SHEETS_QUOTA_AGING_S = max(1.0, float(os.getenv("SHEETS_QUOTA_AGING_S", "30") or "30"))
+
+_DEFAULT_MODULE_LANES: Dict[str, str] = {
+    "nova_trigger_watcher": "critical",
+    "policy_logger": "critical",
+    "trade_guard": "critical",
+    "rotation_executor": "critical",
+}
+# substrings that mark low-value periodic work
+_BACKGROUND_HINTS = ("digest", "summary", "summaries", "report", "rollup", "mirror", "dashboard", "parity")
+
+_STATS_MINUTES = 15
+
+# Frames from these modules are plumbing, not the caller to charge.
+_PLUMBING = ("sheets_quota", "utils", "gspread_guard", "gspread", "google", "contextlib", "functools",
+             "threading", "requests", "urllib3", "concurrent")
+
+
+def _parse_lanes(raw: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        mod, lane = part.split("=", 1)
+        lane = lane.strip().lower()
+        if lane in LANES and mod.strip():
+            out[mod.strip()] = lane
+    return out
+
+
+_module_lanes = dict(_DEFAULT_MODULE_LANES)
+_module_lanes.update(_parse_lanes(os.getenv("SHEETS_QUOTA_LANES", "")))
+
+_ctx = threading.local()
+
+
+@contextmanager
+def quota_context(module: Optional[str] = None, lane: Optional[str] = None):
+    """Charge Sheets tokens inside this block to `module`, queued in `lane`."""
+    prev = (getattr(_ctx, "module", None), getattr(_ctx, "lane", None))
+    if module:
+        _ctx.module = module
+    if lane in LANES:
+        _ctx.lane = lane
+    try:
+        yield
+    finally:
+        _ctx.module, _ctx.lane = prev
+
+
+def lane_for_module(module: str) -> str:
+    lane = _module_lanes.get(module)
+    if lane:
+        return lane
+    m = (module or "").lower()
+    if any(h in m for h in _BACKGROUND_HINTS):
+        return "background"
+    return "normal"
+
+
+def _caller_module() -> str:
+    f = sys._getframe(2)
+    while f is not None:
+        name = f.f_globals.get("__name__", "") or ""
+        if name.split(".", 1)[0] not in _PLUMBING:
+            return name
+        f = f.f_back
+    return "unknown"
+
+
+def current_caller(lane: Optional[str] = None, module: Optional[str] = None) -> Tuple[str, str]:
+    """(module, lane) for the calling thread: explicit args > quota_context > caller frame."""
+    mod = module or getattr(_ctx, "module", None) or _caller_module()
+    ln = lane if lane in LANES else getattr(_ctx, "lane", None)
+    if ln not in LANES:
+        ln = lane_for_module(mod)
+    return mod, ln
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "tokens", "since", "module")
+
+    def __init__(self, rank: int, seq: int, tokens: int, module: str) -> None:
+        self.rank = rank
+        self.seq = seq
+        self.tokens = tokens
+        self.since = time.monotonic()
+        self.module = module
+
+    def key(self, now: float) -> Tuple[float, int]:
+        return (self.rank - (now - self.since) / SHEETS_QUOTA_AGING_S, self.seq)
+
+
+class QuotaScheduler:
+    """Fair, prioritized access to one TokenBucket (see module docstring)."""
+
+    def __init__(self, name: str, bucket: Any) -> None:
+        self.name = name
+        self.bucket = bucket
+        self._cond = threading.Condition()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._spent: Dict[int, Dict[str, int]] = {}   # epoch minute -> module -> tokens
+        self._lanes: Dict[str, Dict[str, float]] = {
+            lane: {"grants": 0, "tokens": 0, "wait_s": 0.0, "max_wait_s": 0.0} for lane in LANES
+        }
+
+    def set_bucket(self, bucket: Any) -> None:
+        with self._cond:
+            self.bucket = bucket
+            self._cond.notify_all()
+
+    def _head(self, now: float) -> Optional[_Waiter]:
+        return min(self._waiters, key=lambda w: w.key(now)) if self._waiters else None
+
+    def _record(self, module: str, lane: str, tokens: int, waited: float) -> None:
+        """Caller holds self._cond."""
+        minute = int(time.time() // 60)
+        per = self._spent.setdefault(minute, {})
+        per[module] = per.get(module, 0) + tokens
+        if len(self._spent) > _STATS_MINUTES:
+            for m in sorted(self._spent)[:-_STATS_MINUTES]:
+                del self._spent[m]
+        st = self._lanes[lane]
+        st["grants"] += 1
+        st["tokens"] += tokens
+        st["wait_s"] += waited
+        st["max_wait_s"] = max(st["max_wait_s"], waited)
+
+    def acquire(self, tokens: int = 1, lane: Optional[str] = None, module: Optional[str] = None) -> None:
+        """Block until `tokens` are granted to this caller (all at once)."""
+        mod, ln = current_caller(lane, module)
+        n = min(max(1, int(tokens)), int(getattr(self.bucket, "capacity", tokens) or tokens))
+        with self._cond:
+            w = _Waiter(LANES[ln], next(self._seq), n, mod)
+            self._waiters.append(w)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._head(now) is w:
+                        if self.bucket.take(n):
+                            break
+                        deficit = n - self.bucket.available()
+                        timeout = max(0.01, deficit / max(self.bucket.refill_per_sec, 1e-9))
+                    else:
+                        # Woken on every grant; the cap lets aging promote us without one.
+                        timeout = 1.0
+                    self._cond.wait(min(timeout, 5.0))
+            finally:
+                self._waiters.remove(w)
+                self._cond.notify_all()
+            self._record(mod, ln, n, time.monotonic() - w.since)
+
+    def try_acquire(self, tokens: int = 1, lane: Optional[str] = None, module: Optional[str] = None) -> bool:
+        """Take tokens now if nobody with an earlier claim is queued; never blocks."""
+        mod, ln = current_caller(lane, module)
+        n = max(1, int(tokens))
+        with self._cond:
+            if self._waiters:
+                now = time.monotonic()
+                mine = (LANES[ln], -1)
+                if min(w.key(now) for w in self._waiters) <= mine:
+                    return False
+            if not self.bucket.take(n):
+                return False
+            self._record(mod, ln, n, 0.0)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        now_min = int(time.time() // 60)
+        with self._cond:
+            waiting: Dict[str, int] = {lane: 0 for lane in LANES}
+            rank_to_lane = {v: k for k, v in LANES.items()}
+            for w in self._waiters:
+                waiting[rank_to_lane[w.rank]] += 1
+            last_min = dict(self._spent.get(now_min - 1, {}))
+            this_min = dict(self._spent.get(now_min, {}))
+            per_minute = {
+                time.strftime("%H:%M", time.gmtime(m * 60)): dict(v) for m, v in sorted(self._spent.items())
+            }
+            lanes = {k: dict(v) for k, v in self._lanes.items()}
+        for v in lanes.values():
+            v["avg_wait_s"] = round(v["wait_s"] / v["grants"], 3) if v["grants"] else 0.0
+            v["wait_s"] = round(v["wait_s"], 3)
+            v["max_wait_s"] = round(v["max_wait_s"], 3)
+        return {
+            "available": round(self.bucket.available(), 2),
+            "capacity": getattr(self.bucket, "capacity", None),
+            "waiting": waiting,
+            "lanes": lanes,
+            "tokens_last_min": last_min,
+            "tokens_this_min": this_min,
+            "tokens_per_min": per_minute,
+        }
+
+
+class _Call:
+    __slots__ = ("event", "result", "exc", "joiners")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.exc: Optional[BaseException] = None
+        self.joiners = 0
+
+
+def _copy_row(r: Any) -> Any:
+    if isinstance(r, list):
+        return list(r)
+    if isinstance(r, dict):
+        return dict(r)
+    return r
+
+
+def _copy_result(v: Any) -> Any:
+    """
+    Rows are lists/dicts; hand every caller its own containers (two levels:
+    the result and its rows). List subclasses such as gspread's ValueRange
+    keep their type and attributes.
+    """
+    if isinstance(v, list):
+        out = copy.copy(v)
+        out[:] = [_copy_row(r) for r in v]
+        return out
+    if isinstance(v, dict):
+        return {k: _copy_row(r) for k, r in v.items()}
+    return v
+
+
+class SingleFlight:
+    """
+    Collapse identical concurrent calls into one. The leader gets fn()'s
+    result; each joiner gets its own copy (see _copy_result), so no caller
+    can see another's mutations.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, _Call] = {}
+        self.leaders = 0
+        self.joined = 0
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.joiners += 1
+                self.joined += 1
+        if not leader:
+            call.event.wait()
+            if call.exc is not None:
+                raise call.exc
+            return _copy_result(call.result)
+        result = None
+        try:
+            result = fn()
+            return result
+        except BaseException as e:
+            call.exc = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                joiners = call.joiners
+            # Joiners copy from a private snapshot taken before they wake, so
+            # the leader's caller may mutate its result freely.
+            if joiners and call.exc is None:
+                call.result = _copy_result(result)
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"leaders": self.leaders, "joined": self.joined, "in_flight": in_flight}
+
+
+read_flight = SingleFlight()
+
+_schedulers: Dict[str, QuotaScheduler] = {}
+
+
+def register(scheduler: QuotaScheduler) -> QuotaScheduler:
+    _schedulers[scheduler.name] = scheduler
+    return scheduler
+
+
+def quota_stats() -> Dict[str, Any]:
+    out: Dict[str, Any] = {name: s.stats() for name, s in sorted(_schedulers.items())}
+    out["single_flight"] = read_flight.stats()
+    return out
@@ -30,6 +30,11 @@ BEGIN
   IF NOT FOUND THEN
     RAISE EXCEPTION 'Missing table alpha_proposals. Create it before running generator.';
   END IF;
+
+  -- Materialized readiness (alpha_tools.sql): refreshed only when a source table changed.
+  IF to_regproc('alpha_readiness_refresh') IS NOT NULL THEN
+    PERFORM alpha_readiness_refresh();
+  END IF;
 END
 $$;
 
@@ -137,22 +142,26 @@ to_insert AS (
     -- Dedup key (one proposal per token+action per UTC day)
     (token || '|' || action || '|' || (SELECT utc_day FROM params))::text AS proposal_hash
   FROM classified
+),
+inserted AS (
+  INSERT INTO alpha_proposals (
+    proposal_id, agent_id, token, venue, symbol, action,
+    notional_usd, confidence, rationale, gates, payload, proposal_hash
+  )
+  SELECT
+    t.proposal_id, t.agent_id, t.token, t.venue, t.symbol, t.action,
+    t.notional_usd, t.confidence, t.rationale, t.gates, t.payload, t.proposal_hash
+  FROM to_insert t
+  JOIN params p ON 1=1
+  WHERE p.preview_enabled = 1
+    AND NOT EXISTS (
+      SELECT 1 FROM alpha_proposals ap
+      WHERE ap.proposal_hash = t.proposal_hash
+    )
+  RETURNING 1
 )
-
-INSERT INTO alpha_proposals (
-  proposal_id, agent_id, token, venue, symbol, action,
-  notional_usd, confidence, rationale, gates, payload, proposal_hash
-)
-SELECT
-  t.proposal_id, t.agent_id, t.token, t.venue, t.symbol, t.action,
-  t.notional_usd, t.confidence, t.rationale, t.gates, t.payload, t.proposal_hash
-FROM to_insert t
-JOIN params p ON 1=1
-WHERE p.preview_enabled = 1
-  AND NOT EXISTS (
-    SELECT 1 FROM alpha_proposals ap
-    WHERE ap.proposal_hash = t.proposal_hash
-  );
+-- Inserted count (alpha_proposal_runner reads this column)
+SELECT COUNT(*) AS inserted FROM inserted;
 
 -- Quick summary (today)
 WITH today AS (
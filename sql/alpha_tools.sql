@@ -114,10 +114,19 @@ END;
 $$;
 
 -- ============================================================
--- Option 3 foundation: Readiness view (queryable anytime)
+-- Option 3 foundation: Readiness (queryable anytime)
+--
+-- alpha_readiness_live_v   computes readiness from the source tables.
+-- alpha_readiness_mv       materialized copy (unique on token), refreshed
+--                          CONCURRENTLY by alpha_readiness_refresh() only when
+--                          a source table changed (statement triggers bump
+--                          alpha_readiness_change_seq) or it is older than
+--                          p_max_stale (windowed counts such as seen_24h).
+-- alpha_readiness_v        what readers query: the materialized rows, with
+--                          the clock-dependent freshness columns computed live.
 -- ============================================================
 
-CREATE OR REPLACE VIEW alpha_readiness_v AS
+CREATE OR REPLACE VIEW alpha_readiness_live_v AS
 WITH
 universe AS (
   SELECT DISTINCT token FROM alpha_ideas
@@ -175,21 +184,19 @@ m AS (
   GROUP BY token
 ),
 pick_symbol AS (
+  -- one ranked probe per token: COINBASE, then BINANCEUS, then first venue
   SELECT
     u.token,
-    COALESCE(
-      (SELECT symbol FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='COINBASE'  AND s.tradable=1 LIMIT 1),
-      (SELECT symbol FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='BINANCEUS' AND s.tradable=1 LIMIT 1),
-      (SELECT symbol FROM alpha_symbol_map s WHERE s.token=u.token AND s.tradable=1 ORDER BY venue LIMIT 1),
-      ''
-    ) AS symbol,
-    COALESCE(
-      (SELECT venue FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='COINBASE'  AND s.tradable=1 LIMIT 1),
-      (SELECT venue FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='BINANCEUS' AND s.tradable=1 LIMIT 1),
-      (SELECT venue FROM alpha_symbol_map s WHERE s.token=u.token AND s.tradable=1 ORDER BY venue LIMIT 1),
-      ''
-    ) AS venue
+    COALESCE(p.symbol, '') AS symbol,
+    COALESCE(p.venue, '')  AS venue
   FROM universe u
+  LEFT JOIN LATERAL (
+    SELECT s.symbol, s.venue
+    FROM alpha_symbol_map s
+    WHERE s.token = u.token AND s.tradable = 1
+    ORDER BY CASE s.venue WHEN 'COINBASE' THEN 0 WHEN 'BINANCEUS' THEN 1 ELSE 2 END, s.venue, s.symbol
+    LIMIT 1
+  ) p ON TRUE
 )
 SELECT
   u.token,
@@ -257,6 +264,118 @@ LEFT JOIN gateD gd USING (token)
 LEFT JOIN pick_symbol ps USING (token)
 WHERE u.token IS NOT NULL AND u.token <> '';
 
+CREATE INDEX IF NOT EXISTS idx_alpha_symbol_map_token_tradable ON alpha_symbol_map (token) WHERE tradable = 1;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS alpha_readiness_mv AS
+SELECT * FROM alpha_readiness_live_v;
+
+-- required by REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_alpha_readiness_mv_token ON alpha_readiness_mv (token);
+
+-- Change counter: non-transactional, so writers never contend on a row.
+CREATE SEQUENCE IF NOT EXISTS alpha_readiness_change_seq;
+
+CREATE TABLE IF NOT EXISTS alpha_readiness_state (
+  id              INT         PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  refreshed_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  change_seen     BIGINT      NOT NULL DEFAULT 0,
+  refreshes       BIGINT      NOT NULL DEFAULT 0,
+  last_refresh_ms NUMERIC
+);
+INSERT INTO alpha_readiness_state (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION alpha_readiness_touch() RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  PERFORM nextval('alpha_readiness_change_seq');
+  RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['alpha_ideas', 'alpha_memory', 'alpha_symbol_map', 'alpha_policy_blocks'] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_alpha_readiness_touch ON %I', t);
+    EXECUTE format(
+      'CREATE TRIGGER trg_alpha_readiness_touch AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+      'FOR EACH STATEMENT EXECUTE FUNCTION alpha_readiness_touch()', t);
+  END LOOP;
+END
+$$;
+
+-- Returns TRUE when it refreshed. Callers serialize on the state row.
+CREATE OR REPLACE FUNCTION alpha_readiness_refresh(
+  p_max_stale INTERVAL DEFAULT INTERVAL '1 hour',
+  p_force BOOLEAN DEFAULT FALSE
+) RETURNS BOOLEAN
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_state alpha_readiness_state%ROWTYPE;
+  v_changes BIGINT;
+  v_t0 TIMESTAMPTZ := clock_timestamp();
+BEGIN
+  SELECT * INTO v_state FROM alpha_readiness_state WHERE id = 1 FOR UPDATE;
+  -- read before refreshing: writes that land during the refresh trigger the next one
+  -- a fresh sequence reports last_value 1 before its first nextval
+  SELECT CASE WHEN is_called THEN last_value ELSE 0 END INTO v_changes FROM alpha_readiness_change_seq;
+
+  IF NOT p_force
+     AND v_state.change_seen = v_changes
+     AND v_state.refreshed_at > NOW() - p_max_stale THEN
+    RETURN FALSE;
+  END IF;
+
+  REFRESH MATERIALIZED VIEW CONCURRENTLY alpha_readiness_mv;
+
+  UPDATE alpha_readiness_state
+  SET refreshed_at = NOW(),
+      change_seen = v_changes,
+      refreshes = refreshes + 1,
+      last_refresh_ms = ROUND((EXTRACT(EPOCH FROM clock_timestamp() - v_t0) * 1000)::numeric, 1)
+  WHERE id = 1;
+  RETURN TRUE;
+END;
+$$;
+
+-- Same columns as the original view, so dependants keep working.
+CREATE OR REPLACE VIEW alpha_readiness_v AS
+SELECT
+  token,
+  alpha_stage,
+  seen_24h,
+  seen_7d,
+  distinct_seen_days_7d,
+  confirmed_7d,
+  confirmed_30d,
+  watch_7d,
+  expired_30d,
+  demoted_30d,
+  last_seen_ts,
+  CASE WHEN last_seen_ts IS NULL THEN NULL ELSE (NOW() - last_seen_ts) END AS age_since_last_seen,
+  last_idea_ts,
+  last_source,
+  novelty_reason,
+  venue,
+  symbol,
+  gate_a_memory_maturity,
+  gate_b_venue_feasible,
+  gate_b_note,
+  CASE
+    WHEN last_seen_ts IS NOT NULL
+     AND last_seen_ts >= NOW() - INTERVAL '7 days'
+    THEN 1 ELSE 0
+  END AS gate_c_fresh_enough,
+  gate_d_policy_clear,
+  gate_d_note
+FROM alpha_readiness_mv;
+
+-- (Re)applying this file may change alpha_readiness_live_v: rebuild now.
+SELECT alpha_readiness_refresh(p_force => TRUE);
+
 -- ============================================================
 -- Option 2: Proposal table (you already created; safe to re-run)
 -- ============================================================
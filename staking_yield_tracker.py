@@ -1,8 +1,6 @@
 import os
 from datetime import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from utils import ping_webhook_debug
+from utils import get_sheet, ping_webhook_debug
 from nova_heartbeat import log_heartbeat
 
 # === Legacy defaults (used if env not configured) ===
@@ -55,17 +53,7 @@ def _load_token_configs():
 
 def run_staking_yield_tracker():
     try:
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        svc_path = os.getenv(
-            "GOOGLE_APPLICATION_CREDENTIALS",
-            "/etc/secrets/sentiment-log-service.json",
-        )
-        creds = ServiceAccountCredentials.from_json_keyfile_name(svc_path, scope)
-        client = gspread.authorize(creds)
-        ws = client.open_by_url(SHEET_URL).worksheet(SHEET_NAME)
+        ws = get_sheet(SHEET_URL).worksheet(SHEET_NAME)
         data = ws.get_all_records()
 
         token_configs = _load_token_configs()
@@ -30,7 +30,7 @@ from datetime import datetime, timezone
 from typing import Dict, Tuple, List, Any
 
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_sheet
 
 # Optional utilities (Telegram + logging). We degrade gracefully if missing.
 try:
@@ -87,19 +87,7 @@ def _open_sheet():
     if not SHEET_URL:
         raise RuntimeError("SHEET_URL env var is not set")
 
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    # Same default path pattern as other modules
-    svc_path = os.getenv(
-        "GOOGLE_APPLICATION_CREDENTIALS",
-        "/etc/secrets/sentiment-log-service.json",
-    )
-
-    creds = ServiceAccountCredentials.from_json_keyfile_name(svc_path, scope)
-    client = gspread.authorize(creds)
-    return client.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 
 def _get_ws(sh, title: str):
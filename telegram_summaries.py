@@ -284,12 +284,11 @@ def _format_message(counts):
 def _write_summary_log(kind: str, text: str):
     # best-effort audit log
     try:
-        from utils import get_gspread_client
+        from utils import get_sheet
         SHEET_URL = os.getenv("SHEET_URL", "")
         if not SHEET_URL:
             return
-        gc = get_gspread_client()
-        sh = gc.open_by_url(SHEET_URL)
+        sh = get_sheet(SHEET_URL)
         try:
             ws = sh.worksheet(SUMMARY_LOG_TAB)
         except Exception:
@@ -25,6 +25,11 @@ try:
 except ImportError:
     telemetry_read = None
 
+try:
+    import agent_freshness  # lease trust boundary freshness (in-memory)
+except ImportError:
+    agent_freshness = None
+
 bp = Blueprint("telemetry", __name__, url_prefix="/api")
 
 REQUIRE_HMAC_TELEM = os.getenv("REQUIRE_HMAC_TELEMETRY", "1").lower() in {"1", "true", "yes"}
@@ -199,6 +204,8 @@ def _persist(agent: str, flat: Dict[str, Any], by_venue: Dict[str, Any], ts: int
     Call through to whichever function your telemetry_store provides.
     Tries common names; no-ops if none found (won't crash).
     """
+    if agent_freshness:
+        agent_freshness.note_seen(agent, ts)
     if not telemetry_store:
         return
 
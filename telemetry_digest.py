@@ -26,7 +26,7 @@ STABLES = {"USD", "USDT", "USDC"}
 
 try:
     from utils import (
-        get_gspread_client,
+        get_sheet,
         send_telegram_message_dedup,
         send_once_per_day,
         warn,
@@ -40,8 +40,8 @@ except Exception:
     def info(msg: str) -> None:  # type: ignore
         print("[INFO]", msg)
 
-    def get_gspread_client():  # type: ignore
-        raise RuntimeError("get_gspread_client unavailable")
+    def get_sheet(url=None):  # type: ignore
+        raise RuntimeError("get_sheet unavailable")
 
     def send_telegram_message_dedup(  # type: ignore
         message: str, key: str, ttl_min: int = 15
@@ -249,8 +249,7 @@ def run_telemetry_digest() -> None:
 
     # 2) Append heartbeat row
     try:
-        gc = get_gspread_client()
-        sh = gc.open_by_url(SHEET_URL)
+        sh = get_sheet(SHEET_URL)
         headers = [
             "Timestamp",
             "Agent",
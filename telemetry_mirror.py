@@ -13,6 +13,14 @@ CRITICAL FIX (Dec 2025):
     Free=Amount, Locked="QUOTE", Class=<compact fragment>, Snapshot=""
 - This drop-in version detects the header and writes the correct format.
 
+SNAPSHOT STORE:
+- Each push is recorded once in wallet_snapshot_store (typed, delta-encoded
+  Postgres/SQLite history). With WALLET_MONITOR_SHEET_MODE=latest (default)
+  Wallet_Monitor only holds the latest snapshot's rows for each agent (one
+  row block per agent, sorted by agent), overwritten in place, with the
+  compact Snapshot string on each block's first row only. Set
+  WALLET_MONITOR_SHEET_MODE=append for the old append-per-push behaviour.
+
 PHASE 22B FIX (Dec 29, 2025):
 - Some telemetry payloads arriving at /api/telemetry/last do NOT include `by_venue`.
   They may include a compact snapshot string (e.g. "BINANCEUS:USD=...,USDT=...; COINBASE:...").
@@ -58,6 +66,15 @@ STABLES = {"USD", "USDT", "USDC"}
 # Compaction: keep at most this many data rows (excluding header).
 WALLET_MONITOR_MAX_ROWS = int(os.getenv("WALLET_MONITOR_MAX_ROWS", "1000"))
 
+# "latest": Wallet_Monitor is a bounded view of the newest snapshot; "append": legacy history.
+WALLET_MONITOR_SHEET_MODE = (os.getenv("WALLET_MONITOR_SHEET_MODE", "latest") or "latest").strip().lower()
+
+# Data rows currently in the latest view (None until learned from the sheet once).
+_view_rows: Optional[int] = None
+# Latest rows per agent; the view is one row block per agent, so a push from
+# one Edge agent never removes another agent's balances.
+_view_blocks: Dict[str, List[List[Any]]] = {}
+
 
 # ---------------- Telemetry fetch ----------------
 def _http_get_last() -> Dict[str, Any]:
@@ -95,6 +112,11 @@ def _append_rows(ws, rows: List[List[Any]]) -> None:
     ws.append_rows(rows, value_input_option="RAW")
 
 
+@with_sheet_backoff
+def _update_range(ws, range_a1: str, rows: List[List[Any]]) -> None:
+    ws.update(range_a1, rows, value_input_option="RAW")
+
+
 @with_sheet_backoff
 def _delete_rows(ws, start_row: int, end_row: int) -> None:
     ws.delete_rows(start_row, end_row)
@@ -293,7 +315,8 @@ def _telemetry_ok_for_sheet(data: Dict[str, Any]) -> bool:
 
 # ---------------- Compaction ----------------
 def _compact_wallet_monitor_if_needed() -> None:
-    if WALLET_MONITOR_MAX_ROWS <= 0:
+    if WALLET_MONITOR_MAX_ROWS <= 0 or WALLET_MONITOR_SHEET_MODE == "latest":
+        # The latest view is already bounded; nothing accumulates.
         return
     try:
         ws = _open_wallet_monitor_ws()
@@ -361,6 +384,8 @@ def _write_wallet_monitor_rows(data: Dict[str, Any]) -> None:
         info("telemetry_mirror: no non-dust balances to mirror.")
         return
 
+    _record_snapshot(agent, float(ts), by_venue)
+
     snapshot_frag = _format_compact_fragment(by_venue)
 
     ws = _open_wallet_monitor_ws()
@@ -384,10 +409,73 @@ def _write_wallet_monitor_rows(data: Dict[str, Any]) -> None:
             else:
                 out_rows.append([now_str, agent, venue, asset, qty, klass, snapshot_frag])
 
+    if WALLET_MONITOR_SHEET_MODE == "latest":
+        _write_latest_view(ws, out_rows, agent=str(agent))
+        return
+
     _append_rows(ws, out_rows)
     info(f"telemetry_mirror: appended {len(out_rows)} Wallet_Monitor rows.")
 
 
+def _record_snapshot(agent: str, ts: float, by_venue: Dict[str, Dict[str, float]]) -> None:
+    """Typed, delta-encoded history lives in wallet_snapshot_store (best-effort)."""
+    try:
+        from wallet_snapshot_store import record_snapshot
+        snap = record_snapshot(agent, ts, by_venue, min_balance=TELEMETRY_MIRROR_MIN_BALANCE)
+        if snap is None:
+            warn("telemetry_mirror: wallet snapshot store write failed (see store_stats).")
+    except Exception as e:
+        warn(f"telemetry_mirror: wallet snapshot store unavailable: {e}")
+
+
+def _learn_view(ws) -> None:
+    """Seed _view_rows / _view_blocks from the sheet once per process (Agent is column B)."""
+    global _view_rows
+    try:
+        vals = ws.get_all_values() or []
+    except Exception:
+        _view_rows = 0
+        return
+    while vals and not any(str(c).strip() for c in vals[-1]):
+        vals.pop()
+    _view_rows = max(0, len(vals) - 1)
+    if not vals or len(vals[0]) < 2 or str(vals[0][1]).strip() != "Agent":
+        return
+    latest: Dict[str, str] = {}
+    for r in vals[1:]:
+        if len(r) > 1 and str(r[1]).strip():
+            latest[r[1]] = max(latest.get(r[1], ""), str(r[0]))
+    for r in vals[1:]:
+        # Legacy append history may hold several snapshots per agent: keep the newest.
+        if len(r) > 1 and str(r[1]).strip() and str(r[0]) == latest[r[1]]:
+            _view_blocks.setdefault(r[1], []).append(list(r))
+
+
+def _write_latest_view(ws, out_rows: List[List[Any]], agent: str = "") -> None:
+    """Replace this agent's block in the Wallet_Monitor latest view; one update for the whole view."""
+    global _view_rows
+    width = len(out_rows[0])
+    # The compact string is only needed once per snapshot.
+    for r in out_rows[1:]:
+        r[-1] = ""
+
+    if _view_rows is None:
+        _learn_view(ws)
+
+    _view_blocks[agent] = [list(r) for r in out_rows]
+    values: List[List[Any]] = []
+    for a in sorted(_view_blocks):
+        values += [(list(r) + [""] * width)[:width] for r in _view_blocks[a]]
+    n_rows = len(values)
+    # Blank out rows left over from a larger previous view (or legacy history).
+    values += [[""] * width for _ in range(max(0, (_view_rows or 0) - n_rows))]
+    end_col = chr(ord("A") + width - 1)
+    _update_range(ws, f"A2:{end_col}{len(values) + 1}", values)
+    _view_rows = n_rows
+    info(f"telemetry_mirror: wrote latest view ({len(out_rows)} rows for {agent or '?'}, "
+         f"{len(_view_blocks)} agent(s), {n_rows} rows) to {WALLET_MONITOR_WS}.")
+
+
 # ---------------- Entrypoint ----------------
 def run_telemetry_mirror() -> None:
     data = _http_get_last()
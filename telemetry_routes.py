@@ -47,6 +47,16 @@ _last_aggregates: Dict[str, Any] = {}
 _last_telemetry_ts: float = 0.0
 
 
+def _note_agent_seen(agent: Any, ts: Any, source: str = "push") -> None:
+    """Feed the lease trust boundary (edge_authority) its freshness signal in memory."""
+    try:
+        import agent_freshness
+
+        agent_freshness.note_seen(agent, ts, source=source)
+    except Exception:
+        pass
+
+
 # -----------------------------------------------------------------------------
 # HMAC verification
 # -----------------------------------------------------------------------------
@@ -101,6 +111,7 @@ def telemetry_heartbeat():
         "ts": ts,
         "latency_ms": latency_ms,
     }
+    _note_agent_seen(agent, ts, source="heartbeat")
 
     info(f"heartbeat ok from {agent} latency={latency_ms}ms")
 
@@ -164,6 +175,7 @@ def telemetry_push():
     _last_aggregates = aggregates
     _last_balances = last_balances
     _last_telemetry_ts = ts
+    _note_agent_seen(agent, ts)
 
     info(
         f"telemetry: received aggregates from {agent} "
@@ -215,6 +227,8 @@ def update_from_push(
     """
     global _last_balances, _last_aggregates, _last_telemetry_ts
 
+    _note_agent_seen(agent, ts)
+
     if not isinstance(balances, dict):
         balances = {}
 
@@ -239,6 +253,15 @@ def update_from_push(
 
     _last_aggregates = agg
 
+    # Keep Unified_Snapshot current from the push itself (diffed, debounced write)
+    try:
+        from unified_snapshot import note_telemetry_push
+
+        note_telemetry_push(balances, now_ts)
+    except Exception:
+        # Soft-fail only; the scheduled reconcile still runs
+        pass
+
     # Optional: also persist into telemetry_store if available
     try:
         import telemetry_store
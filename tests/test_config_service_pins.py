@@ -0,0 +1,63 @@
+"""A transient failure reading config_pins must not drop the pin (cloud_hold kill switch)."""
+
+import pytest
+
+import config_service as cs
+
+
+class _Store:
+    def __init__(self):
+        self.pin = None        # (raw, stamp) or None
+        self.fail = False
+
+    def read(self):
+        if self.fail:
+            raise RuntimeError("connection reset by peer")
+        return self.pin
+
+
+@pytest.fixture
+def store(monkeypatch):
+    st = _Store()
+    monkeypatch.setenv("DB_URL", "postgresql://example/db")
+    monkeypatch.delenv("DB_READ_JSON_FILE", raising=False)
+    monkeypatch.setenv("DB_READ_JSON", '{"cloud_hold": false}')
+    monkeypatch.setattr(cs, "_db_pin_read", st.read)
+    monkeypatch.setattr(cs, "_start_pin_watcher", lambda: None)
+    monkeypatch.setattr(cs, "_override", None)
+    monkeypatch.setattr(cs, "_pin_seen", None)
+    monkeypatch.setattr(cs, "_env_raw", None)
+    monkeypatch.setattr(cs, "_listeners", [])
+    st.pin = ('{"cloud_hold": true}', "2026-10-16 10:00:00+00")
+    with cs._lock:
+        cs._load_sources("test")
+    return st
+
+
+def test_pin_survives_failed_read(store):
+    assert cs.get_bool("cloud_hold") is True
+    assert cs.snapshot().source == "config_pins"
+
+    store.fail = True
+    assert cs._check_pin() is False
+    with cs._lock:
+        cs._load_sources("pin_changed")
+
+    assert cs.get_bool("cloud_hold") is True
+    assert cs.snapshot().source == "config_pins"
+    assert cs.config_status()["pin_read_errors"] >= 2
+
+
+def test_pin_dropped_only_when_read_finds_no_row(store):
+    store.pin = None
+    assert cs._check_pin() is True
+
+    assert cs.get_bool("cloud_hold") is False
+    assert cs.snapshot().source == "env"
+    assert cs.config_status()["pinned"] == ""
+
+
+def test_status_reports_shadowed_env(store):
+    status = cs.config_status()
+    assert status["pinned"] == "config_pins"
+    assert status["env_shadowed"] is True
@@ -0,0 +1,69 @@
+"""A read capped by mirror_max_rows must never be stored or served as the full tab."""
+
+import db_mirror
+import db_read_adapter
+
+
+def _rows(n):
+    return [{"Token": f"T{i}", "ROI": i} for i in range(n)]
+
+
+def test_capped_read_is_marked_incomplete(monkeypatch):
+    snaps, events = [], []
+    monkeypatch.setattr(db_mirror, "enabled_reads", lambda: True)
+    monkeypatch.setattr(db_mirror, "_load_db_read_json_cfg", lambda: {"mirror_max_rows": 10})
+    monkeypatch.setattr(db_mirror, "write_snapshot",
+                        lambda tab, rows, complete=True: snaps.append((tab, list(rows), complete)))
+    monkeypatch.setattr(db_mirror._MIRROR, "_insert_records", lambda recs: events.extend(recs))
+
+    db_mirror.mirror_rows("Rotation_Log", _rows(25))
+
+    assert len(snaps) == 1
+    tab, rows, complete = snaps[0]
+    assert tab == "Rotation_Log"
+    assert complete is False
+    assert len(rows) == 10
+    # legacy sheet_row events are still written for the fallback reader
+    assert len(events) == 10
+    assert all('"type": "sheet_row"' in payload for _, _, payload in events)
+
+
+def test_full_read_is_complete(monkeypatch):
+    snaps = []
+    monkeypatch.setattr(db_mirror, "enabled_reads", lambda: True)
+    monkeypatch.setattr(db_mirror, "_load_db_read_json_cfg", lambda: {"mirror_max_rows": 10})
+    monkeypatch.setattr(db_mirror, "write_snapshot",
+                        lambda tab, rows, complete=True: snaps.append((len(rows), complete)))
+    monkeypatch.setattr(db_mirror._MIRROR, "_insert_records", lambda recs: None)
+
+    db_mirror.mirror_rows("Rotation_Log", _rows(10))
+
+    assert snaps == [(10, True)]
+
+
+def test_incomplete_snapshot_is_not_served(monkeypatch):
+    import time
+
+    queries = []
+
+    def fake_query(sql, params=()):
+        queries.append(sql)
+        # newest snapshot for the tab is a capped read
+        return [{"id": 7, "complete": False, "ts": time.time()}]
+
+    monkeypatch.setattr(db_read_adapter, "DB_READ_ENABLED", True)
+    monkeypatch.setattr(db_read_adapter, "DB_READ_PREFER", True)
+    monkeypatch.setattr(db_read_adapter, "DB_READ_PREFER_TABS", set())
+    monkeypatch.setattr(db_read_adapter, "_table_exists", lambda name: True)
+    monkeypatch.setattr(db_read_adapter._pg, "query", fake_query)
+    db_read_adapter._CACHE.clear()
+
+    sheet_rows = _rows(25)
+    got = db_read_adapter.get_records_prefer_db(
+        "Rotation_Log", "sheet_mirror:Rotation_Log", ttl_s=60,
+        sheets_fallback_fn=lambda tab, ttl_s=60: sheet_rows,
+    )
+
+    assert got is sheet_rows
+    # only the head lookup ran; no member rows were read from the capped snapshot
+    assert len(queries) == 1
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+tools/bench_alpha_readiness.py
+
+Benchmark the readiness objects from sql/alpha_tools.sql on a synthetic
+universe, inside a throwaway schema:
+
+  legacy       the original view (six correlated alpha_symbol_map subqueries per token)
+  live         alpha_readiness_live_v (single ranked LATERAL pick)
+  materialized SELECT * FROM alpha_readiness_v (reads alpha_readiness_mv)
+  refresh/noop alpha_readiness_refresh() with no source change (counter check only)
+  refresh/chg  alpha_readiness_refresh() after one alpha_memory insert (CONCURRENTLY)
+
+and checks that legacy and materialized rows agree on venue/symbol and gates.
+
+Usage:
+  DB_URL=postgres://... python tools/bench_alpha_readiness.py [--tokens 10000] [--events 20] [--repeat 3] [--keep]
+
+Needs a database where the user may CREATE SCHEMA; nothing outside the
+scratch schema is touched (CREATE EXTENSION is skipped; gen_random_uuid is
+built in from Postgres 13).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2  # noqa: E402
+
+from alpha_proposal_runner import SQL_DIR, _patched_tools_sql, _psql_statements  # noqa: E402
+
+SOURCE_DDL = """
+CREATE TABLE alpha_ideas (
+  idea_id BIGSERIAL PRIMARY KEY, ts TIMESTAMPTZ NOT NULL, token TEXT NOT NULL,
+  source TEXT NOT NULL DEFAULT '', payload JSONB NOT NULL DEFAULT '{}'::jsonb);
+CREATE TABLE alpha_memory (
+  id BIGSERIAL PRIMARY KEY, ts TIMESTAMPTZ NOT NULL, token TEXT NOT NULL, event TEXT NOT NULL,
+  reason_code TEXT NOT NULL DEFAULT '', facts JSONB NOT NULL DEFAULT '{}'::jsonb);
+CREATE TABLE alpha_symbol_map (
+  token TEXT NOT NULL, venue TEXT NOT NULL, symbol TEXT NOT NULL, tradable INT NOT NULL DEFAULT 1,
+  PRIMARY KEY (token, venue));
+CREATE TABLE alpha_policy_blocks (
+  id BIGSERIAL PRIMARY KEY, block_id UUID NOT NULL, ts TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  token TEXT NOT NULL, block_code TEXT NOT NULL, severity TEXT NOT NULL DEFAULT 'BLOCK',
+  source TEXT NOT NULL DEFAULT 'bench', details JSONB NOT NULL DEFAULT '{}'::jsonb,
+  expires_at TIMESTAMPTZ, cleared INT NOT NULL DEFAULT 0, cleared_ts TIMESTAMPTZ,
+  cleared_by TEXT, clear_reason TEXT);
+CREATE INDEX ON alpha_ideas (token, ts DESC);
+CREATE INDEX ON alpha_memory (token);
+"""
+
+SEED_SQL = """
+INSERT INTO alpha_ideas (ts, token, source, payload)
+SELECT NOW() - (random() * INTERVAL '30 days'), 'T' || lpad(g::text, 6, '0'), 'bench',
+       jsonb_build_object('novelty_reason', 'seed')
+FROM generate_series(1, %(tokens)s) g, generate_series(1, 2);
+
+INSERT INTO alpha_memory (ts, token, event)
+SELECT NOW() - (random() * INTERVAL '30 days'), 'T' || lpad((1 + (random() * (%(tokens)s - 1))::int)::text, 6, '0'),
+       (ARRAY['SEEN','SEEN','SEEN','SEEN','CONFIRMED','PROMOTED_TO_WATCH','EXPIRED','DEMOTED'])[1 + (random() * 7)::int]
+FROM generate_series(1, %(tokens)s * %(events)s);
+
+INSERT INTO alpha_symbol_map (token, venue, symbol, tradable)
+SELECT 'T' || lpad(g::text, 6, '0'), v.venue, 'T' || g || '-USD', (random() < 0.8)::int
+FROM generate_series(1, %(tokens)s) g
+CROSS JOIN (VALUES ('COINBASE'), ('BINANCEUS'), ('KRAKEN')) v(venue)
+WHERE random() < 0.6;
+
+INSERT INTO alpha_policy_blocks (block_id, token, block_code, severity, details)
+SELECT gen_random_uuid(), 'T' || lpad(g::text, 6, '0'), 'BENCH', 'BLOCK', '{"note": "bench"}'::jsonb
+FROM generate_series(1, %(tokens)s) g
+WHERE random() < 0.05;
+"""
+
+LEGACY_PICK = """pick_symbol AS (
+  SELECT
+    u.token,
+    COALESCE(
+      (SELECT symbol FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='COINBASE'  AND s.tradable=1 LIMIT 1),
+      (SELECT symbol FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='BINANCEUS' AND s.tradable=1 LIMIT 1),
+      (SELECT symbol FROM alpha_symbol_map s WHERE s.token=u.token AND s.tradable=1 ORDER BY venue LIMIT 1),
+      ''
+    ) AS symbol,
+    COALESCE(
+      (SELECT venue FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='COINBASE'  AND s.tradable=1 LIMIT 1),
+      (SELECT venue FROM alpha_symbol_map s WHERE s.token=u.token AND s.venue='BINANCEUS' AND s.tradable=1 LIMIT 1),
+      (SELECT venue FROM alpha_symbol_map s WHERE s.token=u.token AND s.tradable=1 ORDER BY venue LIMIT 1),
+      ''
+    ) AS venue
+  FROM universe u
+)
+SELECT"""
+
+COMPARE_COLS = ("token, venue, symbol, alpha_stage, gate_a_memory_maturity, gate_b_venue_feasible, "
+                "gate_c_fresh_enough, gate_d_policy_clear")
+
+
+def _tools_statements():
+    script = _patched_tools_sql((SQL_DIR / "alpha_tools.sql").read_text(encoding="utf-8"))
+    stmts = [s for s in _psql_statements(script) if not re.search(r"CREATE\s+EXTENSION", s, re.I)]
+    live = next(s for s in stmts if "VIEW alpha_readiness_live_v AS" in s)
+    legacy = live.replace("alpha_readiness_live_v", "alpha_readiness_legacy_v")
+    legacy = re.sub(r"pick_symbol AS \(.*?\n\)\nSELECT", lambda _: LEGACY_PICK, legacy, count=1, flags=re.S)
+    assert "LATERAL" not in legacy, "could not rebuild the legacy view"
+    return stmts, legacy
+
+
+def _timeit(cur, sql, repeat, setup=None, expect=None):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        if setup:
+            cur.execute(setup)
+        t0 = time.perf_counter()
+        cur.execute(sql)
+        out = cur.fetchall()
+        best = min(best, time.perf_counter() - t0)
+        # every timed run must do the work being measured, not just the last
+        assert expect is None or out == expect, (sql, out, expect)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tokens", type=int, default=10000)
+    ap.add_argument("--events", type=int, default=20, help="alpha_memory rows per token")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--keep", action="store_true", help="keep the scratch schema")
+    args = ap.parse_args()
+
+    url = os.getenv("DB_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise SystemExit("DB_URL is not set")
+
+    schema = f"bench_alpha_readiness_{os.getpid()}"
+    conn = psycopg2.connect(url)
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute(f"CREATE SCHEMA {schema}")
+    try:
+        cur.execute(f"SET search_path TO {schema}, public")
+        cur.execute(SOURCE_DDL)
+        t0 = time.perf_counter()
+        cur.execute(SEED_SQL, {"tokens": args.tokens, "events": args.events})
+        stmts, legacy = _tools_statements()
+        for s in stmts:
+            cur.execute(s)
+        cur.execute(legacy)
+        cur.execute("ANALYZE")
+        print(f"tokens={args.tokens} memory_rows={args.tokens * args.events} repeat={args.repeat} (best of); "
+              f"setup {time.perf_counter() - t0:.1f}s")
+
+        t_legacy, rows_legacy = _timeit(cur, "SELECT * FROM alpha_readiness_legacy_v", args.repeat)
+        t_live, _ = _timeit(cur, "SELECT * FROM alpha_readiness_live_v", args.repeat)
+        t_mat, rows_mat = _timeit(cur, "SELECT * FROM alpha_readiness_v", args.repeat)
+        cur.execute("SELECT alpha_readiness_refresh()")
+        t_noop, _ = _timeit(cur, "SELECT alpha_readiness_refresh()", args.repeat, expect=[(False,)])
+        t_chg, _ = _timeit(
+            cur, "SELECT alpha_readiness_refresh()", args.repeat,
+            setup="INSERT INTO alpha_memory (ts, token, event) VALUES (NOW(), 'T000001', 'SEEN')",
+            expect=[(True,)],
+        )
+
+        cur.execute(f"SELECT {COMPARE_COLS} FROM alpha_readiness_legacy_v EXCEPT SELECT {COMPARE_COLS} FROM alpha_readiness_v")
+        diff = cur.fetchall()
+        assert len(rows_legacy) == len(rows_mat) and not diff, (len(rows_legacy), len(rows_mat), diff[:5])
+
+        for name, t in (("legacy", t_legacy), ("live", t_live), ("materialized", t_mat),
+                        ("refresh/noop", t_noop), ("refresh/chg", t_chg)):
+            print(f"{name:<13} {t * 1000:9.1f} ms  ({t_legacy / t:7.1f}x vs legacy)")
+        print(f"rows={len(rows_mat)}  legacy and materialized results match")
+    finally:
+        if not args.keep:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
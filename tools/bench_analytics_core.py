@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+tools/bench_analytics_core.py
+
+Benchmark analytics_core (pandas) against the original per-row loops on
+synthetic logs, and check that both produce the same numbers:
+
+  dashboard  performance_dashboard._aggregate_metrics_loop vs analytics_core.novascore_rows
+  memory     rotation_memory._aggregate_log vs analytics_core.roi_stats
+
+"cold" includes building the Table from raw rows (parsing every cell);
+"warm" reuses Tables whose columns are already parsed, which is what every
+consumer after the first pays while load_table's TTL holds. For memory,
+"part" is a shared Table whose Token column is already parsed (what
+performance_dashboard leaves behind) while the ROI column is not.
+
+Usage:
+  python tools/bench_analytics_core.py [--rows 50000] [--tokens 400] [--repeat 3]
+
+No Sheets or DB access; everything runs on generated data.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics_core  # noqa: E402
+import performance_dashboard  # noqa: E402
+import rotation_memory  # noqa: E402
+
+
+def _roi(rnd):
+    r = rnd.random()
+    if r < 0.05:
+        return ""
+    if r < 0.08:
+        return "N/A"
+    return f"{rnd.gauss(2.0, 15.0):.2f}" + ("%" if r < 0.3 else "")
+
+
+def make_data(n_rows: int, n_tokens: int, seed: int = 7):
+    rnd = random.Random(seed)
+    toks = [f"T{i:04d}" for i in range(n_tokens)]
+    tok = lambda: rnd.choice(toks) if rnd.random() > 0.01 else ""  # noqa: E731
+
+    rotation_stats = [{"Token": tok(), "Follow-up ROI": _roi(rnd) if rnd.random() < 0.7 else "",
+                       "Initial ROI": _roi(rnd)} for _ in range(n_rows)]
+    rotation_log = [{"Token": tok(), "Allocation (%)": f"{rnd.uniform(0, 10):.2f}" if rnd.random() < 0.8 else "",
+                     "Follow-up ROI": _roi(rnd)} for _ in range(n_rows)]
+    vault_intel = [{"Token": t, "liquidity_usd": f"{rnd.uniform(1e3, 1e6):.2f}",
+                    "memory_score": f"{rnd.random():.3f}"} for t in toks]
+    trade_log = [{"Token": tok()} for _ in range(n_rows)]
+    rotation_mem = [{"Token": t, "Wins": rnd.randint(0, 20), "Losses": rnd.randint(0, 20)} for t in toks]
+
+    log_values = [["Token", "Follow-up ROI"]] + [[r["Token"], r["Follow-up ROI"]] for r in rotation_log]
+    return {
+        "rotation_stats": rotation_stats,
+        "rotation_log": rotation_log,
+        "vault_intel": vault_intel,
+        "trade_log": trade_log,
+        "rotation_mem": rotation_mem,
+    }, log_values
+
+
+def _close(a, b, tol=1e-6):
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    return abs(a - b) <= tol * max(1.0, abs(a), abs(b))
+
+
+def _timeit(fn, repeat):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def bench_dashboard(tabs, repeat):
+    data = dict(tabs)
+    data["tokens"] = {str(r.get("Token", "")).strip().upper() for rows in tabs.values() for r in rows} - {""}
+    t_loop, loop_rows = _timeit(lambda: performance_dashboard._aggregate_metrics_loop(data), repeat)
+
+    def tables():
+        return {k: analytics_core.Table.from_records(v) for k, v in tabs.items()}
+    t_cold, vec_rows = _timeit(lambda: analytics_core.novascore_rows(tables()), repeat)
+    warm = tables()
+    analytics_core.novascore_rows(warm)
+    t_warm, _ = _timeit(lambda: analytics_core.novascore_rows(warm), repeat)
+
+    assert len(loop_rows) == len(vec_rows), (len(loop_rows), len(vec_rows))
+    for a, b in zip(loop_rows, vec_rows):
+        for k in a:
+            assert _close(a[k], b[k]), (a["Token"], k, a[k], b[k])
+    return t_loop, t_cold, t_warm
+
+
+def bench_memory(log_values, repeat):
+    t_loop, a = _timeit(lambda: rotation_memory._aggregate_log(log_values, 0, 1), repeat)
+
+    def vec(t):
+        s = analytics_core.roi_stats(t.tokens(0), t.num(1))
+        return {tok: {"wins": int(w), "total": int(n), "sum": float(sm)}
+                for tok, w, n, sm in zip(s.index, s["wins"], s["n"], s["sum"])}
+    t_vec, b = _timeit(lambda: vec(analytics_core.Table.from_values(log_values, usecols=[0, 1])), repeat)
+    assert a.keys() == b.keys()
+    for t in a:
+        assert a[t]["wins"] == b[t]["wins"] and a[t]["total"] == b[t]["total"], t
+        assert _close(a[t]["sum"], b[t]["sum"]), t
+    warm = analytics_core.Table.from_values(log_values, usecols=[0, 1])
+    vec(warm)
+    t_warm, _ = _timeit(lambda: vec(warm), repeat)
+
+    t_part = float("inf")
+    for _ in range(repeat):
+        t = analytics_core.Table.from_values(log_values, usecols=[0, 1])
+        t.tokens(0)
+        t0 = time.perf_counter()
+        vec(t)
+        t_part = min(t_part, time.perf_counter() - t0)
+    return t_loop, t_vec, t_warm, t_part
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--tokens", type=int, default=400)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if not analytics_core.HAVE_PANDAS:
+        raise SystemExit("pandas is not installed")
+
+    tabs, log_values = make_data(args.rows, args.tokens)
+    print(f"rows={args.rows} tokens={args.tokens} repeat={args.repeat} (best of)")
+    for name, fn, arg in (
+        ("dashboard", bench_dashboard, tabs),
+        ("memory", bench_memory, log_values),
+    ):
+        t_loop, t_cold, t_warm, *rest = fn(arg, args.repeat)
+        line = (f"{name:<10} loop={t_loop * 1000:8.1f} ms  cold={t_cold * 1000:8.1f} ms ({t_loop / t_cold:5.1f}x)"
+                f"  warm={t_warm * 1000:8.1f} ms ({t_loop / t_warm:5.1f}x)")
+        if rest:
+            line += f"  part={rest[0] * 1000:8.1f} ms ({t_loop / rest[0]:5.1f}x)"
+        print(line + "  results match")
+
+
+if __name__ == "__main__":
+    main()
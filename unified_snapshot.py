@@ -19,20 +19,40 @@ Fixes/enhancements:
     Timestamp | Agent | Venue | Asset | Free | Locked | Class | Snapshot
 
 - Always emits 9 rows: (COINBASE,BINANCEUS,KRAKEN) × (USD,USDC,USDT)
+
+Incremental mode (UNIFIED_SNAPSHOT_INCREMENTAL=1, default):
+- telemetry_routes.update_from_push feeds note_telemetry_push(), which keeps
+  the latest (venue, stable) balances in memory and wakes a background writer
+  (debounced by UNIFIED_SNAPSHOT_DEBOUNCE_S).
+- The writer diffs the 9 rows against what it last wrote (learned from one
+  get_all_values per process) and sends only the changed cells in a single
+  batch_update. A Timestamp alone is rewritten only once it is older than
+  UNIFIED_SNAPSHOT_TS_REFRESH_S, so an unchanged wallet costs no writes.
+- run_unified_snapshot stays on the schedule as a reconcile: whenever no
+  push has arrived in this process since its previous run (e.g. worker.py),
+  it re-seeds the state (wallet_snapshot_store first, then the full
+  Wallet_Monitor scan) and flushes through the diff.
+  clear()+append_rows is only used when the tab's layout is not the 10 rows
+  we expect.
 """
 
 from __future__ import annotations
 
 import os
-from datetime import datetime
-from typing import Any, Dict, Iterable, List, Tuple
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from utils import with_sheet_backoff
 from utils import get_ws_cached, info, warn
-from utils import get_all_records_cached_dbaware
+from utils import get_all_records_cached_dbaware, invalidate_tab, SheetWriteBatch
 
 UNIFIED_SNAPSHOT_SRC_WS = os.getenv("UNIFIED_SNAPSHOT_SRC_WS", "Wallet_Monitor")
 UNIFIED_SNAPSHOT_WS = os.getenv("UNIFIED_SNAPSHOT_WS", "Unified_Snapshot")
+UNIFIED_SNAPSHOT_INCREMENTAL = os.getenv("UNIFIED_SNAPSHOT_INCREMENTAL", "1").strip().lower() not in ("0", "false", "no")
+UNIFIED_SNAPSHOT_DEBOUNCE_S = float(os.getenv("UNIFIED_SNAPSHOT_DEBOUNCE_S", "5") or "5")
+UNIFIED_SNAPSHOT_TS_REFRESH_S = float(os.getenv("UNIFIED_SNAPSHOT_TS_REFRESH_S", "900") or "900")
 
 VENUES: List[str] = ["COINBASE", "BINANCEUS", "KRAKEN"]
 STABLES: List[str] = ["USD", "USDC", "USDT"]
@@ -168,14 +188,13 @@ def _build_unified_rows(latest: Dict[Tuple[str, str], Dict[str, Any]]) -> List[L
     return out
 
 
-def run_unified_snapshot() -> None:
-    info("📸 unified_snapshot: building Unified_Snapshot from Wallet_Monitor…")
-
+def _scan_wallet_monitor() -> Optional[Dict[Tuple[str, str], Dict[str, Any]]]:
+    """Full Wallet_Monitor read -> latest per (venue, asset); None if the tab can't be read."""
     try:
         src_ws = _open_ws(UNIFIED_SNAPSHOT_SRC_WS)
     except Exception as e:
         warn(f"unified_snapshot: failed to open source worksheet '{UNIFIED_SNAPSHOT_SRC_WS}': {e}")
-        return
+        return None
 
     # Phase 22B: Prefer DB-backed sheet_mirror for Wallet_Monitor when available.
     # If DB has no mirror for this tab (or DB unavailable), we fall back to the sheet read below.
@@ -195,7 +214,7 @@ def run_unified_snapshot() -> None:
             rows = src_ws.get_all_records()
         except Exception as e:
             warn(f"unified_snapshot: get_all_records() failed for '{UNIFIED_SNAPSHOT_SRC_WS}': {e}")
-            return
+            return None
 
     info(f"unified_snapshot: Wallet_Monitor get_all_records -> {len(rows)} rows")
     if rows:
@@ -204,20 +223,304 @@ def run_unified_snapshot() -> None:
 
     latest = _latest_wallet_records(rows)
     info(f"unified_snapshot: latest per (venue, asset) -> {len(latest)} keys")
+    return latest
+
+
+# ---------------- Incremental builder (telemetry-driven) ----------------
+Key = Tuple[str, str]
+
+_ROW_KEYS: List[Key] = [(v, a) for v in VENUES for a in STABLES]
+_TS_COL = HEADER.index("Timestamp")
+_EPS = 1e-12
+
+
+def _split_balance(v: Any) -> Tuple[float, float]:
+    """Push values are a qty, a (free, locked) pair or a {free, locked} dict."""
+    if isinstance(v, dict):
+        free = v.get("free", v.get("Free", v.get("total", v.get("amount"))))
+        return _safe_float(free), _safe_float(v.get("locked", v.get("Locked")))
+    if isinstance(v, (list, tuple)):
+        return _safe_float(v[0] if v else 0.0), _safe_float(v[1] if len(v) > 1 else 0.0)
+    return _safe_float(v), 0.0
+
+
+def _same_cell(cur: Any, new: Any) -> bool:
+    """Compare a cell as read back from Sheets (formatted string) or last written, to a new value."""
+    if isinstance(new, bool):
+        return str(cur).strip().upper() == ("TRUE" if new else "FALSE")
+    if isinstance(new, float):
+        try:
+            return abs(float(str(cur).replace(",", "")) - new) <= 1e-9
+        except Exception:
+            return False
+    return str(cur) == str(new)
+
+
+@with_sheet_backoff
+def _read_values(ws) -> List[List[Any]]:
+    return ws.get_all_values() or []
 
-    out_rows = _build_unified_rows(latest)
 
+def _read_layout(ws) -> Optional[List[List[Any]]]:
+    """Current data rows if the tab has exactly HEADER + one row per _ROW_KEYS in order, else None."""
+    vals = _read_values(ws)
+    while vals and not any(str(c).strip() for c in vals[-1]):
+        vals.pop()
+    if len(vals) != 1 + len(_ROW_KEYS) or [str(h).strip() for h in vals[0][:len(HEADER)]] != HEADER:
+        return None
+    out: List[List[Any]] = []
+    for (venue, asset), row in zip(_ROW_KEYS, vals[1:]):
+        row = (list(row) + [""] * len(HEADER))[:len(HEADER)]
+        if str(row[1]).strip().upper() != venue or str(row[2]).strip().upper() != asset:
+            return None
+        out.append(row)
+    return out
+
+
+class _IncrementalSnapshot:
+    """
+    Latest (venue, stable) balances, updated per telemetry push, plus the rows
+    Unified_Snapshot is known to hold so flush() can write only changed cells.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._latest: Dict[Key, Dict[str, Any]] = {}
+        self._dirty = False
+        self._pushes_at_reconcile = 0
+        self._sheet: Optional[List[List[Any]]] = None  # None: unknown, read it before diffing
+        self._ts_written: Dict[int, float] = {}         # row index -> when its Timestamp cell was written
+        self._stats: Dict[str, Any] = {
+            "pushes": 0,
+            "value_changes": 0,
+            "flushes": 0,
+            "cells_written": 0,
+            "batch_updates": 0,
+            "full_rewrites": 0,
+            "layout_reads": 0,
+            "errors": 0,
+            "last_error": None,
+            "last_push_ts": 0,
+            "last_write_ts": 0,
+        }
+
+    def pushes_since_reconcile(self) -> int:
+        """Pushes seen since the last call (the reconcile's "is this process fed?" check)."""
+        with self._lock:
+            n = self._stats["pushes"] - self._pushes_at_reconcile
+            self._pushes_at_reconcile = self._stats["pushes"]
+            return n
+
+    def note(self, by_venue: Dict[str, Any], ts: float, push: bool = True) -> int:
+        """Apply one push; returns how many (venue, stable) balances changed."""
+        ts_str = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        changed = 0
+        with self._lock:
+            for venue, balances in by_venue.items():
+                v = str(venue).strip().upper()
+                if v not in VENUES or not isinstance(balances, dict):
+                    continue
+                # A venue's push is its full balance set: a missing stable is 0.
+                norm = {str(a).strip().upper(): x for a, x in balances.items()}
+                for asset in STABLES:
+                    free, locked = _split_balance(norm.get(asset))
+                    if free < 0 or locked < 0:
+                        continue
+                    key = (v, asset)
+                    prev = self._latest.get(key)
+                    if prev is not None and prev["ts"] > ts:
+                        continue
+                    if prev is None or abs(prev["Free"] - free) > _EPS or abs(prev["Locked"] - locked) > _EPS:
+                        changed += 1
+                    self._latest[key] = {
+                        "ts": float(ts), "Timestamp": ts_str, "Venue": v, "Asset": asset,
+                        "Free": free, "Locked": locked,
+                    }
+            if push:
+                self._stats["pushes"] += 1
+                self._stats["last_push_ts"] = int(ts)
+            if changed:
+                self._stats["value_changes"] += changed
+                self._dirty = True
+        return changed
+
+    def seed(self, latest: Dict[Key, Dict[str, Any]]) -> None:
+        """Merge records from a full Wallet_Monitor scan (newer state wins)."""
+        with self._lock:
+            for key, rec in latest.items():
+                prev = self._latest.get(key)
+                if prev is None or prev["ts"] < rec["ts"]:
+                    self._latest[key] = dict(rec)
+            self._dirty = True
+
+    def _diff(self, rows: List[List[Any]], now: float) -> Tuple[List[Tuple[int, int, Any]], List[List[Any]]]:
+        """(cells to write as (row_idx, col_idx, value), resulting sheet rows)."""
+        cells: List[Tuple[int, int, Any]] = []
+        new_sheet: List[List[Any]] = []
+        for i, (cur, new) in enumerate(zip(self._sheet or [], rows)):
+            value_diff = [c for c in range(len(HEADER)) if c != _TS_COL and not _same_cell(cur[c], new[c])]
+            row = list(cur)
+            ts_stale = now - self._ts_written.get(i, 0.0) >= UNIFIED_SNAPSHOT_TS_REFRESH_S
+            if (value_diff or ts_stale) and not _same_cell(cur[_TS_COL], new[_TS_COL]):
+                value_diff.append(_TS_COL)
+            for c in value_diff:
+                cells.append((i, c, new[c]))
+                row[c] = new[c]
+            new_sheet.append(row)
+        return cells, new_sheet
+
+    def flush(self) -> int:
+        """Bring Unified_Snapshot in line with the state; returns cells written."""
+        with self._flush_lock:
+            with self._lock:
+                rows = _build_unified_rows(self._latest)
+                self._dirty = False
+            now = time.time()
+            try:
+                ws = _open_ws(UNIFIED_SNAPSHOT_WS)
+                if self._sheet is None:
+                    self._stats["layout_reads"] += 1
+                    self._sheet = _read_layout(ws)
+                    if self._sheet is not None:
+                        self._ts_written = {i: _parse_ts(r[_TS_COL], 0) for i, r in enumerate(self._sheet)}
+                if self._sheet is None:
+                    _replace_rows(ws, HEADER, rows)
+                    cells = len(rows) * len(HEADER)
+                    self._sheet = [list(r) for r in rows]
+                    self._ts_written = {i: now for i in range(len(rows))}
+                    self._stats["full_rewrites"] += 1
+                else:
+                    diff, new_sheet = self._diff(rows, now)
+                    cells = len(diff)
+                    if diff:
+                        with SheetWriteBatch(ws, header=HEADER, value_input_option="RAW") as wb:
+                            for i, c, v in diff:
+                                wb.set(i + 2, c + 1, v)
+                                if c == _TS_COL:
+                                    self._ts_written[i] = now
+                        self._stats["batch_updates"] += 1
+                    self._sheet = new_sheet
+            except Exception as e:
+                # Sheet contents are unknown after a failed write: re-read next time.
+                self._sheet = None
+                with self._lock:
+                    self._dirty = True
+                self._stats["errors"] += 1
+                self._stats["last_error"] = f"{e.__class__.__name__}: {e}"
+                warn(f"unified_snapshot: failed writing rows to Unified_Snapshot: {e}")
+                return 0
+            self._stats["flushes"] += 1
+            if cells:
+                self._stats["cells_written"] += cells
+                self._stats["last_write_ts"] = int(now)
+                invalidate_tab(UNIFIED_SNAPSHOT_WS)
+            return cells
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Coalesce bursts of pushes (one per agent/venue) into one write.
+            time.sleep(max(0.0, UNIFIED_SNAPSHOT_DEBOUNCE_S))
+            if self._dirty:
+                try:
+                    self.flush()
+                except Exception as e:
+                    self._stats["last_error"] = f"{e.__class__.__name__}: {e}"
+
+    def kick(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="unified-snapshot-writer", daemon=True)
+                    self._thread.start()
+        self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["keys"] = len(self._latest)
+            out["dirty"] = self._dirty
+        out["sheet_known"] = self._sheet is not None
+        out["incremental"] = UNIFIED_SNAPSHOT_INCREMENTAL
+        return out
+
+
+_incr = _IncrementalSnapshot()
+
+
+def note_telemetry_push(by_venue: Dict[str, Any], ts: Optional[float] = None) -> int:
+    """
+    Feed one telemetry push (venue -> {asset: qty}) into the snapshot state.
+    Called from telemetry_routes.update_from_push; schedules a diff write when
+    a stable balance changed. Returns the number of changed balances.
+    """
+    if not UNIFIED_SNAPSHOT_INCREMENTAL or not isinstance(by_venue, dict):
+        return 0
+    ts_f = float(ts or time.time())
+    if ts_f > 10_000_000_000:
+        ts_f /= 1000.0
+    changed = _incr.note(by_venue, ts_f)
+    if changed and os.getenv("SHEET_URL"):
+        _incr.kick()
+    return changed
+
+
+def unified_snapshot_stats() -> Dict[str, Any]:
+    return _incr.stats()
+
+
+def _seed_from_snapshot_store() -> bool:
+    """Seed from wallet_snapshot_store's latest push (one DB read, no Sheets)."""
     try:
-        out_ws = _open_ws(UNIFIED_SNAPSHOT_WS)
-    except Exception as e:
-        warn(f"unified_snapshot: failed to open Unified_Snapshot worksheet '{UNIFIED_SNAPSHOT_WS}': {e}")
+        from wallet_snapshot_store import latest_snapshot
+        snap = latest_snapshot()
+    except Exception:
+        return False
+    if snap is None:
+        return False
+    by_venue: Dict[str, Dict[str, Any]] = {}
+    for h in snap.holdings:
+        by_venue.setdefault(h.venue, {})[h.asset] = (h.free, h.locked)
+    _incr.note(by_venue, float(snap.ts), push=False)
+    info(f"unified_snapshot: seeded from wallet_snapshot_store (agent={snap.agent}, venues={len(by_venue)})")
+    return True
+
+
+def run_unified_snapshot() -> None:
+    if not UNIFIED_SNAPSHOT_INCREMENTAL:
+        info("📸 unified_snapshot: building Unified_Snapshot from Wallet_Monitor…")
+        latest = _scan_wallet_monitor()
+        if latest is None:
+            return
+        out_rows = _build_unified_rows(latest)
+        try:
+            out_ws = _open_ws(UNIFIED_SNAPSHOT_WS)
+        except Exception as e:
+            warn(f"unified_snapshot: failed to open Unified_Snapshot worksheet '{UNIFIED_SNAPSHOT_WS}': {e}")
+            return
+        try:
+            _replace_rows(out_ws, HEADER, out_rows)
+            info(f"✅ unified_snapshot: wrote {len(out_rows)} rows to Unified_Snapshot")
+        except Exception as e:
+            warn(f"unified_snapshot: failed writing rows to Unified_Snapshot: {e}")
         return
 
-    try:
-        _replace_rows(out_ws, HEADER, out_rows)
-        info(f"✅ unified_snapshot: wrote {len(out_rows)} rows to Unified_Snapshot")
-    except Exception as e:
-        warn(f"unified_snapshot: failed writing rows to Unified_Snapshot: {e}")
+    # Reconcile: pushes normally keep the tab current; this covers cold starts,
+    # processes that receive no pushes, and stale Timestamp cells. Without a
+    # push since the last run the in-memory state may be stale: re-seed it.
+    if not _incr.pushes_since_reconcile() and not _seed_from_snapshot_store():
+        info("📸 unified_snapshot: no telemetry state yet; seeding from Wallet_Monitor…")
+        latest = _scan_wallet_monitor()
+        if latest is None:
+            return
+        _incr.seed(latest)
+    cells = _incr.flush()
+    info(f"✅ unified_snapshot: reconcile wrote {cells} cell(s) to Unified_Snapshot")
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@
 # - HMAC signing & Enqueue helpers (FIXED)
 
 from __future__ import annotations
-import os, time, json, threading, functools, hashlib, hmac, random, traceback
+import os, time, json, threading, functools, hashlib, hmac, random, traceback, collections, atexit
 from datetime import datetime, timezone
 from contextlib import contextmanager
 from typing import Any
@@ -17,6 +17,10 @@ from typing import Callable, Iterable, Tuple, Type
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
+import config_service
+import shared_sheet_cache
+from sheets_quota import QuotaScheduler, register as register_quota_scheduler
+
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
@@ -111,34 +115,12 @@ def env_enabled(name: str, default=False):
 
 def get_sheet_client():
     """
-    Return a gspread client using the service account JSON from env.
+    Return the shared gspread client.
 
-    Looks for SVC_JSON (preferred) or GOOGLE_SERVICE_JSON containing the
-    raw JSON keyfile contents.
+    Kept for older callers; authorization now goes through the process-wide
+    registry (see get_gspread_client below), so this no longer re-authorizes.
     """
-    svc_json = (
-        os.getenv("SVC_JSON")
-        or os.getenv("GOOGLE_SERVICE_JSON")
-        or os.getenv("GOOGLE_SVC_JSON")
-    )
-    if not svc_json:
-        raise RuntimeError("No service account JSON found in SVC_JSON/GOOGLE_SERVICE_JSON")
-
-    # Accept either raw JSON or a path-like string
-    svc_json = svc_json.strip()
-    if svc_json.startswith("{"):
-        info = json.loads(svc_json)
-    else:
-        # Treat as a file path
-        with open(svc_json, "r", encoding="utf-8") as f:
-            info = json.load(f)
-
-    scopes = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(info, scopes)
-    return gspread.authorize(creds)
+    return get_gspread_client()
 
 def retry_on_exception(
     retries: int = 3,
@@ -270,36 +252,65 @@ class TokenBucket:
                 self.tokens -= n
                 return True
             return False
+    def available(self):
+        """Tokens that could be taken right now (does not consume)."""
+        with self.lock:
+            elapsed = time.monotonic() - self.last
+            return min(self.capacity, self.tokens + elapsed * self.refill_per_sec)
 
 _read_bucket  = TokenBucket(READS_PER_MIN,  READS_PER_MIN  / 60.0)
 _write_bucket = TokenBucket(WRITES_PER_MIN, WRITES_PER_MIN / 60.0)
 
+# All waits go through the quota scheduler: priority lanes, atomic multi-token
+# grants and condition-variable wakeups (see sheets_quota).
+_read_sched  = register_quota_scheduler(QuotaScheduler("read",  _read_bucket))
+_write_sched = register_quota_scheduler(QuotaScheduler("write", _write_bucket))
+
+def _sched_for(bucket_or_mode):
+    if bucket_or_mode is _read_bucket or bucket_or_mode is _read_sched.bucket:
+        return _read_sched
+    if isinstance(bucket_or_mode, str) and bucket_or_mode.lower() == "read":
+        return _read_sched
+    return _write_sched
+
 def _wait_for(bucket):
-    while not bucket.take(1):
-        time.sleep(0.2)
+    _sched_for(bucket).acquire(1)
 
 def set_sheets_budget(reads_per_min=None, writes_per_min=None):
     """Optional live tuning at runtime."""
     global _read_bucket, _write_bucket
     if reads_per_min:
         _read_bucket  = TokenBucket(reads_per_min,  reads_per_min  / 60.0)
+        _read_sched.set_bucket(_read_bucket)
     if writes_per_min:
         _write_bucket = TokenBucket(writes_per_min, writes_per_min / 60.0)
+        _write_sched.set_bucket(_write_bucket)
+
+def sheets_budget_available():
+    """Current read/write token headroom; used for scheduler cost hints."""
+    return {"read": _read_bucket.available(), "write": _write_bucket.available()}
+
+def try_take_sheets_token(mode: str = "write") -> bool:
+    """Non-blocking take of one read/write token (for background flushers that must not stall)."""
+    return _sched_for(mode or "write").try_acquire(1)
+
+def sheets_token_eta(mode: str = "write") -> float:
+    """Seconds until one read/write token is available (0.0 when one is available now)."""
+    bucket = _read_bucket if (mode or "").lower() == "read" else _write_bucket
+    missing = 1.0 - bucket.available()
+    return 0.0 if missing <= 0 else missing / max(bucket.refill_per_sec, 1e-9)
 
 # ========= Sheets gate (decorator + context manager) =========
 def _take_tokens(bucket, tokens: int):
-    tokens = max(1, int(tokens))
-    for _ in range(tokens):
-        _wait_for(bucket)
+    _sched_for(bucket).acquire(max(1, int(tokens)))
 
 def with_sheets_gate(mode: str = "read", tokens: int = 1):
     """Decorator form: pre-consume read/write tokens before running the func."""
     mode_l = (mode or "read").lower()
-    bucket = _read_bucket if mode_l == "read" else _write_bucket
     def _decorator(fn):
         @functools.wraps(fn)
         def _wrapper(*args, **kwargs):
-            _take_tokens(bucket, tokens)
+            _take_tokens(mode_l, tokens)
             return fn(*args, **kwargs)
         return _wrapper
     return _decorator
@@ -307,9 +318,7 @@ def with_sheets_gate(mode: str = "read", tokens: int = 1):
 @contextmanager
 def sheets_gate(mode: str = "read", tokens: int = 1):
     """Context-manager form to pre-consume tokens around raw gspread usage."""
-    mode_l = (mode or "read").lower()
-    bucket = _read_bucket if mode_l == "read" else _write_bucket
-    _take_tokens(bucket, tokens)
+    _take_tokens((mode or "read").lower(), tokens)
     try:
         yield
     finally:
@@ -442,7 +451,6 @@ def mark_warm_boot():
 _SCOPE = ["https://spreadsheets.google.com/feeds","https://www.googleapis.com/auth/drive"]
 _gs_lock = threading.Lock()
 _gs_client = None
-
 def _resolve_service_account_path() -> str | None:
     # 1) Explicit env path(s)
     for env_name in ("GOOGLE_APPLICATION_CREDENTIALS", "GOOGLE_CREDS_JSON_PATH"):
@@ -498,23 +506,165 @@ def _make_gspread_client():
         warn(f"[WEB] oauth2client fallback failed: {e}; trying gspread default lookup.")
         return gspread.service_account()
 
+# ========= Shared gspread client + Spreadsheet registry =========
+# One authorized client, one Spreadsheet handle per URL and a title->Worksheet
+# map per process. Every module should open Sheets through get_gspread_client /
+# get_sheet / open_ws instead of calling gspread.authorize + open_by_url itself.
+#
+# The client is rotated after GSPREAD_CLIENT_MAX_AGE_S (token lifetime is ~1h)
+# or when a call fails with an auth error (see reset_gspread_client).
+GSPREAD_CLIENT_MAX_AGE_S = int(os.getenv("GSPREAD_CLIENT_MAX_AGE_S", "3000"))
+SHEETS_WS_MAP_TTL_S      = int(os.getenv("SHEETS_WS_MAP_TTL_S", "900"))
+
+_gs_client_born = 0.0
+_gs_sheets: dict[str, "_SpreadsheetHandle"] = {}
+_gs_stats = {
+    "authorizations": 0,
+    "authorizations_avoided": 0,
+    "open_by_url": 0,
+    "open_by_url_avoided": 0,
+    "worksheet_fetches": 0,
+    "worksheet_fetches_avoided": 0,
+    "client_resets": 0,
+}
+# Separate from _gs_lock: some counts are taken while _gs_lock is held.
+_gs_stats_lock = threading.Lock()
+
+def _gs_count(key: str, n: int = 1) -> None:
+    with _gs_stats_lock:
+        _gs_stats[key] = _gs_stats.get(key, 0) + n
+
+class _SpreadsheetHandle:
+    """Registry-owned Spreadsheet proxy.
+
+    Behaves like gspread.Spreadsheet (attribute access is delegated) but
+    serves worksheet(title) from a per-process map so repeated lookups don't
+    each cost a metadata fetch.
+    """
+
+    def __init__(self, sh):
+        self._sh = sh
+        self._ws: dict[str, tuple[float, Any]] = {}
+        self._ws_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._sh, name)
+
+    def _remember(self, ws):
+        title = getattr(ws, "title", None)
+        if title:
+            with self._ws_lock:
+                self._ws[title] = (time.time() + SHEETS_WS_MAP_TTL_S, ws)
+        return ws
+
+    def worksheet(self, title: str):
+        with self._ws_lock:
+            item = self._ws.get(title)
+            if item and time.time() < item[0]:
+                _gs_count("worksheet_fetches_avoided")
+                return item[1]
+        ws = self._sh.worksheet(title)
+        _gs_count("worksheet_fetches")
+        return self._remember(ws)
+
+    def worksheets(self, *args, **kwargs):
+        wss = self._sh.worksheets(*args, **kwargs)
+        _gs_count("worksheet_fetches")
+        for ws in wss:
+            self._remember(ws)
+        return wss
+
+    def add_worksheet(self, title, *args, **kwargs):
+        return self._remember(self._sh.add_worksheet(title, *args, **kwargs))
+
+    def del_worksheet(self, worksheet):
+        with self._ws_lock:
+            self._ws.pop(getattr(worksheet, "title", None), None)
+        return self._sh.del_worksheet(worksheet)
+
+    def forget(self, title: str) -> None:
+        with self._ws_lock:
+            self._ws.pop(title, None)
+
 def get_gspread_client():
-    global _gs_client
+    """Return the process-wide authorized gspread client (rotated on max age)."""
+    global _gs_client, _gs_client_born
     with _gs_lock:
-        if _gs_client is None:
-            _gs_client = _make_gspread_client()
+        now = time.time()
+        if _gs_client is not None and now - _gs_client_born < GSPREAD_CLIENT_MAX_AGE_S:
+            _gs_count("authorizations_avoided")
+            return _gs_client
+        if _gs_client is not None:
+            # Max age reached: drop handles bound to the old session.
+            _gs_sheets.clear()
+        _gs_client = _make_gspread_client()
+        _gs_client_born = now
+        _gs_count("authorizations")
         return _gs_client
 
-def get_sheet():
-    if not SHEET_URL:
+def reset_gspread_client(reason: str = "") -> None:
+    """Forget the cached client and every handle opened with it."""
+    global _gs_client, _gs_client_born
+    with _gs_lock:
+        _gs_client = None
+        _gs_client_born = 0.0
+        _gs_sheets.clear()
+        _gs_count("client_resets")
+    with _cache_lock:
+        _cached_ws.clear()
+    if reason:
+        warn_throttled("gspread_client_reset", f"gspread client reset: {reason}")
+
+def get_sheet(url: str | None = None):
+    """Return the cached Spreadsheet handle for url (defaults to SHEET_URL)."""
+    url = (url or SHEET_URL or "").strip()
+    if not url:
         raise RuntimeError("SHEET_URL env is not set.")
-    return get_gspread_client().open_by_url(SHEET_URL)
+    with _gs_lock:
+        sh = _gs_sheets.get(url)
+    if sh is not None and _gs_client is not None and time.time() - _gs_client_born < GSPREAD_CLIENT_MAX_AGE_S:
+        _gs_count("open_by_url_avoided")
+        return sh
+    gc = get_gspread_client()
+    sh = _SpreadsheetHandle(gc.open_by_url(url))
+    _gs_count("open_by_url")
+    with _gs_lock:
+        _gs_sheets[url] = sh
+    return sh
+
+def open_ws(title: str, *, url: str | None = None, create: bool = False,
+            rows: int = 1000, cols: int = 26, headers: list | None = None):
+    """Worksheet lookup through the registry; optionally create the tab (with headers)."""
+    sh = get_sheet(url)
+    try:
+        return sh.worksheet(title)
+    except gspread.exceptions.WorksheetNotFound:
+        if not create:
+            raise
+        ws = sh.add_worksheet(title=title, rows=rows, cols=cols)
+        if headers:
+            ws.append_row(list(headers), value_input_option="USER_ENTERED")
+        return ws
+
+def sheets_registry_stats() -> dict:
+    """Counters for the client/Spreadsheet registry (calls made vs avoided)."""
+    with _gs_stats_lock:
+        out = dict(_gs_stats)
+    with _gs_lock:
+        out["client_age_s"] = round(time.time() - _gs_client_born, 1) if _gs_client is not None else None
+        out["spreadsheets_cached"] = len(_gs_sheets)
+        out["worksheets_cached"] = sum(len(sh._ws) for sh in _gs_sheets.values())
+    return out
 
 # ========= Backoff + Budget decorator for Sheets =========
+def _is_auth_error(msg: str) -> bool:
+    return any(x in msg for x in ("401", "unauthenticated", "invalid_grant", "invalid credentials"))
+
 def with_sheet_backoff(fn):
     @functools.wraps(fn)
     def wrapper(*a, **k):
         delay = BACKOFF_BASE_S + random.random()*BACKOFF_JIT_S
+        auth_retried = False
         while True:
             try:
                 op = k.pop("_sheet_op", None) or fn.__name__
@@ -525,6 +675,10 @@ def with_sheet_backoff(fn):
                 return fn(*a, **k)
             except gspread.exceptions.APIError as e:
                 msg = str(e).lower()
+                if _is_auth_error(msg) and not auth_retried:
+                    auth_retried = True
+                    reset_gspread_client(f"{fn.__name__}: {e}")
+                    continue
                 if any(s in msg for s in ["rate limit", "quota", "429", "500", "503", "user rate limit"]):
                     warn_throttled(f"sheets_backoff:{fn.__name__}", f"Sheets backoff ({fn.__name__}): {e}")
                     time.sleep(delay)
@@ -542,8 +696,9 @@ def with_sheet_backoff(fn):
 
 # ========= Cached handles/rows/values =========
 _cached_ws: dict[str, tuple[float, Any]] = {}
-_cached_rows: dict[str, tuple[float, Any]] = {}
-_values_cache: dict[str, tuple[float, Any]] = {}
+# (expires_at, value, shared_sheet_cache version stamp)
+_cached_rows: dict[str, tuple[float, Any, int]] = {}
+_values_cache: dict[str, tuple[float, Any, int]] = {}
 _cache_lock = threading.Lock()
 
 # ========= Phase 22B Capstone: Sheet Mirror READ shadow-write (best-effort) =========
@@ -569,13 +724,7 @@ _mirror_cv = threading.Condition(_mirror_lock)
 _mirror_started = False
 
 def _load_db_read_json_cfg() -> dict:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        return json.loads(raw)
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 def _mirror_reads_enabled() -> bool:
     # Hard override (optional)
@@ -594,14 +743,6 @@ def _mirror_reads_enabled() -> bool:
     # mirror_reads defaults to 1 when enabled (capstone behavior)
     return bool(cfg.get("mirror_reads", 1))
 
-def _mirror_reads_max_rows() -> int:
-    cfg = _load_db_read_json_cfg()
-    try:
-        v = int(cfg.get("mirror_max_rows", 1000))
-        return max(10, min(5000, v))
-    except Exception:
-        return 1000
-
 def _mirror_worker():
     while True:
         with _mirror_cv:
@@ -632,13 +773,8 @@ def _mirror_rows_async(tab: str, rows: Any) -> None:
     if not _mirror_reads_enabled():
         return
 
-    try:
-        max_rows = _mirror_reads_max_rows()
-        if isinstance(rows, list) and len(rows) > max_rows:
-            rows = rows[:max_rows]
-    except Exception:
-        pass
-
+    # Pass the full read: db_mirror applies mirror_max_rows itself and needs
+    # the real length to tell a complete snapshot from a capped one.
     try:
         _ensure_mirror_worker()
         with _mirror_cv:
@@ -653,14 +789,46 @@ def clear_sheet_caches():
         _cached_ws.clear()
         _cached_rows.clear()
         _values_cache.clear()
+    shared_sheet_cache.invalidate(None)
 
 def invalidate_tab(tab: str):
     with _cache_lock:
         _cached_ws.pop(f"ws::{tab}", None)
         for k in list(_values_cache.keys()):
-            if k.startswith(f"vals::{tab}::"):
+            if k.startswith((f"vals::{tab}::", f"tail::{tab}::")):
                 _values_cache.pop(k, None)
         _cached_rows.pop(f"rows::{tab}", None)
+    # The tab may have been rewritten; re-count its last row on the next read_tail.
+    with _tail_lock:
+        _tail_last_row.pop(tab, None)
+    # Version bump: the other processes drop their copies on their next poll.
+    shared_sheet_cache.invalidate(tab)
+
+def _cache_lookup(cache: dict, key: str, tab: str):
+    """(hit, value, version): local dict first, then the shared cross-process layer."""
+    ver = shared_sheet_cache.tab_version(tab)
+    with _cache_lock:
+        item = cache.get(key)
+        if item:
+            exp, val, item_ver = item
+            if time.time() < exp and item_ver == ver:
+                shared_sheet_cache.note("local_hits")
+                return True, val, ver
+            cache.pop(key, None)
+    shared = shared_sheet_cache.get(key, tab)
+    if shared is not None:
+        val, exp, _ = shared
+        with _cache_lock:
+            cache[key] = (exp, val, ver)
+        shared_sheet_cache.note("shared_hits")
+        return True, val, ver
+    shared_sheet_cache.note("misses")
+    return False, None, ver
+
+def _cache_store(cache: dict, key: str, tab: str, val, ttl_s: int, ver: int) -> None:
+    with _cache_lock:
+        cache[key] = (time.time() + ttl_s, val, ver)
+    shared_sheet_cache.put(key, tab, val, ttl_s, ver)
 
 @with_sheet_backoff
 def get_ws(name: str):
@@ -692,19 +860,14 @@ def _ws_get_all_values(ws):
 def get_all_records_cached(name: str, ttl_s: int | None = None):
     ttl_s = DEFAULT_ROWS_TTL_S if ttl_s is None else ttl_s
     key = f"rows::{name}"
-    with _cache_lock:
-        item = _cached_rows.get(key)
-        if item:
-            exp, rows = item
-            if time.time() < exp:
-                return rows
-            _cached_rows.pop(key, None)
+    hit, rows, ver = _cache_lookup(_cached_rows, key, name)
+    if hit:
+        return rows
     ws = get_ws_cached(name, ttl_s=ttl_s)
     rows = _ws_get_all_records(ws)
     # Phase 22B: shadow-write read rows into Postgres sheet_mirror_events (best-effort)
     _mirror_rows_async(name, rows)
-    with _cache_lock:
-        _cached_rows[key] = (time.time()+ttl_s, rows)
+    _cache_store(_cached_rows, key, name, rows, ttl_s, ver)
     return rows
 
 def get_records_cached(sheet_name: str, ttl_s: int = 120):
@@ -717,18 +880,13 @@ def _ws_get(ws, range_a1: str):
 def get_values_cached(sheet_name: str, range_a1: str | None = None, ttl_s: int | None = None):
     ttl_s = DEFAULT_VALUES_TTL_S if ttl_s is None else ttl_s
     key = f"vals::{sheet_name}::{range_a1 or '__ALL__'}"
-    with _cache_lock:
-        item = _values_cache.get(key)
-        if item:
-            exp, vals = item
-            if time.time() < exp:
-                return vals
-            _values_cache.pop(key, None)
+    hit, vals, ver = _cache_lookup(_values_cache, key, sheet_name)
+    if hit:
+        return vals
 
     ws = get_ws_cached(sheet_name, ttl_s=ttl_s)
     vals = _ws_get(ws, range_a1) if range_a1 else _ws_get_all_values(ws)
-    with _cache_lock:
-        _values_cache[key] = (time.time() + ttl_s, vals)
+    _cache_store(_values_cache, key, sheet_name, vals, ttl_s, ver)
     return vals
 
 def get_value_cached(sheet_name: str, cell_a1: str, ttl_s: int = 60):
@@ -740,6 +898,117 @@ def get_value_cached(sheet_name: str, cell_a1: str, ttl_s: int = 60):
         return row[0]
     return row or ""
 
+# ========= Tail-window reads for append-only tabs =========
+# read_tail(tab, n) fetches only the last n data rows (A{k}:{col}{end}) instead
+# of the whole tab. Each tab's last used row is remembered per process:
+# our own appends advance it (note_tail_append), every window read probes a few
+# rows past it, and a full column-A count re-verifies it every TAIL_VERIFY_S.
+TAIL_VERIFY_S = int(os.getenv("TAIL_VERIFY_S", "600"))
+TAIL_PROBE_ROWS = int(os.getenv("TAIL_PROBE_ROWS", "50"))
+TAIL_TTL_S = int(os.getenv("TAIL_TTL_S", "15"))
+TAIL_HEADER_TTL_S = int(os.getenv("TAIL_HEADER_TTL_S", "600"))
+
+_tail_lock = threading.Lock()
+_tail_last_row: dict[str, list] = {}   # tab -> [last_used_row, verified_at]
+
+
+def _col_letter(n: int) -> str:
+    s = ""
+    n = max(1, int(n))
+    while n:
+        n, r = divmod(n - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+
+def _tail_set(tab: str, last_row: int, verified: bool) -> None:
+    with _tail_lock:
+        cur = _tail_last_row.get(tab)
+        ts = time.time() if verified or cur is None else cur[1]
+        _tail_last_row[tab] = [max(1, int(last_row)), ts]
+
+
+def note_tail_append(tab: str, n_rows: int = 1, response: Any = None) -> None:
+    """Advance the cached last-used row of `tab` after one of our own appends."""
+    try:
+        with _cache_lock:
+            for k in [k for k in _values_cache if k.startswith(f"tail::{tab}::")]:
+                _values_cache.pop(k, None)
+        rng = ((response or {}).get("updates") or {}).get("updatedRange") if isinstance(response, dict) else None
+        if rng:
+            end = rng.split("!")[-1].split(":")[-1]
+            digits = "".join(ch for ch in end if ch.isdigit())
+            if digits:
+                _tail_set(tab, int(digits), verified=False)
+                return
+        with _tail_lock:
+            cur = _tail_last_row.get(tab)
+            if cur is not None:
+                cur[0] += max(0, int(n_rows))
+    except Exception:
+        pass
+
+
+def _tail_last_used_row(ws, tab: str) -> int:
+    with _tail_lock:
+        cur = _tail_last_row.get(tab)
+    if cur is not None and time.time() - cur[1] < TAIL_VERIFY_S:
+        return cur[0]
+    last = len(_ws_col_values(ws, 1) or [])
+    _tail_set(tab, last, verified=True)
+    return last
+
+
+@with_sheet_backoff
+def _ws_col_values(ws, col: int):
+    return ws.col_values(col)
+
+
+def read_tail(tab: str, n: int, ttl_s: int | None = None) -> list[dict]:
+    """Last `n` data rows of `tab` as header-mapped dicts (oldest first), like get_all_records()[-n:]."""
+    n = max(1, int(n))
+    ttl_s = TAIL_TTL_S if ttl_s is None else ttl_s
+    key = f"tail::{tab}::{n}"
+    # Local only (the window depends on this process's last-row estimate), but
+    # stamped with the shared tab version so another process's invalidate_tab
+    # drops it too.
+    ver = shared_sheet_cache.tab_version(tab)
+    with _cache_lock:
+        item = _values_cache.get(key)
+        if item and time.time() < item[0] and item[2] == ver:
+            return item[1]
+
+    header = [str(h).strip() for h in ((get_values_cached(tab, "1:1", ttl_s=TAIL_HEADER_TTL_S) or [[]])[0] or [])]
+    if not header:
+        return []
+    ws = get_ws_cached(tab)
+    last = _tail_last_used_row(ws, tab)
+    end_col = _col_letter(len(header))
+
+    for attempt in range(2):
+        start = max(2, last - n + 1)
+        end = max(start, last) + TAIL_PROBE_ROWS
+        vals = _ws_get(ws, f"A{start}:{end_col}{end}") or []
+        seen_last = start + len(vals) - 1
+        # Probe window full (tab grew past it) or came back short (rows were
+        # removed): re-count and read again once.
+        if attempt == 0 and (len(vals) >= end - start + 1 or seen_last < last):
+            last = len(_ws_col_values(ws, 1) or [])
+            _tail_set(tab, last, verified=True)
+            continue
+        break
+    _tail_set(tab, max(1, seen_last), verified=False)
+
+    rows: list[dict] = []
+    for r in vals[-n:]:
+        if not any(str(c).strip() for c in r):
+            continue
+        rows.append({h: (r[i] if i < len(r) else "") for i, h in enumerate(header)})
+    with _cache_lock:
+        _values_cache[key] = (time.time() + ttl_s, rows, ver)
+    return rows
+
+
 # ---------------------------------------------------------------------------
 # Backwards-compat shim: write_rows_to_sheet
 # Older code (and some boot diagnostics) still import this from utils.
@@ -790,7 +1059,8 @@ def ws_batch_update(ws, writes):
 
 @with_sheet_backoff
 def ws_append_row(ws, values):
-    ws.append_row(values, value_input_option="RAW")
+    resp = ws.append_row(values, value_input_option="RAW")
+    note_tail_append(getattr(ws, "title", ""), 1, resp)
 
 def sanitize_range(a1: str) -> str:
     if "!" not in a1: return a1
@@ -802,6 +1072,104 @@ def sanitize_range(a1: str) -> str:
 def ws_update(ws, range_a1, values):
     ws.update(sanitize_range(range_a1), values)
 
+@with_sheet_backoff
+def _ws_batch_update_values(ws, data: list[dict], value_input_option: str):
+    return ws.batch_update(data, value_input_option=value_input_option)
+
+@with_sheet_backoff
+def _ws_append_rows(ws, rows: list[list], value_input_option: str):
+    return ws.append_rows(rows, value_input_option=value_input_option)
+
+
+class SheetWriteBatch:
+    """Collect cell updates and appends for one worksheet; write them in one go on exit.
+
+        with SheetWriteBatch(ws, header=header) as wb:
+            for i, row in enumerate(rows, start=2):
+                wb.set(i, "Days Held", days)       # header name or 1-based column
+            wb.append({"Token": "ABC", "Date": today})
+
+    Cell updates are coalesced into contiguous per-column ranges and sent as a
+    single batch_update; appends go out as a single append_rows. Nothing is
+    written if the block raises.
+    """
+
+    def __init__(self, ws, header: list | None = None, value_input_option: str = "USER_ENTERED"):
+        self.ws = ws
+        self._header = [str(h).strip() for h in header] if header is not None else None
+        self.value_input_option = value_input_option
+        self._cells: dict[tuple[int, int], Any] = {}
+        self._appends: list[list] = []
+        self.stats = {"cells": 0, "ranges": 0, "appends": 0, "calls": 0}
+
+    @property
+    def header(self) -> list:
+        if self._header is None:
+            self._header = [str(h).strip() for h in (self.ws.row_values(1) or [])]
+        return self._header
+
+    def col(self, name_or_index) -> int:
+        if isinstance(name_or_index, int):
+            return name_or_index
+        try:
+            return self.header.index(str(name_or_index).strip()) + 1
+        except ValueError:
+            raise KeyError(f"{getattr(self.ws, 'title', '?')}: no column {name_or_index!r}") from None
+
+    def set(self, row: int, col, value) -> None:
+        self._cells[(int(row), self.col(col))] = value
+
+    def append(self, row) -> None:
+        if isinstance(row, dict):
+            row = [row.get(h, "") for h in self.header]
+        self._appends.append(list(row))
+
+    def _ranges(self) -> list[dict]:
+        by_col: dict[int, list[int]] = {}
+        for r, c in self._cells:
+            by_col.setdefault(c, []).append(r)
+        data = []
+        for c, rows in sorted(by_col.items()):
+            rows.sort()
+            run = [rows[0]]
+            for r in rows[1:] + [None]:
+                if r is not None and r == run[-1] + 1:
+                    run.append(r)
+                    continue
+                letter = _col_letter(c)
+                data.append({
+                    "range": f"{letter}{run[0]}:{letter}{run[-1]}",
+                    "values": [[self._cells[(x, c)]] for x in run],
+                })
+                if r is not None:
+                    run = [r]
+        return data
+
+    def flush(self) -> dict:
+        if self._cells:
+            data = self._ranges()
+            _ws_batch_update_values(self.ws, data, self.value_input_option)
+            self.stats["cells"] += len(self._cells)
+            self.stats["ranges"] += len(data)
+            self.stats["calls"] += 1
+            self._cells.clear()
+        if self._appends:
+            resp = _ws_append_rows(self.ws, self._appends, self.value_input_option)
+            note_tail_append(getattr(self.ws, "title", ""), len(self._appends), resp)
+            self.stats["appends"] += len(self._appends)
+            self.stats["calls"] += 1
+            self._appends = []
+        return self.stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        return False
+
+
 def ensure_sheet_headers(tab: str, required_headers: list[str]) -> list[str]:
     try:
         ws = get_ws_cached(tab, ttl_s=30)
@@ -867,13 +1235,154 @@ def backoff_guard(tries=5, base=1.8, first_sleep=1.0):
 
 @backoff_guard(tries=6, base=1.6, first_sleep=1.0)
 def sheets_append_rows(sheet_url: str, worksheet_name: str, rows: list[list]):
-    gc = get_gspread_client()
-    sh = gc.open_by_url(sheet_url)
-    try:
-        ws = sh.worksheet(worksheet_name)
-    except gspread.exceptions.WorksheetNotFound:
-        ws = sh.add_worksheet(title=worksheet_name, rows=200, cols=20)
-    ws.append_rows(rows, value_input_option="USER_ENTERED")
+    ws = open_ws(worksheet_name, url=sheet_url, create=True, rows=200, cols=20)
+    resp = ws.append_rows(rows, value_input_option="USER_ENTERED")
+    note_tail_append(worksheet_name, len(rows), resp)
+
+
+# Same retry policy (and env knobs) as SheetsGateway's write queue.
+_APPEND_BACKOFF_BASE_S = float(os.getenv("SHEETS_QUEUE_BACKOFF_BASE_S", "5"))
+_APPEND_BACKOFF_MAX_S = float(os.getenv("SHEETS_QUEUE_BACKOFF_MAX_S", "600"))
+_APPEND_MAX_ATTEMPTS = int(os.getenv("SHEETS_QUEUE_MAX_ATTEMPTS", "10"))
+SHEET_APPEND_DEADLETTER_PATH = os.getenv("SHEET_APPEND_DEADLETTER_PATH", "sheet_append_deadletter.jsonl")
+
+
+class SheetAppendBuffer:
+    """
+    Asynchronous batched appender for one tab.
+
+    append() queues a row and returns at once; a daemon thread writes up to
+    max_batch rows per append_rows call every flush_s seconds (sooner once a
+    full batch is waiting). A failed batch stays at the head of the queue, so
+    row order is preserved, and is retried with exponential backoff (never
+    sooner than the next write token). After SHEETS_QUEUE_MAX_ATTEMPTS the
+    batch is dead-lettered to SHEET_APPEND_DEADLETTER_PATH (JSONL) and the
+    queue moves on. The queue is bounded by max_pending; append() returns
+    False (and counts a drop) when it is full so callers can fall back to a
+    direct write.
+    """
+
+    def __init__(self, tab: str, *, url: str | None = None, flush_s: float = 2.0,
+                 max_batch: int = 200, max_pending: int = 5000):
+        self.tab = tab
+        self.url = url
+        self.flush_s = max(0.1, float(flush_s))
+        self.max_batch = max(1, int(max_batch))
+        self.max_pending = max(1, int(max_pending))
+        self._pending: "collections.deque[list]" = collections.deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._attempts = 0        # consecutive failures of the head batch
+        self._next_at = 0.0       # no retry before this (backoff)
+        self._stats = {"queued": 0, "written": 0, "batches": 0, "failures": 0,
+                       "dropped": 0, "dead_lettered": 0, "last_error": None, "last_flush_ts": 0}
+
+    def append(self, row: list) -> bool:
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self._stats["dropped"] += 1
+                return False
+            self._pending.append(list(row))
+            self._stats["queued"] += 1
+            full = len(self._pending) >= self.max_batch
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+        return True
+
+    def _write(self, batch: list[list]) -> None:
+        ws = open_ws(self.tab, url=self.url)
+        resp = ws.append_rows(batch, value_input_option="USER_ENTERED")
+        note_tail_append(self.tab, len(batch), resp)
+
+    def _backoff(self) -> float:
+        delay = min(_APPEND_BACKOFF_MAX_S, _APPEND_BACKOFF_BASE_S * (2 ** max(0, self._attempts - 1)))
+        delay *= 1.0 + random.random() * 0.25
+        return max(delay, sheets_token_eta("write"))
+
+    def _dead_letter(self, batch: list[list], error: str) -> None:
+        try:
+            with open(SHEET_APPEND_DEADLETTER_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"tab": self.tab, "ts": int(time.time()), "error": error,
+                                    "rows": batch}, default=str) + "\n")
+        except Exception as e:
+            warn(f"{self.tab}: dead-letter write failed, {len(batch)} rows lost: {e}")
+
+    def flush(self, force: bool = False) -> int:
+        """Write everything queued so far (in max_batch chunks). Returns rows written.
+
+        While the head batch is backing off nothing is attempted unless force=True.
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                if not force and time.time() < self._next_at:
+                    break
+                with self._lock:
+                    batch = [self._pending[i] for i in range(min(self.max_batch, len(self._pending)))]
+                if not batch:
+                    break
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    err = f"{e.__class__.__name__}: {e}"
+                    self._attempts += 1
+                    self._stats["failures"] += 1
+                    self._stats["last_error"] = err
+                    if self._attempts < _APPEND_MAX_ATTEMPTS:
+                        self._next_at = time.time() + self._backoff()
+                        warn_throttled(f"append_buffer:{self.tab}",
+                                       f"{self.tab} batched append failed (attempt {self._attempts}, will retry): {e}")
+                        break
+                    # Give up on this batch so the rows behind it can move.
+                    self._dead_letter(batch, err)
+                    with self._lock:
+                        for _ in batch:
+                            self._pending.popleft()
+                    self._stats["dead_lettered"] += len(batch)
+                    warn(f"{self.tab}: batch of {len(batch)} rows dead-lettered after {self._attempts} attempts: {e}")
+                    self._attempts = 0
+                    self._next_at = 0.0
+                    continue
+                self._attempts = 0
+                self._next_at = 0.0
+                with self._lock:
+                    for _ in batch:
+                        self._pending.popleft()
+                written += len(batch)
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+                self._stats["last_flush_ts"] = int(time.time())
+        return written
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"append-{self.tab}", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush, force=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+            out["pending"] = len(self._pending)
+        out["attempts"] = self._attempts
+        out["retry_in_s"] = round(max(0.0, self._next_at - time.time()), 1)
+        out["tab"] = self.tab
+        return out
 
 WATCHDOG_TAB = os.getenv("WATCHDOG_TAB", "Rotation_Log")
 WATCHDOG_TOKEN_COL = os.getenv("WATCHDOG_TOKEN_COL", "Token")
@@ -3,18 +3,13 @@ import os
 from datetime import datetime
 import gspread
 from gspread.exceptions import APIError
-from oauth2client.service_account import ServiceAccountCredentials
-
-from utils import with_sheet_backoff, str_or_empty, safe_float
+from utils import get_sheet, with_sheet_backoff, str_or_empty, safe_float
 
 SHEET_URL = os.getenv("SHEET_URL")
-SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 
 @with_sheet_backoff
 def _open_sheet():
-    creds = ServiceAccountCredentials.from_json_keyfile_name("sentiment-log-service.json", SCOPE)
-    client = gspread.authorize(creds)
-    return client.open_by_url(SHEET_URL)
+    return get_sheet(SHEET_URL)
 
 @with_sheet_backoff
 def _get_ws(title: str):
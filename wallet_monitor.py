@@ -6,11 +6,11 @@
 import os
 import re
 import time
-import requests
 from datetime import datetime
 from typing import List, Optional, Tuple, Set, Dict
 
-from utils import with_sheet_backoff, get_sheet
+from utils import with_sheet_backoff, get_sheet, SheetWriteBatch
+from provider_fanout import fan_out, http_get, http_post
 
 # Prefer deduped telegram if available; fallback to send_telegram_message if not
 try:
@@ -58,6 +58,9 @@ WALLET_AUTO_RESOLVE_STATUS = os.getenv("WALLET_AUTO_RESOLVE_STATUS", "1").lower(
 # If you truly want auto-claim marking, keep it off by default:
 WALLET_AUTO_MARK_CLAIMED = os.getenv("WALLET_AUTO_MARK_CLAIMED", "0").lower() in {"1", "true", "yes", "on"}
 
+# Overall wall-clock budget for provider fetches (all wallets, all chains).
+WALLET_FETCH_DEADLINE_S = float(os.getenv("WALLET_FETCH_DEADLINE_S", "45"))
+
 # Allowed symbol pattern: letters/numbers/_-. up to 10 chars
 SYM_OK = re.compile(r"^[A-Z0-9._-]{2,10}$")
 
@@ -156,7 +159,7 @@ def _zapper_graphql_fetch_symbols(address: str) -> Tuple[Set[str], Optional[str]
         while True:
             loops += 1
             payload = {"query": query, "variables": variables}
-            r = requests.post(_ZAPPER_GQL_URL, headers=headers, json=payload, timeout=30)
+            r = http_post("zapper", _ZAPPER_GQL_URL, headers=headers, json=payload, timeout=30)
 
             if r.status_code != 200:
                 return out_syms, f"zapper:{r.status_code}:{(r.text or '')[:200]}"
@@ -207,57 +210,72 @@ def _zapper_graphql_fetch_symbols(address: str) -> Tuple[Set[str], Optional[str]
 
 
 # ---------------- Covalent/GoldRush fallback ----------------
-def _fetch_covalent_tokens(address: str, chains: List[str]) -> Tuple[Set[str], Optional[str]]:
+def _fetch_covalent_chain(address: str, chain: str) -> Tuple[Set[str], List[str]]:
     key = COVALENT_API_KEY
-    if not key or not chains:
-        return set(), "covalent:no-key-or-chains"
-
     syms: Set[str] = set()
-    errs = []
+    errs: List[str] = []
+    ok = False
+    j = None
 
-    for chain in chains:
-        ok = False
-        j = None
+    # (1) Legacy query-param style
+    try:
+        url_qs = f"https://api.covalenthq.com/v1/{chain}/address/{address}/balances_v2/?key={key}"
+        r = http_get("covalent", url_qs, timeout=20)
+        if r.status_code == 200:
+            ok, j = True, (r.json() or {})
+        else:
+            errs.append(f"{chain}:qs:{r.status_code}")
+    except Exception as e:
+        errs.append(f"{chain}:qs_exc:{e}")
 
-        # (1) Legacy query-param style
+    # (2) Bearer header style (GoldRush)
+    if not ok:
         try:
-            url_qs = f"https://api.covalenthq.com/v1/{chain}/address/{address}/balances_v2/?key={key}"
-            r = requests.get(url_qs, timeout=20)
+            url_hdr = f"https://api.covalenthq.com/v1/{chain}/address/{address}/balances_v2/"
+            r = http_get("covalent", url_hdr, timeout=20, headers={"Authorization": f"Bearer {key}"})
             if r.status_code == 200:
                 ok, j = True, (r.json() or {})
             else:
-                errs.append(f"{chain}:qs:{r.status_code}")
+                errs.append(f"{chain}:bearer:{r.status_code}")
         except Exception as e:
-            errs.append(f"{chain}:qs_exc:{e}")
-
-        # (2) Bearer header style (GoldRush)
-        if not ok:
-            try:
-                url_hdr = f"https://api.covalenthq.com/v1/{chain}/address/{address}/balances_v2/"
-                r = requests.get(url_hdr, timeout=20, headers={"Authorization": f"Bearer {key}"})
-                if r.status_code == 200:
-                    ok, j = True, (r.json() or {})
-                else:
-                    errs.append(f"{chain}:bearer:{r.status_code}")
-            except Exception as e:
-                errs.append(f"{chain}:bearer_exc:{e}")
-
-        if not ok:
-            continue
+            errs.append(f"{chain}:bearer_exc:{e}")
 
-        items = ((j.get("data") or {}).get("items") or [])
-        for it in items:
-            sym = (it.get("contract_ticker_symbol") or "").upper().strip()
-            raw = it.get("balance")
-            dec = it.get("contract_decimals") or 0
-            try:
-                bal = float(raw) / (10 ** int(dec)) if raw is not None else 0.0
-            except Exception:
-                bal = 0.0
-            if sym and bal > 0:
-                if REQUIRE_SYMBOL_CLEAN and not is_symbol_clean(sym):
-                    continue
-                syms.add(sym)
+    if not ok:
+        return syms, errs
+
+    items = ((j.get("data") or {}).get("items") or [])
+    for it in items:
+        sym = (it.get("contract_ticker_symbol") or "").upper().strip()
+        raw = it.get("balance")
+        dec = it.get("contract_decimals") or 0
+        try:
+            bal = float(raw) / (10 ** int(dec)) if raw is not None else 0.0
+        except Exception:
+            bal = 0.0
+        if sym and bal > 0:
+            if REQUIRE_SYMBOL_CLEAN and not is_symbol_clean(sym):
+                continue
+            syms.add(sym)
+    return syms, errs
+
+
+def _fetch_covalent_tokens(address: str, chains: List[str]) -> Tuple[Set[str], Optional[str]]:
+    if not COVALENT_API_KEY or not chains:
+        return set(), "covalent:no-key-or-chains"
+
+    syms: Set[str] = set()
+    errs: List[str] = []
+    res = fan_out({chain: (lambda c=chain: _fetch_covalent_chain(address, c)) for chain in chains},
+                  deadline_s=WALLET_FETCH_DEADLINE_S)
+    for chain in chains:
+        if chain in res.results:
+            c_syms, c_errs = res.results[chain]
+            syms |= c_syms
+            errs.extend(c_errs)
+        elif chain in res.errors:
+            errs.append(f"{chain}:exc:{res.errors[chain]}")
+        else:
+            errs.append(f"{chain}:timeout")
 
     return syms, (";".join(errs) if errs else None)
 
@@ -286,6 +304,69 @@ def fetch_wallet_tokens(address: str) -> Tuple[List[str], Dict[str, str]]:
     return [], diag
 
 
+def fetch_wallets_tokens(addresses: List[str]) -> Dict[str, Tuple[List[str], Dict[str, str]]]:
+    """
+    fetch_wallet_tokens for many addresses at once, under one WALLET_FETCH_DEADLINE_S budget.
+    Zapper for every address runs concurrently; Covalent (per address x chain, also
+    concurrent) only for addresses Zapper returned nothing for. Addresses whose
+    providers ran out of time come back as provider "timeout".
+    """
+    t0 = time.monotonic()
+    out: Dict[str, Tuple[List[str], Dict[str, str]]] = {}
+
+    z = fan_out({a: (lambda a=a: _zapper_graphql_fetch_symbols(a)) for a in addresses},
+                deadline_s=WALLET_FETCH_DEADLINE_S)
+    fallback: Dict[str, Dict[str, str]] = {}
+    for a in addresses:
+        if a in z.results:
+            z_syms, z_err = z.results[a]
+        else:
+            z_syms, z_err = set(), ("zapper:timeout" if a in z.timed_out else f"zapper:exc:{z.errors.get(a)}")
+        if z_syms:
+            out[a] = (sorted(z_syms), {"provider": "zapper"})
+        else:
+            fallback[a] = {"zapper_err": (z_err or "empty")}
+
+    if not fallback:
+        return out
+
+    chains = WALLET_CHAINS if COVALENT_API_KEY else []
+    left = WALLET_FETCH_DEADLINE_S - (time.monotonic() - t0)
+    c = fan_out({(a, ch): (lambda a=a, ch=ch: _fetch_covalent_chain(a, ch)) for a in fallback for ch in chains},
+                deadline_s=max(0.0, left))
+    for a, diag in fallback.items():
+        if not chains:
+            diag["covalent_err"] = "covalent:no-key-or-chains"
+            diag["provider"] = "none"
+            out[a] = ([], diag)
+            continue
+        syms: Set[str] = set()
+        errs: List[str] = []
+        timed_out = False
+        for ch in chains:
+            key = (a, ch)
+            if key in c.results:
+                c_syms, c_errs = c.results[key]
+                syms |= c_syms
+                errs.extend(c_errs)
+            elif key in c.errors:
+                errs.append(f"{ch}:exc:{c.errors[key]}")
+            else:
+                errs.append(f"{ch}:timeout")
+                timed_out = True
+        if syms:
+            diag["provider"] = "covalent"
+            diag["covalent_note"] = f"zapper_failed={diag['zapper_err']}"
+            if errs:
+                diag["covalent_err"] = ";".join(errs)
+            out[a] = (sorted(syms), diag)
+        else:
+            diag["covalent_err"] = ";".join(errs) or "empty"
+            diag["provider"] = "timeout" if timed_out else "none"
+            out[a] = ([], diag)
+    return out
+
+
 def _tg(text: str, key: str) -> None:
     if not _tg_send:
         return
@@ -351,8 +432,7 @@ def run_wallet_monitor() -> None:
     all_wallet_tokens: Set[str] = set()
     diags: List[str] = []
 
-    for addr in addrs:
-        toks, diag = fetch_wallet_tokens(addr)
+    for addr, (toks, diag) in fetch_wallets_tokens(addrs).items():
         all_wallet_tokens.update(toks)
         if diag.get("provider") != "zapper":
             short = f"{addr[:6]}…{addr[-4:]}"
@@ -380,6 +460,19 @@ def run_wallet_monitor() -> None:
         print("✅ Wallet Monitor: no unclaimed approved arrivals detected.")
         return
 
+    # token -> first Claim_Tracker row (sheet row number), built once
+    claim_row_by_token: Dict[str, int] = {}
+    for i, row in enumerate(claim_data, start=2):
+        tok = (row.get("Token") or "").strip().upper()
+        if tok and tok not in claim_row_by_token:
+            claim_row_by_token[tok] = i
+
+    claim_header = list(claim_data[0].keys()) if claim_data else None
+    claim_batch = SheetWriteBatch(claim_ws, header=claim_header)
+    # Header names when present; otherwise the original fixed columns (I / H).
+    status_col = "Status" if claim_header and "Status" in claim_header else 9
+    claimed_col = "Claimed?" if claim_header and "Claimed?" in claim_header else 8
+
     for token in arrivals:
         msg = (
             f"⚠️ *{token}* has arrived in your on-chain wallet,\n"
@@ -389,30 +482,20 @@ def run_wallet_monitor() -> None:
         )
         _tg(msg, key=f"wallet_arrival:{token}")
 
+        row_i = claim_row_by_token.get(token)
+        if row_i is None:
+            continue
         # Update Status column to Resolved (if configured)
         if WALLET_AUTO_RESOLVE_STATUS:
-            # best-effort: find token row and set Status column to Resolved if column exists
-            for i, row in enumerate(claim_data, start=2):
-                if (row.get("Token") or "").strip().upper() == token:
-                    try:
-                        # Column I in your original code; keep it but guard
-                        claim_ws.update_acell(f"I{i}", "Resolved")
-                    except Exception:
-                        pass
-                    break
-
+            claim_batch.set(row_i, status_col, "Resolved")
         # Optional: auto-mark claimed (OFF by default)
         if WALLET_AUTO_MARK_CLAIMED:
-            for i, row in enumerate(claim_data, start=2):
-                if (row.get("Token") or "").strip().upper() == token:
-                    try:
-                        # attempt to set "Claimed?" column if it exists
-                        # If the sheet has a header named "Claimed?", updating by cell index is safer
-                        # but we keep simple behavior: update column that matches original structure if known.
-                        claim_ws.update_acell(f"H{i}", "Claimed")
-                    except Exception:
-                        pass
-                    break
+            claim_batch.set(row_i, claimed_col, "Claimed")
+
+    try:
+        claim_batch.flush()
+    except Exception as e:
+        print(f"⚠️ Wallet Monitor: claim status update failed: {e}")
 
     print(f"✅ Wallet Monitor complete. Alerts sent for: {arrivals}")
 
@@ -0,0 +1,365 @@
+# wallet_snapshot_store.py — compact, typed Wallet_Monitor snapshot history
+"""
+One record per telemetry push instead of one Sheets row per (venue, asset)
+carrying a repeated compact snapshot string.
+
+Storage (Postgres via db_pool, else SQLite at WALLET_SNAPSHOT_SQLITE_PATH):
+
+  wallet_snapshots       id, agent, ts, keyframe, n_changes, created_at
+  wallet_snapshot_rows   snapshot_id, venue, asset, free, locked, removed
+
+Delta encoding: a snapshot stores only the (venue, asset) rows that changed
+since the agent's previous snapshot, plus `removed` tombstones. Every
+WALLET_SNAPSHOT_KEYFRAME_EVERY snapshots (and for an agent's first one) a
+full keyframe is written, so rebuilding any snapshot reads at most one
+keyframe plus its following deltas. Re-recording the push an agent's last
+snapshot already holds (same agent and ts, e.g. the periodic mirror job
+with no new push) writes nothing and returns the stored snapshot.
+
+Readers use the typed API:
+
+    snap = latest_snapshot()               # WalletSnapshot | None
+    snap.holdings                          # [Holding(venue, asset, free, locked)]
+    snap.by_venue()                        # {"KRAKEN": {"USDT": 130.69}, ...}
+    snap.quote_breakdown({"USD", "USDT"})  # {"USDT": 290.2, ...}
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+KEYFRAME_EVERY = max(1, int(os.getenv("WALLET_SNAPSHOT_KEYFRAME_EVERY", "48")))
+SQLITE_PATH = os.getenv("WALLET_SNAPSHOT_SQLITE_PATH", "/tmp/wallet_snapshots.sqlite")
+STABLES = {"USD", "USDT", "USDC", "DAI"}
+
+_EPS = 1e-12
+
+Key = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class Holding:
+    venue: str
+    asset: str
+    free: float
+    locked: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.free + self.locked
+
+
+@dataclass
+class WalletSnapshot:
+    id: int
+    agent: str
+    ts: float
+    holdings: List[Holding] = field(default_factory=list)
+
+    @property
+    def ts_str(self) -> str:
+        return datetime.fromtimestamp(self.ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    def by_venue(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for h in self.holdings:
+            out.setdefault(h.venue, {})[h.asset] = h.total
+        return out
+
+    def quote_breakdown(self, stables: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        wanted = {s.upper() for s in (stables or STABLES)}
+        out: Dict[str, float] = {}
+        for h in self.holdings:
+            if h.asset in wanted:
+                out[h.asset] = out.get(h.asset, 0.0) + h.total
+        return out
+
+
+def _db_url() -> str:
+    return (os.getenv("DB_URL") or os.getenv("DATABASE_URL") or "").strip()
+
+
+def _use_pg() -> bool:
+    if not _db_url():
+        return False
+    try:
+        import psycopg2  # type: ignore  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+_PG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallet_snapshots (
+  id BIGSERIAL PRIMARY KEY,
+  agent TEXT NOT NULL,
+  ts TIMESTAMPTZ NOT NULL,
+  keyframe BOOLEAN NOT NULL,
+  n_changes INT NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS ix_wallet_snapshots_agent_id ON wallet_snapshots(agent, id DESC);
+CREATE INDEX IF NOT EXISTS ix_wallet_snapshots_keyframe ON wallet_snapshots(agent, id DESC) WHERE keyframe;
+CREATE TABLE IF NOT EXISTS wallet_snapshot_rows (
+  snapshot_id BIGINT NOT NULL REFERENCES wallet_snapshots(id) ON DELETE CASCADE,
+  venue TEXT NOT NULL,
+  asset TEXT NOT NULL,
+  free DOUBLE PRECISION NOT NULL,
+  locked DOUBLE PRECISION NOT NULL DEFAULT 0,
+  removed BOOLEAN NOT NULL DEFAULT FALSE,
+  PRIMARY KEY (snapshot_id, venue, asset)
+);
+"""
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallet_snapshots (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  agent TEXT NOT NULL,
+  ts REAL NOT NULL,
+  keyframe INTEGER NOT NULL,
+  n_changes INTEGER NOT NULL,
+  created_at REAL NOT NULL DEFAULT (strftime('%s','now'))
+);
+CREATE INDEX IF NOT EXISTS ix_wallet_snapshots_agent_id ON wallet_snapshots(agent, id);
+CREATE TABLE IF NOT EXISTS wallet_snapshot_rows (
+  snapshot_id INTEGER NOT NULL,
+  venue TEXT NOT NULL,
+  asset TEXT NOT NULL,
+  free REAL NOT NULL,
+  locked REAL NOT NULL DEFAULT 0,
+  removed INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (snapshot_id, venue, asset)
+);
+"""
+
+
+class _Backend:
+    """Thin SQL layer; Postgres and SQLite differ only in paramstyle and a few types."""
+
+    def __init__(self) -> None:
+        self.pg = _use_pg()
+        self._schema_ok = False
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        if self.pg:
+            from db_pool import pg_conn  # type: ignore
+            return pg_conn(url=_db_url(), caller="wallet_snapshot_store")
+        return _SQLiteConn(SQLITE_PATH)
+
+    def _sql(self, q: str) -> str:
+        return q if self.pg else q.replace("%s", "?")
+
+    def _ensure(self, cur) -> None:
+        if self._schema_ok:
+            return
+        if self.pg:
+            cur.execute(_PG_SCHEMA)
+        else:
+            cur.executescript(_SQLITE_SCHEMA)
+        self._schema_ok = True
+
+    def insert_snapshot(self, agent: str, ts: float, keyframe: bool,
+                        rows: List[Tuple[str, str, float, float, bool]]) -> int:
+        with self._lock, self._conn() as conn:
+            cur = conn.cursor()
+            self._ensure(cur)
+            if self.pg:
+                cur.execute(
+                    "INSERT INTO wallet_snapshots(agent, ts, keyframe, n_changes) "
+                    "VALUES (%s, to_timestamp(%s), %s, %s) RETURNING id",
+                    (agent, ts, keyframe, len(rows)),
+                )
+                snap_id = int(cur.fetchone()[0])
+            else:
+                cur.execute(
+                    "INSERT INTO wallet_snapshots(agent, ts, keyframe, n_changes) VALUES (?, ?, ?, ?)",
+                    (agent, ts, int(keyframe), len(rows)),
+                )
+                snap_id = int(cur.lastrowid)
+            if rows:
+                cur.executemany(
+                    self._sql("INSERT INTO wallet_snapshot_rows(snapshot_id, venue, asset, free, locked, removed) "
+                              "VALUES (%s, %s, %s, %s, %s, %s)"),
+                    [(snap_id, v, a, f, l, rm if self.pg else int(rm)) for v, a, f, l, rm in rows],
+                )
+            return snap_id
+
+    def load(self, agent: Optional[str], snapshot_id: Optional[int]) -> Optional[WalletSnapshot]:
+        """Rebuild one snapshot (latest for agent, or a given id) from keyframe + deltas."""
+        ts_col = "extract(epoch from ts)" if self.pg else "ts"
+        with self._lock, self._conn() as conn:
+            cur = conn.cursor()
+            self._ensure(cur)
+            if snapshot_id is not None:
+                cur.execute(self._sql(f"SELECT id, agent, {ts_col} FROM wallet_snapshots WHERE id=%s"), (snapshot_id,))
+            elif agent:
+                cur.execute(self._sql(f"SELECT id, agent, {ts_col} FROM wallet_snapshots WHERE agent=%s "
+                                      "ORDER BY id DESC LIMIT 1"), (agent,))
+            else:
+                cur.execute(f"SELECT id, agent, {ts_col} FROM wallet_snapshots ORDER BY id DESC LIMIT 1")
+            head = cur.fetchone()
+            if not head:
+                return None
+            snap_id, snap_agent, ts = int(head[0]), str(head[1]), float(head[2])
+            cur.execute(
+                self._sql("SELECT COALESCE(MAX(id), 0) FROM wallet_snapshots "
+                          "WHERE agent=%s AND keyframe AND id <= %s" if self.pg else
+                          "SELECT COALESCE(MAX(id), 0) FROM wallet_snapshots "
+                          "WHERE agent=%s AND keyframe=1 AND id <= %s"),
+                (snap_agent, snap_id),
+            )
+            base = int(cur.fetchone()[0] or 0)
+            cur.execute(
+                self._sql("SELECT r.venue, r.asset, r.free, r.locked, r.removed "
+                          "FROM wallet_snapshot_rows r JOIN wallet_snapshots s ON s.id = r.snapshot_id "
+                          "WHERE s.agent=%s AND s.id BETWEEN %s AND %s ORDER BY s.id"),
+                (snap_agent, base, snap_id),
+            )
+            state: Dict[Key, Holding] = {}
+            for venue, asset, free, locked, removed in cur.fetchall():
+                if removed:
+                    state.pop((venue, asset), None)
+                else:
+                    state[(venue, asset)] = Holding(venue, asset, float(free), float(locked or 0.0))
+        holdings = [state[k] for k in sorted(state)]
+        return WalletSnapshot(id=snap_id, agent=snap_agent, ts=ts, holdings=holdings)
+
+
+class _SQLiteConn:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.conn = None
+
+    def __enter__(self):
+        self.conn = sqlite3.connect(self.path, timeout=10)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.commit()
+        finally:
+            self.conn.close()
+        return False
+
+
+_backend: Optional[_Backend] = None
+_backend_lock = threading.Lock()
+
+# agent -> (last state, snapshots since keyframe, last ts, last snapshot id);
+# avoids re-reading for deltas and for the duplicate-push check
+_last: Dict[str, Tuple[Dict[Key, Holding], int, Optional[float], Optional[int]]] = {}
+_stats = {"snapshots": 0, "keyframes": 0, "rows_written": 0, "duplicates_skipped": 0,
+          "errors": 0, "last_error": None}
+
+# Postgres keeps microseconds; a ts read back can differ from the pushed float by rounding.
+_TS_EPS = 1e-3
+
+
+def _get_backend() -> _Backend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _Backend()
+    return _backend
+
+
+def _holdings_from_by_venue(by_venue: Dict[str, Dict[str, object]], min_balance: float) -> Dict[Key, Holding]:
+    out: Dict[Key, Holding] = {}
+    for venue, balances in (by_venue or {}).items():
+        if not isinstance(balances, dict):
+            continue
+        for asset, qty in balances.items():
+            free, locked = qty if isinstance(qty, (tuple, list)) and len(qty) == 2 else (qty, 0.0)
+            try:
+                free_f, locked_f = float(free or 0.0), float(locked or 0.0)
+            except Exception:
+                continue
+            if free_f + locked_f <= min_balance:
+                continue
+            key = (str(venue).upper(), str(asset).upper())
+            out[key] = Holding(key[0], key[1], free_f, locked_f)
+    return out
+
+
+def record_snapshot(agent: str, ts: float, by_venue: Dict[str, Dict[str, object]],
+                    min_balance: float = 0.0) -> Optional[WalletSnapshot]:
+    """
+    Store one push. by_venue maps venue -> {asset: qty | (free, locked)}.
+    Returns the full WalletSnapshot that was recorded, or the stored one when
+    (agent, ts) is the agent's last snapshot already (None on storage error).
+    """
+    agent = (agent or "").strip() or "bus-telemetry"
+    current = _holdings_from_by_venue(by_venue, min_balance)
+    backend = _get_backend()
+    try:
+        prev_state, since_kf, prev_ts, prev_id = _last.get(agent, (None, 0, None, None))
+        if prev_state is None:
+            prev = backend.load(agent, None)
+            prev_state = {(h.venue, h.asset): h for h in prev.holdings} if prev else None
+            prev_ts, prev_id = (prev.ts, prev.id) if prev else (None, None)
+            since_kf = KEYFRAME_EVERY  # unknown distance: start with a keyframe
+            if prev_state is not None:
+                _last[agent] = (prev_state, since_kf, prev_ts, prev_id)
+
+        if prev_state is not None and prev_ts is not None and abs(prev_ts - float(ts)) < _TS_EPS:
+            _stats["duplicates_skipped"] += 1
+            return WalletSnapshot(id=int(prev_id), agent=agent, ts=prev_ts,
+                                  holdings=[prev_state[k] for k in sorted(prev_state)])
+
+        keyframe = prev_state is None or since_kf + 1 >= KEYFRAME_EVERY
+
+        if keyframe:
+            rows = [(h.venue, h.asset, h.free, h.locked, False) for _, h in sorted(current.items())]
+        else:
+            rows = []
+            for key, h in sorted(current.items()):
+                old = prev_state.get(key)
+                if old is None or abs(old.free - h.free) > _EPS or abs(old.locked - h.locked) > _EPS:
+                    rows.append((h.venue, h.asset, h.free, h.locked, False))
+            for key in sorted(set(prev_state) - set(current)):
+                rows.append((key[0], key[1], 0.0, 0.0, True))
+
+        snap_id = backend.insert_snapshot(agent, float(ts), keyframe, rows)
+        _last[agent] = (current, 0 if keyframe else since_kf + 1, float(ts), snap_id)
+        _stats["snapshots"] += 1
+        _stats["keyframes"] += int(keyframe)
+        _stats["rows_written"] += len(rows)
+        return WalletSnapshot(id=snap_id, agent=agent, ts=float(ts),
+                              holdings=[current[k] for k in sorted(current)])
+    except Exception as e:
+        _stats["errors"] += 1
+        _stats["last_error"] = f"{e.__class__.__name__}:{e}"
+        _last.pop(agent, None)
+        return None
+
+
+def latest_snapshot(agent: Optional[str] = None) -> Optional[WalletSnapshot]:
+    """Most recent snapshot (for agent, or across agents). None if nothing stored / store down."""
+    try:
+        return _get_backend().load(agent, None)
+    except Exception as e:
+        _stats["errors"] += 1
+        _stats["last_error"] = f"{e.__class__.__name__}:{e}"
+        return None
+
+
+def get_snapshot(snapshot_id: int) -> Optional[WalletSnapshot]:
+    try:
+        return _get_backend().load(None, int(snapshot_id))
+    except Exception:
+        return None
+
+
+def store_stats() -> Dict[str, object]:
+    out = dict(_stats)
+    out["backend"] = "postgres" if _get_backend().pg else "sqlite"
+    out["keyframe_every"] = KEYFRAME_EVERY
+    return out
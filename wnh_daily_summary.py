@@ -18,6 +18,8 @@ import hashlib
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Tuple
 
+import config_service
+
 
 def _truthy(v: Any) -> bool:
     if v is None:
@@ -30,14 +32,7 @@ def _truthy(v: Any) -> bool:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _wnh_cfg() -> Dict[str, Any]:
@@ -112,21 +107,16 @@ def _get_all_values(ws) -> List[List[str]]:
 
 
 def _tail_signatures(ws, tail_n: int) -> set:
-    vals = _get_all_values(ws)
-    if not vals:
-        return set()
-    header = vals[0] if vals else []
     try:
-        sig_i = header.index("Signature")
+        from utils import read_tail  # type: ignore
+        tail = read_tail(ws.title, tail_n, ttl_s=0)
     except Exception:
         return set()
-    tail = vals[-tail_n:] if len(vals) > tail_n else vals[1:]
     out = set()
     for r in tail:
-        if len(r) > sig_i:
-            s = (r[sig_i] or "").strip()
-            if s:
-                out.add(s)
+        s = str(r.get("Signature") or "").strip()
+        if s:
+            out.add(s)
     return out
 
 
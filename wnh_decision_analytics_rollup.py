@@ -29,24 +29,13 @@ def _open_ws(tab: str):
         return get_ws_cached(tab, ttl_s=30)
     except Exception:
         # fallback: raw gspread (rare; usually utils exists)
-        import gspread
-        from oauth2client.service_account import ServiceAccountCredentials
+        from utils import get_sheet
 
         sheet_url = os.getenv("SHEET_URL")
         if not sheet_url:
             raise RuntimeError("SHEET_URL not set")
 
-        svc = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        if not svc:
-            raise RuntimeError("GOOGLE_APPLICATION_CREDENTIALS not set")
-
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-        gc = gspread.authorize(creds)
-        sh = gc.open_by_url(sheet_url)
+        sh = get_sheet(sheet_url)
 
         try:
             return sh.worksheet(tab)
@@ -30,6 +30,8 @@ import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+import config_service
+
 
 DEFAULT_TAB = "Why_Nothing_Happened"
 
@@ -52,14 +54,7 @@ def _safe_json(obj: Any) -> str:
 
 
 def _load_db_read_json() -> Dict[str, Any]:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg() -> Dict[str, Any]:
@@ -160,28 +155,15 @@ def _ensure_sheet_headers(tab: str) -> None:
     except Exception:
         pass
 
-    # Fallback path (mirrors policy_logger legacy auth style)
+    # Fallback path (shared registry handle; creates the tab if missing)
     try:
-        import gspread
-        from oauth2client.service_account import ServiceAccountCredentials
+        from utils import get_sheet
 
         sheet_url = os.getenv("SHEET_URL")
         if not sheet_url:
             return
 
-        svc = (
-            os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-            or os.getenv("GOOGLE_CREDENTIALS_JSON")
-            or os.getenv("SVC_JSON")
-            or "sentiment-log-service.json"
-        )
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-        gc = gspread.authorize(creds)
-        sh = gc.open_by_url(sheet_url)
+        sh = get_sheet(sheet_url)
         try:
             ws = sh.worksheet(tab)
         except Exception:
@@ -210,28 +192,15 @@ def _append_row(tab: str, row: List[Any]) -> None:
     except Exception:
         pass
 
-    # Fallback to legacy open (like policy_logger)
+    # Fallback to the shared registry handle
     try:
-        import gspread
-        from oauth2client.service_account import ServiceAccountCredentials
+        from utils import get_sheet
 
         sheet_url = os.getenv("SHEET_URL")
         if not sheet_url:
             return
 
-        svc = (
-            os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-            or os.getenv("GOOGLE_CREDENTIALS_JSON")
-            or os.getenv("SVC_JSON")
-            or "sentiment-log-service.json"
-        )
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-        gc = gspread.authorize(creds)
-        sh = gc.open_by_url(sheet_url)
+        sh = get_sheet(sheet_url)
         ws = sh.worksheet(tab)
         try:
             ws.append_row(row, value_input_option="USER_ENTERED")
@@ -257,11 +226,8 @@ def _tail_has_key(tab: str, key: str) -> bool:
     """
     n = sheet_tail_n()
     try:
-        from utils import get_records_cached
-        rows = get_records_cached(tab, ttl_s=60) or []
-        if not rows:
-            return False
-        tail = rows[-n:]
+        from utils import read_tail
+        tail = read_tail(tab, n, ttl_s=60) or []
         for r in tail:
             tok = str(r.get("Token", "") or "").upper()
             stage = str(r.get("Stage", "") or "")
@@ -358,14 +324,7 @@ def append_row_dict(row: dict) -> dict:
     import os, json
 
     def _load_db_read_json() -> dict:
-        raw = (os.getenv("DB_READ_JSON") or "").strip()
-        if not raw:
-            return {}
-        try:
-            o = json.loads(raw)
-            return o if isinstance(o, dict) else {}
-        except Exception:
-            return {}
+        return config_service.db_read_json()
 
     def _truthy(v) -> bool:
         if v is None:
@@ -413,25 +372,14 @@ def append_row_dict(row: dict) -> dict:
             from utils import get_ws_cached  # type: ignore
             ws = get_ws_cached(tab, ttl_s=30)
         except Exception:
-            # Fallback to gspread direct (works in Render if creds are set)
-            import gspread
-            from oauth2client.service_account import ServiceAccountCredentials
+            # Fallback to the shared registry handle (creates the tab if missing)
+            from utils import get_sheet
 
             sheet_url = os.getenv("SHEET_URL")
             if not sheet_url:
                 return {"ok": False, "reason": "SHEET_URL not set"}
 
-            svc = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-            if not svc:
-                return {"ok": False, "reason": "GOOGLE_APPLICATION_CREDENTIALS not set"}
-
-            scope = [
-                "https://spreadsheets.google.com/feeds",
-                "https://www.googleapis.com/auth/drive",
-            ]
-            creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-            gc = gspread.authorize(creds)
-            sh = gc.open_by_url(sheet_url)
+            sh = get_sheet(sheet_url)
             try:
                 ws = sh.worksheet(tab)
             except Exception:
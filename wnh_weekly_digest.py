@@ -23,6 +23,8 @@ import logging
 from datetime import datetime, timedelta, timezone
 from collections import Counter, defaultdict
 
+import config_service
+
 log = logging.getLogger("wnh_weekly_digest")
 
 
@@ -41,14 +43,7 @@ def _truthy(v) -> bool:
 
 
 def _load_db_read_json() -> dict:
-    raw = (os.getenv("DB_READ_JSON") or "").strip()
-    if not raw:
-        return {}
-    try:
-        obj = json.loads(raw)
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return config_service.db_read_json()
 
 
 def _cfg_get(cfg: dict, dotted: str, default=None):
@@ -137,24 +132,13 @@ def _get_ws(tab: str):
     except Exception:
         pass
 
-    import gspread
-    from oauth2client.service_account import ServiceAccountCredentials
+    from utils import get_sheet
 
     sheet_url = os.getenv("SHEET_URL")
     if not sheet_url:
         raise RuntimeError("SHEET_URL not set")
 
-    svc = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-    if not svc:
-        raise RuntimeError("GOOGLE_APPLICATION_CREDENTIALS not set")
-
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(svc, scope)
-    gc = gspread.authorize(creds)
-    sh = gc.open_by_url(sheet_url)
+    sh = get_sheet(sheet_url)
     try:
         return sh.worksheet(tab)
     except Exception:
@@ -181,19 +165,9 @@ def _append_by_header(ws, row_dict: dict) -> None:
 
 
 def _dedupe_recent(ws, decision_id: str, window: int = 400) -> bool:
-    vals = _retry(lambda: ws.get_all_values()) or []
-    if len(vals) <= 1:
-        return False
-    header = vals[0]
-    try:
-        didx = header.index("decision_id")
-    except Exception:
-        return False
-    tail = vals[max(1, len(vals) - window):]
-    for r in tail:
-        if len(r) > didx and r[didx] == decision_id:
-            return True
-    return False
+    from utils import read_tail  # type: ignore
+    tail = _retry(lambda: read_tail(ws.title, window, ttl_s=0)) or []
+    return any(r.get("decision_id") == decision_id for r in tail)
 
 
 def _compact_pairs(pairs: list[tuple[str, int]], limit: int = 6) -> str:
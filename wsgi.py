@@ -5,14 +5,14 @@ import os, json, hmac, hashlib, logging, threading, time, uuid, re
 from functools import wraps
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List, Tuple
-from flask import Flask, request, jsonify, Blueprint
+from flask import Flask, request, jsonify, Blueprint, Response, stream_with_context
 from bus_store_pg import get_store, OUTBOX_LEASE_SECONDS
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from sheets_bp import SHEETS_ROUTES, start_background_flusher
 from telemetry_routes import bp_telemetry
 from autonomy_modes import get_autonomy_state
 from ops_api import bp as ops_bp
+import config_service
 
 # Phase 29 safety: one-line boot config health (warnings only)
 try:
@@ -122,6 +122,24 @@ def _queue_depth() -> dict:
 TRADE_LOGGED_CMDS = set()
 TRADE_LOG_STUB_WARNED = set()
 
+# Trade_Log rows are appended by a background batched writer (one append_rows
+# per TRADE_LOG_FLUSH_S) instead of one append_row per ACK.
+TRADE_LOG_ASYNC = os.getenv("TRADE_LOG_ASYNC", "1").lower() in ("1", "true", "yes", "on")
+TRADE_LOG_FLUSH_S = float(os.getenv("TRADE_LOG_FLUSH_S", "3"))
+_trade_log_buffers: Dict[str, Any] = {}
+_trade_log_buffers_lock = threading.Lock()
+
+def _trade_log_buffer(sheet_url: str):
+    buf = _trade_log_buffers.get(sheet_url)
+    if buf is None:
+        from utils import SheetAppendBuffer
+        with _trade_log_buffers_lock:
+            buf = _trade_log_buffers.get(sheet_url)
+            if buf is None:
+                buf = SheetAppendBuffer("Trade_Log", url=sheet_url, flush_s=TRADE_LOG_FLUSH_S)
+                _trade_log_buffers[sheet_url] = buf
+    return buf
+
 
 # ---------- Command context cache (for richer Trade_Log receipts) ----------
 # Some store backends (e.g., PGStore) do not expose store.get(cmd_id).
@@ -489,6 +507,50 @@ def policy_override():
     _policy_overrides["ttl_expiry"] = time.time() + ttl
     return jsonify(ok=True, applied=values, ttl_sec=ttl), 200
 
+# ========== DB_READ_JSON config (config_service) ==========
+@flask_app.post("/api/config/reload")
+def config_reload():
+    """Re-read DB_READ_JSON from its sources, or pin {"db_read_json": {...}} for all processes.
+
+    Installing a new config always needs a valid X-NT-Sig; a plain re-read
+    follows REQUIRE_HMAC_OPS like the other ops endpoints.
+    """
+    body, err = _require_json()
+    if err: return err
+    body = body if isinstance(body, dict) else {}
+    new_cfg = body.get("db_read_json")
+    if REQUIRE_HMAC_OPS or new_cfg is not None:
+        ok, _, _, _ = _verify_hmac_json("OUTBOX_SECRET", "X-NT-Sig")
+        if not ok:
+            return jsonify(ok=False, error="invalid_signature"), 401
+    if new_cfg is not None and not isinstance(new_cfg, (dict, str)):
+        return jsonify(ok=False, error="db_read_json must be an object or JSON string"), 400
+    try:
+        changed = config_service.reload(new_cfg, reason=str(body.get("reason") or "api"))
+    except Exception as e:
+        # A pin only this process would see is refused (see config_service).
+        return jsonify(ok=False, error=f"pin_failed: {e}"), 409
+    return jsonify(ok=True, changed=changed, config=config_service.config_status()), 200
+
+@flask_app.post("/api/config/unpin")
+def config_unpin():
+    """Drop the shared pin (DB_READ_JSON_FILE / config_pins row) so env DB_READ_JSON applies again everywhere."""
+    body, err = _require_json()
+    if err: return err
+    body = body if isinstance(body, dict) else {}
+    ok, _, _, _ = _verify_hmac_json("OUTBOX_SECRET", "X-NT-Sig")
+    if not ok:
+        return jsonify(ok=False, error="invalid_signature"), 401
+    try:
+        changed = config_service.unpin(reason=str(body.get("reason") or "api"))
+    except Exception as e:
+        return jsonify(ok=False, error=f"unpin_failed: {e}"), 409
+    return jsonify(ok=True, changed=changed, config=config_service.config_status()), 200
+
+@flask_app.get("/api/config/status")
+def config_status():
+    return jsonify(ok=True, config=config_service.config_status()), 200
+
 # ========== Health/root ==========
 @flask_app.get("/")
 def index():
@@ -501,6 +563,43 @@ def healthz():
                       "path": POLICY_PATH, "loaded": _policy.loaded, "error": _policy.load_error}
     try: info["queue"] = _queue_depth()
     except Exception as e: info["queue_error"] = str(e)
+    try:
+        from db_pool import pool_stats
+        info["db_pool"] = pool_stats()
+    except Exception as e: info["db_pool_error"] = str(e)
+    try: info["command_wakeup"] = wakeup_stats()
+    except Exception as e: info["command_wakeup_error"] = str(e)
+    info["trade_log_writer"] = [b.stats() for b in list(_trade_log_buffers.values())]
+    try:
+        from policy_logger import policy_log_stats
+        info["policy_log_writer"] = policy_log_stats()
+    except Exception as e: info["policy_log_writer_error"] = str(e)
+    try:
+        from job_executor import executor_stats
+        info["job_executor"] = executor_stats()
+    except Exception as e: info["job_executor_error"] = str(e)
+    try: info["config"] = config_service.config_status()
+    except Exception as e: info["config_error"] = str(e)
+    try:
+        from agent_freshness import freshness_stats
+        info["agent_freshness"] = freshness_stats()
+    except Exception as e: info["agent_freshness_error"] = str(e)
+    try:
+        from sheets_quota import quota_stats
+        info["sheets_quota"] = quota_stats()
+    except Exception as e: info["sheets_quota_error"] = str(e)
+    try:
+        from shared_sheet_cache import cache_report
+        info["sheets_cache"] = cache_report()
+    except Exception as e: info["sheets_cache_error"] = str(e)
+    try:
+        from policy_bias_engine import bias_table_status
+        info["policy_bias"] = bias_table_status()
+    except Exception as e: info["policy_bias_error"] = str(e)
+    try:
+        from unified_snapshot import unified_snapshot_stats
+        info["unified_snapshot"] = unified_snapshot_stats()
+    except Exception as e: info["unified_snapshot_error"] = str(e)
     return jsonify(info), 200
 
 @flask_app.get("/health")
@@ -1180,6 +1279,62 @@ def add_server_timing_header(response):
     return response
            
 
+# ---- Long-poll / stream delivery (command_wakeup) ----
+# wait_s > 0 in the pull body blocks until work is enqueued (LISTEN/NOTIFY in
+# Postgres mode, condition variable in SQLite mode) instead of leasing on every
+# idle poll. Waiters park a gunicorn thread, so they are capped; extra pulls
+# degrade to a plain immediate lease.
+CMD_PULL_MAX_WAIT_S = float(os.getenv("CMD_PULL_MAX_WAIT_S", "25"))
+CMD_PULL_MAX_WAITERS = int(os.getenv("CMD_PULL_MAX_WAITERS", "4"))
+CMD_STREAM_MAX_S = float(os.getenv("CMD_STREAM_MAX_S", "300"))
+CMD_STREAM_HEARTBEAT_S = float(os.getenv("CMD_STREAM_HEARTBEAT_S", "15"))
+_pull_waiters = threading.BoundedSemaphore(max(1, CMD_PULL_MAX_WAITERS))
+
+try:
+    from command_wakeup import generation as _cmd_generation, wait_for_work as _wait_for_work, wakeup_stats  # type: ignore
+except Exception:
+    _cmd_generation = None  # type: ignore
+    _wait_for_work = None  # type: ignore
+    def wakeup_stats() -> dict:  # type: ignore
+        return {}
+
+def _pull_params(body: dict) -> Tuple[str, int, float]:
+    agent = (body.get("agent_id") or body.get("agent") or body.get("agent_target") or "edge").strip()
+    try:
+        n = int(body.get("limit") or body.get("max_items") or body.get("n") or 5)
+    except Exception:
+        n = 5
+    n = max(1, min(n, 25))
+    try:
+        wait_s = float(body.get("wait_s") or body.get("wait") or 0)
+    except Exception:
+        wait_s = 0.0
+    wait_s = max(0.0, min(wait_s, CMD_PULL_MAX_WAIT_S))
+    return agent, n, wait_s
+
+def _lease_canonical(agent: str, n: int) -> list:
+    return _canonicalize_leased_commands(store.lease(agent, n) or [])
+
+def _lease_with_wait(agent: str, n: int, wait_s: float) -> list:
+    """Lease now; if empty, block up to wait_s for a wakeup and lease again."""
+    if wait_s <= 0 or _wait_for_work is None:
+        return _lease_canonical(agent, n)
+    gen = _cmd_generation(agent)
+    out = _lease_canonical(agent, n)
+    if out or not _pull_waiters.acquire(blocking=False):
+        return out
+    try:
+        deadline = time.time() + wait_s
+        while not out:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not _wait_for_work(agent, remaining, since=gen):
+                break
+            gen = _cmd_generation(agent)
+            out = _lease_canonical(agent, n)
+        return out
+    finally:
+        _pull_waiters.release()
+
 # Edge pulls leased commands
 @flask_app.post("/api/commands/pull")
 def cmd_pull():
@@ -1199,12 +1354,7 @@ def cmd_pull():
             401,
         )
 
-    agent = (body.get("agent_id") or body.get("agent") or body.get("agent_target") or "edge").strip()
-    try:
-        n = int(body.get("limit") or body.get("max_items") or body.get("n") or 5)
-    except Exception:
-        n = 5
-    n = max(1, min(n, 25))
+    agent, n, wait_s = _pull_params(body)
 
     # Phase 24C+ trust boundary
     trusted, reason, age = evaluate_agent(agent)
@@ -1229,11 +1379,9 @@ def cmd_pull():
         resp["lease_seconds"] = OUTBOX_LEASE_SECONDS
         return jsonify(resp)
 
-    # Lease commands for this agent
+    # Lease commands for this agent (optionally long-polling for new work)
     try:
-        out = store.lease(agent, n) or []
-        # Canonicalize intents before sending to Edge (backward compatible)
-        out = _canonicalize_leased_commands(out)
+        out = _lease_with_wait(agent, n, wait_s)
     except Exception as e:
         log.exception("cmd_pull: lease error agent=%s", agent)
         return jsonify({"ok": False, "error": f"lease_error: {e}"}), 500
@@ -1250,6 +1398,78 @@ def cmd_pull():
         }
     )
 
+# Edge streams leased commands (SSE). Same HMAC body as /api/commands/pull;
+# the stream ends after CMD_STREAM_MAX_S and the Edge simply reconnects.
+@flask_app.post("/api/commands/stream")
+def cmd_stream():
+    ok, body, provided, expected = _verify_hmac_json("OUTBOX_SECRET", "X-OUTBOX-SIGN")
+    if not ok:
+        log.error("cmd_stream: invalid HMAC provided=%s expected=%s", provided, expected)
+        return jsonify({"ok": False, "error": "invalid_signature"}), 401
+    if _wait_for_work is None:
+        return jsonify({"ok": False, "error": "stream_unavailable"}), 503
+    if not _pull_waiters.acquire(blocking=False):
+        return jsonify({"ok": False, "error": "too_many_waiters"}), 429
+
+    # The slot is released exactly once: when the generator ends, when the
+    # response is closed (even if it was never iterated), or right here if
+    # building the response fails.
+    released = threading.Lock()
+
+    def _release_slot():
+        if released.acquire(blocking=False):
+            _pull_waiters.release()
+
+    try:
+        agent, n, _ = _pull_params(body)
+    except Exception:
+        _release_slot()
+        raise
+
+    def _event(name: str, data: dict) -> str:
+        return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    def gen():
+        try:
+            until = time.time() + CMD_STREAM_MAX_S
+            while time.time() < until:
+                wake = _cmd_generation(agent)
+                trusted, _, age = evaluate_agent(agent)
+                if _cloud_hold_active():
+                    yield _event("hold", {"reason": _cloud_hold_reason(), "agent_id": agent})
+                elif not trusted:
+                    yield _event("blocked", lease_block_response(agent))
+                else:
+                    out = _lease_canonical(agent, n)
+                    if out:
+                        yield _event("commands", {
+                            "ok": True,
+                            "commands": out,
+                            "lease_seconds": OUTBOX_LEASE_SECONDS,
+                            "agent_id": agent,
+                            "age_sec": age,
+                        })
+                        continue
+                wait = min(CMD_STREAM_HEARTBEAT_S, max(0.0, until - time.time()))
+                if not _wait_for_work(agent, wait, since=wake):
+                    yield ": keepalive\n\n"
+            yield _event("end", {"reconnect": True})
+        except Exception as e:
+            log.exception("cmd_stream: error agent=%s", agent)
+            yield _event("error", {"error": str(e)})
+        finally:
+            _release_slot()
+
+    try:
+        resp = Response(stream_with_context(gen()), mimetype="text/event-stream")
+        resp.headers["Cache-Control"] = "no-cache"
+        resp.headers["X-Accel-Buffering"] = "no"
+        resp.call_on_close(_release_slot)
+    except Exception:
+        _release_slot()
+        raise
+    return resp
+
 
 def append_trade_log_safe(cmd_id, agent_id, receipt, status: str, ok_val: bool):
     """
@@ -1338,6 +1558,45 @@ def append_trade_log_safe(cmd_id, agent_id, receipt, status: str, ok_val: bool):
         # Sheets/logging issues must NEVER break ACK
         log.exception("trade_log: append degraded (non-fatal)")
 
+def _normalize_ack(body: dict, default_agent: str = "edge"):
+    """Normalize one ack body -> (agent_id, cmd_id, cmd_id_int, receipt, status, ok_val)."""
+    receipt = body.get("receipt") or {}
+    if not isinstance(receipt, dict):
+        receipt = {"raw": receipt}
+
+    agent_id = str(
+        (body.get("meta") or {}).get("agent_id")
+        or body.get("agent_id")
+        or body.get("agent")
+        or default_agent
+    ).strip()
+
+    cmd_id = body.get("id") or body.get("cmd_id")
+
+    # status can come from wrapper body or receipt
+    status = str(body.get("status") or receipt.get("status") or "").strip().lower()
+
+    # ok can come from wrapper body OR receipt; if absent, infer from status
+    ok_raw = body.get("ok", None)
+    if ok_raw is None:
+        ok_raw = receipt.get("ok", None)
+
+    if ok_raw is None:
+        # infer if not explicitly provided
+        ok_val = status not in ("error", "failed", "held")
+    else:
+        ok_val = bool(ok_raw)
+
+    if not status:
+        status = "ok" if ok_val else "error"
+
+    try:
+        cmd_id_int = int(cmd_id)
+    except Exception:
+        cmd_id_int = None
+
+    return agent_id, cmd_id, cmd_id_int, receipt, status, ok_val
+
 # Edge ACKs execution results
 @flask_app.post("/api/commands/ack")
 def cmd_ack():
@@ -1373,42 +1632,11 @@ def cmd_ack():
         )
 
     # ---- 2) Normalize fields -----------------------------------------------
-    receipt = body.get("receipt") or {}
-
-    agent_id = (
-        (body.get("meta") or {}).get("agent_id")
-        or body.get("agent_id")
-        or body.get("agent")
-        or "edge"
-    ).strip()
-
-    cmd_id = body.get("id") or body.get("cmd_id")
+    agent_id, cmd_id, cmd_id_int, receipt, status, ok_val = _normalize_ack(body)
     if cmd_id is None:
         return jsonify({"ok": False, "error": "missing cmd id"}), 400
 
-    # status can come from wrapper body or receipt
-    status = (body.get("status") or receipt.get("status") or "").strip().lower()
-
-    # ok can come from wrapper body OR receipt; if absent, infer from status
-    ok_raw = body.get("ok", None)
-    if ok_raw is None:
-        ok_raw = receipt.get("ok", None)
-
-    if ok_raw is None:
-        # infer if not explicitly provided
-        ok_val = status not in ("error", "failed", "held")
-    else:
-        ok_val = bool(ok_raw)
-
-    if not status:
-        status = "ok" if ok_val else "error"
-
     # ---- 3) Persist receipt + mark command done/failed ----------------------
-    try:
-        cmd_id_int = int(cmd_id)
-    except Exception:
-        cmd_id_int = None
-
     try:
         # Always record the receipt in the outbox store
         store.save_receipt(agent_id, cmd_id_int, receipt, ok=ok_val)
@@ -1447,6 +1675,73 @@ def cmd_ack():
     return jsonify({"ok": True})
 
 
+ACK_BATCH_MAX = int(os.getenv("ACK_BATCH_MAX", "500"))
+
+# Edge replays a backlog of receipts in one signed request
+@flask_app.post("/api/commands/ack_batch")
+def cmd_ack_batch():
+    """
+    Batched variant of /api/commands/ack for Edge backlog replays.
+
+    Body (HMAC-signed as a whole, OUTBOX_SECRET + X-OUTBOX-SIGN):
+      {"agent_id": "...", "receipts": [<same shape as an /ack body>, ...]}
+
+    All receipts are inserted and their commands settled in ONE transaction
+    (store.ack_batch); Trade_Log rows go to the async batched writer. The
+    response carries one result per input receipt, in order.
+    """
+    ok, body, provided, expected = _verify_hmac_json("OUTBOX_SECRET", "X-OUTBOX-SIGN")
+    if not ok:
+        log.error("cmd_ack_batch: invalid HMAC provided=%s expected=%s", provided, expected)
+        return jsonify({"ok": False, "error": "invalid_signature", "provided": provided, "expected": expected}), 401
+
+    items = body.get("receipts") or body.get("acks") or []
+    if not isinstance(items, list):
+        return jsonify({"ok": False, "error": "receipts must be a list"}), 400
+    if len(items) > ACK_BATCH_MAX:
+        return jsonify({"ok": False, "error": f"too many receipts (max {ACK_BATCH_MAX})"}), 413
+
+    default_agent = str(body.get("agent_id") or body.get("agent") or "edge").strip()
+    results: List[Dict[str, Any]] = []
+    acks: List[Dict[str, Any]] = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append({"id": None, "ok": False, "status": "invalid", "error": "receipt must be an object"})
+            continue
+        agent_id, cmd_id, cmd_id_int, receipt, status, ok_val = _normalize_ack(item, default_agent)
+        if cmd_id is None:
+            results.append({"id": None, "ok": False, "status": "invalid", "error": "missing cmd id"})
+            continue
+        ack = {"agent_id": agent_id, "cmd_id": cmd_id_int, "cmd_ref": cmd_id,
+               "receipt": receipt, "status": status, "ok": ok_val}
+        acks.append(ack)
+        results.append(ack)
+
+    try:
+        settled = store.ack_batch(acks)
+    except Exception as e:
+        log.exception("cmd_ack_batch: persist failed (%d receipts)", len(acks))
+        return jsonify({"ok": False, "error": f"persist_error: {e}"}), 500
+
+    out: List[Dict[str, Any]] = []
+    for r in results:
+        if "receipt" not in r:
+            out.append(r)
+            continue
+        cid = r["cmd_id"]
+        out.append({
+            "id": r["cmd_ref"],
+            "ok": True,
+            "receipt_ok": bool(r["ok"]),
+            "status": settled.get(cid, "unknown_cmd") if cid is not None else "receipt_only",
+        })
+        log.info("ops_ack: agent=%s cmd=%s status=%s ok=%s (batch)",
+                 r["agent_id"], r["cmd_ref"], r["status"], "true" if r["ok"] else "false")
+        append_trade_log_safe(r["cmd_ref"], r["agent_id"], r["receipt"], status=r["status"], ok_val=r["ok"])
+
+    return jsonify({"ok": True, "count": len(out), "persisted": len(acks), "results": out})
+
+
 @flask_app.get("/api/debug/outbox")
 def dbg_outbox():
     return jsonify(store.stats())
@@ -1509,13 +1804,12 @@ def _verify_hmac(sig: str, body: bytes) -> bool:
     return hmac.compare_digest(mac, sig or "")
 
 def _append_trade_row(norm: dict):
-    # Uses your utils.get_gspread_client + SHEET_URL env
-    from utils import get_gspread_client
+    # Uses the shared utils Spreadsheet registry + SHEET_URL env
+    from utils import get_sheet
     SHEET_URL = os.getenv("SHEET_URL", "")
     if not SHEET_URL:
         raise RuntimeError("SHEET_URL missing")
-    gc = get_gspread_client()
-    sh = gc.open_by_url(SHEET_URL)
+    sh = get_sheet(SHEET_URL)
     ws = sh.worksheet("Trade_Log")   # make sure this tab exists
 
     row = [
@@ -1664,14 +1958,8 @@ except Exception:
 
 # --- Sheets helpers ---------------------------------------------------------
 def _get_gspread():
-    import gspread
-    from oauth2client.service_account import ServiceAccountCredentials
-
-    svc_json = os.environ.get("SVC_JSON", "sentiment-log-service.json")
-    scopes = ["https://spreadsheets.google.com/feeds",
-              "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name(svc_json, scopes)
-    return gspread.authorize(creds)
+    from utils import get_gspread_client
+    return get_gspread_client()
 
 def _find_decision_id_any(obj: Any) -> str:
     """Depth-first search for 'decision_id' inside nested dicts/lists."""
@@ -1765,7 +2053,9 @@ from datetime import datetime
 
 # --- helpers: get worksheet & append row (reuse your existing sheets utils if you have them) ---
 def _open_ws(gc, sheet_url: str, tab: str):
-    sh = gc.open_by_url(sheet_url)
+    # gc is kept for call compatibility; the handle comes from the shared registry.
+    from utils import get_sheet
+    sh = get_sheet(sheet_url)
     try:
         return sh.worksheet(tab)
     except Exception:
@@ -1961,6 +2251,10 @@ def log_trade_to_sheet(gc, sheet_url: str, command: dict, receipt: dict) -> None
             source,   # Source
         ]
 
+        # Async batched path: ack handlers never wait on Sheets.
+        if TRADE_LOG_ASYNC and _trade_log_buffer(sheet_url).append(row):
+            return
+
         ws = _open_ws(gc, sheet_url, "Trade_Log")
         ws.append_row(row, value_input_option="USER_ENTERED")
 